@@ -0,0 +1,123 @@
+"""
+Шардированный запуск на одной машине: N процессов-шардов и роутер.
+
+    python -m backend.api.cluster --workers 4 --port 8000
+
+Каждый шард — обычное приложение backend.api.main на своём Unix-сокете с
+SHARD_COUNT/SHARD_INDEX в окружении; игры делятся между ними по хэшу game_id.
+Роутер (backend.api.shard_router) слушает внешний порт и передаёт запросы
+шарду-владельцу. Кроме сокета, шард i слушает TCP-порт --shard-port + i
+(по умолчанию --port + 1 + i; 0 — не слушать), и роутер отдаёт клиенту в
+websocket_connection адрес этого порта: WebSocket игры идёт прямо в шард.
+"""
+import argparse
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import List
+
+import uvicorn
+
+from backend.api.shard_router import ShardRouter, create_app
+from backend.api.sharding import socket_path
+from backend.app.config.logging_config import setup_logging, shutdown_logging
+from backend.app.config.settings import SHARD_SOCKET_DIR
+
+logger = logging.getLogger(__name__)
+
+# Сколько секунд ждём, пока шарды откроют сокеты
+STARTUP_TIMEOUT = 30.0
+
+
+def start_shard(index: int, shard_count: int, socket_dir: str, host: str = "", port: int = 0) -> subprocess.Popen:
+    """Запускает процесс-шард index; port — его TCP-порт для прямых WebSocket (0 — без него)."""
+    path = socket_path(socket_dir, index)
+    if os.path.exists(path):
+        os.unlink(path)
+    env = dict(
+        os.environ,
+        SHARD_COUNT=str(shard_count),
+        SHARD_INDEX=str(index),
+        SHARD_SOCKET_DIR=socket_dir,
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "backend.api.cluster", "--serve-shard", path, "--host", host, "--port", str(port)],
+        env=env,
+    )
+
+
+def serve_shard(path: str, host: str, port: int) -> None:
+    """Процесс-шард: приложение на Unix-сокете для роутера и, если port задан, на TCP-порту."""
+    unix = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    unix.bind(path)
+    os.chmod(path, 0o666)
+    sockets = [unix]
+    if port:
+        sockets.append(socket.create_server((host, port)))
+    uvicorn.Server(uvicorn.Config("backend.api.main:app")).run(sockets=sockets)
+
+
+def wait_for_sockets(paths: List[str], processes: List[subprocess.Popen], timeout: float) -> None:
+    """Ждёт сокеты всех шардов; падает, если шард завершился или не успел."""
+    deadline = time.monotonic() + timeout
+    while not all(os.path.exists(path) for path in paths):
+        for index, process in enumerate(processes):
+            if process.poll() is not None:
+                raise RuntimeError(f"Шард {index} завершился с кодом {process.returncode}")
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Шарды не открыли сокеты за {timeout} сек.")
+        time.sleep(0.1)
+
+
+def stop_shards(processes: List[subprocess.Popen]) -> None:
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Шардированный запуск сервера игры")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Число процессов-шардов")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--socket-dir", default=SHARD_SOCKET_DIR, help="Каталог Unix-сокетов шардов")
+    parser.add_argument(
+        "--shard-port", type=int, default=None,
+        help="Первый TCP-порт шардов для прямых WebSocket (по умолчанию --port + 1; 0 — только через роутер)",
+    )
+    parser.add_argument("--public-host", default="localhost", help="Хост шардов в адресах websocket_connection")
+    parser.add_argument("--serve-shard", metavar="SOCKET", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve_shard:
+        serve_shard(args.serve_shard, args.host, args.port)
+        return
+
+    setup_logging()
+    os.makedirs(args.socket_dir, exist_ok=True)
+    shard_port = args.port + 1 if args.shard_port is None else args.shard_port
+    ports = [shard_port + index if shard_port else 0 for index in range(args.workers)]
+    paths = [socket_path(args.socket_dir, index) for index in range(args.workers)]
+    processes = [
+        start_shard(index, args.workers, args.socket_dir, args.host, ports[index]) for index in range(args.workers)
+    ]
+    try:
+        wait_for_sockets(paths, processes, STARTUP_TIMEOUT)
+        logger.info("Запущено шардов: %s", args.workers)
+        public_urls = [f"ws://{args.public_host}:{port}" for port in ports] if shard_port else None
+        router = ShardRouter.over_unix_sockets(args.workers, args.socket_dir, public_urls)
+        uvicorn.run(create_app(router), host=args.host, port=args.port)
+    finally:
+        stop_shards(processes)
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
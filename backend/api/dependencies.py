@@ -1,8 +1,70 @@
+import random
+from typing import Tuple
+
 from backend.api.managers.connection_managaer import ConnectionManager
+from backend.api.managers.game_actor import GameActors
 from backend.api.managers.game_manager import GameManager
+from backend.api.managers.game_reaper import GameReaper, ReaperConfig
+from backend.api.managers.lobby_hub import LobbyHub
+from backend.api.managers.state_sync_manager import StateSyncManager
+from backend.api.managers.timer_wheel import TimerWheel
+from backend.api.sharding import shard_map_from_settings
+from backend.app.config.settings import (
+    ABANDONED_GAME_TTL,
+    DECK_POOL_SIZE,
+    EMPTY_LOBBY_TTL,
+    FINISHED_GAME_TTL,
+    GAME_MEMORY_BUDGET_MB,
+    GAME_REAPER_INTERVAL,
+    GAME_STORE,
+    SHARD_COUNT,
+    SHARD_INDEX,
+    SNAPSHOT_STORE,
+)
+from backend.app.models.deck import RandomDeckSource
+from backend.app.models.deck_pool import DeckPool
+from backend.app.storage.game_store import open_game_store
+from backend.app.storage.snapshot_store import open_snapshot_store
 
-game_manager = GameManager()
+lobby_hub = LobbyHub()
+deck_source = DeckPool(DECK_POOL_SIZE) if DECK_POOL_SIZE > 0 else RandomDeckSource(random.SystemRandom())
+game_manager = GameManager(
+    lobby_hub=lobby_hub,
+    snapshot_store=open_snapshot_store(SNAPSHOT_STORE),
+    deck_source=deck_source,
+    shard=shard_map_from_settings(SHARD_COUNT, SHARD_INDEX),
+    store=open_game_store(GAME_STORE, deck_source=deck_source),
+)
 connection_manager = ConnectionManager()
+timer_wheel = TimerWheel()
+game_actors = GameActors(timer_wheel)
+state_sync_manager = StateSyncManager()
+
+
+def forget_game(game_id: str, player_ids: Tuple[str, ...] = ()) -> None:
+    """
+    Освобождает то, что процесс держит для удалённой игры: очередь команд,
+    статистику рассылок и последние отправленные игрокам состояния.
+    """
+    game_actors.close(game_id)
+    connection_manager.forget_room(game_id)
+    for player_id in player_ids:
+        state_sync_manager.forget(player_id)
+
+
+game_reaper = GameReaper(
+    game_manager,
+    ReaperConfig(
+        empty_lobby_ttl=EMPTY_LOBBY_TTL,
+        abandoned_ttl=ABANDONED_GAME_TTL,
+        finished_ttl=FINISHED_GAME_TTL,
+        memory_budget=int(GAME_MEMORY_BUDGET_MB * 1024 * 1024),
+        interval=GAME_REAPER_INTERVAL,
+    ),
+    is_connected=connection_manager.is_connected,
+    on_removed=forget_game,
+    in_use=game_actors.is_busy,
+)
 
 
 def get_game_manager() -> GameManager:
@@ -10,6 +72,31 @@ def get_game_manager() -> GameManager:
     return game_manager
 
 
+def get_lobby_hub() -> LobbyHub:
+    """Возвращает синглтон-экземпляр LobbyHub."""
+    return lobby_hub
+
+
+def get_game_reaper() -> GameReaper:
+    """Возвращает синглтон-экземпляр GameReaper."""
+    return game_reaper
+
+
+def get_game_actors() -> GameActors:
+    """Возвращает синглтон-экземпляр GameActors."""
+    return game_actors
+
+
+def get_timer_wheel() -> TimerWheel:
+    """Возвращает синглтон-экземпляр TimerWheel."""
+    return timer_wheel
+
+
 def get_connection_manager() -> ConnectionManager:
     """Возвращает синглтон-экземпляр ConnectionManager."""
-    return connection_manager 
\ No newline at end of file
+    return connection_manager 
+
+
+def get_state_sync_manager() -> StateSyncManager:
+    """Возвращает синглтон-экземпляр StateSyncManager."""
+    return state_sync_manager
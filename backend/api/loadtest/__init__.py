@@ -0,0 +1,2 @@
+from backend.api.loadtest.engine import LoadBot, LoadConfig, LoadReport, read_rss, run_load
+from backend.api.loadtest.transport import InProcessTransport, NetworkTransport
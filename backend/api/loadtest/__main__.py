@@ -0,0 +1,92 @@
+"""
+Нагрузочный тест WebSocket-сервера ботами:
+
+    python -m backend.api.loadtest --bots 200 --room-size 4
+    python -m backend.api.loadtest --url http://127.0.0.1:8000 --server-pid $(pgrep -f uvicorn)
+
+Без --url приложение backend.api.main:app поднимается в этом же процессе.
+С порогами (--max-p95-ms и т.д.) код выхода 1 при их нарушении — для CI.
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from backend.api.loadtest.engine import LoadConfig, run_load
+from backend.app.simulation.policies import POLICIES
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Нагрузочный тест FoolGame по WebSocket")
+    parser.add_argument("--bots", type=int, default=100, help="количество ботов (одновременных WebSocket)")
+    parser.add_argument("--room-size", type=int, default=2, help="игроков в комнате")
+    parser.add_argument(
+        "--policy",
+        default="greedy",
+        help=f"стратегии через запятую, по кругу на ботов ({', '.join(POLICIES)})",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="зерно стратегий ботов")
+    parser.add_argument("--url", help="адрес запущенного сервера; без него — приложение в этом процессе")
+    parser.add_argument("--server-pid", type=int, help="PID сервера для замера RSS при --url")
+    parser.add_argument("--timeout", type=float, default=120.0, help="предел прогона, секунды")
+    parser.add_argument("--move-timeout", type=float, default=5.0, help="ожидание ответа на ход, секунды")
+    parser.add_argument("--rss-interval", type=float, default=0.5, help="период замера RSS, секунды")
+    parser.add_argument("--max-p95-ms", type=float, help="порог p95 времени ответа на ход")
+    parser.add_argument("--max-p99-ms", type=float, help="порог p99 времени ответа на ход")
+    parser.add_argument("--min-messages-per-sec", type=float, help="минимум сообщений в секунду")
+    parser.add_argument("--max-rss-mb", type=float, help="порог пиковой памяти сервера")
+    parser.add_argument("--json", action="store_true", help="вывести отчёт в JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    policies = tuple(name.strip() for name in args.policy.split(",") if name.strip())
+    unknown = [name for name in policies if name not in POLICIES]
+    if unknown:
+        print(f"Неизвестные стратегии: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    if not 2 <= args.room_size <= 6 or args.bots < args.room_size:
+        print("Нужно 2..6 игроков в комнате и хотя бы одна полная комната", file=sys.stderr)
+        return 2
+
+    config = LoadConfig(
+        bots=args.bots,
+        room_size=args.room_size,
+        policies=policies,
+        seed=args.seed,
+        timeout=args.timeout,
+        move_timeout=args.move_timeout,
+        rss_interval=args.rss_interval,
+        server_pid=args.server_pid,
+    )
+    report = asyncio.run(run_load(config, url=args.url))
+    failures = report.check(
+        max_p95_ms=args.max_p95_ms,
+        max_p99_ms=args.max_p99_ms,
+        min_messages_per_sec=args.min_messages_per_sec,
+        max_rss_mb=args.max_rss_mb,
+    )
+
+    if args.json:
+        print(json.dumps({**report.to_dict(), "failures": failures}, ensure_ascii=False, indent=2))
+    else:
+        print(f"Ботов:           {report.bots} (подключено {report.connected})")
+        print(f"Партий:          {report.games} (завершено {report.finished})")
+        print(f"Время:           {report.elapsed:.2f} с")
+        print(f"Ходов:           {report.moves} ({report.moves_per_sec:.1f}/с)")
+        print(f"Сообщений/с:     {report.messages_per_sec:.1f}")
+        print(f"Ответ на ход:    p50 {report.p50 * 1000:.2f} мс, p95 {report.p95 * 1000:.2f} мс, "
+              f"p99 {report.p99 * 1000:.2f} мс")
+        print(f"Ошибки/таймауты: {report.errors}/{report.timeouts}")
+        if report.rss_samples:
+            print("RSS сервера, МБ:")
+            for t, rss in report.rss_samples:
+                print(f"  {t:7.2f} с  {rss / 2**20:.1f}")
+        for failure in failures:
+            print(f"Порог нарушен: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,428 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import msgspec
+
+from backend.api.loadtest.transport import ConnectionClosed, InProcessTransport, NetworkTransport
+from backend.app.models.beats import defense_options
+from backend.app.models.card import Card, Suit, card_by_index
+from backend.app.models.card_set import cards_of_ranks, ranks_of
+from backend.app.simulation.policies import BotPolicy, make_policy
+
+logger = logging.getLogger(__name__)
+
+PLAY_STATE = "PlayRoundWithoutThrowState"
+# Мест на столе в первом раунде; после первого отбоя — 6 (как в PlayRoundWithoutThrowState)
+FIRST_ROUND_SLOTS = 5
+NEXT_ROUND_SLOTS = 6
+
+_encoder = msgspec.json.Encoder()
+
+
+@dataclass(frozen=True)
+class LoadConfig:
+    """Параметры нагрузочного прогона"""
+
+    bots: int = 100
+    room_size: int = 2
+    policies: Tuple[str, ...] = ("greedy",)
+    seed: int = 0
+    timeout: float = 120.0  # Предел всего прогона, секунды
+    move_timeout: float = 5.0  # Сколько бот ждёт ответа на свой ход
+    rss_interval: float = 0.5  # Период замера памяти сервера, секунды
+    server_pid: Optional[int] = None  # Процесс сервера для замера RSS (по URL); в процессе — свой
+
+
+@dataclass
+class LoadReport:
+    """Итоги нагрузочного прогона"""
+
+    bots: int = 0
+    connected: int = 0
+    games: int = 0
+    finished: int = 0
+    moves: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    messages_received: int = 0
+    messages_sent: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)  # Время ответа на ход, секунды
+    rss_samples: List[Tuple[float, int]] = field(default_factory=list)  # (секунда прогона, байт)
+
+    def percentile(self, q: float) -> float:
+        """Перцентиль времени ответа на ход (ближайший ранг), секунды."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(1, -(-len(ordered) * q // 100))
+        return ordered[int(rank) - 1]
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(95)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(99)
+
+    @property
+    def messages_per_sec(self) -> float:
+        return (self.messages_received + self.messages_sent) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def moves_per_sec(self) -> float:
+        return self.moves / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def peak_rss(self) -> Optional[int]:
+        return max((rss for _, rss in self.rss_samples), default=None)
+
+    def check(
+        self,
+        max_p95_ms: Optional[float] = None,
+        max_p99_ms: Optional[float] = None,
+        min_messages_per_sec: Optional[float] = None,
+        max_rss_mb: Optional[float] = None,
+    ) -> List[str]:
+        """
+        Сверяет прогон с порогами (для CI); незавершённые партии — всегда нарушение.
+
+        Returns:
+            List[str]: Описания нарушенных порогов; пустой список — прогон прошёл.
+        """
+        failures = []
+        if self.finished < self.games:
+            failures.append(f"завершено партий {self.finished} из {self.games}")
+        if max_p95_ms is not None and self.p95 * 1000 > max_p95_ms:
+            failures.append(f"p95 {self.p95 * 1000:.2f} мс > {max_p95_ms} мс")
+        if max_p99_ms is not None and self.p99 * 1000 > max_p99_ms:
+            failures.append(f"p99 {self.p99 * 1000:.2f} мс > {max_p99_ms} мс")
+        if min_messages_per_sec is not None and self.messages_per_sec < min_messages_per_sec:
+            failures.append(f"сообщений/с {self.messages_per_sec:.0f} < {min_messages_per_sec}")
+        if max_rss_mb is not None and self.peak_rss is not None and self.peak_rss / 2**20 > max_rss_mb:
+            failures.append(f"RSS {self.peak_rss / 2**20:.1f} МБ > {max_rss_mb} МБ")
+        return failures
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "bots": self.bots,
+            "connected": self.connected,
+            "games": self.games,
+            "finished": self.finished,
+            "moves": self.moves,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "elapsed": round(self.elapsed, 3),
+            "moves_per_sec": round(self.moves_per_sec, 1),
+            "messages_received": self.messages_received,
+            "messages_sent": self.messages_sent,
+            "messages_per_sec": round(self.messages_per_sec, 1),
+            "latency_ms": {
+                "p50": round(self.p50 * 1000, 3),
+                "p95": round(self.p95 * 1000, 3),
+                "p99": round(self.p99 * 1000, 3),
+                "max": round(max(self.latencies, default=0.0) * 1000, 3),
+            },
+            "rss_mb": [[round(t, 2), round(rss / 2**20, 1)] for t, rss in self.rss_samples],
+        }
+
+
+def read_rss(pid: int) -> Optional[int]:
+    """Резидентная память процесса в байтах из /proc (только Linux)."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class LoadBot:
+    """
+    Игрок-бот по WebSocket.
+
+    Состояние игры бот собирает сам из полного снимка и дельт, как клиент;
+    ход выбирает стратегия симулятора по маскам допустимых карт.
+    """
+
+    def __init__(self, name: str, policy: BotPolicy, report: LoadReport) -> None:
+        self.name = name
+        self.policy = policy
+        self.report = report
+        self.player_id: Optional[str] = None
+        self.game_id: Optional[str] = None
+        self.hand = 0  # Маска карт в руке
+        self.table: List[List[Optional[int]]] = []  # [индекс атакующей, индекс защищающейся | None]
+        self.table_slots = FIRST_ROUND_SLOTS
+        self.scalars: Dict[str, Any] = {}
+        self.players: Dict[str, dict] = {}
+        self.seq = 0
+        self.synced = False
+        self.sent_at: Optional[float] = None  # Время отправки хода, на который ждём ответа
+        self.rejected = False
+        self.game_over = False
+
+    async def join(self, http, room_size: int) -> None:
+        response = await http.post("/api/v1/auth_guest", params={"player_name": self.name})
+        response.raise_for_status()
+        self.player_id = response.json()["player_id"]
+        response = await http.post(
+            "/api/v1/join_game", params={"player_id": self.player_id, "players_limit": room_size}
+        )
+        response.raise_for_status()
+        self.game_id = response.json()["game_id"]
+
+    async def play(self, transport, move_timeout: float) -> None:
+        """Подключается, объявляет готовность и играет до конца партии."""
+        websocket = await transport.websocket(f"/api/v1/ws/{self.game_id}", {"player_id": self.player_id})
+        self.report.connected += 1
+        try:
+            await self._send(websocket, {"type": "change_status", "data": {"status": "ready"}})
+            while not self.game_over:
+                try:
+                    frame = await asyncio.wait_for(websocket.recv(), move_timeout)
+                except asyncio.TimeoutError:
+                    if self.sent_at is not None:
+                        # Ответа на ход нет — считаем потерянным и ходим заново
+                        self.report.timeouts += 1
+                        self.sent_at = None
+                        await self._move(websocket)
+                    continue
+                self.report.messages_received += 1
+                if self.sent_at is not None:
+                    self.report.latencies.append(time.perf_counter() - self.sent_at)
+                    self.sent_at = None
+                if not self.apply(msgspec.json.decode(frame)):
+                    await self._send(websocket, {"type": "resync_state"})
+                    continue
+                await self._move(websocket)
+        except ConnectionClosed:
+            logger.warning(f"Сервер закрыл соединение бота {self.name}")
+        finally:
+            await websocket.close()
+
+    async def leave(self, http) -> None:
+        await http.post("/api/v1/exit_game", params={"player_id": self.player_id})
+
+    async def _send(self, websocket, message: dict) -> None:
+        self.report.messages_sent += 1
+        await websocket.send(_encoder.encode(message).decode())
+
+    async def _move(self, websocket) -> None:
+        move = self.next_move()
+        if move is None:
+            return
+        self.report.moves += 1
+        self.sent_at = time.perf_counter()
+        await self._send(websocket, move)
+
+    def apply(self, message: dict) -> bool:
+        """
+        Применяет сообщение сервера к состоянию бота.
+
+        Returns:
+            bool: False, если пропущен номер дельты и нужен полный снимок.
+        """
+        kind, data = message.get("type"), message.get("data") or {}
+        if kind == "connection_confirmed":
+            self.hand = _mask(data["cards"])
+            self.table = [_slot(slot) for slot in data["table_cards"]]
+            self.players = {p["player_id"]: p for p in data["room_players"]}
+            self.scalars = {
+                k: v for k, v in data.items() if k not in ("cards", "table_cards", "room_players", "seq")
+            }
+            self.seq, self.synced, self.rejected = data["seq"], True, False
+        elif kind == "game_state_delta":
+            if not self.synced:
+                return True
+            if data["seq"] != self.seq + 1:
+                self.synced = False
+                return False
+            self.seq = data["seq"]
+            self.rejected = False
+            self.scalars.update(data.get("set", {}))
+            self.hand = (self.hand | _mask(data.get("cards_added", ()))) & ~_mask(data.get("cards_removed", ()))
+            if "table_size" in data:
+                if self.table and not data["table_size"]:
+                    self.table_slots = NEXT_ROUND_SLOTS
+                del self.table[data["table_size"]:]
+                for index, slot in data.get("table_slots", ()):
+                    if index < len(self.table):
+                        self.table[index] = _slot(slot)
+                    else:
+                        self.table.append(_slot(slot))
+            for update in data.get("players_updated", ()):
+                self.players.setdefault(update["player_id"], {}).update(update)
+            for player_id in data.get("players_removed", ()):
+                self.players.pop(player_id, None)
+        elif kind == "game_ended":
+            self.game_over = True
+        elif kind == "error":
+            self.report.errors += 1
+            self.rejected = True
+        return True
+
+    def next_move(self) -> Optional[dict]:
+        """Ход бота или None, если сейчас ход не его."""
+        scalars = self.scalars
+        if not self.synced or scalars.get("current_state") != PLAY_STATE:
+            return None
+        actions = scalars.get("allowed_actions") or []
+        position = scalars.get("position")
+        trump_suit = Suit(scalars["trump_suit"])
+        uncovered = [attack for attack, defend in self.table if defend is None]
+
+        if position == scalars.get("defender_position") and "DEFEND" in actions and uncovered:
+            attack_card = card_by_index(uncovered[0], trump_suit)
+            legal = defense_options(self.hand, attack_card, trump_suit)
+            choice = None if self.rejected else self.policy.choose_defense(legal, attack_card, trump_suit)
+            if choice is None:
+                return {"type": "pass_turn"}
+            return {
+                "type": "play_card",
+                "attack_card": attack_card.to_dict(),
+                "defend_card": card_by_index(choice).to_dict(),
+            }
+
+        if position != scalars.get("attacker_position") or "ATTACK" not in actions:
+            return None
+        # Пас атакующему доступен при покрытом столе или когда защищающийся берёт
+        collecting = bool(uncovered) and "PASS" in actions
+        if uncovered and not collecting:
+            return None
+        can_pass = bool(self.table) and "PASS" in actions
+        choice = None
+        if not (self.rejected and can_pass):
+            choice = self.policy.choose_attack(self._legal_attacks(collecting), trump_suit, not self.table)
+        if choice is None:
+            return {"type": "pass_turn"} if can_pass else None
+        return {"type": "play_card", "attack_card": card_by_index(choice).to_dict()}
+
+    def _legal_attacks(self, collecting: bool) -> int:
+        """Маска карт, которые стол примет (те же лимиты, что в симуляторе)."""
+        if len(self.table) >= self.table_slots:
+            return 0
+        defender = next(
+            (p for p in self.players.values() if p.get("position") == self.scalars.get("defender_position")),
+            None,
+        )
+        if defender is not None:
+            defender_cards = defender.get("cards_count", 0)
+            uncovered = sum(1 for _, defend in self.table if defend is None)
+            if collecting and len(self.table) + 1 >= defender_cards:
+                return 0
+            if not collecting and uncovered + 1 > defender_cards:
+                return 0
+        if not self.table:
+            return self.hand
+        table_mask = _mask_indices(index for slot in self.table for index in slot if index is not None)
+        return self.hand & cards_of_ranks(ranks_of(table_mask))
+
+
+def _card_index(data: dict) -> int:
+    return Card.from_dict(data).index
+
+
+def _mask_indices(indices) -> int:
+    mask = 0
+    for index in indices:
+        mask |= 1 << index
+    return mask
+
+
+def _mask(cards) -> int:
+    return _mask_indices(_card_index(card) for card in cards)
+
+
+def _slot(slot: dict) -> List[Optional[int]]:
+    defend = slot.get("defend_card")
+    return [_card_index(slot["attack_card"]), _card_index(defend) if defend else None]
+
+
+async def _sample_rss(pid: int, report: LoadReport, started: float, interval: float) -> None:
+    while True:
+        rss = read_rss(pid)
+        if rss is None:
+            return
+        report.rss_samples.append((time.perf_counter() - started, rss))
+        await asyncio.sleep(interval)
+
+
+async def run_load(
+    config: LoadConfig = LoadConfig(),
+    url: Optional[str] = None,
+    app=None,
+    log_level: int = logging.WARNING,
+) -> LoadReport:
+    """
+    Нагрузочный прогон: config.bots ботов входят в комнаты по config.room_size,
+    подключаются по WebSocket одновременно и доигрывают партии до конца.
+
+    Args:
+        config: Параметры прогона.
+        url: Адрес запущенного сервера; без него приложение поднимается в этом процессе.
+        app: ASGI-приложение для прогона в процессе (по умолчанию backend.api.main:app).
+        log_level: Уровень логов на время прогона в процессе.
+
+    Returns:
+        LoadReport: Время ответа на ходы, сообщения в секунду и память сервера.
+    """
+    transport = NetworkTransport(url) if url else InProcessTransport(app)
+    pid = config.server_pid if url else os.getpid()
+    rng = random.Random(config.seed)
+    report = LoadReport(bots=config.bots, games=config.bots // config.room_size)
+    bots = [
+        LoadBot(
+            f"bot-{i}",
+            make_policy(config.policies[i % len(config.policies)], random.Random(rng.getrandbits(64))),
+            report,
+        )
+        for i in range(report.games * config.room_size)
+    ]
+
+    async with transport:
+        # Lifespan приложения настраивает логирование заново, поэтому уровень меняется после входа;
+        # корневой логгер заодно глушит httpx, который пишет каждый запрос
+        root_logger = logging.getLogger()
+        previous_level = root_logger.level
+        if not url:
+            root_logger.setLevel(log_level)
+        try:
+            # Вход по очереди: быстрый подбор заполняет комнаты одну за другой
+            for bot in bots:
+                await bot.join(transport.http, config.room_size)
+
+            started = time.perf_counter()
+            sampler = asyncio.create_task(_sample_rss(pid, report, started, config.rss_interval)) if pid else None
+            try:
+                results = await asyncio.wait_for(
+                    asyncio.gather(
+                        *(bot.play(transport, config.move_timeout) for bot in bots), return_exceptions=True
+                    ),
+                    config.timeout,
+                )
+                for bot, result in zip(bots, results):
+                    if isinstance(result, Exception):
+                        logger.error(f"Бот {bot.name} завершился с ошибкой: {result!r}")
+            except asyncio.TimeoutError:
+                logger.error(f"Прогон не уложился в {config.timeout} с")
+            finally:
+                report.elapsed = time.perf_counter() - started
+                if sampler is not None:
+                    sampler.cancel()
+
+            report.finished = len({bot.game_id for bot in bots if bot.game_over})
+            for bot in bots:
+                await bot.leave(transport.http)
+        finally:
+            root_logger.setLevel(previous_level)
+    return report
@@ -0,0 +1,176 @@
+"""
+Транспорты нагрузочного теста: приложение в том же процессе или сервер по URL.
+
+InProcessTransport вызывает ASGI-приложение напрямую в текущем цикле событий:
+HTTP — через httpx.ASGITransport, WebSocket — через очереди ASGI-сообщений,
+без сокетов и потоков. NetworkTransport ходит на запущенный uvicorn.
+"""
+import asyncio
+import contextlib
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+import httpx
+import websockets
+
+# Сколько ждём принятия WebSocket-соединения и завершения обработчика при закрытии
+CONNECT_TIMEOUT = 10.0
+CLOSE_TIMEOUT = 5.0
+
+
+class ConnectionClosed(Exception):
+    """Сервер закрыл WebSocket-соединение"""
+
+
+class AsgiWebSocket:
+    """WebSocket-клиент, подключённый к ASGI-приложению через очереди сообщений"""
+
+    def __init__(self, app, path: str, query: Dict[str, str]) -> None:
+        self.app = app
+        self.scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "http_version": "1.1",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": urlencode(query).encode(),
+            "headers": [(b"host", b"loadtest")],
+            "client": ("127.0.0.1", 0),
+            "server": ("loadtest", 80),
+            "subprotocols": [],
+        }
+        self._incoming: asyncio.Queue = asyncio.Queue()  # Клиент -> приложение
+        self._outgoing: asyncio.Queue = asyncio.Queue()  # Приложение -> клиент
+        self._accepted = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.close_code: Optional[int] = None
+
+    async def _receive(self) -> dict:
+        return await self._incoming.get()
+
+    async def _send(self, message: dict) -> None:
+        kind = message["type"]
+        if kind == "websocket.accept":
+            self._accepted.set()
+        elif kind == "websocket.send":
+            text = message.get("text")
+            self._outgoing.put_nowait(text if text is not None else message["bytes"])
+        elif kind == "websocket.close":
+            self.close_code = message.get("code", 1000)
+            self._outgoing.put_nowait(None)
+            self._accepted.set()
+
+    async def _run(self) -> None:
+        try:
+            await self.app(self.scope, self._receive, self._send)
+        finally:
+            self._outgoing.put_nowait(None)
+            self._accepted.set()
+
+    async def connect(self) -> "AsgiWebSocket":
+        self._incoming.put_nowait({"type": "websocket.connect"})
+        self._task = asyncio.create_task(self._run())
+        await asyncio.wait_for(self._accepted.wait(), CONNECT_TIMEOUT)
+        if self.close_code is not None:
+            raise ConnectionClosed(f"Соединение отклонено с кодом {self.close_code}")
+        return self
+
+    async def send(self, text: str) -> None:
+        self._incoming.put_nowait({"type": "websocket.receive", "text": text})
+
+    async def recv(self) -> Any:
+        frame = await self._outgoing.get()
+        if frame is None:
+            self._outgoing.put_nowait(None)
+            raise ConnectionClosed(f"Соединение закрыто с кодом {self.close_code}")
+        return frame
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._incoming.put_nowait({"type": "websocket.disconnect", "code": 1000})
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(self._task, CLOSE_TIMEOUT)
+        self._task = None
+
+
+class NetworkWebSocket:
+    """Обёртка над websockets с тем же интерфейсом, что у AsgiWebSocket"""
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self._connection = None
+
+    async def connect(self) -> "NetworkWebSocket":
+        self._connection = await websockets.connect(self.url, open_timeout=CONNECT_TIMEOUT, max_queue=None)
+        return self
+
+    async def send(self, text: str) -> None:
+        await self._connection.send(text)
+
+    async def recv(self) -> Any:
+        try:
+            return await self._connection.recv()
+        except websockets.ConnectionClosed as e:
+            raise ConnectionClosed(str(e)) from None
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+
+class InProcessTransport:
+    """
+    Приложение в этом же процессе; на время теста выполняется его lifespan.
+
+    Args:
+        app: ASGI-приложение (по умолчанию backend.api.main:app).
+    """
+
+    def __init__(self, app=None) -> None:
+        if app is None:
+            from backend.api.main import app
+        self.app = app
+        self.http: Optional[httpx.AsyncClient] = None
+        self._stack: Optional[contextlib.AsyncExitStack] = None
+
+    async def __aenter__(self) -> "InProcessTransport":
+        self._stack = contextlib.AsyncExitStack()
+        await self._stack.enter_async_context(self.app.router.lifespan_context(self.app))
+        self.http = await self._stack.enter_async_context(
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app), base_url="http://loadtest")
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._stack.aclose()
+
+    async def websocket(self, path: str, query: Dict[str, str]) -> AsgiWebSocket:
+        return await AsgiWebSocket(self.app, path, query).connect()
+
+
+class NetworkTransport:
+    """
+    Запущенный сервер, например `uvicorn backend.api.main:app`.
+
+    Args:
+        base_url: Адрес сервера, например http://127.0.0.1:8000.
+    """
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.http: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "NetworkTransport":
+        self.http = httpx.AsyncClient(base_url=self.base_url, timeout=CONNECT_TIMEOUT)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.http.aclose()
+
+    async def websocket(self, path: str, query: Dict[str, str]) -> NetworkWebSocket:
+        ws_base = "ws" + self.base_url[len("http"):] if self.base_url.startswith("http") else self.base_url
+        return await NetworkWebSocket(f"{ws_base}{path}?{urlencode(query)}").connect()
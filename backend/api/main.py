@@ -2,12 +2,15 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import uvicorn
+from backend.api.dependencies import get_game_manager, get_game_reaper, get_timer_wheel
 from backend.api.middlewares import setup_middlewares
+from backend.api.routers.admin import router as admin_router
 from backend.api.routers.games import router as games_router
 from backend.api.routers.auth import router as auth_router
+from backend.api.routers.metrics import router as metrics_router
 from backend.api.routers.stream import router as stream_router
 from backend.api.routers.websocket import router as websocket_router
-from backend.app.config.logging_config import setup_logging
+from backend.app.config.logging_config import setup_logging, shutdown_logging
 from backend.app.config.settings import DEBUG
 
 
@@ -15,8 +18,14 @@ from backend.app.config.settings import DEBUG
 async def lifespan(app: FastAPI):
     logging.info("Приложение запущено!")
     setup_logging()
+    get_game_manager().restore_games()
+    get_game_reaper().start()
     yield
+    await get_game_reaper().stop()
+    await get_timer_wheel().stop()
+    get_game_manager().store.flush()
     logging.info("Приложение остановлено!")
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -32,6 +41,8 @@ app.include_router(games_router)
 app.include_router(auth_router)
 app.include_router(stream_router)
 app.include_router(websocket_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
 
 if __name__ == "__main__":
     uvicorn.run("backend.api.main:app", host="0.0.0.0", port=8000, reload=True)
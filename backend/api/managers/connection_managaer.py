@@ -1,32 +1,124 @@
+import asyncio
 import logging
-from typing import Dict, List, Optional, Union
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Union
 from fastapi import WebSocket
 
+from backend.api.wire_format import JSON_WIRE, Frame, WireFormat
+from backend.app.utils.metrics import REGISTRY
+
 logger = logging.getLogger(__name__)
 
+# Размер очереди исходящих сообщений на одно соединение
+OUTBOUND_QUEUE_SIZE = 64
+# Сколько секунд ждём отправки одного сообщения, прежде чем счесть клиента зависшим
+SEND_TIMEOUT = 5.0
+
+FANOUT_LATENCY = REGISTRY.histogram(
+    "fool_broadcast_fanout_seconds", "Время от постановки рассылки в очереди до отправки последнему получателю"
+)
+
+
+@dataclass
+class FanoutStats:
+    """Задержка рассылки по комнате: от постановки в очереди до отправки последнему игроку"""
+
+    count: int = 0
+    last: float = 0.0
+    max: float = 0.0
+    total: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, latency: float) -> None:
+        self.count += 1
+        self.last = latency
+        self.total += latency
+        if latency > self.max:
+            self.max = latency
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "last_ms": round(self.last * 1000, 3),
+            "mean_ms": round(self.mean * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class _Fanout:
+    """Одна рассылка: считает недоставленные сообщения и фиксирует задержку по последнему"""
+
+    __slots__ = ("manager", "room_id", "started", "pending")
+
+    def __init__(self, manager: "ConnectionManager", room_id: str, pending: int) -> None:
+        self.manager = manager
+        self.room_id = room_id
+        self.started = time.perf_counter()
+        self.pending = pending
+
+    def done(self) -> None:
+        self.pending -= 1
+        if self.pending == 0:
+            self.manager._record_fanout(self.room_id, time.perf_counter() - self.started)
+
+
+@dataclass
+class _Connection:
+    """Соединение игрока с очередью исходящих сообщений и задачей-писателем"""
+
+    websocket: WebSocket
+    queue: asyncio.Queue
+    wire: WireFormat = JSON_WIRE
+    writer: Optional[asyncio.Task] = None
+    closing: bool = field(default=False)
+
 
 class ConnectionManager:
     """
     Менеджер подключений. Управляет WebSocket соединениями игроков.
+
+    Игровая логика не ждёт сети: сообщения сериализуются в формате соединения
+    (JSON или компактный, см. wire_format) и кладутся в ограниченную очередь,
+    а отдельная задача-писатель отправляет их с таймаутом. Клиент, который
+    не успевает забирать сообщения (переполнена очередь или истёк таймаут
+    отправки), отключается.
     """
 
-    def __init__(self):
+    def __init__(self, queue_size: int = OUTBOUND_QUEUE_SIZE, send_timeout: float = SEND_TIMEOUT):
         """
         Инициализация менеджера подключений.
 
         Атрибуты:
             connections (dict): Словарь вида {player_id: websocket},
                               где хранится информация о подключениях игроков.
+            fanout_stats (dict): Задержки рассылок по комнатам {room_id: FanoutStats}.
         """
         self.connections: dict[str, WebSocket] = {}  # {player_id: websocket}
+        self.fanout_stats: Dict[str, FanoutStats] = {}
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self._outbound: Dict[str, _Connection] = {}
+        self._drops: Set[asyncio.Task] = set()  # Закрытия зависших соединений, ещё не завершённые
 
-    async def connect(self, player_id: str, websocket: WebSocket):
+    async def connect(
+        self,
+        player_id: str,
+        websocket: WebSocket,
+        wire: WireFormat = JSON_WIRE,
+        subprotocol: Optional[str] = None,
+    ):
         """
         Подключает игрока и сохраняет его WebSocket соединение.
 
         Args:
             player_id (str): Уникальный идентификатор игрока.
             websocket (WebSocket): WebSocket соединение игрока.
+            wire (WireFormat): Формат сообщений соединения.
+            subprotocol (str | None): Подпротокол для ответа на рукопожатие.
         """
         if not player_id:
             raise ValueError("player_id не может быть пустым")
@@ -34,82 +126,178 @@ class ConnectionManager:
         # Закрываем старое соединение, если оно есть
         if player_id in self.connections:
             old_websocket = self.connections[player_id]
+            self.disconnect(player_id)
             try:
                 await old_websocket.close(code=1000, reason="Reconnection")
             except Exception as e:
                 logger.error(
-                    f"Ошибка при закрытии старого соединения для игрока {player_id}: {e}"
+                    "Ошибка при закрытии старого соединения для игрока %s: %s", player_id, e
                 )
 
         # Создаем новое соединение
         try:
-            await websocket.accept()
+            if subprotocol:
+                await websocket.accept(subprotocol=subprotocol)
+            else:
+                await websocket.accept()
         except Exception as e:
-            logger.debug(f"WebSocket уже принят для игрока {player_id}: {e}")
+            logger.debug("WebSocket уже принят для игрока %s: %s", player_id, e)
 
-        # Сохраняем соединение
+        # Сохраняем соединение и запускаем отправку из очереди
         self.connections[player_id] = websocket
-        logger.info(f"Игрок {player_id} подключен")
+        connection = _Connection(websocket=websocket, queue=asyncio.Queue(self.queue_size), wire=wire)
+        connection.writer = asyncio.create_task(self._writer(player_id, connection))
+        self._outbound[player_id] = connection
+        logger.info("Игрок %s подключен", player_id)
 
-    def disconnect(self, player_id: str):
+    def disconnect(self, player_id: str, websocket: Optional[WebSocket] = None):
         """
         Отключает игрока и удаляет его WebSocket соединение.
 
         Args:
             player_id (str): Уникальный идентификатор игрока.
+            websocket (WebSocket | None): Если передан, отключается только это
+                соединение (не затирает более новое после переподключения).
         """
+        if websocket is not None and self.connections.get(player_id) is not websocket:
+            return
         if player_id in self.connections:
             del self.connections[player_id]
-            logger.info(f"Игрок {player_id} отключен")
+            logger.info("Игрок %s отключен", player_id)
+        connection = self._outbound.pop(player_id, None)
+        if connection:
+            connection.closing = True
+            if connection.writer and connection.writer is not asyncio.current_task():
+                connection.writer.cancel()
+            # Разблокируем счётчики рассылок для недоставленных сообщений
+            while not connection.queue.empty():
+                _, fanout = connection.queue.get_nowait()
+                if fanout:
+                    fanout.done()
+
+    async def _writer(self, player_id: str, connection: _Connection) -> None:
+        """Задача-писатель: отправляет сообщения из очереди соединения по одному."""
+        while True:
+            frame, fanout = await connection.queue.get()
+            send = connection.websocket.send_bytes if isinstance(frame, bytes) else connection.websocket.send_text
+            try:
+                await asyncio.wait_for(send(frame), self.send_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Игрок %s не принял сообщение за %s с, соединение закрывается", player_id, self.send_timeout
+                )
+                await self._drop(player_id, connection, reason="Send timeout")
+                return
+            except Exception as e:
+                logger.error("Ошибка при отправке сообщения игроку %s: %s", player_id, e)
+                await self._drop(player_id, connection)
+                return
+            finally:
+                if fanout:
+                    fanout.done()
+
+    async def _drop(self, player_id: str, connection: _Connection, reason: Optional[str] = None) -> None:
+        self.disconnect(player_id, connection.websocket)
+        if reason:
+            try:
+                await asyncio.wait_for(
+                    connection.websocket.close(code=1013, reason=reason), self.send_timeout
+                )
+            except Exception as e:
+                logger.debug("Не удалось закрыть соединение игрока %s: %s", player_id, e)
+
+    def _enqueue(
+        self,
+        player_id: str,
+        message: dict,
+        fanout: Optional[_Fanout] = None,
+        encoded: Optional[Dict[str, Frame]] = None,
+    ) -> bool:
+        """
+        Кодирует сообщение в формате соединения и ставит в его очередь.
+
+        encoded — кэш {формат: кадр} одного сообщения для рассылки: сообщение
+        кодируется не больше одного раза на формат.
+        """
+        connection = self._outbound.get(player_id)
+        if connection is None or connection.closing:
+            logger.warning("Игрок %s не имеет активного соединения", player_id)
+            if fanout:
+                fanout.done()
+            return False
+        wire = connection.wire
+        if encoded is None:
+            frame = wire.encode(message)
+        else:
+            frame = encoded.get(wire.name)
+            if frame is None:
+                frame = encoded[wire.name] = wire.encode(message)
+        try:
+            connection.queue.put_nowait((frame, fanout))
+        except asyncio.QueueFull:
+            logger.warning(
+                "Очередь сообщений игрока %s переполнена, соединение закрывается", player_id
+            )
+            if fanout:
+                fanout.done()
+            connection.closing = True
+            drop = asyncio.create_task(self._drop(player_id, connection, reason="Outbound queue overflow"))
+            self._drops.add(drop)
+            drop.add_done_callback(self._drops.discard)
+            return False
+        return True
+
+    def _record_fanout(self, room_id: str, latency: float) -> None:
+        FANOUT_LATENCY.observe(latency)
+        self.fanout_stats.setdefault(room_id, FanoutStats()).add(latency)
 
     async def broadcast_to_players(
         self,
         player_ids: List[str],
         message: dict,
         exclude: Union[str, List[str], None] = None,
+        room_id: Optional[str] = None,
     ) -> int:
         """
         Отправляет сообщение указанным игрокам.
 
+        Сообщение сериализуется один раз на формат и ставится в очереди всех получателей.
+
         Args:
             player_ids (List[str]): Список ID игроков для отправки.
             message (dict): Сообщение для отправки в формате JSON.
             exclude (str | list[str] | None): ID игрока(ов) которых нужно исключить из рассылки.
+            room_id (str | None): Комната, по которой считается задержка рассылки.
 
         Returns:
-            int: Количество игроков, которым успешно доставлено сообщение.
+            int: Количество игроков, которым сообщение поставлено в очередь.
         """
         excluded_players = []
         if exclude:
             excluded_players = [exclude] if isinstance(exclude, str) else exclude
 
-        successful_sends = 0
-        failed_players = []
-
-        for player_id in player_ids:
-            if player_id in excluded_players:
-                continue
-
-            if player_id not in self.connections:
-                logger.warning(f"Игрок {player_id} не имеет активного соединения")
-                continue
-
-            try:
-                await self.connections[player_id].send_json(message)
-                successful_sends += 1
-            except Exception as e:
-                logger.error(f"Ошибка при отправке сообщения игроку {player_id}: {e}")
-                failed_players.append(player_id)
+        recipients = [pid for pid in player_ids if pid not in excluded_players]
+        if not recipients:
+            return 0
+        fanout = _Fanout(self, room_id, len(recipients)) if room_id else None
+        encoded: Dict[str, Frame] = {}
+        return sum(self._enqueue(pid, message, fanout, encoded) for pid in recipients)
 
-        for player_id in failed_players:
-            self.disconnect(player_id)
+    async def send_to_players(self, messages: Dict[str, dict], room_id: Optional[str] = None) -> int:
+        """
+        Рассылает каждому игроку своё сообщение одной рассылкой.
 
-        if failed_players:
-            logger.warning(
-                f"Удалены игроки с неработающими соединениями: {failed_players}"
-            )
+        Args:
+            messages (dict): Словарь {player_id: сообщение}.
+            room_id (str | None): Комната, по которой считается задержка рассылки.
 
-        return successful_sends
+        Returns:
+            int: Количество игроков, которым сообщение поставлено в очередь.
+        """
+        if not messages:
+            return 0
+        fanout = _Fanout(self, room_id, len(messages)) if room_id else None
+        return sum(self._enqueue(pid, message, fanout) for pid, message in messages.items())
 
     async def send_message(self, player_id: str, message: dict) -> bool:
         """
@@ -120,19 +308,21 @@ class ConnectionManager:
             message (dict): Сообщение для отправки в формате JSON.
 
         Returns:
-            bool: True если сообщение успешно отправлено, False в противном случае.
+            bool: True если сообщение поставлено в очередь, False в противном случае.
         """
-        if player_id not in self.connections:
-            logger.warning(f"Игрок {player_id} не имеет активного соединения")
-            return False
+        return self._enqueue(player_id, message)
 
-        try:
-            await self.connections[player_id].send_json(message)
-            return True
-        except Exception as e:
-            logger.error(f"Ошибка при отправке сообщения игроку {player_id}: {e}")
-            self.disconnect(player_id)
-            return False
+    def get_fanout_stats(self, room_id: str) -> Optional[FanoutStats]:
+        """Возвращает статистику задержки рассылок комнаты."""
+        return self.fanout_stats.get(room_id)
+
+    def all_fanout_stats(self) -> Dict[str, dict]:
+        """Задержки рассылок всех комнат {room_id: сводка}."""
+        return {room_id: stats.to_dict() for room_id, stats in self.fanout_stats.items()}
+
+    def forget_room(self, room_id: str) -> None:
+        """Удаляет статистику рассылок закрытой комнаты."""
+        self.fanout_stats.pop(room_id, None)
 
     def get_connection(self, player_id: str) -> Optional[WebSocket]:
         """
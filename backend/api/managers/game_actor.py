@@ -0,0 +1,253 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional, Set, Tuple
+
+from backend.api.managers.timer_wheel import TimerHandle, TimerWheel
+from backend.app.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+COMMAND_LATENCY = REGISTRY.histogram(
+    "fool_game_command_seconds", "Задержка команды игры от постановки в очередь до завершения", ("result",)
+)
+
+# Команда игры: корутинная функция без аргументов; выполняется целиком до следующей команды
+Command = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class CommandStats:
+    """Статистика команд игры: задержка от постановки в очередь до завершения"""
+
+    count: int = 0
+    failed: int = 0
+    last: float = 0.0
+    max: float = 0.0
+    total: float = 0.0
+    max_depth: int = 0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, latency: float, failed: bool = False) -> None:
+        self.count += 1
+        self.failed += failed
+        self.last = latency
+        self.total += latency
+        if latency > self.max:
+            self.max = latency
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "failed": self.failed,
+            "max_depth": self.max_depth,
+            "last_ms": round(self.last * 1000, 3),
+            "mean_ms": round(self.mean * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class GameActor:
+    """
+    Очередь команд одной игры.
+
+    Все изменения партии (ввод игроков, выход, авто-сброс в лобби) ставятся в
+    очередь и выполняются задачей-актором строго по одной: следующая команда
+    начинается, только когда предыдущая, включая рассылку состояния, закончилась.
+    Задача запускается при появлении команд и завершается, когда очередь пуста,
+    поэтому простаивающие игры задач не держат. Разные игры друг друга не ждут.
+
+    Отложенные команды ставятся таймерами общего колеса (TimerWheel), а не
+    отдельными задачами. У игры есть один срок (deadline) — таймер хода,
+    готовности в лобби или сброса после партии: новый срок заменяет прежний.
+    """
+
+    def __init__(self, game_id: str, wheel: Optional[TimerWheel] = None) -> None:
+        self.game_id = game_id
+        self.stats = CommandStats()
+        self.wheel = wheel or TimerWheel()
+        self._commands: Deque[Tuple[Command, asyncio.Future, float]] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._timers: Set[TimerHandle] = set()
+        self._deadline: Optional[TimerHandle] = None
+        self._deadline_key: Optional[Hashable] = None
+        self._deadline_seq = 0
+        self._closed = False
+
+    @property
+    def depth(self) -> int:
+        """Сколько команд ждут выполнения"""
+        return len(self._commands)
+
+    @property
+    def busy(self) -> bool:
+        """Выполняется команда или команды ждут в очереди"""
+        return self._task is not None or bool(self._commands)
+
+    def submit(self, command: Command) -> asyncio.Future:
+        """
+        Ставит команду в очередь.
+
+        Returns:
+            asyncio.Future: Результат или исключение команды.
+
+        Принятая команда выполняется, даже если её результат больше никто не ждёт.
+        """
+        if self._closed:
+            raise RuntimeError(f"Очередь команд игры {self.game_id} закрыта")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._commands.append((command, future, time.perf_counter()))
+        if len(self._commands) > self.stats.max_depth:
+            self.stats.max_depth = len(self._commands)
+        if self._task is None:
+            self._task = loop.create_task(self._run(), name=f"game-actor-{self.game_id}")
+        return future
+
+    def post(self, command: Command) -> None:
+        """Ставит команду в очередь без ожидания результата; ошибка попадает в лог."""
+        self.submit(command).add_done_callback(self._log_failure)
+
+    def schedule(self, delay: float, command: Command) -> TimerHandle:
+        """Ставит команду в очередь через delay секунд (таймер отменяется при закрытии)."""
+
+        def fire() -> None:
+            self._timers.discard(handle)
+            if not self._closed:
+                self.post(command)
+
+        handle = self.wheel.schedule(delay, fire)
+        self._timers.add(handle)
+        return handle
+
+    @property
+    def deadline_key(self) -> Optional[Hashable]:
+        """Ключ текущего срока; None — срока нет."""
+        return self._deadline_key if self._deadline is not None else None
+
+    def set_deadline(self, delay: float, command: Command, key: Optional[Hashable] = None) -> None:
+        """
+        Назначает срок игры: через delay секунд в очередь встанет command.
+
+        Прежний срок отменяется. Если срок с тем же key (не None) уже назначен,
+        он остаётся как есть — повторная рассылка того же хода его не продлевает.
+        Команда не выполнится, если срок переназначили или сняли, пока она
+        ждала в очереди.
+        """
+        if key is not None and self._deadline is not None and key == self._deadline_key:
+            return
+        self.clear_deadline()
+        seq = self._deadline_seq
+
+        async def expired() -> Any:
+            if seq != self._deadline_seq:
+                return None
+            self._deadline = None
+            self._deadline_key = None
+            return await command()
+
+        self._deadline = self.schedule(delay, expired)
+        self._deadline_key = key
+
+    def clear_deadline(self) -> None:
+        """Снимает срок игры."""
+        self._deadline_seq += 1
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._timers.discard(self._deadline)
+        self._deadline = None
+        self._deadline_key = None
+
+    async def _run(self) -> None:
+        try:
+            while self._commands:
+                command, future, enqueued = self._commands.popleft()
+                failed = False
+                try:
+                    result = await command()
+                except asyncio.CancelledError:
+                    if not future.done():
+                        future.cancel()
+                    raise
+                except Exception as e:
+                    failed = True
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+                latency = time.perf_counter() - enqueued
+                self.stats.add(latency, failed)
+                COMMAND_LATENCY.labels("error" if failed else "ok").observe(latency)
+        finally:
+            self._task = None
+
+    def _log_failure(self, future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            error = future.exception()
+            logger.error("Команда игры %s завершилась ошибкой: %s", self.game_id, error, exc_info=error)
+
+    def close(self) -> None:
+        """Отменяет таймеры, текущую и ожидающие команды."""
+        self._closed = True
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+        self._deadline = None
+        if self._task is not None:
+            self._task.cancel()
+        while self._commands:
+            _, future, _ = self._commands.popleft()
+            future.cancel()
+
+
+class GameActors:
+    """Реестр очередей команд по game_id; таймеры всех игр — на одном колесе"""
+
+    def __init__(self, wheel: Optional[TimerWheel] = None) -> None:
+        self.wheel = wheel or TimerWheel()
+        self._actors: Dict[str, GameActor] = {}
+
+    def get(self, game_id: str) -> GameActor:
+        """Возвращает очередь команд игры, создавая её при первом обращении."""
+        actor = self._actors.get(game_id)
+        if actor is None:
+            actor = self._actors[game_id] = GameActor(game_id, self.wheel)
+        return actor
+
+    def submit(self, game_id: str, command: Command) -> asyncio.Future:
+        """Ставит команду в очередь игры game_id."""
+        return self.get(game_id).submit(command)
+
+    def is_busy(self, game_id: str) -> bool:
+        """Выполняет ли игра команду прямо сейчас (или они ждут в очереди)."""
+        actor = self._actors.get(game_id)
+        return actor is not None and actor.busy
+
+    def close(self, game_id: str) -> None:
+        """Закрывает и забывает очередь команд игры."""
+        actor = self._actors.pop(game_id, None)
+        if actor is not None:
+            actor.close()
+
+    def get_stats(self, game_id: str) -> Optional[dict]:
+        """Глубина очереди и задержки команд игры; None — очереди нет."""
+        actor = self._actors.get(game_id)
+        if actor is None:
+            return None
+        return {"depth": actor.depth, **actor.stats.to_dict()}
+
+    def __len__(self) -> int:
+        return len(self._actors)
+
+    def queued(self) -> int:
+        """Сколько команд ждут выполнения во всех играх."""
+        return sum(actor.depth for actor in self._actors.values())
+
+    def all_stats(self) -> Dict[str, dict]:
+        return {game_id: self.get_stats(game_id) for game_id in self._actors}
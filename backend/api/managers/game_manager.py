@@ -1,100 +1,441 @@
+import heapq
+import itertools
 import logging
+import time
+from collections import OrderedDict
 from uuid import uuid4
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
 
+from backend.api.managers.lobby_hub import LobbyHub
+from backend.api.sharding import ShardMap
 from backend.app.contracts.game_contract import PlayerInput, PlayerAction
+from backend.app.models.deck import DeckSource
 from backend.app.models.game import FoolGame
 from backend.app.states.lobby_state import LobbyState
+from backend.app.storage.game_store import GameStore, InMemoryGameStore
+from backend.app.storage.snapshot_store import SnapshotStore
 
 
 logger = logging.getLogger(__name__)
 
 
+# Корзина матчмейкинга: (лимит игроков, свободных мест)
+SlotKey = Tuple[int, int]
+
+
+class GameInfo(NamedTuple):
+    """Что нужно сборщику простаивающих игр (GameReaper), не поднимая партию"""
+
+    state: str  # Имя текущего состояния
+    player_ids: Tuple[str, ...]
+    in_memory: bool  # False — партия выгружена в хранилище снимков
+
+
 class GameManager:
     """
     Управляет жизненным циклом игр: создание, поиск, перемещение
     между лобби и активной фазой.
+
+    Для быстрого подбора игры ожидающие игры со свободными местами лежат в
+    корзинах по (players_limit, свободных мест); внутри корзины — куча по
+    порядку создания. Корзин не больше 15 (лимиты 2–6), поэтому поиск не
+    зависит от числа игр. Индекс обновляется там же, где игра переходит
+    между pending и active. Запись игры, покинувшей корзину, остаётся в
+    куче до просмотра; когда таких записей больше половины кучи, корзина
+    пересобирается, так что её размер ограничен удвоенным числом игр в ней.
+
+    Сами партии и привязка игроков лежат в хранилище игр (GameStore): по
+    умолчанию в памяти процесса, либо в общем хранилище ключ-значение.
+    Индекс матчмейкинга и лента лобби — локальные для процесса.
+
+    Менеджер помнит время последнего изменения каждой игры в порядке LRU;
+    по нему GameReaper удаляет простаивающие игры и выгружает холодные
+    (evict_game), а get_game_by_id поднимает выгруженную игру обратно.
     """
 
-    def __init__(self):
-        self.active_games: Dict[str, FoolGame] = {}  # Игры, которые идут
-        self.pending_games: Dict[str, FoolGame] = {}  # Игры, ожидающие игроков
-        self.player_to_game: Dict[str, str] = {}  # Связь player_id -> game_id
+    def __init__(
+        self,
+        lobby_hub: Optional[LobbyHub] = None,
+        snapshot_store: Optional[SnapshotStore] = None,
+        deck_source: Optional[DeckSource] = None,
+        shard: Optional[ShardMap] = None,
+        store: Optional[GameStore] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.store = store if store is not None else InMemoryGameStore()
+        self.clock = clock
+        self.lobby_hub = lobby_hub
+        self.snapshot_store = snapshot_store
+        self.deck_source = deck_source  # Откуда берутся колоды новых партий (например, DeckPool)
+        self.shard = shard  # Шард процесса при шардированном запуске; None — все игры здесь
+        self._lobby_view: Dict[str, dict] = {}  # Последнее опубликованное состояние лобби
+        self._slot_buckets: Dict[SlotKey, List[list]] = {}  # {корзина: куча [порядок создания, game_id]}
+        self._game_slots: Dict[str, Tuple[SlotKey, list]] = {}  # {game_id: (корзина, запись в куче)}
+        self._stale_slots: Dict[SlotKey, int] = {}  # {корзина: устаревших записей в её куче}
+        self._created_order: Dict[str, int] = {}  # {game_id: порядковый номер создания}
+        self._creation_counter = itertools.count()
+        self._last_active: "OrderedDict[str, float]" = OrderedDict()  # {game_id: время изменения}, старые первыми
+        self._evicted: Dict[str, GameInfo] = {}  # Игры, выгруженные в хранилище снимков
 
     def create_game(self, players_limit: int) -> FoolGame:
         """Создает новую игру и помещает ее в ожидание."""
-        game_id = str(uuid4())
-        game = FoolGame(game_id=game_id, players_limit=players_limit)
-        self.pending_games[game.game_id] = game
-        logger.info(f"Создана новая игра с ID: {game.game_id}")
+        game_id = self.shard.new_game_id() if self.shard else str(uuid4())
+        game = FoolGame(game_id=game_id, players_limit=players_limit, deck_source=self.deck_source)
+        self.store.add(game, pending=True)
+        self._created_order[game.game_id] = next(self._creation_counter)
+        logger.info("Создана новая игра с ID: %s", game.game_id)
+        self._touch(game.game_id)
+        self._index_game_slots(game.game_id)
+        self._publish_lobby_change(game.game_id)
         return game
 
+    @property
+    def active_games(self) -> Mapping[str, FoolGame]:
+        """Игры, которые идут."""
+        return self.store.active
+
+    @property
+    def pending_games(self) -> Mapping[str, FoolGame]:
+        """Игры, ожидающие игроков."""
+        return self.store.pending
+
     def get_game_by_id(self, game_id: str) -> FoolGame | None:
         """Получает игру по её ID из любого списка."""
-        logger.debug(f"Поиск игры по ID: {game_id}")
-        return self.active_games.get(game_id) or self.pending_games.get(game_id)
+        logger.debug("Поиск игры по ID: %s", game_id)
+        evicted = self._evicted.pop(game_id, None) if self._evicted else None
+        game = self.store.get(game_id)
+        if game is None and evicted is not None:
+            game = self._reload_evicted(game_id)
+        return game
 
     def get_game_by_player_id(self, player_id: str) -> FoolGame | None:
         """Находит игру, в которой числится игрок."""
-        logger.debug(f"Поиск игры для игрока: {player_id}")
-        game_id = self.player_to_game.get(player_id)
+        logger.debug("Поиск игры для игрока: %s", player_id)
+        game_id = self.store.player_game(player_id)
         if not game_id:
             return None
         return self.get_game_by_id(game_id)
 
-    def find_available_game(self) -> FoolGame | None:
-        """Находит первую доступную игру в лобби со свободным местом."""
-        for game in self.pending_games.values():
-            if not game.is_full():
-                return game
-        logger.debug("Свободных игр в лобби не найдено.")
+    def find_available_game(self, players_limit: Optional[int] = None) -> FoolGame | None:
+        """
+        Находит игру в лобби со свободным местом.
+
+        Предпочитает игру, ближе всего к старту (меньше всего свободных мест),
+        среди равных — созданную раньше.
+
+        Args:
+            players_limit: Нужный размер комнаты; None — любой.
+        """
+        best: Optional[Tuple[int, int, str]] = None  # (свободных мест, порядок создания, game_id)
+        for key, heap in self._slot_buckets.items():
+            limit, free = key
+            if players_limit is not None and limit != players_limit:
+                continue
+            entry = self._peek_bucket(key, heap)
+            if entry is not None and (best is None or (free, entry[0]) < best[:2]):
+                best = (free, entry[0], entry[1])
+        if best is None:
+            logger.debug("Свободных игр в лобби не найдено.")
+            return None
+        return self.store.get(best[2])
+
+    def _is_live(self, entry: list) -> bool:
+        slot = self._game_slots.get(entry[1])
+        return slot is not None and slot[1] is entry
+
+    def _peek_bucket(self, key: SlotKey, heap: List[list]) -> Optional[list]:
+        """Самая старая актуальная запись корзины; устаревшие записи выбрасываются."""
+        while heap:
+            entry = heap[0]
+            if self._is_live(entry):
+                return entry
+            heapq.heappop(heap)
+            self._stale_slots[key] -= 1
         return None
 
+    def _drop_slot(self, game_id: str) -> None:
+        """Убирает игру из корзины; корзина пересобирается, если устаревших записей больше половины."""
+        slot = self._game_slots.pop(game_id, None)
+        if slot is None:
+            return
+        key = slot[0]
+        stale = self._stale_slots.get(key, 0) + 1
+        heap = self._slot_buckets[key]
+        if stale * 2 > len(heap):
+            heap[:] = [entry for entry in heap if self._is_live(entry)]
+            heapq.heapify(heap)
+            stale = 0
+        self._stale_slots[key] = stale
+
+    def _index_game_slots(self, game_id: str) -> None:
+        """Перекладывает игру в корзину матчмейкинга по числу свободных мест."""
+        game = self.store.pending.get(game_id)
+        free = game.players_limit - len(game.players) if game else 0
+        key = (game.players_limit, free) if free > 0 else None
+
+        current = self._game_slots.get(game_id)
+        if current is not None and current[0] == key:
+            return
+        # Старая запись остаётся в куче до просмотра или пересборки корзины
+        self._drop_slot(game_id)
+        if key is None:
+            return
+        entry = [self._created_order.get(game_id, 0), game_id]
+        heapq.heappush(self._slot_buckets.setdefault(key, []), entry)
+        self._game_slots[game_id] = (key, entry)
+
     def add_game_to_player(self, game_id: str, player_id: str) -> None:
         """Привязывает ID игры к ID игрока."""
-        self.player_to_game[player_id] = game_id
-        logger.debug(f"Игрок {player_id} привязан к игре {game_id}")
+        self.store.bind_player(player_id, game_id)
+        logger.debug("Игрок %s привязан к игре %s", player_id, game_id)
 
     def remove_game_from_player(self, player_id: str) -> None:
         """Удаляет привязку игрока к игре."""
-        if player_id in self.player_to_game:
-            del self.player_to_game[player_id]
-            logger.debug(f"Удалена связь для игрока {player_id}")
+        self.store.unbind_player(player_id)
+        logger.debug("Удалена связь для игрока %s", player_id)
 
     def update_game_slots_by_id(self, game_id: str) -> None:
         """Перемещает игру между pending и active в зависимости от ее состояния."""
         game = self.get_game_by_id(game_id)
         if not game:
-            logger.warning(f"Попытка обновить несуществующую игру: {game_id}")
+            logger.warning("Попытка обновить несуществующую игру: %s", game_id)
             return
+        self._touch(game_id)
 
         is_in_lobby = isinstance(game._current_state, LobbyState)
         is_full = game.is_full()
 
         # Перемещаем в active, если игра заполнилась или вышла из лобби
-        if (is_full or not is_in_lobby) and game_id in self.pending_games:
-            self.active_games[game_id] = self.pending_games.pop(game_id)
-            logger.info(f"Игра {game_id} перемещена в active_games.")
+        if (is_full or not is_in_lobby) and game_id in self.store.pending:
+            self.store.move(game_id, pending=False)
+            logger.info("Игра %s перемещена в active_games.", game_id)
         # Возвращаем в pending, если освободились места и игра еще в лобби
-        elif not is_full and is_in_lobby and game_id in self.active_games:
-            self.pending_games[game_id] = self.active_games.pop(game_id)
-            logger.info(f"Игра {game_id} перемещена в pending_games.")
+        elif not is_full and is_in_lobby and game_id in self.store.active:
+            self.store.move(game_id, pending=True)
+            logger.info("Игра %s перемещена в pending_games.", game_id)
+
+        self._index_game_slots(game_id)
+        self._publish_lobby_change(game_id)
+
+    def handle_player_quit(self, game_id: str, player_id: str) -> bool:
+        """
+        Обрабатывает выход игрока, делегируя логику ядру игры.
 
-    def handle_player_quit(self, game_id: str, player_id: str):
-        """Обрабатывает выход игрока, делегируя логику ядру игры."""
+        Повторный выход (игрок уже не привязан к этой игре) ничего не делает.
+
+        Returns:
+            bool: Игрок вышел из игры сейчас.
+        """
+        if self.store.player_game(player_id) != game_id:
+            logger.debug("Игрок %s уже вышел из игры %s", player_id, game_id)
+            return False
         game = self.get_game_by_id(game_id)
         if not game:
-            logger.warning(f"Игра {game_id} не найдена для выхода игрока {player_id}")
-            return
+            logger.warning("Игра %s не найдена для выхода игрока %s", game_id, player_id)
+            return False
 
         # Ядро игры само изменит свое состояние
         game.handle_input(PlayerInput(player_id=player_id, action=PlayerAction.QUIT))
 
         self.remove_game_from_player(player_id)
         self.update_game_slots_by_id(game_id)
-        logger.info(f"Выход игрока {player_id} из игры {game_id} обработан.")
+        self.checkpoint(game)
+        logger.info("Выход игрока %s из игры %s обработан.", player_id, game_id)
+        return True
+
+    def checkpoint(self, game: FoolGame) -> None:
+        """
+        Записывает изменённую партию в хранилище игр и снимок — в хранилище
+        снимков; ошибка хранилища не прерывает игру.
+        """
+        self._touch(game.game_id)
+        try:
+            self.store.save(game)
+        except Exception as e:
+            logger.error("Не удалось записать игру %s в хранилище: %s", game.game_id, e)
+        if self.snapshot_store is None:
+            return
+        try:
+            self.snapshot_store.save(game.game_id, game.snapshot())
+        except Exception as e:
+            logger.error("Не удалось сохранить снимок игры %s: %s", game.game_id, e)
+
+    def _touch(self, game_id: str) -> None:
+        """Отмечает изменение игры: она становится самой свежей в порядке LRU."""
+        self._last_active[game_id] = self.clock()
+        self._last_active.move_to_end(game_id)
+
+    def games_by_activity(self) -> Iterator[Tuple[str, float]]:
+        """Перебирает (game_id, время последнего изменения), начиная с самых давних."""
+        return iter(list(self._last_active.items()))
+
+    def game_info(self, game_id: str) -> Optional[GameInfo]:
+        """Состояние и игроки игры; выгруженная игра при этом не поднимается."""
+        evicted = self._evicted.get(game_id)
+        if evicted is not None:
+            return evicted
+        game = self.store.get(game_id)
+        if game is None:
+            return None
+        state = type(game._current_state).__name__ if game._current_state else ""
+        return GameInfo(state, tuple(p.id_ for p in game.players), True)
+
+    def remove_game(self, game_id: str) -> bool:
+        """
+        Удаляет игру целиком: из хранилищ, индекса матчмейкинга и ленты лобби;
+        игроки отвязываются.
+
+        Returns:
+            bool: False — игры нет.
+        """
+        info = self.game_info(game_id)
+        if info is None:
+            return False
+        for player_id in info.player_ids:
+            if self.store.player_game(player_id) == game_id:
+                self.store.unbind_player(player_id)
+        self.store.remove(game_id)
+        self._evicted.pop(game_id, None)
+        self._last_active.pop(game_id, None)
+        self._created_order.pop(game_id, None)
+        self._index_game_slots(game_id)
+        self._publish_lobby_change(game_id)
+        if self.snapshot_store is not None:
+            try:
+                self.snapshot_store.delete(game_id)
+            except Exception as e:
+                logger.error("Не удалось удалить снимок игры %s: %s", game_id, e)
+        logger.info("Игра %s удалена.", game_id)
+        return True
+
+    def evict_game(self, game_id: str) -> bool:
+        """
+        Выгружает идущую игру из памяти процесса; следующее обращение через
+        get_game_by_id поднимет её снова. Игры в лобби не выгружаются — они
+        нужны матчмейкингу и ленте лобби.
+
+        Returns:
+            bool: True — игра выгружена; False — её нечем потом поднять
+            (нет ни хранилища снимков, ни внешнего хранилища игр).
+        """
+        if game_id in self._evicted or game_id not in self.store.active:
+            return False
+        info = self.game_info(game_id)
+        if not self.store.evict(game_id):
+            if self.snapshot_store is None:
+                return False
+            try:
+                self.snapshot_store.save(game_id, self.store.get(game_id).snapshot())
+            except Exception as e:
+                logger.error("Игра %s не выгружена: снимок не сохранён: %s", game_id, e)
+                return False
+            self.store.remove(game_id)
+        self._evicted[game_id] = info._replace(in_memory=False)
+        logger.debug("Игра %s выгружена из памяти.", game_id)
+        return True
+
+    def _reload_evicted(self, game_id: str) -> Optional[FoolGame]:
+        """Поднимает выгруженную игру из хранилища снимков."""
+        data = self.snapshot_store.load(game_id) if self.snapshot_store is not None else None
+        if data is None:
+            logger.error("Снимок выгруженной игры %s пропал", game_id)
+            return None
+        try:
+            game = FoolGame.restore(data)
+        except ValueError as e:
+            logger.error("Выгруженная игра %s не поднята: %s", game_id, e)
+            return None
+        game.deck.source = self.deck_source
+        self.store.add(game, pending=False)
+        logger.debug("Игра %s поднята из хранилища снимков.", game_id)
+        return game
+
+    def restore_games(self) -> int:
+        """
+        Поднимает партии после перезапуска: из хранилища снимков и из общего
+        хранилища игр (такие партии уже лежат в нём, их нужно только внести
+        в индекс матчмейкинга и ленту лобби).
+
+        Returns:
+            int: Количество восстановленных партий.
+        """
+        restored = self._restore_snapshots()
+        for game_id in list(self.store.pending) + list(self.store.active):
+            if game_id in self._created_order or (self.shard and not self.shard.owns(game_id)):
+                continue
+            self._created_order[game_id] = next(self._creation_counter)
+            self.update_game_slots_by_id(game_id)
+            restored += 1
+        logger.info("Восстановлено игр: %s", restored)
+        return restored
+
+    def _restore_snapshots(self) -> int:
+        """Поднимает партии из хранилища снимков."""
+        if self.snapshot_store is None:
+            return 0
+        restored = 0
+        for game_id in list(self.snapshot_store.game_ids()):
+            if self.shard and not self.shard.owns(game_id):
+                # Игру восстановит шард-владелец
+                continue
+            data = self.snapshot_store.load(game_id)
+            if data is None:
+                continue
+            try:
+                game = FoolGame.restore(data)
+            except ValueError as e:
+                logger.error("Снимок игры %s не восстановлен: %s", game_id, e)
+                continue
+            if not game.players:
+                # Пустые комнаты не переживают перезапуск
+                self.snapshot_store.delete(game_id)
+                continue
+            game.deck.source = self.deck_source
+            self.store.add(game, pending=False)
+            self._created_order[game.game_id] = next(self._creation_counter)
+            for player in game.players:
+                self.store.bind_player(player.id_, game.game_id)
+            self.update_game_slots_by_id(game.game_id)
+            restored += 1
+        logger.info("Восстановлено игр из снимков: %s", restored)
+        return restored
 
     @property
     def flatten_pending_games(self) -> List[FoolGame]:
         """Возвращает плоский список игр, ожидающих игроков."""
-        return list(self.pending_games.values())
+        return list(self.store.pending.values())
+
+    @staticmethod
+    def lobby_entry(game: FoolGame) -> dict:
+        """Описание ожидающей игры для ленты лобби."""
+        return {
+            "game_id": game.game_id,
+            "players_limit": game.players_limit,
+            "players_inside": len(game.players),
+        }
+
+    def lobby_games(self) -> List[dict]:
+        """Список ожидающих игр для ленты лобби."""
+        return [self.lobby_entry(game) for game in self.store.pending.values()]
+
+    def _publish_lobby_change(self, game_id: str) -> None:
+        """
+        Публикует изменение игры в ленте лобби: game_added, game_updated или game_removed.
+
+        Событие уходит, только если видимое в лобби описание игры изменилось.
+        """
+        game = self.store.pending.get(game_id)
+        entry = self.lobby_entry(game) if game else None
+        previous = self._lobby_view.get(game_id)
+        if entry == previous:
+            return
+
+        if entry is None:
+            del self._lobby_view[game_id]
+            event, data = "game_removed", {"game_id": game_id}
+        else:
+            self._lobby_view[game_id] = entry
+            event, data = ("game_added" if previous is None else "game_updated"), entry
+
+        if self.lobby_hub:
+            self.lobby_hub.publish(event, data)
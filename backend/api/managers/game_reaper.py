@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.api.managers.game_manager import GameInfo, GameManager
+from backend.app.states.registry import StateName
+from backend.app.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+RECLAIMED = REGISTRY.counter("fool_reaper_reclaimed_total", "Игры, удалённые сборщиком, по причине", ("reason",))
+EVICTED = REGISTRY.counter("fool_reaper_evicted_total", "Игры, выгруженные сборщиком в хранилище снимков")
+BYTES_FREED = REGISTRY.counter("fool_reaper_bytes_freed_total", "Оценка памяти, освобождённой сборщиком, байт")
+
+
+@dataclass
+class ReaperConfig:
+    """
+    Сроки жизни простаивающих игр (секунды без изменений) и бюджет памяти.
+
+    0 отключает соответствующее правило.
+    """
+
+    empty_lobby_ttl: float = 300.0  # Комната в лобби без игроков
+    abandoned_ttl: float = 1800.0  # Игра с игроками, ни один из которых не подключён
+    finished_ttl: float = 600.0  # Законченная игра, не вернувшаяся в лобби
+    memory_budget: int = 0  # Байт на партии в памяти; сверх него холодные игры выгружаются
+    interval: float = 30.0  # Период обхода
+
+
+@dataclass
+class ReaperStats:
+    """Счётчики сборщика с момента запуска"""
+
+    sweeps: int = 0
+    reclaimed: Dict[str, int] = field(default_factory=lambda: {"empty_lobby": 0, "abandoned": 0, "finished": 0})
+    evicted: int = 0
+    bytes_freed: int = 0
+    tracked_bytes: int = 0  # Оценка памяти партий после последнего обхода
+    last_sweep: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "sweeps": self.sweeps,
+            "reclaimed": dict(self.reclaimed),
+            "evicted": self.evicted,
+            "bytes_freed": self.bytes_freed,
+            "tracked_bytes": self.tracked_bytes,
+            "last_sweep_ms": round(self.last_sweep * 1000, 3),
+        }
+
+
+class GameReaper:
+    """
+    Сборщик простаивающих игр.
+
+    Периодически обходит игры менеджера от давно не менявшихся к свежим и
+    удаляет те, что простояли дольше срока для своего вида (ReaperConfig).
+    Если задан бюджет памяти и оценка памяти партий его превышает, самые
+    давние идущие игры выгружаются в хранилище снимков (GameManager.evict_game)
+    и поднимаются обратно при следующем обращении. Игры с подключёнными
+    игроками или выполняющейся командой не выгружаются: обработчики WebSocket
+    держат ссылку на объект партии, и выгрузка разделила бы её на две копии.
+
+    Память партии оценивается размером её снимка: объекты в памяти крупнее, но
+    растут вместе с ним. Снимок пересчитывается, только если игра менялась с
+    прошлого обхода.
+
+    Args:
+        manager: Менеджер игр.
+        config: Сроки и бюджет.
+        is_connected: Подключён ли игрок; без него игры с игроками считаются
+            брошенными только по сроку.
+        on_removed: Вызывается с game_id и игроками после удаления игры
+            (например, чтобы закрыть её очередь команд).
+        in_use: Занята ли игра (выполняется её команда); занятые игры не выгружаются.
+    """
+
+    def __init__(
+        self,
+        manager: GameManager,
+        config: Optional[ReaperConfig] = None,
+        is_connected: Optional[Callable[[str], bool]] = None,
+        on_removed: Optional[Callable[[str, Tuple[str, ...]], None]] = None,
+        in_use: Optional[Callable[[str], bool]] = None,
+    ) -> None:
+        self.manager = manager
+        self.config = config or ReaperConfig()
+        self.is_connected = is_connected
+        self.on_removed = on_removed
+        self.in_use = in_use
+        self.stats = ReaperStats()
+        self._sizes: Dict[str, Tuple[float, int]] = {}  # {game_id: (время изменения при замере, байт)}
+        self._task: Optional[asyncio.Task] = None
+
+    def _expired_reason(self, info: GameInfo, idle: float) -> Optional[str]:
+        """Почему игру пора удалить; None — рано."""
+        config = self.config
+        if info.state == StateName.GAME_OVER:
+            return "finished" if config.finished_ttl and idle >= config.finished_ttl else None
+        if not info.player_ids:
+            if info.state == StateName.LOBBY and config.empty_lobby_ttl and idle >= config.empty_lobby_ttl:
+                return "empty_lobby"
+            return None
+        if not config.abandoned_ttl or idle < config.abandoned_ttl:
+            return None
+        if self.is_connected and any(self.is_connected(player_id) for player_id in info.player_ids):
+            return None
+        return "abandoned"
+
+    def _evictable(self, game_id: str, player_ids: Tuple[str, ...]) -> bool:
+        """Можно ли выгрузить игру: никто не подключён и команд игры не выполняется."""
+        if self.is_connected and any(self.is_connected(player_id) for player_id in player_ids):
+            return False
+        return not (self.in_use and self.in_use(game_id))
+
+    def _size_of(self, game_id: str, changed_at: float) -> int:
+        """Оценка памяти игры в байтах; выгруженная игра памяти не занимает."""
+        cached = self._sizes.get(game_id)
+        if cached is not None and cached[0] == changed_at:
+            return cached[1]
+        game = self.manager.store.get(game_id)
+        size = len(game.snapshot()) if game is not None else 0
+        self._sizes[game_id] = (changed_at, size)
+        return size
+
+    def sweep(self) -> int:
+        """
+        Один обход: удаление просроченных игр и выгрузка сверх бюджета.
+
+        Returns:
+            int: Сколько игр удалено или выгружено.
+        """
+        started = time.perf_counter()
+        now = self.manager.clock()
+        reclaimed = 0
+        resident: List[Tuple[str, int, Tuple[str, ...]]] = []  # [(game_id, байт, игроки)], старые первыми
+        for game_id, changed_at in self.manager.games_by_activity():
+            info = self.manager.game_info(game_id)
+            if info is None:
+                continue
+            reason = self._expired_reason(info, now - changed_at)
+            if reason is not None:
+                size = self._size_of(game_id, changed_at) if info.in_memory else 0
+                if self.manager.remove_game(game_id):
+                    self.stats.reclaimed[reason] += 1
+                    self.stats.bytes_freed += size
+                    RECLAIMED.labels(reason).inc()
+                    BYTES_FREED.inc(size)
+                    reclaimed += 1
+                    if self.on_removed:
+                        self.on_removed(game_id, info.player_ids)
+                continue
+            if info.in_memory:
+                resident.append((game_id, self._size_of(game_id, changed_at), info.player_ids))
+        # Замеры игр, удалённых мимо сборщика, больше не нужны
+        for game_id in self._sizes.keys() - {game_id for game_id, _, _ in resident}:
+            del self._sizes[game_id]
+
+        total = sum(size for _, size, _ in resident)
+        for game_id, size, player_ids in resident:
+            if not self.config.memory_budget or total <= self.config.memory_budget:
+                break
+            if self._evictable(game_id, player_ids) and self.manager.evict_game(game_id):
+                del self._sizes[game_id]
+                total -= size
+                self.stats.evicted += 1
+                self.stats.bytes_freed += size
+                EVICTED.inc()
+                BYTES_FREED.inc(size)
+                reclaimed += 1
+        if self.config.memory_budget and total > self.config.memory_budget:
+            logger.warning(
+                "Партии занимают ~%s байт при бюджете %s: выгружать больше нечего", total, self.config.memory_budget
+            )
+
+        self.stats.sweeps += 1
+        self.stats.tracked_bytes = total
+        self.stats.last_sweep = time.perf_counter() - started
+        if reclaimed:
+            logger.info("Сборщик игр: удалено или выгружено %s, всего %s", reclaimed, self.stats.to_dict())
+        return reclaimed
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error("Ошибка сборщика игр: %s", e, exc_info=e)
+
+    def start(self) -> None:
+        """Запускает периодический обход в текущем цикле событий."""
+        if self._task is None and self.config.interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="game-reaper")
+
+    async def stop(self) -> None:
+        """Останавливает обход."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import logging
+from typing import Optional, Set, Union
+
+from sse_starlette.sse import ServerSentEvent
+
+logger = logging.getLogger(__name__)
+
+# Сколько событий может накопить один подписчик, прежде чем ему понадобится полный список
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Маркер в очереди подписчика: события потеряны, нужно отправить полный список заново
+RESYNC = object()
+
+
+class LobbySubscription:
+    """Подписка одного SSE клиента на события лобби"""
+
+    def __init__(self, hub: "LobbyHub", queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.hub = hub
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+
+    def push(self, frame: bytes) -> None:
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Клиент не успевает читать: выбрасываем накопленное и просим полный список
+            logger.warning("Подписчик лобби отстал, будет отправлен полный список игр")
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self, timeout: Optional[float] = None) -> Union[bytes, object, None]:
+        """
+        Ждёт следующее событие.
+
+        Returns:
+            Optional[bytes]: Готовый SSE кадр, RESYNC или None, если за timeout ничего не пришло.
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+    def __enter__(self) -> "LobbySubscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class LobbyHub:
+    """
+    Pub/sub для ленты лобби.
+
+    GameManager публикует изменения списка ожидающих игр, хаб один раз
+    сериализует событие в готовый SSE кадр и раскладывает его по очередям
+    всех подписчиков. Публикация синхронная и не ждёт клиентов.
+    """
+
+    def __init__(self):
+        self.subscribers: Set[LobbySubscription] = set()
+
+    def subscribe(self) -> LobbySubscription:
+        subscription = LobbySubscription(self)
+        self.subscribers.add(subscription)
+        logger.debug(f"Новый подписчик лобби, всего {len(self.subscribers)}")
+        return subscription
+
+    def unsubscribe(self, subscription: LobbySubscription) -> None:
+        self.subscribers.discard(subscription)
+
+    @staticmethod
+    def encode(event: str, data) -> bytes:
+        """Сериализует событие в SSE кадр."""
+        return ServerSentEvent(data=json.dumps(data), event=event).encode()
+
+    def publish(self, event: str, data) -> int:
+        """
+        Рассылает событие всем подписчикам.
+
+        Returns:
+            int: Количество подписчиков, получивших событие.
+        """
+        if not self.subscribers:
+            return 0
+        frame = self.encode(event, data)
+        for subscription in self.subscribers:
+            subscription.push(frame)
+        return len(self.subscribers)
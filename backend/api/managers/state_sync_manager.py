@@ -0,0 +1,220 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.api.models.websocket_models import MessageType
+from backend.app.models.card import CARDS
+from backend.app.models.card_set import iter_indices
+from backend.app.models.game import FoolGame
+from backend.app.models.player import Player
+
+logger = logging.getLogger(__name__)
+
+# Готовые словари карт: to_dict() вызывается один раз на процесс
+_CARD_DICTS: Tuple[Dict[str, str], ...] = tuple(card.to_dict() for card in CARDS)
+
+
+def _enum_str(value: Any) -> Optional[str]:
+    """Приводит значение enum к строке так же, как pydantic-модели ответов."""
+    if value is None:
+        return None
+    return str(getattr(value, "value", value))
+
+
+@dataclass
+class _SharedView:
+    """Общая для всех игроков часть состояния, собирается один раз за рассылку"""
+
+    scalars: Dict[str, Any]
+    table_cards: List[dict]
+    players: Dict[str, dict]
+    positions: Dict[str, int]
+
+
+@dataclass
+class PlayerSyncState:
+    """Последнее состояние, отправленное игроку, и номер последнего сообщения"""
+
+    seq: int = 0
+    scalars: Dict[str, Any] = field(default_factory=dict)
+    cards_mask: int = 0
+    table_cards: List[dict] = field(default_factory=list)
+    room_players: Dict[str, dict] = field(default_factory=dict)
+    synced: bool = False
+
+
+class StateSyncManager:
+    """
+    Синхронизация состояния игры с клиентами дельтами.
+
+    Для каждого игрока хранится последнее отправленное ему состояние. После хода
+    игроку уходит только то, что изменилось (карты в руке, места на столе, роли,
+    данные соперников), с монотонно растущим номером seq. Полный снимок
+    (connection_confirmed) отправляется при первом подключении, переподключении,
+    запросе клиента после пропуска номера и после неудачной отправки.
+    """
+
+    def __init__(self):
+        self.players: Dict[str, PlayerSyncState] = {}  # {player_id: состояние}
+
+    def reset(self, player_id: str) -> None:
+        """Следующее сообщение игроку будет полным снимком."""
+        state = self.players.get(player_id)
+        if state:
+            state.synced = False
+
+    def forget(self, player_id: str) -> None:
+        """Удаляет сохранённое состояние игрока (игрок вышел из игры)."""
+        self.players.pop(player_id, None)
+
+    def build_shared_view(self, game: FoolGame) -> _SharedView:
+        """Собирает общую часть состояния; позиции игроков считаются один раз."""
+        positions = {p.id_: i + 1 for i, p in enumerate(game.players)}
+        trump_card = game.deck.trump_card
+        scalars = {
+            "current_state": game.current_state_name,
+            "room_size": game.players_limit,
+            "deck_size": len(game.deck),
+            "trump_suit": _enum_str(game.deck.trump_suit),
+            "trump_rank": _enum_str(trump_card.rank) if trump_card else None,
+            "attacker_position": positions.get(game.current_attacker_id)
+            if game.current_attacker_id
+            else -1,
+            "defender_position": positions.get(game.current_defender_id)
+            if game.current_defender_id
+            else -1,
+        }
+        players = {
+            p.id_: {
+                "player_id": p.id_,
+                "position": positions[p.id_],
+                "cards_count": len(p.get_cards()),
+                "status": _enum_str(p.status),
+                "name": p.name,
+            }
+            for p in game.players
+        }
+        return _SharedView(
+            scalars=scalars,
+            table_cards=[
+                {
+                    "attack_card": _CARD_DICTS[slot.attack_card.index],
+                    "defend_card": _CARD_DICTS[slot.defend_card.index] if slot.defend_card else None,
+                }
+                for slot in game.game_table.table_cards
+            ],
+            players=players,
+            positions=positions,
+        )
+
+    def snapshot(
+        self,
+        game: FoolGame,
+        player: Player,
+        allowed_actions: List[str],
+        shared: Optional[_SharedView] = None,
+    ) -> dict:
+        """Полный снимок состояния для игрока; сбрасывает базу для дельт."""
+        shared = shared or self.build_shared_view(game)
+        state = self.players.setdefault(player.id_, PlayerSyncState())
+        state.seq += 1
+        scalars = self._player_scalars(player, allowed_actions, shared)
+        room_players = {pid: data for pid, data in shared.players.items() if pid != player.id_}
+
+        state.scalars = scalars
+        state.cards_mask = player.hand_mask
+        state.table_cards = shared.table_cards
+        state.room_players = room_players
+        state.synced = True
+
+        data = dict(scalars)
+        data["cards"] = [_CARD_DICTS[i] for i in iter_indices(player.hand_mask)]
+        data["room_players"] = list(room_players.values())
+        data["table_cards"] = shared.table_cards
+        data["seq"] = state.seq
+        return {"type": MessageType.CONNECTION_CONFIRMED, "data": data}
+
+    def update(
+        self,
+        game: FoolGame,
+        player: Player,
+        allowed_actions: List[str],
+        shared: Optional[_SharedView] = None,
+    ) -> Optional[dict]:
+        """
+        Сообщение для игрока после изменения игры.
+
+        Returns:
+            Optional[dict]: Дельта, полный снимок (если базы нет) или None,
+            если для игрока ничего не изменилось.
+        """
+        state = self.players.get(player.id_)
+        if state is None or not state.synced:
+            return self.snapshot(game, player, allowed_actions, shared)
+
+        shared = shared or self.build_shared_view(game)
+        delta: Dict[str, Any] = {}
+
+        scalars = self._player_scalars(player, allowed_actions, shared)
+        changed = {
+            name: value for name, value in scalars.items() if state.scalars.get(name) != value
+        }
+        if changed:
+            delta["set"] = changed
+            state.scalars = scalars
+
+        hand_mask = player.hand_mask
+        if hand_mask != state.cards_mask:
+            added = hand_mask & ~state.cards_mask
+            removed = state.cards_mask & ~hand_mask
+            if added:
+                delta["cards_added"] = [_CARD_DICTS[i] for i in iter_indices(added)]
+            if removed:
+                delta["cards_removed"] = [_CARD_DICTS[i] for i in iter_indices(removed)]
+            state.cards_mask = hand_mask
+
+        table_cards = shared.table_cards
+        if table_cards != state.table_cards:
+            old = state.table_cards
+            delta["table_size"] = len(table_cards)
+            slots = [
+                [i, slot]
+                for i, slot in enumerate(table_cards)
+                if i >= len(old) or old[i] != slot
+            ]
+            if slots:
+                delta["table_slots"] = slots
+            state.table_cards = table_cards
+
+        room_players = {pid: data for pid, data in shared.players.items() if pid != player.id_}
+        if room_players != state.room_players:
+            updated = []
+            for pid, data in room_players.items():
+                previous = state.room_players.get(pid)
+                if previous is None:
+                    updated.append(data)
+                elif previous != data:
+                    # Для известного игрока — только изменившиеся поля
+                    changed_fields = {k: v for k, v in data.items() if previous.get(k) != v}
+                    changed_fields["player_id"] = pid
+                    updated.append(changed_fields)
+            removed_ids = [pid for pid in state.room_players if pid not in room_players]
+            if updated:
+                delta["players_updated"] = updated
+            if removed_ids:
+                delta["players_removed"] = removed_ids
+            state.room_players = room_players
+
+        if not delta:
+            return None
+        state.seq += 1
+        delta["seq"] = state.seq
+        return {"type": MessageType.GAME_STATE_DELTA, "data": delta}
+
+    @staticmethod
+    def _player_scalars(player: Player, allowed_actions: List[str], shared: _SharedView) -> Dict[str, Any]:
+        scalars = dict(shared.scalars)
+        scalars["status"] = _enum_str(player.status)
+        scalars["position"] = shared.positions.get(player.id_)
+        scalars["allowed_actions"] = allowed_actions
+        return scalars
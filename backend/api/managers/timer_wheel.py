@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Шаг колеса по умолчанию, секунды: таймер срабатывает не раньше срока и не позже чем на шаг
+TICK = 0.01
+
+
+class TimerHandle:
+    """Таймер колеса; cancel() снимает его за O(1)"""
+
+    __slots__ = ("expires", "callback", "args", "_wheel", "_bucket")
+
+    def __init__(
+        self, wheel: "TimerWheel", expires: int, callback: Callable[..., Any], args: Tuple[Any, ...]
+    ) -> None:
+        self.expires = expires  # Номер шага, на котором таймер срабатывает
+        self.callback = callback
+        self.args = args
+        self._wheel = wheel
+        self._bucket: Optional[Dict["TimerHandle", None]] = None
+
+    @property
+    def pending(self) -> bool:
+        """Таймер ещё не сработал и не отменён"""
+        return self._bucket is not None
+
+    def cancel(self) -> bool:
+        """Отменяет таймер; False — он уже сработал или отменён."""
+        bucket = self._bucket
+        if bucket is None:
+            return False
+        del bucket[self]
+        self._bucket = None
+        self._wheel._count -= 1
+        return True
+
+
+class TimerWheel:
+    """
+    Иерархическое колесо таймеров.
+
+    levels уровней по slots ячеек (slots — степень двойки): ячейка уровня 0
+    соответствует одному шагу tick, ячейка уровня n — slots**n шагам. Таймер
+    кладётся на уровень по расстоянию до срока, а когда время доходит до его
+    ячейки на верхнем уровне, переносится ниже. Ячейка — словарь таймеров,
+    поэтому постановка и отмена стоят O(1), а за шаг разбирается одна ячейка
+    уровня 0 (и изредка по ячейке верхних уровней).
+
+    Колесо ведёт одна задача в цикле событий: она запускается с первым
+    таймером и завершается, когда таймеров не осталось. Обратные вызовы
+    выполняются синхронно в этой задаче; долгую работу они должны ставить в
+    очередь (см. GameActor.schedule). Таймеры дальше slots**levels шагов
+    доезжают до верхнего уровня и ждут там, пока не станут ближе.
+
+    Args:
+        tick: Длительность шага, секунды.
+        slots: Ячеек на уровне (степень двойки).
+        levels: Число уровней.
+        clock: Источник монотонного времени.
+    """
+
+    def __init__(
+        self,
+        tick: float = TICK,
+        slots: int = 64,
+        levels: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if slots < 2 or slots & (slots - 1):
+            raise ValueError(f"Число ячеек должно быть степенью двойки: {slots}")
+        self.tick = tick
+        self.clock = clock
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._levels = levels
+        self._wheel: List[List[Dict[TimerHandle, None]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._origin = clock()
+        self._current = 0  # Последний обработанный шаг
+        self._count = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        """Число ожидающих таймеров"""
+        return self._count
+
+    def _tick_of(self, moment: float) -> int:
+        return int((moment - self._origin) / self.tick)
+
+    def _place(self, handle: TimerHandle) -> None:
+        delta = handle.expires - self._current
+        expires = handle.expires
+        level = 0
+        while level < self._levels - 1 and delta >> (self._bits * (level + 1)):
+            level += 1
+        if delta >> (self._bits * (level + 1)):
+            # Дальше, чем охватывает колесо: ждёт в самой дальней ячейке верхнего уровня
+            expires = self._current + (1 << (self._bits * self._levels)) - 1
+        bucket = self._wheel[level][(expires >> (self._bits * level)) & self._mask]
+        bucket[handle] = None
+        handle._bucket = bucket
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        """
+        Вызывает callback(*args) через delay секунд (не раньше).
+
+        Вызов вне цикла событий допустим, но колесо тогда двигает только advance().
+        """
+        now = self.clock()
+        if not self._count:
+            # Пустое колесо не крутили: догоняем время без разбора пустых шагов
+            self._current = max(self._current, self._tick_of(now))
+        expires = max(math.ceil((now + delay - self._origin) / self.tick), self._current + 1)
+        handle = TimerHandle(self, expires, callback, args)
+        self._place(handle)
+        self._count += 1
+        self._ensure_running()
+        return handle
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """
+        Обрабатывает шаги до момента now (по умолчанию — текущее время).
+
+        Returns:
+            int: Сколько таймеров сработало.
+        """
+        target = self._tick_of(self.clock() if now is None else now)
+        fired = 0
+        if not self._count:
+            self._current = max(self._current, target)
+            return fired
+        while self._current < target and self._count:
+            self._current += 1
+            current = self._current
+            # Сначала верхние уровни: их таймеры спускаются ниже, в том числе в текущую ячейку
+            for level in range(self._levels - 1, 0, -1):
+                if current & ((1 << (self._bits * level)) - 1) == 0:
+                    self._cascade(self._wheel[level][(current >> (self._bits * level)) & self._mask])
+            bucket = self._wheel[0][current & self._mask]
+            if not bucket:
+                continue
+            due = list(bucket)
+            bucket.clear()
+            for handle in due:
+                handle._bucket = None
+                if handle.expires > current:
+                    # Не дождался своего круга (срок дальше охвата колеса)
+                    self._place(handle)
+                    continue
+                fired += 1
+                self._count -= 1
+                try:
+                    handle.callback(*handle.args)
+                except Exception as e:
+                    logger.error("Ошибка в обработчике таймера: %s", e, exc_info=e)
+        return fired
+
+    def _cascade(self, bucket: Dict[TimerHandle, None]) -> None:
+        if not bucket:
+            return
+        handles = list(bucket)
+        bucket.clear()
+        for handle in handles:
+            self._place(handle)
+
+    def _ensure_running(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = self._task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._task = loop.create_task(self._run(), name="timer-wheel")
+
+    async def _run(self) -> None:
+        try:
+            while self._count:
+                await asyncio.sleep(self.tick)
+                self.advance()
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+
+    async def stop(self) -> None:
+        """Останавливает задачу колеса; таймеры остаются и продолжатся со следующим schedule()."""
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
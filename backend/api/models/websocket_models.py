@@ -9,6 +9,7 @@ class MessageType(str, Enum):
     PLAYER_DISCONNECTED = "player_disconnected"
     PLAYER_STATUS = "player_status"
     SELF_STATUS_UPDATE = "self_status_update"
+    RESYNC_STATE = "resync_state"
 
     # Game Actions
     PLAY_CARD = "play_card"
@@ -18,6 +19,7 @@ class MessageType(str, Enum):
     # Game Events (outgoing)
     CONNECTION_CONFIRMED = "connection_confirmed"
     GAME_STATE_UPDATE = "game_state_update"
+    GAME_STATE_DELTA = "game_state_delta"
     ROUND_ENDED = "round_ended"
     GAME_STARTED = "game_started"
     GAME_ENDED = "game_ended"
@@ -90,7 +92,7 @@ class PublicGameData(BaseModel):
 class ReconnectionData(PrivatePlayerData, PublicGameData):
     """Модель данных для переподключения с полным состоянием игры"""
     current_state: str | None = None
-    pass
+    seq: int = 0
 
 
 class ReconnectionResponse(BaseModel):
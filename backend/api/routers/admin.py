@@ -0,0 +1,130 @@
+import logging
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse, Response
+
+from backend.api.dependencies import get_connection_manager, get_game_actors
+from backend.api.managers.connection_managaer import ConnectionManager
+from backend.api.managers.game_actor import GameActors
+from backend.app.config.settings import ADMIN_TOKEN
+from backend.app.utils.profiling import (
+    MAX_PROFILE_SECONDS,
+    PROFILER,
+    profile_to_pstats,
+    profile_to_text,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Пропускает запрос только с верным X-Admin-Token; без ADMIN_TOKEN эндпоинты выключены."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Неверный токен администратора")
+
+
+router = APIRouter(prefix="/api/v1/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/timings", summary="Замеры вызовов горячего пути")
+async def get_timings(limit: int = Query(100, ge=0, le=10000)) -> dict:
+    """
+    Сводка по функциям и последние вызовы из кольцевого буфера.
+
+    Args:
+        limit: Сколько последних вызовов вернуть.
+    """
+    return {"enabled": PROFILER.enabled, "summary": PROFILER.summary(), "recent": PROFILER.recent(limit)}
+
+
+@router.post("/timings/enable", summary="Включить замеры")
+async def enable_timings(clear: bool = True) -> dict:
+    """Включает замеры вызовов; по умолчанию очищает буфер."""
+    if clear:
+        PROFILER.clear()
+    PROFILER.enable()
+    logger.info("Замеры вызовов включены", extra={"event": "admin.timings"})
+    return {"enabled": True}
+
+
+@router.post("/timings/disable", summary="Выключить замеры")
+async def disable_timings() -> dict:
+    """Выключает замеры; собранные данные остаются в буфере."""
+    PROFILER.disable()
+    logger.info("Замеры вызовов выключены", extra={"event": "admin.timings"})
+    return {"enabled": False}
+
+
+@router.get("/games/stats", summary="Очереди команд игр")
+async def get_games_stats(actors: GameActors = Depends(get_game_actors)) -> dict:
+    """Глубина очереди и задержки команд по каждой игре с очередью в памяти."""
+    return actors.all_stats()
+
+
+@router.get("/games/{game_id}/stats", summary="Очередь команд игры")
+async def get_game_stats(game_id: str, actors: GameActors = Depends(get_game_actors)) -> dict:
+    """
+    Глубина очереди и задержки команд одной игры.
+
+    Raises:
+        HTTPException: 404, если у игры нет очереди команд.
+    """
+    stats = actors.get_stats(game_id)
+    if stats is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Очереди игры {game_id} нет")
+    return stats
+
+
+@router.get("/rooms/fanout", summary="Задержки рассылок по комнатам")
+async def get_rooms_fanout(connections: ConnectionManager = Depends(get_connection_manager)) -> dict:
+    """Задержка рассылки состояния от постановки в очереди до последнего игрока, по комнатам."""
+    return connections.all_fanout_stats()
+
+
+@router.get("/rooms/{room_id}/fanout", summary="Задержки рассылок комнаты")
+async def get_room_fanout(room_id: str, connections: ConnectionManager = Depends(get_connection_manager)) -> dict:
+    """
+    Задержка рассылок одной комнаты.
+
+    Raises:
+        HTTPException: 404, если в комнату ещё ничего не рассылалось.
+    """
+    stats = connections.get_fanout_stats(room_id)
+    if stats is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Рассылок комнаты {room_id} не было")
+    return stats.to_dict()
+
+
+@router.post("/profile", summary="Снять профиль cProfile сервера")
+async def run_profile(
+    seconds: float = Query(10.0, gt=0, le=MAX_PROFILE_SECONDS),
+    format: str = Query("text", pattern="^(text|pstats)$"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|ncalls)$"),
+) -> Response:
+    """
+    Профилирует цикл событий seconds секунд и возвращает результат.
+
+    Args:
+        seconds: Длительность профиля.
+        format: text — отчёт pstats; pstats — файл для `python -m pstats` или snakeviz.
+        sort: Порядок функций в текстовом отчёте.
+
+    Raises:
+        HTTPException: 409, если профиль уже снимается.
+    """
+    logger.info("Профиль cProfile на %s с", seconds, extra={"event": "admin.profile"})
+    try:
+        profile = await PROFILER.run_cprofile(seconds)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if format == "pstats":
+        return Response(
+            profile_to_pstats(profile),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="server.pstats"'},
+        )
+    return PlainTextResponse(profile_to_text(profile, sort=sort))
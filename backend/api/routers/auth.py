@@ -26,11 +26,7 @@ async def auth_guest(request: Request, player_name: str) -> ResponsePlayer:
         HTTPException: Если имя игрока не содержит от 2 до 20 символов.
         HTTPException: При возникновении других непредвиденных ошибок.
     """
-    logger.info(
-        f"Получен запрос на авторизацию гостя. Headers: {dict(request.headers)}"
-    )
-    logger.info(f"Query параметры: {dict(request.query_params)}")
-    logger.info(f"Имя игрока: {player_name}")
+    logger.debug("Запрос на авторизацию гостя, имя: %s", player_name)
 
     try:
         if not (2 <= len(player_name) <= 20):
@@ -41,11 +37,8 @@ async def auth_guest(request: Request, player_name: str) -> ResponsePlayer:
             )
 
         player_id = str(uuid.uuid4())
-        logger.info(f"Создан новый игрок. ID: {player_id}, Имя: {player_name}")
-
-        response = ResponsePlayer(player_id=player_id)
-        logger.info(f"Отправляем ответ: {response}")
-        return response
+        logger.info("Создан гость %s", player_name, extra={"event": "auth.guest", "player_id": player_id})
+        return ResponsePlayer(player_id=player_id)
 
     except HTTPException as e:
         logger.error(f"Ошибка валидации: {e.detail}")
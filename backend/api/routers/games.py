@@ -3,7 +3,8 @@ from uuid import uuid4
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.responses import JSONResponse
 
-from backend.api.dependencies import get_game_manager
+from backend.api.dependencies import get_game_actors, get_game_manager
+from backend.api.managers.game_actor import GameActors
 from backend.api.managers.game_manager import GameManager
 from backend.api.models.game import (
     GameCreatedResponse,
@@ -17,6 +18,9 @@ from backend.app.config.settings import DEBUG
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["Games"])
 
+# Сколько игр перебирает быстрый подбор, если места в них занимают одновременно
+QUICK_JOIN_ATTEMPTS = 3
+
 
 @router.post(
     "/create_game",
@@ -58,14 +62,18 @@ async def create_game(
 async def join_game(
     player_id: str,
     game_id: str | None = None,
+    players_limit: int | None = None,
     gm: GameManager = Depends(get_game_manager),
+    actors: GameActors = Depends(get_game_actors),
 ) -> GameJoinedResponse:
     """Присоединяет игрока к игре.
 
     Args:
         player_id: ID присоединяющегося игрока.
         game_id: ID игры для присоединения. Если None, находит доступную игру.
+        players_limit: Желаемый размер комнаты при быстром подборе (без game_id).
         gm: Экземпляр менеджера игр.
+        actors: Очереди команд игр; вход выполняется командой в очереди игры.
 
     Returns:
         Объект GameJoinedResponse с деталями игры и игрока.
@@ -73,6 +81,7 @@ async def join_game(
     Raises:
         HTTPException: Если игра не найдена, заполнена, или если игрок уже в игре.
     """
+    quick_join = not game_id
     if game_id:
         game = gm.get_game_by_id(game_id)
         if not game:
@@ -84,26 +93,51 @@ async def join_game(
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT, detail="Вы уже в этой игре."
             )
-    else:
-        game = gm.find_available_game() or gm.create_game(players_limit=2)
-        game_id = game.game_id
+    elif players_limit is not None and not (2 <= players_limit <= 6):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Количество игроков должно быть от 2 до 6.",
+        )
 
     player_input = PlayerInput(player_id=player_id, action=PlayerAction.JOIN)
 
-    try:
-        answer = game.handle_input(player_input)
-        if answer.result != ActionResult.SUCCESS:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT, detail=answer.message
-            )
-    except Exception as e:
-        logger.error(f"Ошибка присоединения к игре: {e}", exc_info=DEBUG)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
-        )
+    def join_command(game: FoolGame):
+        async def join() -> bool:
+            """Вход в очереди игры; False — при быстром подборе последнее место уже заняли."""
+            try:
+                answer = game.handle_input(player_input)
+            except Exception as e:
+                logger.error(f"Ошибка присоединения к игре: {e}", exc_info=DEBUG)
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+                )
+            if quick_join and answer.result == ActionResult.ROOM_FULL:
+                return False
+            if answer.result != ActionResult.SUCCESS:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT, detail=answer.message
+                )
+            gm.add_game_to_player(game.game_id, player_id)
+            gm.update_game_slots_by_id(game.game_id)
+            gm.checkpoint(game)
+            return True
+
+        return join
+
+    if game_id:
+        await actors.submit(game_id, join_command(game))
+    else:
+        # Кандидата выбирают вне очереди игры, поэтому одновременные входы могут
+        # занять последнее место раньше: тогда берём следующую игру, а последней
+        # попыткой — новую, где вход встаёт в очередь первым
+        for attempt in range(QUICK_JOIN_ATTEMPTS):
+            candidate = gm.find_available_game(players_limit) if attempt < QUICK_JOIN_ATTEMPTS - 1 else None
+            game = candidate or gm.create_game(players_limit=players_limit or 2)
+            if await actors.submit(game.game_id, join_command(game)):
+                break
+            logger.info("Игра %s заполнилась до входа игрока %s, подбор другой", game.game_id, player_id)
+        game_id = game.game_id
 
-    gm.add_game_to_player(game_id, player_id)
-    gm.update_game_slots_by_id(game_id)
     # TODO: сделать env для исправления жестко закодированного пути к серверу
     return GameJoinedResponse(
         game_id=game.game_id,
@@ -114,13 +148,16 @@ async def join_game(
 
 @router.post("/exit_game", summary="Выйти из игры")
 async def exit_game(
-    player_id: str, gm: GameManager = Depends(get_game_manager)
+    player_id: str,
+    gm: GameManager = Depends(get_game_manager),
+    actors: GameActors = Depends(get_game_actors),
 ) -> JSONResponse:
     """Удаляет игрока из игры.
 
     Args:
         player_id: ID удаляемого игрока.
         gm: Экземпляр менеджера игр.
+        actors: Очереди команд игр; выход выполняется командой в очереди игры.
 
     Returns:
         JSONResponse с сообщением об успехе.
@@ -135,7 +172,10 @@ async def exit_game(
             detail=f"Игрок с ID {player_id} не найден ни в одной игре.",
         )
 
-    gm.handle_player_quit(game.game_id, player_id)
+    async def quit_game() -> None:
+        gm.handle_player_quit(game.game_id, player_id)
+
+    await actors.submit(game.game_id, quit_game)
 
     return JSONResponse(content={"message": "Успешный выход из игры"})
 
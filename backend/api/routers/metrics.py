@@ -0,0 +1,43 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend.api.dependencies import (
+    get_connection_manager,
+    get_game_actors,
+    get_game_manager,
+    get_game_reaper,
+    get_lobby_hub,
+)
+from backend.app.utils.metrics import REGISTRY
+
+router = APIRouter(tags=["Metrics"])
+
+# Тип содержимого текстового формата Prometheus
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+game_manager = get_game_manager()
+connection_manager = get_connection_manager()
+lobby_hub = get_lobby_hub()
+game_actors = get_game_actors()
+game_reaper = get_game_reaper()
+
+REGISTRY.gauge(
+    "fool_games",
+    "Игры в памяти по статусу",
+    lambda: {("active",): len(game_manager.active_games), ("pending",): len(game_manager.pending_games)},
+    ("status",),
+)
+REGISTRY.gauge("fool_websocket_connections", "Открытые WebSocket-соединения", lambda: len(connection_manager.connections))
+REGISTRY.gauge("fool_lobby_subscribers", "Подписчики SSE-потока лобби", lambda: len(lobby_hub.subscribers))
+REGISTRY.gauge("fool_game_actors", "Очереди команд игр в памяти", lambda: len(game_actors))
+REGISTRY.gauge("fool_game_commands_queued", "Команды, ждущие выполнения, во всех играх", game_actors.queued)
+REGISTRY.gauge(
+    "fool_reaper_tracked_bytes", "Оценка памяти партий после последнего обхода сборщика, байт",
+    lambda: game_reaper.stats.tracked_bytes,
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Метрики процесса в текстовом формате Prometheus."""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
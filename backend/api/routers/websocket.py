@@ -2,7 +2,7 @@ import logging
 
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
 
-from backend.api.dependencies import get_game_manager, connection_manager
+from backend.api.dependencies import get_game_manager, connection_manager, game_actors
 from backend.api.managers.game_manager import GameManager
 from backend.api.models.websocket_models import MessageType
 from backend.api.routers.websocket_handlers import (
@@ -10,6 +10,7 @@ from backend.api.routers.websocket_handlers import (
     handle_player_disconnected,
     websocket_inout_resolve,
 )
+from backend.api.wire_format import WireFormat, compact_schema, negotiate
 from backend.app.config.settings import DEBUG
 from backend.app.utils.errors import GameLogicError
 
@@ -18,6 +19,20 @@ router = APIRouter(prefix="/api/v1", tags=["Games"])
 logger = logging.getLogger(__name__)
 
 
+async def _receive_message(websocket: WebSocket, wire: WireFormat) -> dict:
+    """Принимает кадр (текстовый или двоичный) и декодирует его форматом соединения."""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE), message.get("reason"))
+    frame = message.get("text")
+    return wire.decode(frame if frame is not None else message["bytes"])
+
+
+@router.get("/wire/compact", summary="Таблицы кодов компактного формата WebSocket")
+async def wire_compact_schema() -> dict:
+    return compact_schema()
+
+
 @router.websocket("/ws/{game_id}")
 async def websocket_game(
     websocket: WebSocket,
@@ -28,6 +43,12 @@ async def websocket_game(
     """
     Основная точка входа для WebSocket-соединения игры.
 
+    Сообщения игрока выполняются командами в очереди игры (GameActors):
+    ходы всех игроков партии обрабатываются строго по одному.
+
+    Формат сообщений выбирается при подключении (?wire=compact или
+    подпротокол, см. wire_format); по умолчанию — JSON.
+
     Args:
         websocket: Экземпляр WebSocket соединения.
         game_id: ID игры, к которой подключается игрок.
@@ -43,20 +64,35 @@ async def websocket_game(
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=reason)
         return
 
-    await connection_manager.connect(player_id, websocket)
-    logger.info(f"Игрок {player_id} подключился к игре {game_id}")
+    try:
+        wire, subprotocol = negotiate(
+            websocket.query_params.get("wire"), websocket.scope.get("subprotocols", [])
+        )
+    except ValueError as e:
+        logger.warning("Игрок %s: %s", player_id, e)
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+        return
+
+    await connection_manager.connect(player_id, websocket, wire, subprotocol)
+    logger.info("Игрок %s подключился к игре %s", player_id, game_id)
 
     # Уведомляем всех о подключении нового игрока
-    await websocket_inout_resolve(
-        {"type": "player_connected"}, game_id, player_id, game, websocket
+    await game_actors.submit(
+        game_id,
+        lambda: websocket_inout_resolve(
+            {"type": "player_connected"}, game_id, player_id, game, websocket
+        ),
     )
 
     try:
         while True:
-            data = await websocket.receive_json()
+            data = await _receive_message(websocket, wire)
             try:
-                await websocket_inout_resolve(
-                    data, game_id, player_id, game, websocket
+                await game_actors.submit(
+                    game_id,
+                    lambda: websocket_inout_resolve(
+                        data, game_id, player_id, game, websocket
+                    ),
                 )
             except GameLogicError as e:
                 # Отправка специфичной ошибки игровой логики клиенту
@@ -64,16 +100,19 @@ async def websocket_game(
                     "type": MessageType.ERROR,
                     "data": {"message": str(e), "code": getattr(e, "error_code", "GAME_LOGIC_ERROR")},
                 }
-                logger.warning(f"Ошибка игровой логики для {player_id}: {e}")
-                await websocket.send_json(error_response)
+                logger.warning("Ошибка игровой логики для %s: %s", player_id, e)
+                await connection_manager.send_message(player_id, error_response)
                 # Повторная синхронизация состояния для клиента, вызвавшего ошибку
-                await _send_full_game_state_to_player(game, player_id)
+                await game_actors.submit(
+                    game_id, lambda: _send_full_game_state_to_player(game, player_id)
+                )
             except Exception as e:
                 # Отправка общей ошибки сервера
-                logger.error(f"Неожиданная ошибка для {player_id}: {e}", exc_info=DEBUG)
+                logger.error("Неожиданная ошибка для %s: %s", player_id, e, exc_info=DEBUG)
                 error_message = str(e) if DEBUG else "Произошла неожиданная ошибка на сервере."
                 error_code = e.__class__.__name__ if DEBUG else "UNEXPECTED_ERROR"
-                await websocket.send_json(
+                await connection_manager.send_message(
+                    player_id,
                     {
                         "type": MessageType.ERROR,
                         "data": {"message": error_message, "code": error_code},
@@ -81,10 +120,12 @@ async def websocket_game(
                 )
 
     except WebSocketDisconnect:
-        logger.info(f"Игрок {player_id} отключился от игры {game_id}")
-        await handle_player_disconnected(game_id, player_id, game)
+        logger.info("Игрок %s отключился от игры %s", player_id, game_id)
+        await game_actors.submit(
+            game_id, lambda: handle_player_disconnected(game_id, player_id, game)
+        )
     except Exception as e:
-        logger.error(f"Критическая ошибка WebSocket для {player_id}: {e}", exc_info=DEBUG)
+        logger.error("Критическая ошибка WebSocket для %s: %s", player_id, e, exc_info=DEBUG)
     finally:
-        connection_manager.disconnect(player_id)
-        logger.info(f"Соединение для игрока {player_id} полностью закрыто.") 
\ No newline at end of file
+        connection_manager.disconnect(player_id, websocket)
+        logger.info("Соединение для игрока %s полностью закрыто.", player_id) 
\ No newline at end of file
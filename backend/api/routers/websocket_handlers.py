@@ -1,8 +1,12 @@
-import asyncio
 import logging
 from fastapi import WebSocket
 
-from backend.api.dependencies import connection_manager, game_manager
+from backend.api.dependencies import (
+    connection_manager,
+    game_actors,
+    game_manager,
+    state_sync_manager,
+)
 from backend.api.models.websocket_models import (
     GameOverData,
     GameOverResponse,
@@ -10,9 +14,6 @@ from backend.api.models.websocket_models import (
     PlayerDisconnectedResponse,
     PlayerStatusChangedResponse,
     PlayerStatusData,
-    PublicPlayerData,
-    ReconnectionData,
-    ReconnectionResponse,
     SelfStatusUpdateData,
     SelfStatusUpdateResponse,
 )
@@ -23,16 +24,23 @@ from backend.app.contracts.game_contract import (
     StateResponse,
     StateTransition,
 )
-from backend.app.models.card import Card
+from backend.app.models.card import Card, card_by_index
 from backend.app.models.game import FoolGame
 from backend.app.models.player import Player, PlayerStatus
+from backend.app.simulation.policies import GreedyPolicy
 from backend.app.states.game_over import GameOverState
+from backend.app.states.registry import StateName
 from backend.app.utils.errors import GameLogicError, WrongTurnError
-from backend.app.config.settings import DEBUG
+from backend.app.utils.profiling import profiled
+from backend.app.config.settings import DEBUG, LOBBY_READY_TIMEOUT, TURN_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
+# Через сколько секунд после окончания партии игра возвращается в лобби
+RESET_TO_LOBBY_DELAY = 15
+
 
+@profiled()
 async def websocket_inout_resolve(
     data: dict, game_id: str, player_id: str, game: FoolGame, websocket: WebSocket
 ) -> None:
@@ -48,8 +56,10 @@ async def websocket_inout_resolve(
     """
     message_type = data.get("type")
     message_data = data.get("data")
-    logger.info(
-        f"Получено сообщение от {player_id} в игре {game_id}: тип={message_type}"
+    logger.debug(
+        "Получено сообщение: тип=%s",
+        message_type,
+        extra={"event": "ws.message", "game_id": game_id, "player_id": player_id},
     )
 
     match message_type:
@@ -64,106 +74,198 @@ async def websocket_inout_resolve(
             await handle_play_card(game_id, player_id, game, websocket, data)
         case "pass_turn":
             await handle_pass_turn(game_id, player_id, game)
+        case "resync_state":
+            # Клиент заметил пропуск номера seq и просит полный снимок
+            await _send_full_game_state_to_player(game, player_id)
         case _:
-            logger.warning(f"Неизвестный тип сообщения: {message_type}")
+            logger.warning("Неизвестный тип сообщения: %s", message_type)
 
 
-async def _broadcast_full_game_state(game: FoolGame):
+@profiled()
+async def _broadcast_game_state(game: FoolGame):
     """
-    Транслирует полное состояние игры всем игрокам в комнате.
+    Рассылает игрокам изменения состояния игры.
+
+    Каждому игроку уходит дельта относительно последнего отправленного ему
+    состояния; полный снимок — только если базы для дельты нет.
 
     Args:
         game: Экземпляр текущей игры.
     """
+    game_manager.checkpoint(game)
     all_allowed_actions = game.get_allowed_actions()
+    shared = state_sync_manager.build_shared_view(game)
 
+    messages = {}
     for p in game.players:
-        player_actions = all_allowed_actions.get(p.id_, [])
-        full_state_response = ReconnectionResponse(
-            data=ReconnectionData(
-                current_state=game.current_state_name,
-                status=p.status,
-                position=game.get_player_position(p.id_),
-                cards=[card.to_dict() for card in p.get_cards()],
-                allowed_actions=player_actions,
-                room_size=game.players_limit,
-                room_players=[
-                    PublicPlayerData(
-                        player_id=other_p.id_,
-                        position=game.get_player_position(other_p.id_),
-                        cards_count=len(other_p.get_cards()),
-                        status=getattr(other_p, "status", PlayerStatus.UNREADY),
-                        name=other_p.name,
-                    )
-                    for other_p in game.players
-                    if other_p.id_ != p.id_
-                ],
-                deck_size=len(game.deck),
-                trump_suit=game.deck.trump_suit,
-                trump_rank=game.deck.trump_card.rank if game.deck.trump_card else None,
-                attacker_position=(
-                    game.get_player_position(game.current_attacker_id)
-                    if game.current_attacker_id
-                    else -1
-                ),
-                defender_position=(
-                    game.get_player_position(game.current_defender_id)
-                    if game.current_defender_id
-                    else -1
-                ),
-                table_cards=[
-                    {
-                        "attack_card": (
-                            pair.get("attack_card").to_dict()
-                            if pair.get("attack_card")
-                            else None
-                        ),
-                        "defend_card": (
-                            pair.get("defend_card").to_dict()
-                            if pair.get("defend_card")
-                            else None
-                        ),
-                    }
-                    for pair in game.game_table.table_cards
-                ],
-            )
+        if not connection_manager.is_connected(p.id_):
+            # Сообщение некому доставить — следующим игрок получит полный снимок
+            state_sync_manager.reset(p.id_)
+            continue
+        message = state_sync_manager.update(
+            game, p, all_allowed_actions.get(p.id_, []), shared
         )
-        await connection_manager.send_message(p.id_, full_state_response.model_dump())
+        if message is not None:
+            messages[p.id_] = message
+    await connection_manager.send_to_players(messages, room_id=game.game_id)
+    _arm_deadline(game)
+
+
+def _turn_owner(game: FoolGame) -> str:
+    """Кого ждёт раунд: защищающегося, пока ему есть что отбивать, иначе атакующего."""
+    defender_id = game.current_defender_id
+    if PlayerAction.DEFEND.name in game.get_allowed_actions().get(defender_id, []):
+        return defender_id
+    return game.current_attacker_id
+
+
+def _arm_deadline(game: FoolGame) -> None:
+    """
+    Назначает срок игры по её состоянию.
+
+    В раунде — срок хода того, кого ждёт партия; в заполненном лобби — срок
+    готовности. Повторная рассылка того же хода (например, после
+    переподключения) срок не продлевает. Срок сброса после партии назначает
+    reset_to_lobby_after_delay, здесь он не трогается.
+    """
+    actor = game_actors.get(game.game_id)
+    state = game.current_state_name
+    if state == StateName.GAME_OVER:
+        return
+    if state == StateName.PLAY_ROUND and TURN_TIMEOUT > 0:
+        player_id = _turn_owner(game)
+        if player_id:
+            table = game.game_table
+            key = (state, player_id, table.attack_count, table.uncovered_count, game.round_defender_status)
+            actor.set_deadline(
+                TURN_TIMEOUT, lambda: handle_turn_timeout(game.game_id, player_id), key
+            )
+            return
+    if (
+        state == StateName.LOBBY
+        and LOBBY_READY_TIMEOUT > 0
+        and len(game.players) == game.players_limit
+        and any(p.status != PlayerStatus.READY for p in game.players)
+    ):
+        # Срок идёт от заполнения комнаты: смена статусов его не продлевает
+        key = (state, tuple(p.id_ for p in game.players))
+        actor.set_deadline(LOBBY_READY_TIMEOUT, lambda: handle_ready_timeout(game.game_id), key)
+        return
+    actor.clear_deadline()
+
+
+@profiled()
+async def handle_turn_timeout(game_id: str, player_id: str) -> None:
+    """
+    Срок хода истёк: защищающийся берёт карты, атакующий пасует, а если
+    стол пуст — ходит самой младшей картой.
+
+    Args:
+        game_id: ID игры.
+        player_id: ID игрока, чей срок истёк.
+    """
+    game = game_manager.get_game_by_id(game_id)
+    if not game or game.current_state_name != StateName.PLAY_ROUND:
+        return
+    actions = game.get_allowed_actions().get(player_id, [])
+    logger.info("Игрок %s не сходил вовремя в игре %s, ход делается автоматически", player_id, game_id)
+    if PlayerAction.PASS.name in actions:
+        await handle_pass_turn(game_id, player_id, game)
+        return
+    player = game.get_player_by_id(player_id)
+    if PlayerAction.ATTACK.name not in actions or not player or game.game_table.attack_count:
+        logger.warning("Для игрока %s нет автоматического хода в игре %s", player_id, game_id)
+        return
+    trump_suit = game.deck.trump_suit
+    index = GreedyPolicy().choose_attack(player.hand_mask, trump_suit, must_attack=True)
+    if index is None:
+        return
+    answer = game.handle_input(
+        PlayerInput(player_id, PlayerAction.ATTACK, attack_card=card_by_index(index, trump_suit))
+    )
+    if answer is None:
+        logger.warning("Автоматический ход игрока %s в игре %s не вернул ответа", player_id, game_id)
+    elif isinstance(answer, StateTransition):
+        await _handle_state_transition(game, answer)
+    elif answer.result == ActionResult.SUCCESS:
+        await _broadcast_game_state(game)
+    else:
+        logger.warning("Автоматический ход игрока %s отклонён: %s", player_id, answer.message)
 
 
-async def reset_to_lobby_after_delay(game: FoolGame, delay: int):
+@profiled()
+async def handle_ready_timeout(game_id: str) -> None:
     """
-    Сбрасывает игру в лобби после заданной задержки.
+    Срок готовности в заполненном лобби истёк: неготовые игроки удаляются из
+    комнаты, их соединения закрываются, а места освобождаются для других.
+
+    Args:
+        game_id: ID игры.
+    """
+    game = game_manager.get_game_by_id(game_id)
+    if not game or game.current_state_name != StateName.LOBBY:
+        return
+    not_ready = [p.id_ for p in game.players if p.status != PlayerStatus.READY]
+    for player_id in not_ready:
+        logger.info("Игрок %s не подтвердил готовность в игре %s и удалён из комнаты", player_id, game_id)
+        await handle_player_disconnected(game_id, player_id, game)
+        websocket = connection_manager.get_connection(player_id)
+        connection_manager.disconnect(player_id)
+        if websocket is not None:
+            try:
+                await websocket.close(code=1000, reason="Ready timeout")
+            except Exception as e:
+                logger.debug("Не удалось закрыть соединение игрока %s: %s", player_id, e)
+    if not_ready:
+        await _broadcast_game_state(game)
+
+
+def reset_to_lobby_after_delay(game: FoolGame, delay: float) -> None:
+    """
+    Планирует сброс игры в лобби после заданной задержки.
+
+    Сброс выполняется командой в очереди игры, поэтому не вклинивается в
+    обработку ходов. Это срок игры (GameActor.set_deadline): он заменяет срок
+    последнего хода.
 
     Args:
         game: Экземпляр игры для сброса.
         delay: Задержка в секундах.
     """
-    await asyncio.sleep(delay)
-    if game:
+
+    async def reset() -> None:
+        if game.current_state_name != "GameOverState":
+            # Партию уже сбросили (например, все вышли)
+            return
         logger.info(
-            f"АВТО-СБРОС: Игра {game.game_id} возвращается в лобби через {delay} сек."
+            "АВТО-СБРОС: Игра %s возвращается в лобби через %s сек.", game.game_id, delay
         )
         game.reset_to_lobby()
-        await _broadcast_full_game_state(game)
+        await _broadcast_game_state(game)
+
+    game_actors.get(game.game_id).set_deadline(delay, reset, key=StateName.GAME_OVER)
 
 
+@profiled()
 async def _handle_state_transition(game: FoolGame, transition: StateTransition):
     """
     Обрабатывает переход состояния игры, включая завершение игры.
 
+    Переход сводный: если ход прошёл через переходные состояния (раздачу),
+    они уже пройдены, и игрокам рассылается только итоговое состояние.
+
     Args:
         game: Экземпляр текущей игры.
         transition: Объект, описывающий переход состояния.
     """
-    logger.info(f"Обработка перехода состояния в {transition.new_state}")
+    logger.info("Обработка перехода состояния: %s", " -> ".join(map(str, transition.path)))
     if transition.new_state == "GameOverState":
         game_over_state = game._current_state
         if not isinstance(game_over_state, GameOverState):
             logger.error(
-                f"Состояние {transition.new_state}, но тип объекта {type(game_over_state)}!"
+                "Состояние %s, но тип объекта %s!", transition.new_state, type(game_over_state)
             )
-            await _broadcast_full_game_state(game)
+            await _broadcast_game_state(game)
             return
 
         game_over_response = GameOverResponse(
@@ -174,13 +276,14 @@ async def _handle_state_transition(game: FoolGame, transition: StateTransition):
         )
         all_player_ids = [p.id_ for p in game.players]
         await connection_manager.broadcast_to_players(
-            all_player_ids, game_over_response.model_dump()
+            all_player_ids, game_over_response.model_dump(), room_id=game.game_id
         )
-        asyncio.create_task(reset_to_lobby_after_delay(game, 15))
+        reset_to_lobby_after_delay(game, RESET_TO_LOBBY_DELAY)
     else:
-        await _broadcast_full_game_state(game)
+        await _broadcast_game_state(game)
 
 
+@profiled()
 async def _send_full_game_state_to_player(game: FoolGame, player_id: str):
     """
     Отправляет полное состояние игры конкретному игроку.
@@ -192,65 +295,19 @@ async def _send_full_game_state_to_player(game: FoolGame, player_id: str):
     player = game.get_player_by_id(player_id)
     if not player:
         logger.warning(
-            f"Попытка отправить состояние несуществующему игроку {player_id}"
+            "Попытка отправить состояние несуществующему игроку %s", player_id
         )
         return
 
     all_allowed_actions = game.get_allowed_actions()
-    player_actions = all_allowed_actions.get(player.id_, [])
-
-    full_state_response = ReconnectionResponse(
-        data=ReconnectionData(
-            current_state=game.current_state_name,
-            status=player.status,
-            position=game.get_player_position(player.id_),
-            cards=[card.to_dict() for card in player.get_cards()],
-            allowed_actions=player_actions,
-            room_size=game.players_limit,
-            room_players=[
-                PublicPlayerData(
-                    player_id=other_p.id_,
-                    position=game.get_player_position(other_p.id_),
-                    cards_count=len(other_p.get_cards()),
-                    status=getattr(other_p, "status", PlayerStatus.UNREADY),
-                    name=other_p.name,
-                )
-                for other_p in game.players
-                if other_p.id_ != player.id_
-            ],
-            deck_size=len(game.deck),
-            trump_suit=game.deck.trump_suit,
-            trump_rank=game.deck.trump_card.rank if game.deck.trump_card else None,
-            attacker_position=(
-                game.get_player_position(game.current_attacker_id)
-                if game.current_attacker_id
-                else -1
-            ),
-            defender_position=(
-                game.get_player_position(game.current_defender_id)
-                if game.current_defender_id
-                else -1
-            ),
-            table_cards=[
-                {
-                    "attack_card": (
-                        pair.get("attack_card").to_dict()
-                        if pair.get("attack_card")
-                        else None
-                    ),
-                    "defend_card": (
-                        pair.get("defend_card").to_dict()
-                        if pair.get("defend_card")
-                        else None
-                    ),
-                }
-                for pair in game.game_table.table_cards
-            ],
-        )
+    snapshot = state_sync_manager.snapshot(
+        game, player, all_allowed_actions.get(player.id_, [])
     )
-    await connection_manager.send_message(player.id_, full_state_response.model_dump())
+    if not await connection_manager.send_message(player.id_, snapshot):
+        state_sync_manager.reset(player.id_)
 
 
+@profiled()
 async def handle_player_connected(
     game_id: str, player_id: str, game: FoolGame, websocket: WebSocket
 ):
@@ -265,21 +322,30 @@ async def handle_player_connected(
     """
     player: Player = next((p for p in game.players if p.id_ == player_id), None)
     if not player:
-        logger.warning(f"Игрок {player_id} не найден в игре {game_id}")
+        logger.warning("Игрок %s не найден в игре %s", player_id, game_id)
         return
-    await _broadcast_full_game_state(game)
+    # Переподключившийся клиент начинает с полного снимка
+    state_sync_manager.reset(player_id)
+    await _broadcast_game_state(game)
 
 
+@profiled()
 async def handle_player_disconnected(game_id: str, player_id: str, game: FoolGame):
     """
     Обрабатывает отключение игрока от WebSocket.
 
+    Повторный вызов (например, срок готовности уже вывел игрока, а потом
+    закрылось его соединение) ничего не рассылает.
+
     Args:
         game_id: ID текущей игры.
         player_id: ID отключившегося игрока.
         game: Экземпляр текущей игры.
     """
-    game_manager.handle_player_quit(game_id, player_id)
+    quit_now = game_manager.handle_player_quit(game_id, player_id)
+    state_sync_manager.forget(player_id)
+    if not quit_now:
+        return
 
     disconnect_response = PlayerDisconnectedResponse(
         data=PlayerDisconnectedData(player_id=player_id)
@@ -291,6 +357,7 @@ async def handle_player_disconnected(game_id: str, player_id: str, game: FoolGam
         )
 
 
+@profiled()
 async def handle_player_status_changed(
     game_id: str, player_id: str, new_status: str, game: FoolGame
 ):
@@ -306,7 +373,7 @@ async def handle_player_status_changed(
     try:
         player: Player = game.get_player_by_id(player_id=player_id)
         if not player:
-            logger.error(f"Игрок {player_id} не найден в игре {game_id}")
+            logger.error("Игрок %s не найден в игре %s", player_id, game_id)
             return
 
         action = PlayerAction.READY if new_status == "ready" else PlayerAction.UNREADY
@@ -341,11 +408,12 @@ async def handle_player_status_changed(
 
     except (GameLogicError, Exception) as e:
         logger.error(
-            f"Ошибка при обработке изменения статуса игрока: {e}", exc_info=DEBUG
+            "Ошибка при обработке изменения статуса игрока: %s", e, exc_info=DEBUG
         )
         raise
 
 
+@profiled()
 async def handle_play_card(
     game_id: str, player_id: str, game: FoolGame, websocket: WebSocket, data: dict
 ):
@@ -377,14 +445,9 @@ async def handle_play_card(
         elif is_defense_action and not is_defender:
             raise WrongTurnError("Сейчас не ваш ход для защиты", "WRONG_TURN")
 
-        # Создание объектов карт из данных
-        trump_suit = game.deck.trump_suit
-        attack_card = Card.from_dict(attack_card_data, trump_suit=trump_suit)
-        defend_card = (
-            Card.from_dict(defend_card_data, trump_suit=trump_suit)
-            if defend_card_data
-            else None
-        )
+        # Карты берутся из общей таблицы; козырь учитывает стол партии
+        attack_card = Card.from_dict(attack_card_data)
+        defend_card = Card.from_dict(defend_card_data) if defend_card_data else None
 
         # Формирование действия игрока
         action = PlayerAction.DEFEND if defend_card else PlayerAction.ATTACK
@@ -403,7 +466,7 @@ async def handle_play_card(
         elif (
             isinstance(answer, StateResponse) and answer.result == ActionResult.SUCCESS
         ):
-            await _broadcast_full_game_state(game)
+            await _broadcast_game_state(game)
         else:
             raise GameLogicError(answer.message, "PLAY_CARD_ERROR")
 
@@ -412,12 +475,13 @@ async def handle_play_card(
     except (GameLogicError, WrongTurnError) as e:
         raise
     except Exception as e:
-        logger.error(f"Неожиданная ошибка при обработке хода: {e}", exc_info=DEBUG)
+        logger.error("Неожиданная ошибка при обработке хода: %s", e, exc_info=DEBUG)
         raise GameLogicError(
             f"Ошибка при обработке хода: {e}", "UNEXPECTED_PLAY_CARD_ERROR"
         )
 
 
+@profiled()
 async def handle_pass_turn(game_id: str, player_id: str, game: FoolGame):
     """
     Обрабатывает действие "пас" от игрока.
@@ -436,11 +500,11 @@ async def handle_pass_turn(game_id: str, player_id: str, game: FoolGame):
         elif (
             isinstance(answer, StateResponse) and answer.result == ActionResult.SUCCESS
         ):
-            await _broadcast_full_game_state(game)
+            await _broadcast_game_state(game)
         else:      
             raise GameLogicError(answer.message, "PASS_TURN_ERROR")
     except (GameLogicError, Exception) as e:
         logger.error(
-            f"Ошибка в handle_pass_turn для игрока {player_id}: {e}", exc_info=DEBUG
+            "Ошибка в handle_pass_turn для игрока %s: %s", player_id, e, exc_info=DEBUG
         )
         raise
@@ -0,0 +1,475 @@
+"""
+Роутер шардированного запуска.
+
+Принимает весь внешний трафик и передаёт его процессам-шардам по их
+Unix-сокетам (см. backend.api.cluster):
+
+* запросы с game_id и WebSocket игры уходят шарду-владельцу shard_of(game_id);
+* быстрый подбор выбирает игру по сводному списку лобби, новые игры
+  распределяются по шардам по кругу;
+* запросы только с player_id идут в шард, где игрок вошёл в игру (если роутер
+  этого не знает — опрашиваются все шарды);
+* список игр, SSE-лента лобби и /metrics собираются со всех шардов
+  (у образцов метрик — метка shard);
+* служебные запросы /api/v1/admin/* уходят шарду игры: game_id берётся из
+  пути (games/<id>/..., rooms/<id>/...) или параметра game_id, иначе нужен
+  явный параметр shard.
+
+Если у шардов есть свои внешние адреса (public_urls, см. --shard-port в
+backend.api.cluster), роутер подменяет websocket_connection в ответах
+join_game и player_game адресом шарда-владельца: клиент подключает WebSocket
+игры прямо к шарду, и кадры игры мимо роутера масштабируются числом шардов.
+Без них WebSocket проходит через прокси роутера (он же остаётся запасным
+путём для клиентов, которые строят адрес сами).
+Запомненный шард игрока (player_shards) забывается при выходе из игры и при
+закрытии его WebSocket на роутере; для прямых подключений устаревшая запись
+сбрасывается, когда шард отвечает, что игрока у него нет.
+
+Сами шарды — обычное приложение backend.api.main с SHARD_COUNT/SHARD_INDEX.
+"""
+import asyncio
+import itertools
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import JSONResponse, Response
+from sse_starlette.sse import EventSourceResponse
+from websockets.asyncio.client import unix_connect
+from websockets.exceptions import ConnectionClosed, InvalidHandshake
+
+from backend.api.middlewares import setup_middlewares
+from backend.api.sharding import shard_of, socket_path
+from backend.app.config.settings import DEBUG
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v1"
+# Интервал keep-alive пинга сводной ленты лобби
+PING_INTERVAL = 30
+# Заголовки, которые не передаются между клиентом и шардом
+_HOP_HEADERS = {"host", "content-length", "connection", "transfer-encoding", "keep-alive", "upgrade"}
+
+# Событие SSE от шарда: (номер шарда, событие, данные); None — поток шарда закончился
+ShardEvent = Optional[Tuple[int, str, str]]
+
+
+class LobbyMerge:
+    """Сводный список ожидающих игр по событиям лент лобби всех шардов"""
+
+    def __init__(self) -> None:
+        self.games: Dict[int, Dict[str, dict]] = {}
+
+    def all_games(self) -> List[dict]:
+        return [game for games in self.games.values() for game in games.values()]
+
+    def apply(self, shard: int, event: str, data: str) -> Optional[Tuple[str, str]]:
+        """
+        Учитывает событие шарда.
+
+        Returns:
+            Optional[Tuple[str, str]]: Событие для клиента или None, если передавать нечего.
+        """
+        if event == "message":
+            # Полный список одного шарда — клиенту нужен полный сводный список
+            self.games[shard] = {game["game_id"]: game for game in json.loads(data)}
+            return "message", json.dumps(self.all_games())
+        if event in ("game_added", "game_updated"):
+            game = json.loads(data)
+            self.games.setdefault(shard, {})[game["game_id"]] = game
+            return event, data
+        if event == "game_removed":
+            self.games.get(shard, {}).pop(json.loads(data)["game_id"], None)
+            return event, data
+        if event == "stop_stream":
+            return event, data
+        # ping шардов не передаётся: у сводной ленты свой
+        return None
+
+
+def merge_shard_metrics(texts: List[str]) -> str:
+    """
+    Сводит выгрузки /metrics шардов в одну: у каждого образца появляется
+    метка shard, а HELP/TYPE семейства остаются один раз перед его образцами.
+    """
+    families: Dict[str, List[str]] = {}  # {семейство: строки HELP/TYPE и образцы}, в порядке появления
+    for shard, text in enumerate(texts):
+        family = ""
+        for line in text.splitlines():
+            if not line:
+                continue
+            if line.startswith("#"):
+                parts = line.split(" ", 3)
+                family = parts[2] if len(parts) > 2 else ""
+                lines = families.setdefault(family, [])
+                if line not in lines:
+                    lines.append(line)
+                continue
+            name, brace, rest = line.partition("{")
+            if brace:
+                labeled = f'{name}{{shard="{shard}",{rest}'
+            else:
+                name, _, value = line.partition(" ")
+                labeled = f'{name}{{shard="{shard}"}} {value}'
+            families.setdefault(family, []).append(labeled)
+    return "\n".join(line for lines in families.values() for line in lines) + "\n"
+
+
+async def parse_sse(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[str, str]]:
+    """Разбирает поток строк SSE на пары (событие, данные)."""
+    event, data = "message", []
+    async for line in lines:
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip(" "))
+
+
+class ShardRouter:
+    """HTTP-клиенты к шардам и правила маршрутизации"""
+
+    def __init__(
+        self,
+        clients: List[httpx.AsyncClient],
+        socket_paths: Optional[List[str]] = None,
+        public_urls: Optional[List[str]] = None,
+    ) -> None:
+        if not clients:
+            raise ValueError("Нужен хотя бы один шард")
+        if public_urls and len(public_urls) != len(clients):
+            raise ValueError("Внешний адрес нужен каждому шарду")
+        self.clients = clients
+        self.socket_paths = socket_paths or []
+        self.public_urls = public_urls or []  # ws://хост:порт шарда для прямых WebSocket
+        self.player_shards: Dict[str, int] = {}  # player_id -> шард, где игрок вошёл в игру
+        self._next_shard = itertools.cycle(range(len(clients)))
+
+    @classmethod
+    def over_unix_sockets(
+        cls, shard_count: int, socket_dir: str, public_urls: Optional[List[str]] = None
+    ) -> "ShardRouter":
+        paths = [socket_path(socket_dir, index) for index in range(shard_count)]
+        clients = [
+            httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(uds=path),
+                base_url=f"http://shard-{index}",
+                timeout=None,
+            )
+            for index, path in enumerate(paths)
+        ]
+        return cls(clients, paths, public_urls)
+
+    @property
+    def shard_count(self) -> int:
+        return len(self.clients)
+
+    def shard_for_game(self, game_id: str) -> int:
+        return shard_of(game_id, self.shard_count)
+
+    def any_shard(self) -> int:
+        """Шард для новой игры: по кругу."""
+        return next(self._next_shard)
+
+    async def close(self) -> None:
+        await asyncio.gather(*(client.aclose() for client in self.clients))
+
+    async def request(
+        self, shard: int, method: str, path: str, params=None, content: bytes = b"", headers=None
+    ) -> httpx.Response:
+        return await self.clients[shard].request(
+            method, path, params=params, content=content, headers=headers
+        )
+
+    async def forward(self, request: Request, shard: int, params=None) -> Response:
+        """Передаёт запрос клиента шарду и возвращает ответ шарда как есть."""
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in _HOP_HEADERS}
+        upstream = await self.request(
+            shard,
+            request.method,
+            request.url.path,
+            params=params if params is not None else request.query_params.multi_items(),
+            content=await request.body(),
+            headers=headers,
+        )
+        self._remember_player(request, shard, upstream)
+        return Response(
+            content=self._redirect_websocket(request, shard, upstream),
+            status_code=upstream.status_code,
+            media_type=upstream.headers.get("content-type"),
+        )
+
+    def _remember_player(self, request: Request, shard: int, upstream: httpx.Response) -> None:
+        player_id = request.query_params.get("player_id")
+        if not player_id or upstream.status_code != status.HTTP_200_OK:
+            return
+        if request.url.path.endswith("/join_game"):
+            self.player_shards[player_id] = shard
+        elif request.url.path.endswith("/exit_game"):
+            self.player_shards.pop(player_id, None)
+
+    def _redirect_websocket(self, request: Request, shard: int, upstream: httpx.Response) -> bytes:
+        """Тело ответа шарда; в websocket_connection — внешний адрес шарда, если он задан."""
+        if (
+            not self.public_urls
+            or upstream.status_code != status.HTTP_200_OK
+            or not request.url.path.endswith(("/join_game", "/player_game"))
+        ):
+            return upstream.content
+        body = upstream.json()
+        connection = urlsplit(body.get("websocket_connection") or "")
+        if not connection.path:
+            return upstream.content
+        public = urlsplit(self.public_urls[shard])
+        body["websocket_connection"] = urlunsplit(connection._replace(scheme=public.scheme, netloc=public.netloc))
+        return json.dumps(body).encode()
+
+    def forget_player(self, player_id: Optional[str], shard: int) -> None:
+        """Забывает шард игрока, если он не сменился: WebSocket игрока закрыт, и шард выводит его из игры."""
+        if player_id and self.player_shards.get(player_id) == shard:
+            del self.player_shards[player_id]
+
+    async def find_player_shard(self, player_id: str) -> Optional[int]:
+        """Шард, где сейчас играет игрок; None — ни в одном."""
+        shard = self.player_shards.get(player_id)
+        if shard is not None:
+            return shard
+        responses = await asyncio.gather(
+            *(
+                self.request(index, "GET", f"{API_PREFIX}/player_game", params={"player_id": player_id})
+                for index in range(self.shard_count)
+            )
+        )
+        for index, response in enumerate(responses):
+            if response.status_code == status.HTTP_200_OK:
+                self.player_shards[player_id] = index
+                return index
+        return None
+
+    async def lobby_games(self) -> List[dict]:
+        """Сводный список ожидающих игр всех шардов."""
+        responses = await asyncio.gather(
+            *(self.request(index, "GET", f"{API_PREFIX}/games") for index in range(self.shard_count))
+        )
+        games = []
+        for response in responses:
+            response.raise_for_status()
+            games.extend(response.json())
+        return games
+
+    async def quick_join_candidates(self, players_limit: Optional[int]) -> List[str]:
+        """
+        Ожидающие игры для быстрого подбора в порядке предпочтения: меньше
+        свободных мест — раньше (как GameManager.find_available_game).
+        """
+        games = [
+            game
+            for game in await self.lobby_games()
+            if game["players_inside"] < game["players_limit"]
+            and (players_limit is None or game["players_limit"] == players_limit)
+        ]
+        games.sort(key=lambda game: game["players_limit"] - game["players_inside"])
+        return [game["game_id"] for game in games]
+
+    async def shard_events(self, shard: int, params, queue: asyncio.Queue) -> None:
+        """Читает SSE-ленту лобби шарда в общую очередь."""
+        try:
+            async with self.clients[shard].stream(
+                "GET", f"{API_PREFIX}/games/stream", params=params
+            ) as response:
+                async for event, data in parse_sse(response.aiter_lines()):
+                    await queue.put((shard, event, data))
+        except httpx.HTTPError as e:
+            logger.error("Лента лобби шарда %s прервана: %s", shard, e)
+        finally:
+            await queue.put(None)
+
+
+def create_app(router: ShardRouter) -> FastAPI:
+    """Приложение-роутер поверх шардов."""
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        logger.info("Роутер запущен, шардов: %s", router.shard_count)
+        yield
+        await router.close()
+
+    app = FastAPI(title="Fool Game API (router)", version="1.0", lifespan=lifespan)
+    setup_middlewares(app)
+    app.state.shard_router = router
+
+    @app.post(f"{API_PREFIX}/auth_guest")
+    async def auth_guest(request: Request) -> Response:
+        # Авторизация гостя не зависит от игры — любой шард
+        return await router.forward(request, router.any_shard())
+
+    @app.get(f"{API_PREFIX}/wire/compact")
+    async def wire_compact(request: Request) -> Response:
+        # Таблицы кодов компактного формата одинаковы на всех шардах
+        return await router.forward(request, router.any_shard())
+
+    @app.post(f"{API_PREFIX}/create_game")
+    async def create_game(request: Request) -> Response:
+        return await router.forward(request, router.any_shard())
+
+    @app.post(f"{API_PREFIX}/join_game")
+    async def join_game(request: Request) -> Response:
+        game_id = request.query_params.get("game_id")
+        if game_id:
+            return await router.forward(request, router.shard_for_game(game_id))
+
+        limit = request.query_params.get("players_limit")
+        players_limit = int(limit) if limit and limit.isdigit() else None
+        for candidate in await router.quick_join_candidates(players_limit):
+            params = dict(request.query_params, game_id=candidate)
+            response = await router.forward(request, router.shard_for_game(candidate), params=params)
+            # Игру могли заполнить, пока шли запросы, — пробуем следующую
+            if response.status_code != status.HTTP_409_CONFLICT:
+                return response
+        # Подходящих игр нет — шард создаст новую
+        return await router.forward(request, router.any_shard())
+
+    @app.post(f"{API_PREFIX}/exit_game")
+    @app.get(f"{API_PREFIX}/player_game")
+    async def player_scoped(request: Request) -> Response:
+        player_id = request.query_params.get("player_id", "")
+        remembered = player_id in router.player_shards
+        shard = await router.find_player_shard(player_id)
+        if shard is not None:
+            response = await router.forward(request, shard)
+            if response.status_code != status.HTTP_404_NOT_FOUND or not remembered:
+                return response
+            # Запись устарела: игрок с прямым WebSocket вышел из игры мимо роутера
+            router.forget_player(player_id, shard)
+            shard = await router.find_player_shard(player_id)
+            if shard is not None:
+                return await router.forward(request, shard)
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"detail": f"Игрок с ID {player_id} не найден ни в одной игре."},
+        )
+
+    @app.get("/metrics")
+    async def metrics() -> Response:
+        responses = await asyncio.gather(
+            *(router.request(index, "GET", "/metrics") for index in range(router.shard_count))
+        )
+        return Response(
+            merge_shard_metrics([response.text for response in responses]),
+            media_type=responses[0].headers.get("content-type"),
+        )
+
+    @app.api_route(f"{API_PREFIX}/admin/{{path:path}}", methods=["GET", "POST"])
+    async def admin(request: Request, path: str) -> Response:
+        parts = path.split("/")
+        game_id = request.query_params.get("game_id")
+        if not game_id and len(parts) > 2 and parts[0] in ("games", "rooms"):
+            game_id = parts[1]
+        if game_id:
+            return await router.forward(request, router.shard_for_game(game_id))
+        shard = request.query_params.get("shard", "")
+        if not shard.isdigit() or int(shard) >= router.shard_count:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"detail": f"Укажите game_id или номер шарда shard (0..{router.shard_count - 1})"},
+            )
+        return await router.forward(request, int(shard))
+
+    @app.get(f"{API_PREFIX}/games")
+    async def games() -> List[dict]:
+        return await router.lobby_games()
+
+    @app.get(f"{API_PREFIX}/games/stream")
+    async def games_stream(request: Request):
+        async def event_generator():
+            queue: asyncio.Queue = asyncio.Queue()
+            readers = [
+                asyncio.create_task(router.shard_events(index, request.query_params.multi_items(), queue))
+                for index in range(router.shard_count)
+            ]
+            merge = LobbyMerge()
+            running = len(readers)
+            try:
+                while running:
+                    try:
+                        item: ShardEvent = await asyncio.wait_for(queue.get(), PING_INTERVAL)
+                    except asyncio.TimeoutError:
+                        yield {"event": "ping", "data": "keep-alive"}
+                        continue
+                    if item is None:
+                        running -= 1
+                        continue
+                    merged = merge.apply(*item)
+                    if merged is None:
+                        continue
+                    event, data = merged
+                    yield {"event": event, "data": data}
+                    if event == "stop_stream":
+                        break
+            except asyncio.CancelledError:
+                logger.info("Сводная лента лобби закрыта.")
+            finally:
+                for reader in readers:
+                    reader.cancel()
+
+        return EventSourceResponse(event_generator())
+
+    @app.websocket(f"{API_PREFIX}/ws/{{game_id}}")
+    async def websocket_proxy(websocket: WebSocket, game_id: str):
+        shard = router.shard_for_game(game_id)
+        player_id = websocket.query_params.get("player_id")
+        uri = f"ws://shard-{shard}{websocket.url.path}?{websocket.url.query}"
+        try:
+            # Подпротокол (формат сообщений, см. wire_format) согласует шард
+            upstream = await unix_connect(
+                router.socket_paths[shard], uri, subprotocols=websocket.scope.get("subprotocols") or None
+            )
+        except (OSError, InvalidHandshake) as e:
+            # Шард отказал (например, игрок не в этой игре) или недоступен
+            logger.warning("WebSocket игры %s не передан шарду %s: %s", game_id, shard, e)
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            router.forget_player(player_id, shard)
+            return
+
+        await websocket.accept(subprotocol=upstream.subprotocol)
+
+        async def client_to_shard() -> None:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                payload = message.get("text")
+                await upstream.send(payload if payload is not None else message.get("bytes"))
+
+        async def shard_to_client() -> None:
+            async for payload in upstream:
+                if isinstance(payload, str):
+                    await websocket.send_text(payload)
+                else:
+                    await websocket.send_bytes(payload)
+
+        to_shard, to_client = asyncio.create_task(client_to_shard()), asyncio.create_task(shard_to_client())
+        done, pending = await asyncio.wait((to_shard, to_client), return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, (ConnectionClosed, WebSocketDisconnect)):
+                logger.error("Ошибка передачи WebSocket игры %s: %s", game_id, error, exc_info=DEBUG)
+        await upstream.close()
+        if to_shard not in done:
+            # Соединение закрыл шард — закрываем клиента с тем же кодом
+            try:
+                await websocket.close(code=upstream.close_code or status.WS_1000_NORMAL_CLOSURE)
+            except (RuntimeError, WebSocketDisconnect):
+                pass
+        router.forget_player(player_id, shard)
+
+    return app
@@ -0,0 +1,53 @@
+"""
+Распределение игр по процессам-шардам.
+
+Игра принадлежит шарду shard_of(game_id): стабильный хэш id по модулю числа
+шардов. Шард создаёт игры только с id, которые попадают в него самого, поэтому
+роутеру (backend.api.shard_router) достаточно game_id, чтобы найти владельца,
+а общий реестр игр не нужен.
+"""
+import hashlib
+import os
+from typing import Optional
+from uuid import uuid4
+
+
+def shard_of(game_id: str, shard_count: int) -> int:
+    """Номер шарда, которому принадлежит игра."""
+    if shard_count <= 1:
+        return 0
+    digest = hashlib.blake2b(game_id.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % shard_count
+
+
+def socket_path(socket_dir: str, index: int) -> str:
+    """Unix-сокет, на котором слушает шард index."""
+    return os.path.join(socket_dir, f"shard-{index}.sock")
+
+
+class ShardMap:
+    """Шард текущего процесса: какие игры ему принадлежат и как выдавать им id"""
+
+    def __init__(self, shard_count: int = 1, shard_index: int = 0) -> None:
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise ValueError(f"Неверный номер шарда {shard_index} при числе шардов {shard_count}")
+        self.shard_count = shard_count
+        self.shard_index = shard_index
+
+    def owns(self, game_id: str) -> bool:
+        """Принадлежит ли игра этому шарду."""
+        return shard_of(game_id, self.shard_count) == self.shard_index
+
+    def new_game_id(self) -> str:
+        """Новый id игры, попадающий в этот шард (в среднем shard_count попыток)."""
+        while True:
+            game_id = str(uuid4())
+            if self.owns(game_id):
+                return game_id
+
+
+def shard_map_from_settings(shard_count: int, shard_index: int) -> Optional[ShardMap]:
+    """ShardMap для шардированного запуска; None, если процесс единственный."""
+    if shard_count <= 1:
+        return None
+    return ShardMap(shard_count, shard_index)
@@ -0,0 +1,181 @@
+"""
+Форматы сообщений WebSocket.
+
+JSON — формат по умолчанию (текстовые кадры, как раньше). Компактный формат
+выбирается при подключении: параметром ?wire=compact или подпротоколом
+fool.compact.v1. В нём кадры двоичные (msgpack), карта — один индекс 0..35
+(позиция_масти * 9 + позиция_ранга, см. backend.app.models.card), а поля-enum —
+небольшие числа. Таблицы кодов отдаёт compact_schema() (GET /api/v1/wire/compact).
+
+Оба формата кодируются msgspec без проверки схемы: сообщения собирает сам сервер
+из готовых словарей (см. StateSyncManager).
+"""
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import msgspec
+
+from backend.api.models.websocket_models import MessageType
+from backend.app.contracts.game_contract import PlayerAction
+from backend.app.models.card import CARDS, RANKS, SUITS
+from backend.app.models.player import PlayerStatus
+from backend.app.states.registry import StateName
+
+Frame = Union[str, bytes]
+
+# Поле -> {значение в JSON: код}; в списках (allowed_actions) кодируется каждый элемент
+_ENUM_CODES: Dict[str, Dict[Any, int]] = {
+    "type": {member.value: i for i, member in enumerate(MessageType)},
+    "current_state": {member.value: i for i, member in enumerate(StateName)},
+    "trump_suit": {suit.value: i for i, suit in enumerate(SUITS)},
+    "trump_rank": {str(rank.value): rank.value for rank in RANKS},
+    "status": {str(status.value): status.value for status in PlayerStatus},
+    "allowed_actions": {action.name: action.value for action in PlayerAction},
+}
+_CARD_CODES: Dict[Tuple[str, str], int] = {(str(card.rank.value), card.suit.value): card.index for card in CARDS}
+_CARD_DICTS: Tuple[Dict[str, str], ...] = tuple(card.to_dict() for card in CARDS)
+# Входящие поля, в которых клиент присылает карту индексом
+_INCOMING_CARD_FIELDS = frozenset(("attack_card", "defend_card", "card"))
+_MESSAGE_TYPES: Tuple[str, ...] = tuple(member.value for member in MessageType)
+
+
+def _compact(message: dict) -> Any:
+    """Заменяет карты индексами и значения enum-полей кодами."""
+    if len(message) == 2 and "rank" in message and "suit" in message:
+        code = _CARD_CODES.get((str(message["rank"]), str(message["suit"])))
+        if code is not None:
+            return code
+    result = {}
+    for name, item in message.items():
+        kind = type(item)
+        if kind is dict:
+            item = _compact(item)
+        elif kind is list:
+            item = _compact_list(item, name)
+        else:
+            codes = _ENUM_CODES.get(name)
+            if codes is not None:
+                item = codes.get(getattr(item, "value", item), item)
+        result[name] = item
+    return result
+
+
+def _compact_list(items: list, name: str) -> list:
+    codes = _ENUM_CODES.get(name)
+    if codes is not None:
+        return [codes.get(item, item) for item in items]
+    return [
+        _compact(item) if type(item) is dict else _compact_list(item, name) if type(item) is list else item
+        for item in items
+    ]
+
+
+def _expand(value: Any, key: Optional[str] = None) -> Any:
+    """Обратное преобразование для входящих сообщений: индексы карт и код типа."""
+    if isinstance(value, dict):
+        return {name: _expand(item, name) for name, item in value.items()}
+    if isinstance(value, int) and not isinstance(value, bool):
+        if key in _INCOMING_CARD_FIELDS and 0 <= value < len(_CARD_DICTS):
+            return dict(_CARD_DICTS[value])
+        if key == "type" and 0 <= value < len(_MESSAGE_TYPES):
+            return _MESSAGE_TYPES[value]
+    return value
+
+
+class WireFormat:
+    """Кодирование сообщений одного соединения"""
+
+    name = ""
+    subprotocol = ""
+    binary = False
+
+    def encode(self, message: dict) -> Frame:
+        raise NotImplementedError
+
+    def decode(self, frame: Frame) -> dict:
+        raise NotImplementedError
+
+
+class JsonWireFormat(WireFormat):
+    """Текстовые кадры JSON — формат, на который рассчитан фронтенд"""
+
+    name = "json"
+    subprotocol = "fool.json"
+
+    def __init__(self) -> None:
+        # Тот же текст, что у json.dumps(separators=(",", ":"), ensure_ascii=False)
+        # в WebSocket.send_json, но в несколько раз быстрее
+        self._encoder = msgspec.json.Encoder()
+
+    def encode(self, message: dict) -> str:
+        # Текстовому кадру нужна строка
+        return self._encoder.encode(message).decode()
+
+    def decode(self, frame: Frame) -> dict:
+        return json.loads(frame)
+
+
+class CompactWireFormat(WireFormat):
+    """Двоичные кадры msgpack с картами-индексами и enum-кодами"""
+
+    name = "compact"
+    subprotocol = "fool.compact.v1"
+    binary = True
+
+    def __init__(self) -> None:
+        self._encoder = msgspec.msgpack.Encoder()
+        self._decoder = msgspec.msgpack.Decoder()
+
+    def encode(self, message: dict) -> bytes:
+        return self._encoder.encode(_compact(message))
+
+    def decode(self, frame: Frame) -> dict:
+        # Текстовый кадр в компактном режиме — обычный JSON (удобно для отладки)
+        message = json.loads(frame) if isinstance(frame, str) else self._decoder.decode(frame)
+        return _expand(message)
+
+
+JSON_WIRE = JsonWireFormat()
+COMPACT_WIRE = CompactWireFormat()
+WIRE_FORMATS: Dict[str, WireFormat] = {wire.name: wire for wire in (JSON_WIRE, COMPACT_WIRE)}
+_BY_SUBPROTOCOL: Dict[str, WireFormat] = {wire.subprotocol: wire for wire in WIRE_FORMATS.values()}
+
+
+def negotiate(requested: Optional[str], subprotocols: Sequence[str]) -> Tuple[WireFormat, Optional[str]]:
+    """
+    Выбирает формат соединения.
+
+    Args:
+        requested: Значение параметра ?wire= (имеет приоритет).
+        subprotocols: Подпротоколы из заголовка Sec-WebSocket-Protocol по порядку предпочтения.
+
+    Returns:
+        Tuple[WireFormat, Optional[str]]: Формат и подпротокол для ответа на
+        рукопожатие (None, если клиент известных подпротоколов не предлагал).
+
+    Raises:
+        ValueError: Неизвестный формат в ?wire=.
+    """
+    offered = next((_BY_SUBPROTOCOL[name] for name in subprotocols if name in _BY_SUBPROTOCOL), None)
+    if requested:
+        wire = WIRE_FORMATS.get(requested)
+        if wire is None:
+            raise ValueError(f"Неизвестный формат сообщений: {requested!r}")
+        return wire, wire.subprotocol if wire.subprotocol in subprotocols else None
+    if offered is not None:
+        return offered, offered.subprotocol
+    return JSON_WIRE, None
+
+
+def compact_schema() -> Dict[str, List[Any]]:
+    """Таблицы кодов компактного формата: индекс в списке — код."""
+    return {
+        "cards": list(_CARD_DICTS),
+        "type": list(_MESSAGE_TYPES),
+        "current_state": [member.value for member in StateName],
+        "trump_suit": [suit.value for suit in SUITS],
+        # Коды рангов, статусов и действий — их числовые значения
+        "trump_rank": [rank.value for rank in RANKS],
+        "status": [[status.name, status.value] for status in PlayerStatus],
+        "allowed_actions": [[action.name, action.value] for action in PlayerAction],
+    }
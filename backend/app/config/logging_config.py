@@ -1,7 +1,148 @@
+import json
 import logging
+import queue
 import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, TextIO, Tuple
 
-from backend.app.config.settings import DEBUG
+from backend.app.config.settings import DEBUG, LOG_FORMAT, LOG_RATE_LIMIT
+
+# Сколько записей ждут вывода; при переполнении новые записи отбрасываются, а не тормозят цикл событий
+LOG_QUEUE_SIZE = 10000
+# Поля контекста, которые передаются через extra= и попадают в JSON-запись
+CONTEXT_FIELDS = ("event", "game_id", "player_id", "suppressed")
+
+TEXT_FORMAT = (
+    "%(asctime)s - [%(levelname)s] - %(name)s - "
+    "(%(filename)s).%(funcName)s(%(lineno)d): %(message)s"
+)
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна JSON-строка на запись: время, уровень, логгер, сообщение и поля контекста"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in CONTEXT_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                data[name] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Ограничение частых событий.
+
+    Записи с extra={"event": ...} пропускаются не чаще rate в секунду на событие
+    (с запасом burst записей). Отброшенные считаются, и следующая пропущенная
+    запись того же события несёт их число в поле suppressed. Записи без event
+    и записи уровня WARNING и выше не ограничиваются.
+
+    Args:
+        rate: Записей в секунду на событие; 0 — без ограничения.
+        burst: Запас записей; по умолчанию равен rate.
+        rates: Свои ограничения для отдельных событий {event: rate}.
+        clock: Источник монотонного времени.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        rates: Optional[Dict[str, float]] = None,
+        clock=time.monotonic,
+    ) -> None:
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.rates = rates or {}
+        self.clock = clock
+        self._buckets: Dict[str, List[float]] = {}  # {event: [запас, время пополнения, отброшено]}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, "event", None)
+        if event is None or record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(event, self.rate)
+        if rate <= 0:
+            return True
+        burst = self.burst if self.burst is not None else max(rate, 1.0)
+        now = self.clock()
+        bucket = self._buckets.get(event)
+        if bucket is None:
+            bucket = self._buckets[event] = [burst, now, 0]
+        else:
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        if bucket[0] < 1:
+            bucket[2] += 1
+            return False
+        bucket[0] -= 1
+        if bucket[2]:
+            record.suppressed = int(bucket[2])
+            bucket[2] = 0
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler, который никогда не ждёт: при полной очереди запись отбрасывается.
+
+    В вызывающем потоке только подставляются аргументы сообщения (пока объекты
+    в них не изменились); форматирование, трейсбек и запись в поток — в потоке
+    QueueListener.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def make_formatter(log_format: str = LOG_FORMAT) -> logging.Formatter:
+    """Форматтер по имени формата: "json" или "text"."""
+    return JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT)
+
+
+def make_queue_logging(
+    stream: TextIO,
+    log_format: str = LOG_FORMAT,
+    rate_limit: float = LOG_RATE_LIMIT,
+    queue_size: int = LOG_QUEUE_SIZE,
+) -> Tuple[NonBlockingQueueHandler, QueueListener]:
+    """
+    Собирает конвейер: обработчик-очередь для логгеров и слушатель, пишущий в stream.
+
+    Слушатель нужно запустить (start) и остановить (stop) — при остановке
+    очередь дописывается до конца.
+    """
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(make_formatter(log_format))
+    queue_handler = NonBlockingQueueHandler(queue.Queue(queue_size))
+    if rate_limit > 0:
+        queue_handler.addFilter(RateLimitFilter(rate_limit))
+    return queue_handler, QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
 
 
 def setup_logging():
@@ -9,29 +150,34 @@ def setup_logging():
     Настраивает централизованное логирование для всего приложения.
 
     - Устанавливает уровень INFO для продакшена и DEBUG для разработки.
-    - Использует единый формат для всех логов.
-    - Выводит логи в sys.stdout.
+    - Формат — текст или JSON-строки с game_id/player_id (LOG_FORMAT).
+    - Частые события ограничиваются по числу в секунду (LOG_RATE_LIMIT).
+    - Логгеры только кладут записи в очередь; в sys.stdout пишет отдельный
+      поток QueueListener, поэтому вывод не блокирует цикл событий.
     """
+    global _listener
     log_level = logging.DEBUG if DEBUG else logging.INFO
-    log_format = (
-        "%(asctime)s - [%(levelname)s] - %(name)s - "
-        "(%(filename)s).%(funcName)s(%(lineno)d): %(message)s"
-    )
 
     # Получаем корневой логгер
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
 
     # Удаляем все существующие обработчики, чтобы избежать дублирования
+    shutdown_logging()
     if root_logger.hasHandlers():
         root_logger.handlers.clear()
 
-    # Создаем и настраиваем обработчик для вывода в консоль
-    stream_handler = logging.StreamHandler(sys.stdout)
-    stream_handler.setLevel(log_level)
-    formatter = logging.Formatter(log_format)
-    stream_handler.setFormatter(formatter)
+    queue_handler, _listener = make_queue_logging(sys.stdout)
+    queue_handler.setLevel(log_level)
+    root_logger.addHandler(queue_handler)
+    _listener.start()
+
+    logging.info("Система логирования успешно настроена.")
 
-    root_logger.addHandler(stream_handler)
 
-    logging.info("Система логирования успешно настроена.") 
\ No newline at end of file
+def shutdown_logging() -> None:
+    """Дописывает очередь логов и останавливает поток вывода."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
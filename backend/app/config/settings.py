@@ -4,6 +4,52 @@ import os
 # Defaults to False (production mode) if ENV is not set.
 DEBUG = os.environ.get('ENV') == 'dev'
 
+# Log output: "text" (human-readable lines) or "json" (one JSON object per line with
+# game_id/player_id/event fields). Records are written to stdout by a background thread.
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')
+# Max records per second for each high-frequency event (records logged with extra={"event": ...});
+# the excess is dropped and counted in the next record's "suppressed" field. 0 disables the limit.
+LOG_RATE_LIMIT = float(os.environ.get('LOG_RATE_LIMIT', '20'))
+
+# Snapshot store for running games: "sqlite:///path/to/file.db" or "file:///path/to/dir".
+# Games are checkpointed after every move and restored on startup. Disabled if not set.
+SNAPSHOT_STORE = os.environ.get('SNAPSHOT_STORE')
+
+# Shared game store for GameManager: "redis://host:port/db" (Redis or backend/app/storage/kv_server.py).
+# Games and the player index then survive restarts and are visible to every API node. In-process if not set.
+GAME_STORE = os.environ.get('GAME_STORE')
+
+# Number of pre-shuffled decks kept ready for new games (seeded from the system RNG).
+# 0 disables the pool; decks are then shuffled on demand.
+DECK_POOL_SIZE = int(os.environ.get('DECK_POOL_SIZE', '256'))
+
+# Idle-game reaper: sweep period and TTLs in seconds without changes (0 disables a rule).
+GAME_REAPER_INTERVAL = float(os.environ.get('GAME_REAPER_INTERVAL', '30'))
+EMPTY_LOBBY_TTL = float(os.environ.get('EMPTY_LOBBY_TTL', '300'))
+ABANDONED_GAME_TTL = float(os.environ.get('ABANDONED_GAME_TTL', '1800'))
+FINISHED_GAME_TTL = float(os.environ.get('FINISHED_GAME_TTL', '600'))
+# Memory budget for games held in memory, MB (estimated by snapshot size). Above it the least
+# recently changed running games are evicted to the snapshot store. 0 disables eviction.
+GAME_MEMORY_BUDGET_MB = float(os.environ.get('GAME_MEMORY_BUDGET_MB', '0'))
+
+# Turn deadline, seconds: when it expires the defender collects the cards and the attacker
+# passes (or plays the lowest card if the table is empty). 0 (default) disables turn timeouts.
+TURN_TIMEOUT = float(os.environ.get('TURN_TIMEOUT', '0'))
+# Seconds a full lobby waits for everyone to get ready; then players who are not ready
+# are removed from the room. 0 (default) disables the timeout.
+LOBBY_READY_TIMEOUT = float(os.environ.get('LOBBY_READY_TIMEOUT', '0'))
+
+# Token for the admin endpoints (/api/v1/admin/..., sent in the X-Admin-Token header):
+# call timings and on-demand cProfile of the server. The endpoints are disabled if not set.
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# Sharded deployment (see backend/api/cluster.py): games are split between SHARD_COUNT
+# worker processes by a hash of game_id; each worker gets its SHARD_INDEX.
+SHARD_COUNT = int(os.environ.get('SHARD_COUNT', '1'))
+SHARD_INDEX = int(os.environ.get('SHARD_INDEX', '0'))
+# Directory with the shards' Unix sockets (shard-<index>.sock)
+SHARD_SOCKET_DIR = os.environ.get('SHARD_SOCKET_DIR', '/tmp/fool-shards')
+
 # You can add other global settings here in the future.
 # For example:
 # SECRET_KEY = os.environ.get('SECRET_KEY', 'a_default_secret_key') 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import List, Optional, Dict, Any, Union
 
@@ -71,6 +71,15 @@ class StateTransition:
     new_state: str
     exit_info: Dict[str, Any]
     enter_info: Dict[str, Any]
+    # Цепочка одиночных переходов, если ход прошёл через переходные состояния
+    steps: List["StateTransition"] = field(default_factory=list)
+
+    @property
+    def path(self) -> List[str]:
+        """Состояния, через которые прошла игра: [previous_state, ..., new_state]"""
+        if not self.steps:
+            return [self.previous_state, self.new_state]
+        return [self.steps[0].previous_state] + [step.new_state for step in self.steps]
 
     def __str__(self):
         return (
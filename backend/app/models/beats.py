@@ -0,0 +1,47 @@
+"""
+Матрица "бьёт" для всех 36 карт при каждой козырной масти.
+
+BEATS[позиция_козыря][индекс_атакующей] — 36-битная строка матрицы: маска карт,
+которыми можно покрыть атакующую карту. Вместе четыре среза дают таблицу
+4×36×36 битов, поэтому любая проверка защиты — сдвиг и битовое И.
+"""
+from typing import Dict, Optional, Tuple
+
+from backend.app.models.card import DECK_SIZE, SUIT_POSITION, SUITS, Card, Suit
+from backend.app.models.card_set import HIGHER_IN_SUIT, beating_mask
+
+BEATS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(beating_mask(index, trump_suit) for index in range(DECK_SIZE))
+    for trump_suit in SUITS
+)
+
+_BEATS_BY_TRUMP: Dict[Optional[Suit], Tuple[int, ...]] = {
+    suit: BEATS[SUIT_POSITION[suit]] for suit in SUITS
+}
+# Без козыря карту бьют только старшие карты той же масти
+_BEATS_BY_TRUMP[None] = HIGHER_IN_SUIT
+
+
+def beats(attack_card: Card, defend_card: Card, trump_suit: Optional[Suit]) -> bool:
+    """
+    Проверяет, можно ли покрыть атакующую карту защищающейся.
+
+    Args:
+        attack_card: Карта на столе.
+        defend_card: Карта, которой защищаются.
+        trump_suit: Козырная масть партии.
+
+    Returns:
+        bool: True, если защищающаяся карта бьёт атакующую.
+    """
+    return bool((_BEATS_BY_TRUMP[trump_suit][attack_card.index] >> defend_card.index) & 1)
+
+
+def beaters_mask(attack_card: Card, trump_suit: Optional[Suit]) -> int:
+    """Возвращает маску всех карт, которыми можно покрыть атакующую карту."""
+    return _BEATS_BY_TRUMP[trump_suit][attack_card.index]
+
+
+def defense_options(hand_mask: int, attack_card: Card, trump_suit: Optional[Suit]) -> int:
+    """Возвращает маску карт руки, которыми можно покрыть атакующую карту."""
+    return hand_mask & _BEATS_BY_TRUMP[trump_suit][attack_card.index]
@@ -1,5 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from typing import Dict, Optional, Tuple
 from typing_extensions import Self
 
 
@@ -22,25 +23,47 @@ class Rank(Enum):
     ACE = 14
 
 
+# Порядок мастей и рангов задаёт индекс карты: index = позиция_масти * 9 + позиция_ранга.
+# Карты одной масти занимают 9 соседних битов, младший бит — шестёрка.
+SUITS: Tuple[Suit, ...] = tuple(Suit)
+RANKS: Tuple[Rank, ...] = tuple(Rank)
+RANKS_COUNT = len(RANKS)
+DECK_SIZE = len(SUITS) * RANKS_COUNT
+
+SUIT_POSITION: Dict[Suit, int] = {suit: i for i, suit in enumerate(SUITS)}
+RANK_POSITION: Dict[Rank, int] = {rank: i for i, rank in enumerate(RANKS)}
+
+
 @dataclass(frozen=True)
 class Card:
     rank: Rank
     suit: Suit
+    index: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "index",
+            SUIT_POSITION[self.suit] * RANKS_COUNT + RANK_POSITION[self.rank],
+        )
 
     def __gt__(self, another: Self) -> bool:
         if self.suit != another.suit:
             return False
-        return self.rank.value > another.rank.value
+        return self.index > another.index
 
     def __lt__(self, another: Self) -> bool:
         if self.suit != another.suit:
             return False
-        return self.rank.value < another.rank.value
+        return self.index < another.index
 
     def __eq__(self, another: object) -> bool:
         if not isinstance(another, Card):
             return NotImplemented
-        return (another.rank == self.rank) and (another.suit == self.suit)
+        return another.index == self.index
+
+    def __hash__(self) -> int:
+        return self.index
 
     def __str__(self) -> str:
         return f"{self.rank.name} of {self.suit.name}"
@@ -51,59 +74,86 @@ class Card:
 
     @staticmethod
     def from_dict(data: dict, trump_suit=None) -> 'Card':
-        rank = data['rank']
-        suit = data['suit']
-        # Преобразуем rank
-        if isinstance(rank, str):
-            if rank.isdigit():
-                rank = Rank(int(rank))
-            else:
-                rank = Rank[rank]  # 'SIX' -> Rank.SIX
-        else:
-            rank = Rank(rank)
-        # Преобразуем suit
-        if isinstance(suit, str):
-            if len(suit) == 1:
-                suit = Suit(suit)
-            else:
-                suit = Suit[suit]  # 'SPADES' -> Suit.SPADES
-        else:
-            suit = Suit(suit)
-        # Если это козырная масть — создаём TrumpCard
-        if trump_suit is not None and suit == trump_suit:
-            return TrumpCard(rank=rank, suit=suit)
-        return Card(rank=rank, suit=suit)
-
-    def __hash__(self):
-        return hash((self.rank, self.suit))
+        """
+        Возвращает интернированную карту по словарю вида {"rank": "14", "suit": "S"}.
+
+        Ранг принимается числом, строкой с числом или именем ('SIX'),
+        масть — буквой ('S') или именем ('SPADES').
+        """
+        rank_position = _RANK_LOOKUP.get(data['rank'])
+        if rank_position is None:
+            raise ValueError(f"Неизвестный ранг карты: {data['rank']!r}")
+        suit_position = _SUIT_LOOKUP.get(data['suit'])
+        if suit_position is None:
+            raise ValueError(f"Неизвестная масть карты: {data['suit']!r}")
+        return card_by_index(suit_position * RANKS_COUNT + rank_position, trump_suit)
 
 
 @dataclass(frozen=True)
 class TrumpCard(Card):
+    __eq__ = Card.__eq__
+    __hash__ = Card.__hash__
+
     def __gt__(self, another: Card) -> bool:
         if self.suit == another.suit:
-            return self.rank.value > another.rank.value
+            return self.index > another.index
         if isinstance(another, TrumpCard):
             return False
         return True
 
     def __ge__(self, another: Card) -> bool:
         if self.suit == another.suit:
-            return self.rank.value >= another.rank.value
+            return self.index >= another.index
         if isinstance(another, TrumpCard):
             return False
         return True
 
     def __lt__(self, another: Card) -> bool:
         if self.suit == another.suit:
-            return self.rank.value < another.rank.value
+            return self.index < another.index
         if isinstance(another, TrumpCard):
             return True
         return False
 
     def __le__(self, another: Card) -> bool:
         if self.suit == another.suit:
-            return self.rank.value <= another.rank.value
+            return self.index <= another.index
         if isinstance(another, TrumpCard):
             return True
         return False
+
+
+# Таблицы-приспособленцы (flyweight): по одному объекту на каждую из 36 карт.
+# Для каждой козырной масти своя таблица, в которой карты этой масти — TrumpCard.
+CARDS: Tuple[Card, ...] = tuple(
+    Card(RANKS[i % RANKS_COUNT], SUITS[i // RANKS_COUNT]) for i in range(DECK_SIZE)
+)
+_CARDS_BY_TRUMP: Dict[Optional[Suit], Tuple[Card, ...]] = {None: CARDS}
+for _trump in SUITS:
+    _CARDS_BY_TRUMP[_trump] = tuple(
+        TrumpCard(card.rank, card.suit) if card.suit == _trump else card
+        for card in CARDS
+    )
+
+_RANK_LOOKUP: Dict[object, int] = {}
+for _rank, _position in RANK_POSITION.items():
+    _RANK_LOOKUP.update(
+        {_rank: _position, _rank.value: _position, str(_rank.value): _position, _rank.name: _position}
+    )
+_SUIT_LOOKUP: Dict[object, int] = {}
+for _suit, _position in SUIT_POSITION.items():
+    _SUIT_LOOKUP.update({_suit: _position, _suit.value: _position, _suit.name: _position})
+
+
+def card_by_index(index: int, trump_suit: Optional[Suit] = None) -> Card:
+    """
+    Возвращает интернированный объект карты по её индексу (0..35).
+
+    Args:
+        index: Индекс карты.
+        trump_suit: Козырная масть; карты этой масти возвращаются как TrumpCard.
+
+    Returns:
+        Card: Общий для всего процесса объект карты.
+    """
+    return _CARDS_BY_TRUMP[trump_suit][index]
@@ -0,0 +1,169 @@
+from collections.abc import MutableSet
+from typing import Iterable, Iterator, Optional, Tuple
+
+from backend.app.models.card import (
+    CARDS,
+    DECK_SIZE,
+    RANKS_COUNT,
+    SUIT_POSITION,
+    SUITS,
+    Card,
+    Suit,
+    TrumpCard,
+    card_by_index,
+)
+
+# Маски колоды: бит i соответствует карте с индексом i (см. backend.app.models.card).
+FULL_DECK_MASK = (1 << DECK_SIZE) - 1
+_SUIT_BLOCK = (1 << RANKS_COUNT) - 1
+_RANK_SPREAD = sum(1 << (RANKS_COUNT * i) for i in range(len(SUITS)))
+
+SUIT_MASKS: Tuple[int, ...] = tuple(
+    _SUIT_BLOCK << (RANKS_COUNT * i) for i in range(len(SUITS))
+)
+RANK_MASKS: Tuple[int, ...] = tuple(_RANK_SPREAD << i for i in range(RANKS_COUNT))
+# Бит ранга карты в 9-битном множестве рангов
+RANK_BITS: Tuple[int, ...] = tuple(1 << (i % RANKS_COUNT) for i in range(DECK_SIZE))
+# Карты той же масти, что старше данной
+HIGHER_IN_SUIT: Tuple[int, ...] = tuple(
+    SUIT_MASKS[i // RANKS_COUNT] & ~((2 << i) - 1) for i in range(DECK_SIZE)
+)
+# Козырный вариант каждой карты (TrumpCard своей масти)
+_TRUMP_CARDS: Tuple[Card, ...] = tuple(
+    card_by_index(i, SUITS[i // RANKS_COUNT]) for i in range(DECK_SIZE)
+)
+
+
+def iter_indices(mask: int) -> Iterator[int]:
+    """Перебирает индексы установленных битов маски по возрастанию."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def ranks_of(mask: int) -> int:
+    """Сворачивает маску карт в 9-битное множество рангов."""
+    mask |= mask >> (RANKS_COUNT * 2)
+    mask |= mask >> RANKS_COUNT
+    return mask & _SUIT_BLOCK
+
+
+def cards_of_ranks(ranks: int) -> int:
+    """Разворачивает 9-битное множество рангов в маску всех карт этих рангов."""
+    return ranks * _RANK_SPREAD
+
+
+def beating_mask(card_index: int, trump_suit: Optional[Suit]) -> int:
+    """
+    Возвращает маску карт, которыми можно побить карту с данным индексом.
+
+    Args:
+        card_index: Индекс атакующей карты.
+        trump_suit: Козырная масть или None, если козыря нет.
+
+    Returns:
+        int: Старшие карты той же масти плюс все козыри, если атакующая карта не козырь.
+    """
+    mask = HIGHER_IN_SUIT[card_index]
+    if trump_suit is not None:
+        trump_mask = SUIT_MASKS[SUIT_POSITION[trump_suit]]
+        if not (trump_mask >> card_index) & 1:
+            mask |= trump_mask
+    return mask
+
+
+class CardSet(MutableSet):
+    """
+    Множество карт в виде 36-битной маски.
+
+    Проверка принадлежности, добавление и удаление — битовые операции над int,
+    при переборе возвращаются интернированные объекты карт. Отдельная маска
+    помнит, какие карты были добавлены как козырные (TrumpCard).
+    """
+
+    __slots__ = ("_mask", "_trumps")
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        self._mask = 0
+        self._trumps = 0
+        for card in cards:
+            self.add(card)
+
+    @classmethod
+    def from_mask(cls, mask: int, trump_suit: Optional[Suit] = None) -> "CardSet":
+        """Создаёт множество по маске; карты козырной масти помечаются козырями."""
+        card_set = cls()
+        card_set._mask = mask & FULL_DECK_MASK
+        if trump_suit is not None:
+            card_set._trumps = card_set._mask & SUIT_MASKS[SUIT_POSITION[trump_suit]]
+        return card_set
+
+    @property
+    def mask(self) -> int:
+        """Битовая маска карт множества."""
+        return self._mask
+
+    @property
+    def ranks_mask(self) -> int:
+        """9-битное множество рангов карт множества."""
+        return ranks_of(self._mask)
+
+    def __contains__(self, card: object) -> bool:
+        index = getattr(card, "index", None)
+        if index.__class__ is not int:
+            return False
+        return bool((self._mask >> index) & 1)
+
+    def __iter__(self) -> Iterator[Card]:
+        trumps = self._trumps
+        for index in iter_indices(self._mask):
+            yield _TRUMP_CARDS[index] if (trumps >> index) & 1 else CARDS[index]
+
+    def __len__(self) -> int:
+        return self._mask.bit_count()
+
+    def __bool__(self) -> bool:
+        return self._mask != 0
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CardSet):
+            return self._mask == other._mask
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        return f"CardSet({', '.join(str(card) for card in self)})"
+
+    @classmethod
+    def _from_iterable(cls, cards: Iterable[Card]) -> "CardSet":
+        return cls(cards)
+
+    def add(self, card: Card) -> None:
+        bit = 1 << card.index
+        self._mask |= bit
+        if isinstance(card, TrumpCard):
+            self._trumps |= bit
+
+    def discard(self, card: Card) -> None:
+        clear = ~(1 << card.index)
+        self._mask &= clear
+        self._trumps &= clear
+
+    def remove(self, card: Card) -> None:
+        if card not in self:
+            raise KeyError(card)
+        self.discard(card)
+
+    def clear(self) -> None:
+        self._mask = 0
+        self._trumps = 0
+
+    def copy(self) -> "CardSet":
+        card_set = CardSet()
+        card_set._mask = self._mask
+        card_set._trumps = self._trumps
+        return card_set
+
+    def can_beat(self, card: Card, trump_suit: Optional[Suit]) -> bool:
+        """Проверяет, есть ли в множестве карта, которой можно побить данную."""
+        return bool(self._mask & beating_mask(card.index, trump_suit))
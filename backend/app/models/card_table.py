@@ -1,123 +1,192 @@
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Set
 
-from backend.app.models.card import Card, TrumpCard, Rank
+from backend.app.models.beats import beats
+from backend.app.models.card import RANKS, RANKS_COUNT, Card, TrumpCard, Rank, Suit
+from backend.app.models.card_set import RANK_BITS, iter_indices
 from backend.app.utils.errors import (
     InvalidDefenseError,
     WeakDefenseError,
     CardNotOnTableError,
     InvalidThrowError,
     CardAlreadyOnTableError,
+    CardAlreadyCoveredError,
     NoFreeSlotsError,
 )
 
+
+class TableSlot:
+    """Место на столе: атакующая карта и карта, которой её покрыли"""
+
+    __slots__ = ("attack_card", "defend_card")
+
+    def __init__(self, attack_card: Card, defend_card: Optional[Card] = None) -> None:
+        self.attack_card: Card = attack_card
+        self.defend_card: Optional[Card] = defend_card
+
+    def to_dict(self) -> dict:
+        """Возвращает словарь, пригодный для JSON-сериализации."""
+        return {
+            "attack_card": self.attack_card.to_dict(),
+            "defend_card": self.defend_card.to_dict() if self.defend_card else None,
+        }
+
+    def __repr__(self) -> str:
+        return f"TableSlot({self.attack_card} / {self.defend_card})"
+
+
 class CardTable:
-    def __init__(self) -> None:
+    """
+    Игровой стол.
+
+    Вместе со списком мест стол ведёт индексы, которые обновляются на каждом
+    throw_card/cover_card/clear_table: маски карт, счётчики рангов, число
+    непокрытых атак и словарь "индекс карты -> номер места". Поэтому проверки
+    хода и запросы состояния не перебирают стол.
+    """
+
+    def __init__(self, trump_suit: Optional[Suit] = None) -> None:
         self.slots = 5
-        self.table_cards: List[Dict] = [] #TODO: make table_cards only getter without setter
+        self.trump_suit: Optional[Suit] = trump_suit
+        self._table: List[TableSlot] = []
+        self._reset_index()
+
+    def _reset_index(self) -> None:
+        self._card_slots: Dict[int, int] = {}  # индекс карты -> номер места
+        self._rank_counts: List[int] = [0] * RANKS_COUNT
+        self._ranks_mask = 0
+        self._attack_mask = 0
+        self._defend_mask = 0
+        self._uncovered = 0
+
+    def _index_card(self, card: Card, slot_idx: int) -> None:
+        self._card_slots[card.index] = slot_idx
+        rank_position = card.index % RANKS_COUNT
+        self._rank_counts[rank_position] += 1
+        self._ranks_mask |= RANK_BITS[card.index]
+
+    @property
+    def table_cards(self) -> List[TableSlot]:
+        """Места на столе в порядке хода (только для чтения)"""
+        return self._table
+
+    @property
+    def cards_mask(self) -> int:
+        """Битовая маска всех карт на столе"""
+        return self._attack_mask | self._defend_mask
+
+    @property
+    def ranks_mask(self) -> int:
+        """9-битное множество рангов карт на столе"""
+        return self._ranks_mask
+
+    @property
+    def attack_count(self) -> int:
+        """Количество атакующих карт на столе"""
+        return len(self._table)
+
+    @property
+    def uncovered_count(self) -> int:
+        """Количество непокрытых атакующих карт"""
+        return self._uncovered
+
+    @property
+    def is_all_covered(self) -> bool:
+        """True, если все атакующие карты покрыты (или стол пуст)"""
+        return self._uncovered == 0
+
+    def rank_count(self, rank: Rank) -> int:
+        """Сколько карт данного ранга лежит на столе"""
+        return self._rank_counts[RANKS.index(rank)]
 
     def _get_attack_cards(self) -> List[Card]:
-        attack_cards = []
-        for pack in self.table_cards:
-            card = pack.get('attack_card')
-            if card is not None:
-                attack_cards.append(pack['attack_card'])
-        return attack_cards
+        return [slot.attack_card for slot in self._table]
 
     def _get_defend_cards(self) -> List[Card]:
-        defend_cards = []
-        for pack in self.table_cards:
-            card = pack.get('defend_card')
-            if card is not None:
-                defend_cards.append(card)
-        return defend_cards
-    
+        return [slot.defend_card for slot in self._table if slot.defend_card is not None]
+
     def _get_card_index(self, to_search_card: Card) -> int | None:
-        for i, pack in enumerate(self.table_cards):
-            attack = pack.get('attack_card')
-            defend = pack.get('defend_card')
-            if attack == to_search_card:
-                return i
-            elif defend == to_search_card:
-                return i
-        return None
+        return self._card_slots.get(to_search_card.index)
 
     def _get_table_ranks(self) -> Set[Rank]:
         """Возвращает множество рангов карт на столе"""
-        ranks = set()
-        for pack in self.table_cards:
-            attack_card = pack.get('attack_card')
-            defend_card = pack.get('defend_card')
-            if attack_card:
-                ranks.add(attack_card.rank)
-            if defend_card:
-                ranks.add(defend_card.rank)
-        return ranks
+        return {RANKS[i] for i in iter_indices(self._ranks_mask)}
 
     def clear_table(self) -> None:
-        self.table_cards.clear()
+        self._table.clear()
+        self._reset_index()
 
     def validate_throw(self, card: Card) -> None:
         """Проверяет возможность подкинуть карту"""
         # Проверяем, не на столе ли уже карта
-        all_cards = self._get_attack_cards() + self._get_defend_cards()
-        if card in all_cards:
+        if card.index in self._card_slots:
             raise CardAlreadyOnTableError(card)
 
         # Проверяем, есть ли место на столе
-        if self.slots <= len(self.table_cards):
+        if self.slots <= len(self._table):
             raise NoFreeSlotsError()
 
         # Если стол не пустой, проверяем ранг
-        if self.table_cards:
+        if self._table and not self._ranks_mask & RANK_BITS[card.index]:
             table_ranks = self._get_table_ranks()
-            if card.rank not in table_ranks:
-                raise InvalidThrowError(str(card), [str(r) for r in table_ranks])
+            raise InvalidThrowError(str(card), [str(r) for r in table_ranks])
 
     def throw_card(self, card: Card) -> Dict:
         """Добавляет карту на стол"""
         # Проверяем возможность подкинуть карту
         self.validate_throw(card)
-        
+
         # Если все проверки пройдены, добавляем карту
-        self.table_cards.append({"attack_card": card, "defend_card": None})
+        self._index_card(card, len(self._table))
+        self._table.append(TableSlot(card))
+        self._attack_mask |= 1 << card.index
+        self._uncovered += 1
         return {"status": "success", "message": "success"}
-    
+
     def validate_defense(self, attack_card: Card, defend_card: Card) -> None:
         """Проверяет возможность защиты картой"""
         # Проверяем, что атакующая карта на столе
-        if self._get_card_index(attack_card) is None:
+        if not (self._attack_mask >> attack_card.index) & 1:
             raise CardNotOnTableError(attack_card)
+        if self._table[self._card_slots[attack_card.index]].defend_card is not None:
+            raise CardAlreadyCoveredError(attack_card)
+        if defend_card.index in self._card_slots:
+            raise CardAlreadyOnTableError(defend_card)
 
-        # Проверяем масти
+        if beats(attack_card, defend_card, self._resolve_trump_suit(attack_card, defend_card)):
+            return
+        # Разные масти и защищающаяся карта не козырь
         if defend_card.suit != attack_card.suit:
-            # Если защищающаяся карта не козырь - ошибка
-            if not isinstance(defend_card, TrumpCard):
-                raise InvalidDefenseError(attack_card=attack_card, defend_card=defend_card)
-        else:
-            # Если масти одинаковые, проверяем значение
-            if not defend_card > attack_card:
-                raise WeakDefenseError(attack_card=attack_card, defend_card=defend_card)
+            raise InvalidDefenseError(attack_card=attack_card, defend_card=defend_card)
+        raise WeakDefenseError(attack_card=attack_card, defend_card=defend_card)
+
+    def _resolve_trump_suit(self, attack_card: Card, defend_card: Card) -> Optional[Suit]:
+        """Козырь партии; без него — масть карты, переданной как TrumpCard"""
+        if self.trump_suit is not None:
+            return self.trump_suit
+        if isinstance(defend_card, TrumpCard):
+            return defend_card.suit
+        if isinstance(attack_card, TrumpCard):
+            return attack_card.suit
+        return None
 
     def cover_card(self, attack_card: Card, defend_card: Card) -> bool:
         """Бьет карту на столе"""
         # Проверяем возможность защиты
         self.validate_defense(attack_card, defend_card)
-        
+
         # Если все проверки пройдены, добавляем карту защиты
-        idx = self._get_card_index(attack_card)
-        if idx is not None:
-            self.table_cards[idx]['defend_card'] = defend_card
-            return True
-        
-        return False
+        idx = self._card_slots[attack_card.index]
+        self._table[idx].defend_card = defend_card
+        self._index_card(defend_card, idx)
+        self._defend_mask |= 1 << defend_card.index
+        self._uncovered -= 1
+        return True
 
     def get_all_cards(self) -> list[Card]:
         """Возвращает все карты на столе (и атакующие, и защитные)."""
         all_cards = []
-        for pair in self.table_cards:
-            if pair.get("attack_card"):
-                all_cards.append(pair["attack_card"])
-            if pair.get("defend_card"):
-                all_cards.append(pair["defend_card"])
+        for slot in self._table:
+            all_cards.append(slot.attack_card)
+            if slot.defend_card is not None:
+                all_cards.append(slot.defend_card)
         return all_cards
-
@@ -1,42 +1,144 @@
 # app/models/deck.py
 import random
-from dataclasses import dataclass
-from typing import List, Optional, Iterator
+from typing import Iterable, Iterator, List, Optional, Tuple
 
-from backend.app.models.card import TrumpCard, Card, Suit, Rank
+from backend.app.models.card import (
+    DECK_SIZE,
+    RANKS_COUNT,
+    SUIT_POSITION,
+    SUITS,
+    Card,
+    Suit,
+    card_by_index,
+)
 
 #TODO: cover with tests
 
+# Колода в порядке раздачи: козырная карта первой (её берут последней), остальные перемешаны
+DeckOrder = Tuple[Card, ...]
+
+_DECK_INDICES = tuple(range(DECK_SIZE))
+
+
+def shuffled_deck(seed: int) -> DeckOrder:
+    """
+    Колода, однозначно определяемая seed.
+
+    Карты — интернированные объекты из card_by_index, новые не создаются.
+    """
+    rng = random.Random(seed)
+    trump_suit = rng.choice(SUITS)
+    trump_index = SUIT_POSITION[trump_suit] * RANKS_COUNT + rng.randrange(RANKS_COUNT)
+    indices = [index for index in _DECK_INDICES if index != trump_index]
+    rng.shuffle(indices)
+    return (card_by_index(trump_index, trump_suit),) + tuple(
+        card_by_index(index, trump_suit) for index in indices
+    )
+
+
+class DeckSource:
+    """
+    Источник колод: выдаёт seed следующей колоды и её порядок.
+
+    Колода всегда равна shuffled_deck(seed), поэтому партию можно воспроизвести
+    по seed, откуда бы он ни взялся.
+    """
+
+    def next_seed(self) -> int:
+        raise NotImplementedError
+
+    def next_deck(self) -> Tuple[int, DeckOrder]:
+        seed = self.next_seed()
+        return seed, shuffled_deck(seed)
+
+
+class RandomDeckSource(DeckSource):
+    """
+    Seed колод из генератора случайных чисел.
+
+    rng — random.Random с seed для воспроизводимости или random.SystemRandom()
+    (источник secrets) для честной раздачи; None — глобальный random.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self.rng = rng
+
+    def next_seed(self) -> int:
+        return (self.rng or random).getrandbits(64)
+
+
+class ScriptedDeckSource(DeckSource):
+    """Seed колод по заданному списку (воспроизведение записанной партии)"""
+
+    def __init__(self, seeds: Iterable[int]) -> None:
+        self._seeds: Iterator[int] = iter(seeds)
+
+    def next_seed(self) -> int:
+        try:
+            return next(self._seeds)
+        except StopIteration:
+            raise ValueError("Закончились seed колод для воспроизведения") from None
+
+
 class Deck:
+    """
+    Колода на 36 карт.
+
+    Каждая генерируемая колода (первая и после каждого сброса партии в лобби)
+    равна shuffled_deck(seed); seed текущей колоды хранится в self.seed.
+    Откуда берутся seed, задаёт источник:
+
+    * seed без источника — первая колода из seed, следующие из random.Random(seed);
+    * rng — seed из переданного генератора (например, random.SystemRandom());
+    * source — любой DeckSource, в том числе пул заранее перемешанных колод (DeckPool).
+
+    Без параметров seed берутся из глобального random.
+    """
+
     _cards: List[Card]
     _trump_card: Optional[Card] 
     _trump_suit: Optional[Suit]
     
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+        source: Optional[DeckSource] = None,
+    ) -> None:
         self._cards = []
         self._trump_card = None
         self._trump_suit = None
-        self.generate_deck()
-    
-    def generate_deck(self) -> None:
-        self._trump_suit = random.choice(list(Suit))
-        self._cards = [
-            Card(rank, suit) if suit != self._trump_suit else TrumpCard(rank, suit)
-            for suit in Suit
-            for rank in Rank
-        ]
-        self._trump_card = random.choice(
-            list(filter(
-                lambda x: isinstance(x, TrumpCard),
-                self._cards))
-                   )
-        self._cards.remove(self._trump_card)
-        self.shuffle()
-        self._cards.insert(0, self._trump_card)
-    
-    def shuffle(self) -> None:
-        """Перемешать колоду"""
-        random.shuffle(self._cards)
+        self.seed: Optional[int] = None
+        if source is None:
+            if rng is None and seed is not None:
+                rng = random.Random(seed)
+            source = RandomDeckSource(rng)
+        self.source: Optional[DeckSource] = source
+        self.generate_deck(seed)
+
+    @classmethod
+    def from_cards(cls, cards: List[Card], trump_card: Optional[Card]) -> "Deck":
+        """Колода с заданным порядком карт (без генерации и перемешивания)"""
+        deck = cls.__new__(cls)
+        deck._cards = list(cards)
+        deck._trump_card = trump_card
+        deck._trump_suit = trump_card.suit if trump_card is not None else None
+        deck.seed = None
+        deck.source = None
+        return deck
+
+    def generate_deck(self, seed: Optional[int] = None) -> None:
+        """Новая колода: из seed, если он передан, иначе из источника колод"""
+        if seed is not None:
+            order = shuffled_deck(seed)
+        else:
+            if self.source is None:
+                self.source = RandomDeckSource()
+            seed, order = self.source.next_deck()
+        self.seed = seed
+        self._trump_card = order[0]
+        self._trump_suit = self._trump_card.suit
+        self._cards = list(order)
     
     def draw(self) -> Optional[Card]:
         """Взять карту из колоды"""
@@ -44,6 +146,14 @@ class Deck:
             return None
         return self._cards.pop()
     
+    @property
+    def mask(self) -> int:
+        """Битовая маска оставшихся в колоде карт"""
+        mask = 0
+        for card in self._cards:
+            mask |= 1 << card.index
+        return mask
+
     @property
     def trump_suit(self) -> Optional[Suit]:
         """Получить козырную масть"""
@@ -0,0 +1,106 @@
+"""
+Пул заранее перемешанных колод.
+
+Перемешивание колоды — самая дорогая часть создания партии. Пул держит запас
+готовых колод (seed, порядок карт) и пополняет его в фоновом потоке, когда
+запас опускается ниже порога, так что партия при старте только забирает
+готовую колоду. Если пул опустел, колода считается на месте.
+
+По умолчанию seed берутся из random.SystemRandom() (os.urandom, как secrets):
+раздачу нельзя предсказать по предыдущим, а записанный в журнал seed всё
+равно позволяет воспроизвести партию.
+"""
+import logging
+import random
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from backend.app.models.deck import DeckOrder, DeckSource, shuffled_deck
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 256
+
+
+class DeckPool(DeckSource):
+    """Источник колод с фоновым пополнением запаса"""
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        rng: Optional[random.Random] = None,
+        low_watermark: Optional[int] = None,
+        background: bool = True,
+    ) -> None:
+        """
+        Args:
+            size: Сколько колод держать в запасе.
+            rng: Генератор seed; по умолчанию random.SystemRandom().
+            low_watermark: При каком остатке будить фоновое пополнение (по умолчанию size // 4).
+            background: Пополнять в фоновом потоке; иначе только через fill().
+        """
+        if size < 1:
+            raise ValueError("Размер пула колод должен быть положительным")
+        self.size = size
+        self.rng = rng if rng is not None else random.SystemRandom()
+        self.low_watermark = size // 4 if low_watermark is None else low_watermark
+        self.hits = 0
+        self.misses = 0
+        self._decks: Deque[Tuple[int, DeckOrder]] = deque()
+        self._rng_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.fill()
+        if background:
+            self._thread = threading.Thread(target=self._refill_loop, name="deck-pool", daemon=True)
+            self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self._decks)
+
+    def next_seed(self) -> int:
+        with self._rng_lock:
+            return self.rng.getrandbits(64)
+
+    def next_deck(self) -> Tuple[int, DeckOrder]:
+        try:
+            deck = self._decks.popleft()
+            self.hits += 1
+        except IndexError:
+            self.misses += 1
+            deck = super().next_deck()
+        if len(self._decks) <= self.low_watermark:
+            self._wakeup.set()
+        return deck
+
+    def fill(self) -> int:
+        """Дополняет запас до size; возвращает число добавленных колод."""
+        added = 0
+        while len(self._decks) < self.size and not self._closed:
+            self._decks.append(super().next_deck())
+            added += 1
+        return added
+
+    def _refill_loop(self) -> None:
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._closed:
+                return
+            try:
+                self.fill()
+            except Exception:
+                logger.exception("Ошибка пополнения пула колод")
+
+    def close(self) -> None:
+        """Останавливает фоновое пополнение."""
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._decks), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,210 @@
+"""
+Журнал ходов партии для детерминированного воспроизведения.
+
+Партия однозначно определяется seed колоды и последовательностью ввода,
+поэтому журнал хранит только их. Каждый ввод — 4 байта: номер игрока в
+таблице id, PlayerAction.value, индекс атакующей и отбивающей карты
+(0xFF — нет). Сброс партии в лобби записывается отдельным событием вместе с
+u64 seed новой колоды: seed могут браться из системного генератора или пула
+колод, и без записи повторить раздачу было бы нечем.
+
+Двоичный формат (to_bytes/from_bytes), версия 2:
+
+    "FL", версия, players_limit, u64 seed, game_id,
+    u8 число игроков + id игроков, u32 число событий + события
+
+Строки — u8 длина + UTF-8 (game_id без значения — длина 0xFF).
+
+Хранилище может держать журнал двумя частями, чтобы дописывать только новые
+события: head_bytes() (всё до числа событий) и сами события
+(events_bytes(), см. from_parts).
+"""
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+
+MAGIC = b"FL"
+VERSION = 2
+NONE = 0xFF
+# Событие сброса партии в лобби: ссылка на игрока 0xFF, действие 0, затем u64 seed колоды
+RESET = (NONE, 0, NONE, NONE)
+
+_HEADER = struct.Struct("<2sBBQ")
+_COUNT = struct.Struct("<I")
+_SEED = struct.Struct("<Q")
+_ACTIONS: Dict[int, PlayerAction] = {action.value: action for action in PlayerAction}
+
+# (player_id, действие, индекс атакующей карты, индекс отбивающей карты);
+# для сброса в лобби player_id и действие — None
+Event = Tuple[Optional[str], Optional[PlayerAction], Optional[int], Optional[int]]
+
+
+class GameEventLog:
+    """Журнал ввода одной партии"""
+
+    __slots__ = ("game_id", "players_limit", "seed", "player_ids", "_player_refs", "_events", "_count")
+
+    def __init__(self, game_id: Optional[str], players_limit: int, seed: int) -> None:
+        self.game_id = game_id
+        self.players_limit = players_limit
+        self.seed = seed
+        self.player_ids: List[str] = []
+        self._player_refs: Dict[str, int] = {}
+        self._events = bytearray()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _player_ref(self, player_id: str) -> int:
+        ref = self._player_refs.get(player_id)
+        if ref is None:
+            ref = len(self.player_ids)
+            if ref >= NONE:
+                raise ValueError("В журнале партии не может быть больше 255 игроков")
+            self.player_ids.append(player_id)
+            self._player_refs[player_id] = ref
+        return ref
+
+    def record_input(self, player_input: PlayerInput) -> None:
+        """Записывает ввод игрока."""
+        attack_card = player_input.attack_card
+        defend_card = player_input.defend_card
+        self._events += bytes((
+            self._player_ref(player_input.player_id),
+            player_input.action.value,
+            attack_card.index if attack_card is not None else NONE,
+            defend_card.index if defend_card is not None else NONE,
+        ))
+        self._count += 1
+
+    def record_reset(self, seed: int) -> None:
+        """Записывает сброс партии в лобби и seed колоды новой партии."""
+        self._events += bytes(RESET)
+        self._events += _SEED.pack(seed)
+        self._count += 1
+
+    def events(self) -> Iterator[Event]:
+        """Перебирает события журнала по порядку."""
+        events = self._events
+        player_ids = self.player_ids
+        offset = 0
+        while offset < len(events):
+            ref, action, attack, defend = events[offset:offset + 4]
+            offset += 4
+            if ref == NONE:
+                offset += _SEED.size
+                yield None, None, None, None
+                continue
+            yield (
+                player_ids[ref],
+                _ACTIONS[action],
+                attack if attack != NONE else None,
+                defend if defend != NONE else None,
+            )
+
+    def reset_seeds(self) -> List[int]:
+        """Seed колод, розданных после сбросов в лобби, по порядку."""
+        seeds = []
+        events = self._events
+        offset = 0
+        while offset < len(events):
+            if events[offset] == NONE:
+                seeds.append(_SEED.unpack_from(events, offset + 4)[0])
+                offset += _SEED.size
+            offset += 4
+        return seeds
+
+    def head_bytes(self) -> bytes:
+        """Заголовок и таблица игроков — to_bytes() без числа событий и событий."""
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, self.players_limit, self.seed))
+        _pack_str(out, self.game_id)
+        out.append(len(self.player_ids))
+        for player_id in self.player_ids:
+            _pack_str(out, str(player_id))
+        return bytes(out)
+
+    def events_bytes(self, offset: int = 0) -> bytes:
+        """События журнала начиная с байта offset (для дозаписи — размер уже записанных)."""
+        return bytes(self._events[offset:])
+
+    @property
+    def events_size(self) -> int:
+        return len(self._events)
+
+    def to_bytes(self) -> bytes:
+        """Сериализует журнал."""
+        return self.head_bytes() + _COUNT.pack(len(self)) + self._events
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "GameEventLog":
+        """Восстанавливает журнал из to_bytes()."""
+        log, offset = cls._from_head(data)
+        try:
+            (count,) = _COUNT.unpack_from(data, offset)
+        except struct.error:
+            raise ValueError("Журнал партии обрезан")
+        log._set_events(data[offset + _COUNT.size:], count)
+        return log
+
+    @classmethod
+    def from_parts(cls, head: bytes, events: bytes) -> "GameEventLog":
+        """Восстанавливает журнал из head_bytes() и events_bytes()."""
+        log, offset = cls._from_head(head)
+        if offset != len(head):
+            raise ValueError("Журнал партии повреждён")
+        log._set_events(events, None)
+        return log
+
+    @classmethod
+    def _from_head(cls, data: bytes) -> Tuple["GameEventLog", int]:
+        """Разбирает заголовок и таблицу игроков; возвращает журнал без событий и смещение за ними."""
+        try:
+            magic, version, players_limit, seed = _HEADER.unpack_from(data)
+        except struct.error:
+            raise ValueError("Журнал партии обрезан")
+        if magic != MAGIC:
+            raise ValueError("Это не журнал партии")
+        if version != VERSION:
+            raise ValueError(f"Неподдерживаемая версия журнала: {version}")
+        offset = _HEADER.size
+        game_id, offset = _unpack_str(data, offset)
+        log = cls(game_id, players_limit, seed)
+        players_count = data[offset]
+        offset += 1
+        for _ in range(players_count):
+            player_id, offset = _unpack_str(data, offset)
+            log._player_ref(player_id)
+        return log, offset
+
+    def _set_events(self, events: bytes, count: Optional[int]) -> None:
+        """Проверяет и ставит события; count None — число событий считается по ним."""
+        position = 0
+        found = 0
+        while position < len(events) and (count is None or found < count):
+            position += 4 + (_SEED.size if events[position] == NONE else 0)
+            found += 1
+        if position != len(events) or (count is not None and found != count):
+            raise ValueError("Журнал партии повреждён")
+        self._events = bytearray(events)
+        self._count = found
+
+
+def _pack_str(out: bytearray, value: Optional[str]) -> None:
+    if value is None:
+        out.append(NONE)
+        return
+    data = value.encode()
+    if len(data) >= NONE:
+        raise ValueError(f"Строка длиннее 254 байт не помещается в журнал: {value[:32]!r}...")
+    out.append(len(data))
+    out += data
+
+
+def _unpack_str(data: bytes, offset: int) -> Tuple[Optional[str], int]:
+    length = data[offset]
+    offset += 1
+    if length == NONE:
+        return None, offset
+    return data[offset:offset + length].decode(), offset + length
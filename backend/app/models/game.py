@@ -1,15 +1,17 @@
 import logging
+import time
 import traceback
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from backend.app.utils.game_interface import Game, GameState
-from backend.app.states.lobby_state import LobbyState
-from backend.app.states.deal_state import DealState
-from backend.app.states.game_over import GameOverState
-from backend.app.states.play_round_state import PlayRoundWithoutThrowState
-from backend.app.models.deck import Deck
+from backend.app.states.registry import STATE_GRAPH, StateName
+from backend.app.models.deck import Deck, DeckSource
 from backend.app.models.player import Player, PlayerStatus
 from backend.app.models.card_table import CardTable
+from backend.app.models.event_log import GameEventLog
+from backend.app.models.game_snapshot import dump_game, load_game
+from backend.app.utils.metrics import REGISTRY
+from backend.app.utils.profiling import profiled
 from backend.app.contracts.game_contract import (
     PlayerInput,
     PlayerAction,
@@ -20,22 +22,40 @@ from backend.app.contracts.game_contract import (
 
 logger = logging.getLogger(__name__)
 
+LOBBY_STATE = StateName.LOBBY.value
+
+INPUT_LATENCY = REGISTRY.histogram(
+    "fool_handle_input_seconds", "Время FoolGame.handle_input по состоянию и действию", ("state", "action")
+)
+STATE_TRANSITIONS = REGISTRY.counter(
+    "fool_state_transitions_total", "Переходы между состояниями игры", ("from_state", "to_state")
+)
+
 
 class FoolGame(Game):
     """Основной класс игры, который управляет состояниями и предоставляет API для взаимодействия"""
 
-    def __init__(self, game_id: Optional[str], players_limit):
+    def __init__(
+        self,
+        game_id: Optional[str],
+        players_limit,
+        seed: Optional[int] = None,
+        deck_source: Optional[DeckSource] = None,
+    ):
         if players_limit < 2:
             raise ValueError("Минимальное количество игроков должно быть 2 или больше")
         self.game_id: Optional[str] = game_id
         self.players_limit = players_limit
         self.players: List[Player] = list()
-        self.deck: Deck = Deck()
+        self.deck: Deck = Deck(seed, source=deck_source)
+        # Журнал ввода для воспроизведения партии (см. backend.app.simulation.replay)
+        self.event_log: Optional[GameEventLog] = GameEventLog(game_id, players_limit, self.deck.seed)
         self.game_table: CardTable = CardTable()
         self.state_history: list[str] = list()
         self.current_attacker_id: str | None = None
         self.current_defender_id: str | None = None
-        self._current_state: GameState = LobbyState(self)
+        self._states: Dict[str, GameState] = {}  # Объекты состояний партии, создаются по одному на имя
+        self._current_state: GameState = self._get_state(LOBBY_STATE)
         self.round_defender_status: PlayerAction | None = None
 
     @property
@@ -80,6 +100,13 @@ class FoolGame(Game):
             )
         return None
 
+    def _get_state(self, name: str) -> GameState:
+        """Объект состояния партии по имени (создаётся при первом обращении)"""
+        state = self._states.get(name)
+        if state is None:
+            state = self._states[name] = STATE_GRAPH.classes[name](self)
+        return state
+
     def _set_state(self, new_state: GameState) -> StateTransition:
         """
         Изменяет текущее состояние игры
@@ -97,17 +124,18 @@ class FoolGame(Game):
             if self._current_state:
                 previous_state = self._current_state.__class__.__name__
                 logger.debug(
-                    f"Переключение состояния: {previous_state} -> {new_state.__class__.__name__}"
+                    "Переключение состояния: %s -> %s", previous_state, new_state.__class__.__name__
                 )
                 exit_info = self._current_state.exit()
                 self.state_history.append(previous_state)
             # Переключаемся на новое состояние
             self._current_state = new_state
+            STATE_TRANSITIONS.labels(previous_state or "", new_state.__class__.__name__).inc()
             enter_info = self._current_state.enter()
         except Exception as e:
             tb_str = traceback.format_exc()  # Получаем строку с полным трейсбеком
             logger.error(
-                f"Ошибка в {__file__}, строка {traceback.extract_tb(e.__traceback__)[-1].lineno}:\n{tb_str}"
+                "Ошибка в %s, строка %s:\n%s", __file__, traceback.extract_tb(e.__traceback__)[-1].lineno, tb_str
             )
             raise e
         # Если предыдущее состояние существует, сохраняем информацию о его выходе
@@ -119,35 +147,93 @@ class FoolGame(Game):
             enter_info=enter_info,
         )
 
+    def _transition_to(self, name: str) -> StateTransition:
+        """
+        Переходит в состояние name, а затем по auto_transition() через все
+        переходные состояния (например, раздачу) до состояния, ждущего ввода
+
+        Returns:
+            StateTransition: Сводный переход от исходного состояния к итоговому;
+            одиночные переходы — в steps
+        """
+        steps = [self._set_state(self._get_state(name))]
+        # Граф конечен, поэтому цепочка длиннее числа состояний — ошибка в состояниях
+        for _ in range(len(STATE_GRAPH.classes)):
+            current_state = self.current_state_name
+            next_state = self._current_state.auto_transition()
+            if next_state is None:
+                break
+            if not STATE_GRAPH.can_transition(current_state, next_state):
+                logger.error("Автоматический переход %s -> %s не разрешён.", current_state, next_state)
+                break
+            steps.append(self._set_state(self._get_state(next_state)))
+        else:
+            logger.error("Цепочка автоматических переходов не завершилась: %s -> %s", steps[0].previous_state, name)
+
+        if len(steps) == 1:
+            return steps[0]
+        return StateTransition(
+            previous_state=steps[0].previous_state,
+            new_state=steps[-1].new_state,
+            exit_info=steps[0].exit_info,
+            enter_info=steps[-1].enter_info,
+            steps=steps,
+        )
+
+    @profiled()
     def handle_input(self, player_input: PlayerInput) -> StateResponse | StateTransition | None:
+        started = time.perf_counter()
+        state = self.current_state_name
+        try:
+            return self._handle_input(player_input)
+        finally:
+            INPUT_LATENCY.labels(state, player_input.action.name).observe(time.perf_counter() - started)
+
+    def _handle_input(self, player_input: PlayerInput) -> StateResponse | StateTransition | None:
         if not self._current_state:
             return StateResponse(ActionResult.INVALID_ACTION, "No active state")
 
-        logger.debug(f"Обработка ввода игрока: {player_input} в состоянии {self.current_state_name}")
+        # Ленивое форматирование: repr ввода и ответа дорогие, а debug обычно выключен
+        logger.debug("Обработка ввода игрока: %s в состоянии %s", player_input, self.current_state_name)
         response = self._current_state.handle_input(player_input)
 
         if not response:
             logger.debug("Обработка ввода не вернула ответа (response is None).")
             return None # Или можно вернуть осмысленный StateResponse
 
-        logger.debug(f"Результат обработки ввода: {response}")
-
-        if (
-            hasattr(response, 'next_state') and response.next_state and
-            response.next_state != self._current_state.__class__.__name__
-        ):
-            logger.info(f"Смена состояния: {self.current_state_name} -> {response.next_state}")
-            
-            state_class = next((s for s in GameState.__subclasses__() if s.__name__ == response.next_state), None)
-            
-            if state_class:
-                return self._set_state(state_class(self))
-            
-            logger.warning(f"Состояние {response.next_state} не найдено.")
-            return StateResponse(ActionResult.INVALID_ACTION, f"State {response.next_state} not found")
+        logger.debug("Результат обработки ввода: %s", response)
 
+        next_state = getattr(response, 'next_state', None)
+        current_state = self.current_state_name
+        if next_state and next_state != current_state:
+            logger.info(
+                "Смена состояния: %s -> %s",
+                current_state,
+                next_state,
+                extra={"event": "game.transition", "game_id": self.game_id},
+            )
+
+            if next_state not in STATE_GRAPH:
+                logger.warning("Состояние %s не найдено.", next_state)
+                return StateResponse(ActionResult.INVALID_ACTION, f"State {next_state} not found")
+            if not STATE_GRAPH.can_transition(current_state, next_state):
+                logger.warning("Переход %s -> %s не разрешён.", current_state, next_state)
+                return StateResponse(
+                    ActionResult.INVALID_ACTION, f"Transition {current_state} -> {next_state} is not allowed"
+                )
+            transition = self._transition_to(next_state)
+            self._record_input(player_input)
+            return transition
+
+        if response.result == ActionResult.SUCCESS:
+            self._record_input(player_input)
         return response
 
+    def _record_input(self, player_input: PlayerInput) -> None:
+        """Пишет принятый ввод в журнал: отклонённый партию не меняет, и воспроизведению не нужен."""
+        if self.event_log is not None:
+            self.event_log.record_input(player_input)
+
     def get_game_state(self) -> Dict[str, Any]:
         """
         Возвращает полную информацию о текущем состоянии игры
@@ -174,6 +260,25 @@ class FoolGame(Game):
             ),
         }
 
+    def snapshot(self) -> bytes:
+        """
+        Возвращает компактный двоичный снимок партии (см. game_snapshot).
+
+        Returns:
+            bytes: Снимок колоды, стола, рук, ролей, текущего состояния и истории.
+        """
+        return dump_game(self)
+
+    @classmethod
+    def restore(cls, data: bytes) -> "FoolGame":
+        """
+        Восстанавливает партию из снимка, сделанного snapshot().
+
+        Raises:
+            SnapshotError: Если снимок повреждён или несовместимой версии.
+        """
+        return load_game(cls, data)
+
     def is_full(self):
         return len(self.players) == self.players_limit
 
@@ -186,7 +291,7 @@ class FoolGame(Game):
 
     def reset_to_lobby(self):
         """Resets the game to a clean lobby state for a new game."""
-        logger.info(f"Resetting game {self.game_id} to lobby state.")
+        logger.info("Сброс игры в лобби", extra={"game_id": self.game_id})
         for player in self.players:
             player.clear_hand()
             player.status = PlayerStatus.UNREADY
@@ -194,7 +299,9 @@ class FoolGame(Game):
         self.round_defender_status = None
         # The transition to LobbyState will call its `enter` method,
         # which already resets the deck, table, and attacker/defender IDs.
-        self._set_state(LobbyState(self))
+        self._transition_to(LOBBY_STATE)
+        if self.event_log is not None:
+            self.event_log.record_reset(self.deck.seed)
 
     def get_allowed_actions(self) -> Dict[str, List[str]]:
         """
@@ -204,12 +311,3 @@ class FoolGame(Game):
             return self._current_state.get_allowed_actions()
         # Return a default (e.g., only QUIT) if no state or method exists
         return {p.id_: [PlayerAction.QUIT.name] for p in self.players}
-
-    def _initialize_states(self):
-        from backend.app.states.lobby_state import LobbyState
-        from backend.app.states.play_round_state import (
-            PlayRoundWithoutThrowState,
-            PlayRoundWithThrowState,
-            PlayRoundWithThrowAndDefendState,
-            PlayRoundWithThrowAndDefendAndAttackState,
-        )
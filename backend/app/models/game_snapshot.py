@@ -0,0 +1,337 @@
+"""
+Компактный двоичный снимок партии.
+
+Формат (все числа беззнаковые, little-endian), версия 2:
+
+    заголовок   "FG", версия, код состояния, players_limit,
+                позиция атакующего, позиция защищающегося (0xFF — нет),
+                round_defender_status (0 — нет, иначе PlayerAction.value),
+                индекс козырной карты, позиция козыря стола (0xFF — нет),
+                число мест на столе (5 в первом раунде, затем 6)
+    game_id     строка
+    колода      u8 число карт + индексы карт в порядке колоды
+    стол        u8 число мест + пары (атакующая, отбивающая или 0xFF)
+    игроки      u8 число игроков + на каждого: статус, id, имя, 5 байт маски руки
+    история     u16 длина + RLE кодов состояний, упакованных по два в байт
+    состояние   данные текущего состояния (у GameOverState — позиция победителя)
+
+Строка — байт-тег: 0 — None, 1 — UUID (16 байт), 2 — UTF-8 с длиной u8,
+3 — имя по умолчанию "Player <id>" (без данных).
+"""
+from __future__ import annotations
+
+import struct
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
+from uuid import UUID
+
+from backend.app.contracts.game_contract import PlayerAction
+from backend.app.models.card import RANKS_COUNT, SUITS, SUIT_POSITION, card_by_index
+from backend.app.models.card_set import CardSet
+from backend.app.models.card_table import CardTable
+from backend.app.models.deck import Deck
+from backend.app.models.player import Player, PlayerStatus
+from backend.app.states.deal_state import DealState
+from backend.app.states.game_over import GameOverState
+from backend.app.states.lobby_state import LobbyState
+from backend.app.states.play_round_state import PlayRoundWithoutThrowState
+from backend.app.utils.errors import CardGameError
+from backend.app.utils.game_interface import GameState
+
+if TYPE_CHECKING:
+    from backend.app.models.game import FoolGame
+
+MAGIC = b"FG"
+VERSION = 2
+NONE = 0xFF
+
+# Коды состояний; порядок менять нельзя — только дописывать в конец
+STATE_CLASSES: Tuple[Type[GameState], ...] = (
+    LobbyState,
+    DealState,
+    PlayRoundWithoutThrowState,
+    GameOverState,
+)
+STATE_CODES: Dict[str, int] = {cls.__name__: code for code, cls in enumerate(STATE_CLASSES)}
+
+_HEADER = struct.Struct("<2sBBBBBBBBB")
+_HISTORY_LEN = struct.Struct("<H")
+_HAND_BYTES = 5  # 36 бит маски руки
+
+_STR_NONE, _STR_UUID, _STR_UTF8, _STR_DEFAULT_NAME = range(4)
+_STATUSES: Tuple[PlayerStatus, ...] = tuple(PlayerStatus)
+_STATUS_CODES: Dict[PlayerStatus, int] = {status: i for i, status in enumerate(_STATUSES)}
+_ACTIONS: Dict[int, PlayerAction] = {action.value: action for action in PlayerAction}
+
+
+class SnapshotError(ValueError):
+    """Снимок повреждён или записан несовместимой версией"""
+
+
+def _uuid_bytes(value: str) -> Optional[bytes]:
+    """16 байт UUID, если строка — UUID в каноническом виде"""
+    if len(value) != 36:
+        return None
+    try:
+        parsed = UUID(value)
+    except ValueError:
+        return None
+    return parsed.bytes if str(parsed) == value else None
+
+
+@lru_cache(maxsize=4096)
+def _encode_str(value: Optional[str]) -> bytes:
+    # id игроков и партии повторяются в каждом снимке, поэтому кодируем их один раз
+    if value is None:
+        return bytes((_STR_NONE,))
+    raw = _uuid_bytes(value)
+    if raw is not None:
+        return bytes((_STR_UUID,)) + raw
+    data = value.encode()
+    if len(data) > 0xFF:
+        raise SnapshotError(f"Строка длиннее 255 байт не помещается в снимок: {value[:32]!r}...")
+    return bytes((_STR_UTF8, len(data))) + data
+
+
+@lru_cache(maxsize=4096)
+def _encode_player(player_id: str, name: str) -> bytes:
+    if name == f"Player {player_id}":
+        return _encode_str(player_id) + bytes((_STR_DEFAULT_NAME,))
+    return _encode_str(player_id) + _encode_str(name)
+
+
+def _position(game: FoolGame, player_id: Optional[str]) -> int:
+    if player_id is None:
+        return NONE
+    for i, player in enumerate(game.players):
+        if player.id_ == player_id:
+            return i
+    return NONE
+
+
+def _state_code(name: str) -> int:
+    code = STATE_CODES.get(name)
+    if code is None:
+        raise SnapshotError(f"Состояние {name} не поддерживается снимками")
+    return code
+
+
+def _pack_history(history: List[str]) -> bytes:
+    """
+    Коды состояний по два в байте, затем RLE пар (число повторов, байт).
+
+    История растёт на два перехода за раунд и почти целиком состоит из
+    повторов "раздача -> раунд", поэтому после RLE занимает несколько байт.
+    """
+    codes = [_state_code(name) for name in history]
+    if len(codes) % 2:
+        codes.append(0)
+    out = bytearray(_HISTORY_LEN.pack(len(history)))
+    run_value, run_length = -1, 0
+    for i in range(0, len(codes), 2):
+        value = codes[i] | codes[i + 1] << 4
+        if value == run_value and run_length < 0xFF:
+            run_length += 1
+            continue
+        if run_length:
+            out += bytes((run_length, run_value))
+        run_value, run_length = value, 1
+    if run_length:
+        out += bytes((run_length, run_value))
+    return bytes(out)
+
+
+def dump_game(game: FoolGame) -> bytes:
+    """Сериализует партию в снимок."""
+    deck = game.deck
+    table = game.game_table
+    trump_card = deck.trump_card
+    status = game.round_defender_status
+
+    out = bytearray(
+        _HEADER.pack(
+            MAGIC,
+            VERSION,
+            _state_code(game.current_state_name),
+            game.players_limit,
+            _position(game, game.current_attacker_id),
+            _position(game, game.current_defender_id),
+            status.value if status is not None else 0,
+            trump_card.index if trump_card is not None else NONE,
+            SUIT_POSITION[table.trump_suit] if table.trump_suit is not None else NONE,
+            table.slots,
+        )
+    )
+    out += _encode_str(game.game_id)
+
+    cards = deck._cards
+    out.append(len(cards))
+    out += bytes(card.index for card in cards)
+
+    slots = table.table_cards
+    out.append(len(slots))
+    for slot in slots:
+        out.append(slot.attack_card.index)
+        out.append(slot.defend_card.index if slot.defend_card is not None else NONE)
+
+    out.append(len(game.players))
+    for player in game.players:
+        out.append(_STATUS_CODES[player.status])
+        out += _encode_player(player.id_, player.name)
+        out += player.hand_mask.to_bytes(_HAND_BYTES, "little")
+
+    out += _pack_history(game.state_history)
+
+    state = game._current_state
+    if isinstance(state, GameOverState):
+        out.append(_position(game, state.winner_id))
+    return bytes(out)
+
+
+class _Reader:
+    """Последовательное чтение снимка"""
+
+    __slots__ = ("data", "offset")
+
+    def __init__(self, data: bytes, offset: int = 0) -> None:
+        self.data = data
+        self.offset = offset
+
+    def take(self, size: int) -> bytes:
+        end = self.offset + size
+        if end > len(self.data):
+            raise SnapshotError("Снимок обрезан")
+        chunk = self.data[self.offset:end]
+        self.offset = end
+        return chunk
+
+    def peek(self) -> int:
+        if self.offset >= len(self.data):
+            raise SnapshotError("Снимок обрезан")
+        return self.data[self.offset]
+
+    def byte(self) -> int:
+        value = self.peek()
+        self.offset += 1
+        return value
+
+    def string(self) -> Optional[str]:
+        tag = self.byte()
+        if tag == _STR_NONE:
+            return None
+        if tag == _STR_UUID:
+            return str(UUID(bytes=self.take(16)))
+        if tag == _STR_UTF8:
+            return self.take(self.byte()).decode()
+        raise SnapshotError(f"Неизвестный тег строки: {tag}")
+
+
+def load_game(game_cls: Type[FoolGame], data: bytes) -> FoolGame:
+    """Восстанавливает партию из снимка, не вызывая enter() состояний и без журнала ходов."""
+    if len(data) < _HEADER.size:
+        raise SnapshotError("Снимок обрезан")
+    (
+        magic,
+        version,
+        state_code,
+        players_limit,
+        attacker_pos,
+        defender_pos,
+        defender_status,
+        trump_index,
+        table_trump_pos,
+        table_slots,
+    ) = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("Это не снимок партии")
+    if version != VERSION:
+        raise SnapshotError(f"Неподдерживаемая версия снимка: {version}")
+    if state_code >= len(STATE_CLASSES):
+        raise SnapshotError(f"Неизвестный код состояния: {state_code}")
+
+    reader = _Reader(data, _HEADER.size)
+    game_id = reader.string()
+
+    trump_suit = SUITS[trump_index // RANKS_COUNT] if trump_index != NONE else None
+    deck = Deck.from_cards(
+        [card_by_index(index, trump_suit) for index in reader.take(reader.byte())],
+        card_by_index(trump_index, trump_suit) if trump_index != NONE else None,
+    )
+
+    table = CardTable(SUITS[table_trump_pos] if table_trump_pos != NONE else None)
+    # Число мест задаётся до раскладки карт: после первого отбоя их 6, а не 5
+    table.slots = table_slots
+    try:
+        for _ in range(reader.byte()):
+            attack_index, defend_index = reader.take(2)
+            attack_card = card_by_index(attack_index, trump_suit)
+            table.throw_card(attack_card)
+            if defend_index != NONE:
+                table.cover_card(attack_card, card_by_index(defend_index, trump_suit))
+    except (CardGameError, IndexError) as e:
+        raise SnapshotError(f"Повреждён стол: {e}") from e
+
+    players: List[Player] = []
+    for _ in range(reader.byte()):
+        status_code = reader.byte()
+        if status_code >= len(_STATUSES):
+            raise SnapshotError(f"Неизвестный статус игрока: {status_code}")
+        status = _STATUSES[status_code]
+        player_id = reader.string()
+        if reader.peek() == _STR_DEFAULT_NAME:
+            reader.offset += 1
+            name = f"Player {player_id}"
+        else:
+            name = reader.string()
+        player = Player(player_id, name)
+        player.status = status
+        player._hand = CardSet.from_mask(
+            int.from_bytes(reader.take(_HAND_BYTES), "little"), trump_suit
+        )
+        players.append(player)
+
+    (history_len,) = _HISTORY_LEN.unpack(reader.take(_HISTORY_LEN.size))
+    history: List[str] = []
+    while len(history) < history_len:
+        run_length, packed = reader.take(2)
+        low, high = packed & 0x0F, packed >> 4
+        if not run_length or low >= len(STATE_CLASSES) or high >= len(STATE_CLASSES):
+            raise SnapshotError("Повреждена история состояний")
+        history += [STATE_CLASSES[low].__name__, STATE_CLASSES[high].__name__] * run_length
+    del history[history_len:]
+
+    for position in (attacker_pos, defender_pos):
+        if position != NONE and position >= len(players):
+            raise SnapshotError(f"Позиция игрока {position} вне списка игроков")
+    if defender_status and defender_status not in _ACTIONS:
+        raise SnapshotError(f"Неизвестный статус защищающегося: {defender_status}")
+
+    game = game_cls.__new__(game_cls)
+    game.game_id = game_id
+    game.players_limit = players_limit
+    game.players = players
+    game.deck = deck
+    game.game_table = table
+    game.state_history = history
+    game.current_attacker_id = players[attacker_pos].id_ if attacker_pos != NONE else None
+    game.current_defender_id = players[defender_pos].id_ if defender_pos != NONE else None
+    game.round_defender_status = _ACTIONS[defender_status] if defender_status else None
+    # Журнал ходов в снимок не входит: восстановленную партию воспроизвести нельзя
+    game.event_log = None
+
+    game._states = {}
+    state = game._get_state(STATE_CLASSES[state_code].__name__)
+    if isinstance(state, GameOverState):
+        winner_pos = reader.byte()
+        if winner_pos != NONE and winner_pos >= len(players):
+            raise SnapshotError(f"Позиция победителя {winner_pos} вне списка игроков")
+        if winner_pos != NONE:
+            state.winner_id = players[winner_pos].id_
+            state.loser_ids = [p.id_ for p in players if p.id_ != state.winner_id]
+        else:
+            state.loser_ids = [p.id_ for p in players]
+    game._current_state = state
+
+    if reader.offset != len(data):
+        raise SnapshotError("Лишние данные в конце снимка")
+    return game
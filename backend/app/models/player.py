@@ -4,6 +4,7 @@ from dataclasses import dataclass, field
 from enum import Enum, auto
 
 from backend.app.models.card import TrumpCard, Card, Suit, Rank  # TODO: fix path
+from backend.app.models.card_set import CardSet
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +23,7 @@ class Player:
         self.id_: str = id_  # get somewhere uuid
         self._status: PlayerStatus = PlayerStatus.UNREADY
         self.name: str = name
-        self._hand: Set[Card] = set()
+        self._hand: CardSet = CardSet()
 
     @property
     def status(self) -> PlayerStatus:
@@ -39,9 +40,14 @@ class Player:
         else:
             raise ValueError("Card is already in hand")
 
-    def get_cards(self) -> Set[Card]:
+    def get_cards(self) -> CardSet:
         return self._hand
 
+    @property
+    def hand_mask(self) -> int:
+        """Битовая маска карт в руке"""
+        return self._hand.mask
+
     def remove_card(self, card: Card) -> None:
         """Удалить карту из руки"""
         try:
@@ -0,0 +1,15 @@
+from backend.app.simulation.engine import (
+    GameRecord,
+    SimulationConfig,
+    SimulationReport,
+    play_game,
+    run_simulation,
+)
+from backend.app.simulation.policies import (
+    POLICIES,
+    BotPolicy,
+    GreedyPolicy,
+    RandomPolicy,
+    make_policy,
+)
+from backend.app.simulation.replay import ReplayReport, replay, replay_logs
@@ -0,0 +1,71 @@
+"""
+Консольный запуск симулятора:
+
+    python -m backend.app.simulation --games 10000 --players 2 --workers 4 --policy greedy,random
+"""
+import argparse
+import json
+import os
+import sys
+
+from backend.app.simulation.engine import SimulationConfig, run_simulation
+from backend.app.simulation.policies import POLICIES
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Headless-симуляция партий FoolGame ботами")
+    parser.add_argument("--games", type=int, default=1000, help="количество партий")
+    parser.add_argument("--players", type=int, default=2, help="игроков в партии")
+    parser.add_argument(
+        "--policy",
+        default="greedy",
+        help=f"стратегии через запятую, по кругу на места ({', '.join(POLICIES)})",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="количество процессов")
+    parser.add_argument("--seed", type=int, default=0, help="базовое зерно серии")
+    parser.add_argument("--max-moves", type=int, default=1000, help="лимит ходов на партию")
+    parser.add_argument("--moves-out", help="записать журналы партий в JSONL-файл")
+    parser.add_argument("--json", action="store_true", help="вывести отчёт в JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    policies = tuple(name.strip() for name in args.policy.split(",") if name.strip())
+    unknown = [name for name in policies if name not in POLICIES]
+    if unknown:
+        print(f"Неизвестные стратегии: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    config = SimulationConfig(
+        players=args.players,
+        policies=policies,
+        max_moves=args.max_moves,
+        record_moves=bool(args.moves_out),
+    )
+    report = run_simulation(args.games, config, workers=args.workers, seed=args.seed)
+
+    if args.moves_out:
+        with open(args.moves_out, "w", encoding="utf-8") as f:
+            for record in report.records:
+                f.write(json.dumps(record.to_dict()) + "\n")
+
+    if args.json:
+        print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        print(f"Партий:          {report.games} (завершено {report.finished}, прервано {report.aborted})")
+        print(f"Время:           {report.elapsed:.2f} с")
+        print(f"Партий/с:        {report.games_per_sec:.1f}")
+        print(f"Ходов/с:         {report.moves_per_sec:.1f}")
+        print(f"Средняя длина:   {report.mean_game_length:.1f} ходов")
+        print("Переходы состояний:")
+        for transition, count in report.transitions.most_common():
+            print(f"  {transition}: {count}")
+        print("Победы:")
+        for player_id, count in report.wins.most_common():
+            print(f"  {player_id}: {count}")
+    return 0 if not report.aborted else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
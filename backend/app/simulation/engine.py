@@ -0,0 +1,302 @@
+import logging
+import multiprocessing
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.app.contracts.game_contract import (
+    ActionResult,
+    PlayerAction,
+    PlayerInput,
+    StateResponse,
+)
+from backend.app.models.beats import defense_options
+from backend.app.models.card import card_by_index
+from backend.app.models.card_set import cards_of_ranks
+from backend.app.models.game import FoolGame
+from backend.app.simulation.policies import BotPolicy, make_policy
+from backend.app.utils.errors import CardGameError
+
+logger = logging.getLogger(__name__)
+
+PLAY_STATE = "PlayRoundWithoutThrowState"
+GAME_OVER_STATE = "GameOverState"
+
+# Ход в журнале партии: (игрок, действие, индекс атакующей карты, индекс защищающейся)
+MoveRecord = Tuple[str, str, Optional[int], Optional[int]]
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    """Параметры симуляции, общие для всех партий"""
+
+    players: int = 2
+    policies: Tuple[str, ...] = ("greedy",)
+    max_moves: int = 1000
+    record_moves: bool = False
+
+
+@dataclass
+class GameRecord:
+    """Результат одной сыгранной партии"""
+
+    seed: int
+    moves: int
+    finished: bool
+    winner_id: Optional[str] = None
+    transitions: Counter = field(default_factory=Counter)
+    log: List[MoveRecord] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seed": self.seed,
+            "moves": self.moves,
+            "finished": self.finished,
+            "winner_id": self.winner_id,
+            "log": [list(move) for move in self.log],
+        }
+
+
+@dataclass
+class SimulationReport:
+    """Сводная статистика по серии партий"""
+
+    games: int = 0
+    finished: int = 0
+    aborted: int = 0
+    moves: int = 0
+    elapsed: float = 0.0
+    transitions: Counter = field(default_factory=Counter)
+    wins: Counter = field(default_factory=Counter)
+    records: List[GameRecord] = field(default_factory=list)
+
+    @property
+    def games_per_sec(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def moves_per_sec(self) -> float:
+        return self.moves / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def mean_game_length(self) -> float:
+        """Среднее число ходов в партии"""
+        return self.moves / self.games if self.games else 0.0
+
+    def add(self, record: GameRecord, keep_record: bool = False) -> None:
+        self.games += 1
+        self.moves += record.moves
+        if record.finished:
+            self.finished += 1
+        else:
+            self.aborted += 1
+        if record.winner_id is not None:
+            self.wins[record.winner_id] += 1
+        self.transitions.update(record.transitions)
+        if keep_record:
+            self.records.append(record)
+
+    def merge(self, other: "SimulationReport") -> None:
+        self.games += other.games
+        self.finished += other.finished
+        self.aborted += other.aborted
+        self.moves += other.moves
+        self.transitions.update(other.transitions)
+        self.wins.update(other.wins)
+        self.records.extend(other.records)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "games": self.games,
+            "finished": self.finished,
+            "aborted": self.aborted,
+            "moves": self.moves,
+            "elapsed": round(self.elapsed, 3),
+            "games_per_sec": round(self.games_per_sec, 2),
+            "moves_per_sec": round(self.moves_per_sec, 2),
+            "mean_game_length": round(self.mean_game_length, 2),
+            "transitions": dict(self.transitions.most_common()),
+            "wins": dict(self.wins.most_common()),
+        }
+
+
+def _legal_attacks(game: FoolGame, collecting: bool) -> int:
+    """Маска карт атакующего, которые стол и правила раунда примут сейчас."""
+    table = game.game_table
+    attacker = game.get_player_by_id(game.current_attacker_id)
+    defender = game.get_player_by_id(game.current_defender_id)
+    if attacker is None or defender is None or table.attack_count >= table.slots:
+        return 0
+    defender_cards = len(defender.get_cards())
+    # Те же лимиты, что проверяет PlayRoundWithoutThrowState после броска карты
+    if collecting:
+        if table.attack_count + 1 >= defender_cards:
+            return 0
+    elif table.uncovered_count + 1 > defender_cards:
+        return 0
+    legal = attacker.hand_mask
+    if table.attack_count:
+        legal &= cards_of_ranks(table.ranks_mask)
+    return legal
+
+
+def _next_input(game: FoolGame, policies: Dict[str, BotPolicy]) -> Optional[PlayerInput]:
+    """Спрашивает стратегию игрока, чья очередь ходить, и собирает PlayerInput."""
+    table = game.game_table
+    trump_suit = game.deck.trump_suit
+    collecting = game.round_defender_status == PlayerAction.COLLECT
+
+    if not collecting and table.uncovered_count:
+        defender = game.get_player_by_id(game.current_defender_id)
+        attack_card = next(
+            slot.attack_card for slot in table.table_cards if slot.defend_card is None
+        )
+        legal = defense_options(defender.hand_mask, attack_card, trump_suit)
+        choice = policies[defender.id_].choose_defense(legal, attack_card, trump_suit)
+        if choice is None:
+            return PlayerInput(defender.id_, PlayerAction.PASS)
+        return PlayerInput(
+            defender.id_,
+            PlayerAction.DEFEND,
+            attack_card=attack_card,
+            defend_card=card_by_index(choice, trump_suit),
+        )
+
+    attacker_id = game.current_attacker_id
+    must_attack = not table.attack_count
+    legal = _legal_attacks(game, collecting)
+    choice = policies[attacker_id].choose_attack(legal, trump_suit, must_attack)
+    if choice is None:
+        if must_attack:
+            return None
+        return PlayerInput(attacker_id, PlayerAction.PASS)
+    return PlayerInput(
+        attacker_id, PlayerAction.ATTACK, attack_card=card_by_index(choice, trump_suit)
+    )
+
+
+def _count_transitions(game: FoolGame) -> Counter:
+    states = game.state_history + [game.current_state_name]
+    return Counter(f"{prev}->{new}" for prev, new in zip(states, states[1:]))
+
+
+def play_game(seed: int, config: SimulationConfig = SimulationConfig()) -> GameRecord:
+    """
+    Играет одну партию ботами от лобби до конца игры.
+
+    Колода тасуется глобальным модулем random, поэтому он пересевается
+    номером партии: одна и та же пара (seed, config) даёт ту же партию.
+
+    Args:
+        seed: Зерно партии.
+        config: Параметры симуляции.
+
+    Returns:
+        GameRecord: Итог партии.
+    """
+    random.seed(seed)
+    rng = random.Random(seed)
+    game = FoolGame(f"sim-{seed}", config.players)
+    player_ids = [f"bot-{seat}" for seat in range(config.players)]
+    policies = {
+        player_id: make_policy(
+            config.policies[seat % len(config.policies)], random.Random(rng.getrandbits(64))
+        )
+        for seat, player_id in enumerate(player_ids)
+    }
+    for player_id in player_ids:
+        game.handle_input(PlayerInput(player_id, PlayerAction.JOIN))
+    for player_id in player_ids:
+        game.handle_input(PlayerInput(player_id, PlayerAction.READY))
+
+    record = GameRecord(seed=seed, moves=0, finished=False)
+    while record.moves < config.max_moves and game.current_state_name == PLAY_STATE:
+        player_input = _next_input(game, policies)
+        if player_input is None:
+            break
+        record.moves += 1
+        if config.record_moves:
+            record.log.append((
+                player_input.player_id,
+                player_input.action.name,
+                player_input.attack_card.index if player_input.attack_card else None,
+                player_input.defend_card.index if player_input.defend_card else None,
+            ))
+        try:
+            response = game.handle_input(player_input)
+        except (CardGameError, ValueError) as e:
+            logger.warning(f"Партия {seed} прервана на ходе {record.moves}: {e}")
+            break
+        if isinstance(response, StateResponse) and response.result != ActionResult.SUCCESS:
+            logger.warning(f"Партия {seed} прервана на ходе {record.moves}: {response}")
+            break
+
+    record.finished = game.current_state_name == GAME_OVER_STATE
+    if record.finished:
+        record.winner_id = game.get_game_state()["state_info"].get("winner_id")
+    record.transitions = _count_transitions(game)
+    return record
+
+
+def _play_chunk(task: Tuple[Sequence[int], SimulationConfig]) -> SimulationReport:
+    seeds, config = task
+    report = SimulationReport()
+    for seed in seeds:
+        report.add(play_game(seed, config), keep_record=config.record_moves)
+    return report
+
+
+def _init_worker(log_level: int) -> None:
+    # Логи состояний на каждом ходе съедают большую часть времени симуляции
+    logging.getLogger("backend.app").setLevel(log_level)
+
+
+def run_simulation(
+    games: int,
+    config: SimulationConfig = SimulationConfig(),
+    workers: int = 1,
+    seed: int = 0,
+    chunk_size: int = 50,
+    log_level: int = logging.WARNING,
+) -> SimulationReport:
+    """
+    Играет серию партий, при workers > 1 — в пуле процессов.
+
+    Каждая партия получает зерно seed + номер партии, так что результат
+    не зависит от числа процессов и порядка выполнения кусков.
+
+    Args:
+        games: Количество партий.
+        config: Параметры симуляции.
+        workers: Количество процессов.
+        seed: Базовое зерно серии.
+        chunk_size: Сколько партий отдаётся процессу за раз.
+        log_level: Уровень логов игры на время симуляции.
+
+    Returns:
+        SimulationReport: Сводная статистика.
+    """
+    seeds = range(seed, seed + games)
+    tasks = [(seeds[i:i + chunk_size], config) for i in range(0, games, chunk_size)]
+    report = SimulationReport()
+    started = time.perf_counter()
+
+    if workers <= 1:
+        app_logger = logging.getLogger("backend.app")
+        previous_level = app_logger.level
+        _init_worker(log_level)
+        try:
+            for task in tasks:
+                report.merge(_play_chunk(task))
+        finally:
+            app_logger.setLevel(previous_level)
+    else:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(log_level,)) as pool:
+            for chunk_report in pool.imap_unordered(_play_chunk, tasks):
+                report.merge(chunk_report)
+
+    report.elapsed = time.perf_counter() - started
+    report.records.sort(key=lambda record: record.seed)
+    return report
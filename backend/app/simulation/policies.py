@@ -0,0 +1,115 @@
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Type
+
+from backend.app.models.card import RANKS_COUNT, SUIT_POSITION, Card, Suit
+from backend.app.models.card_set import SUIT_MASKS, iter_indices
+
+
+class BotPolicy(ABC):
+    """
+    Стратегия бота для симулятора.
+
+    Движок сам считает маски допустимых ходов, поэтому стратегия только
+    выбирает карту из маски (или отказывается от хода, возвращая None).
+    """
+
+    name: str = ""
+
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self.rng: random.Random = rng or random.Random()
+
+    @abstractmethod
+    def choose_attack(self, legal_mask: int, trump_suit: Suit, must_attack: bool) -> Optional[int]:
+        """
+        Выбирает карту для атаки или подкидывания.
+
+        Args:
+            legal_mask: Маска карт руки, которые можно положить на стол.
+            trump_suit: Козырная масть партии.
+            must_attack: True, если стол пуст и пасовать нельзя.
+
+        Returns:
+            Optional[int]: Индекс карты или None, если игрок пасует.
+        """
+
+    @abstractmethod
+    def choose_defense(self, legal_mask: int, attack_card: Card, trump_suit: Suit) -> Optional[int]:
+        """
+        Выбирает карту для защиты.
+
+        Args:
+            legal_mask: Маска карт руки, которыми можно покрыть атакующую карту.
+            attack_card: Непокрытая карта на столе.
+            trump_suit: Козырная масть партии.
+
+        Returns:
+            Optional[int]: Индекс карты или None, если игрок берёт карты.
+        """
+
+
+class RandomPolicy(BotPolicy):
+    """Случайный допустимый ход; пас и взятие — с вероятностью pass_chance"""
+
+    name = "random"
+
+    def __init__(self, rng: Optional[random.Random] = None, pass_chance: float = 0.2) -> None:
+        super().__init__(rng)
+        self.pass_chance = pass_chance
+
+    def _pick(self, mask: int) -> int:
+        return self.rng.choice(list(iter_indices(mask)))
+
+    def choose_attack(self, legal_mask: int, trump_suit: Suit, must_attack: bool) -> Optional[int]:
+        if not legal_mask:
+            return None
+        if not must_attack and self.rng.random() < self.pass_chance:
+            return None
+        return self._pick(legal_mask)
+
+    def choose_defense(self, legal_mask: int, attack_card: Card, trump_suit: Suit) -> Optional[int]:
+        if not legal_mask or self.rng.random() < self.pass_chance:
+            return None
+        return self._pick(legal_mask)
+
+
+class GreedyPolicy(BotPolicy):
+    """
+    Жадная стратегия: ходит и отбивается самой младшей подходящей картой,
+    козыри тратит в последнюю очередь и не подкидывает их.
+    """
+
+    name = "greedy"
+
+    @staticmethod
+    def _cheapest(mask: int, trump_suit: Suit) -> Optional[int]:
+        trump_mask = SUIT_MASKS[SUIT_POSITION[trump_suit]]
+        plain = mask & ~trump_mask
+        pool = plain or mask
+        if not pool:
+            return None
+        # Позиция ранга — остаток от деления индекса карты на число рангов
+        return min(iter_indices(pool), key=lambda index: index % RANKS_COUNT)
+
+    def choose_attack(self, legal_mask: int, trump_suit: Suit, must_attack: bool) -> Optional[int]:
+        if not must_attack:
+            legal_mask &= ~SUIT_MASKS[SUIT_POSITION[trump_suit]]
+        return self._cheapest(legal_mask, trump_suit)
+
+    def choose_defense(self, legal_mask: int, attack_card: Card, trump_suit: Suit) -> Optional[int]:
+        return self._cheapest(legal_mask, trump_suit)
+
+
+POLICIES: Dict[str, Type[BotPolicy]] = {
+    RandomPolicy.name: RandomPolicy,
+    GreedyPolicy.name: GreedyPolicy,
+}
+
+
+def make_policy(name: str, rng: Optional[random.Random] = None) -> BotPolicy:
+    """Создаёт стратегию по имени."""
+    try:
+        return POLICIES[name](rng)
+    except KeyError:
+        raise ValueError(f"Неизвестная стратегия бота: {name}") from None
+
@@ -0,0 +1,125 @@
+"""
+Детерминированное воспроизведение партий по журналу ходов (GameEventLog).
+
+Партия создаётся с seed из журнала (колоды после сбросов в лобби — с
+записанными seed этих сбросов), затем к ней по порядку применяются
+записанные события. Отклонённый ввод тоже записан и тоже применяется: правила
+могут менять состояние и при отказе, поэтому только так копия совпадает с
+оригиналом до байта.
+"""
+import logging
+import multiprocessing
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Sequence
+
+from backend.app.contracts.game_contract import PlayerInput
+from backend.app.models.card import card_by_index
+from backend.app.models.deck import ScriptedDeckSource
+from backend.app.models.event_log import GameEventLog
+from backend.app.models.game import FoolGame
+from backend.app.utils.errors import CardGameError
+
+logger = logging.getLogger(__name__)
+
+
+def replay(log: GameEventLog, upto: Optional[int] = None) -> FoolGame:
+    """
+    Восстанавливает партию по журналу.
+
+    Args:
+        log: Журнал партии.
+        upto: Сколько событий применить; None — все.
+
+    Returns:
+        FoolGame: Партия после применения событий (со своим журналом).
+    """
+    game = FoolGame(
+        log.game_id,
+        log.players_limit,
+        seed=log.seed,
+        deck_source=ScriptedDeckSource(log.reset_seeds()),
+    )
+    for number, (player_id, action, attack, defend) in enumerate(log.events()):
+        if upto is not None and number >= upto:
+            break
+        if action is None:
+            game.reset_to_lobby()
+            continue
+        trump_suit = game.deck.trump_suit
+        player_input = PlayerInput(
+            player_id,
+            action,
+            card_by_index(attack, trump_suit) if attack is not None else None,
+            card_by_index(defend, trump_suit) if defend is not None else None,
+        )
+        try:
+            game.handle_input(player_input)
+        except (CardGameError, ValueError):
+            # В оригинале этот ввод тоже завершился ошибкой
+            pass
+    return game
+
+
+@dataclass
+class ReplayReport:
+    """Итог массового воспроизведения: снимки конечных состояний в порядке журналов"""
+
+    games: int = 0
+    events: int = 0
+    elapsed: float = 0.0
+    snapshots: List[bytes] = field(default_factory=list)
+
+    @property
+    def games_per_sec(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def events_per_sec(self) -> float:
+        return self.events / self.elapsed if self.elapsed else 0.0
+
+
+def _replay_snapshot(data: bytes) -> bytes:
+    return replay(GameEventLog.from_bytes(data)).snapshot()
+
+
+def _init_worker(log_level: int) -> None:
+    logging.getLogger("backend.app").setLevel(log_level)
+
+
+def replay_logs(
+    logs: Iterable[bytes],
+    workers: int = 1,
+    chunk_size: int = 200,
+    log_level: int = logging.WARNING,
+) -> ReplayReport:
+    """
+    Воспроизводит журналы (GameEventLog.to_bytes()) и возвращает снимки конечных состояний.
+
+    Сравнение снимков с записанными позволяет проверить, что изменение правил
+    не меняет исход реальных партий.
+
+    Args:
+        logs: Сериализованные журналы.
+        workers: Число процессов; 1 — в текущем процессе.
+        chunk_size: Сколько журналов отдавать процессу за раз.
+        log_level: Уровень логов движка на время воспроизведения.
+    """
+    logs: Sequence[bytes] = list(logs)
+    report = ReplayReport(games=len(logs))
+    report.events = sum(len(GameEventLog.from_bytes(data)) for data in logs)
+
+    app_logger = logging.getLogger("backend.app")
+    previous_level = app_logger.level
+    started = time.perf_counter()
+    if workers <= 1:
+        app_logger.setLevel(log_level)
+        try:
+            report.snapshots = [_replay_snapshot(data) for data in logs]
+        finally:
+            app_logger.setLevel(previous_level)
+    else:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(log_level,)) as pool:
+            report.snapshots = pool.map(_replay_snapshot, logs, chunksize=chunk_size)
+    report.elapsed = time.perf_counter() - started
+    return report
@@ -27,25 +27,21 @@ class DealState(GameState):
     def __init__(self, game: FoolGame):
         self.game: FoolGame = game
 
-    def enter(self) -> None:
-        """Возвращает True если игра завершена"""
+    def enter(self) -> Dict[str, Any]:
+        """Раздаёт карты и сбрасывает статусы готовности"""
         self._deal_cards()
         self.update_player_statuses()
-        # Заглушка для инициации перехода к другому состоянию #TODO: либо убрать состояние DealState либо переписать обработку enter в классе FoolGame
-        self.game.handle_input(
-            player_input=PlayerInput(
-                99,
-                PlayerAction.READY,
-            )
-        )
-        # TODO: обновить возвраты
-        # return {
-        #     "message": "Драка завершена.",
-        #     "table_cards": [str(card) for card in self.game.game_table.table_cards]
-        # }
+        return {
+            "message": "Карты розданы.",
+            "deck_remaining": len(self.game.deck),
+        }
+
+    def auto_transition(self) -> str:
+        """Раздача не ждёт ввода: игра сразу продолжается или заканчивается"""
+        return self._next_state()
 
     def handle_input(self, player_input: PlayerInput) -> StateResponse:
-        if not self._check_win_condition():
+        if self._next_state() != "GameOverState":
             return StateResponse(
                 ActionResult.SUCCESS,
                 "Продолжаем игру",
@@ -57,6 +53,12 @@ class DealState(GameState):
                 ActionResult.GAME_OVER, "Игра окончена", "GameOverState"
             )
 
+    def _next_state(self) -> str:
+        """Следующее состояние: раунд, из которого пришли, или конец игры"""
+        if self._check_win_condition():
+            return "GameOverState"
+        return self.game.state_history[-1]
+
     def exit(self) -> None:
         """Выход из состояния раздачи"""
         # Определение новых ролей если игра продолжается
@@ -29,7 +29,10 @@ class GameOverState(GameState):
 
     def enter(self) -> Dict[str, Any]:
         """Определяет победителя и проигравших и возвращает информацию."""
-        
+        # Объект состояния переиспользуется партией, итог прошлой игры сбрасываем
+        self.winner_id = None
+        self.loser_ids = []
+
         # Находим игрока, у которого не осталось карт
         winner: Player | None = next(
             (p for p in self.game.players if not p.get_cards()), None
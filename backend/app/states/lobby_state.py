@@ -16,7 +16,8 @@ from backend.app.contracts.game_contract import (
     StateResponse,
     StateTransition,
 )
-from backend.app.models.card import Card, Rank, Suit
+from backend.app.models.card import SUIT_POSITION, Card, Rank, Suit
+from backend.app.models.card_set import SUIT_MASKS
 
 
 logger = logging.getLogger(__name__)
@@ -53,9 +54,6 @@ class LobbyState(GameState):
         Returns:
             Dict[str, Any]: Информация о результатах состояния
         """
-        # Подготовка к началу игры
-        # self.game.deck.shuffle()
-
         # Раздача карт игрокам
         for player in self.game.players:
             for _ in range(6):
@@ -64,6 +62,8 @@ class LobbyState(GameState):
         # Определение первого атакующего (у кого наименьший козырь)
         self.game.current_attacker_id = self._determine_first_attacker()
         self.game.current_defender_id = self._determine_defender()
+        # Правила защиты на столе считаются от козыря текущей партии
+        self.game.game_table.trump_suit = self.game.deck.trump_suit
         self._clear_statuses()
         return {
             "message": "Игра начинается!",
@@ -248,22 +248,17 @@ class LobbyState(GameState):
         Returns:
             int: ID первого атакующего игрока
         """
-        trump_suit = self.game.deck.trump_card.suit
-        min_trump_rank = None
+        trump_mask = SUIT_MASKS[SUIT_POSITION[self.game.deck.trump_card.suit]]
+        min_trump_bit = None
         first_attacker_id = None
 
-        # Ищем игрока с наименьшим козырем
+        # Ищем игрока с наименьшим козырем: в пределах масти младший бит — младший ранг
         for player in self.game.players:
-            trump_cards = [
-                card for card in player.get_cards() if card.suit == trump_suit
-            ]
-            if trump_cards:
-                min_player_trump = min(trump_cards, key=lambda card: card.rank.value)
-                if (
-                    min_trump_rank is None
-                    or min_player_trump.rank.value < min_trump_rank
-                ):
-                    min_trump_rank = min_player_trump.rank.value
+            player_trumps = player.hand_mask & trump_mask
+            if player_trumps:
+                lowest_bit = player_trumps & -player_trumps
+                if min_trump_bit is None or lowest_bit < min_trump_bit:
+                    min_trump_bit = lowest_bit
                     first_attacker_id = player.id_
 
         # Если ни у кого нет козырей, выбираем первого игрока
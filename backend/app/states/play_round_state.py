@@ -107,12 +107,11 @@ class PlayRoundWithoutThrowState(GameState):
 
         # Отдаем в руку карты со стола игроку, который не отбился
         if self.game.round_defender_status == PlayerAction.COLLECT:
-            for pair in self.game.game_table.table_cards:
-                for card in pair.items():
-                    pl: Player = self.game.players[self.game.current_defender_idx]
-                    if pl:
-                        pl.add_card(card)
-        logging.debug(f"current defender status is{self.game.round_defender_status}")
+            pl: Player = self.game.players[self.game.current_defender_idx]
+            if pl:
+                for card in self.game.game_table.get_all_cards():
+                    pl.add_card(card)
+        logger.debug("Статус защищающегося: %s", self.game.round_defender_status)
         # self.game.game_table.clear_table()
         return {
             "message": "Драка завершена.",
@@ -209,13 +208,11 @@ class PlayRoundWithoutThrowState(GameState):
         except (TypeError, IndexError):
             attacker = None
         if not attacker or player_input.attack_card not in attacker.get_cards():
-            logger.info(f"Player hand: {[str(c) for c in attacker.get_cards()]}")
-            logger.info(f"Card to play: {player_input.attack_card} (rank={player_input.attack_card.rank} id={id(player_input.attack_card.rank)} type={type(player_input.attack_card.rank)}), (suit={player_input.attack_card.suit} id={id(player_input.attack_card.suit)} type={type(player_input.attack_card.suit)})")
-            for c in attacker.get_cards():
-                logger.info(f"  Card in hand: {c} (rank={c.rank} id={id(c.rank)} type={type(c.rank)}), (suit={c.suit} id={id(c.suit)} type={type(c.suit)})")
-                logger.info(f"    card == c: {player_input.attack_card == c}, card is c: {player_input.attack_card is c}, hash(card): {hash(player_input.attack_card)}, hash(c): {hash(c)}")
-                logger.info(f"    card.rank module: {player_input.attack_card.rank.__module__}, c.rank module: {c.rank.__module__}")
-                logger.info(f"    card.suit module: {player_input.attack_card.suit.__module__}, c.suit module: {c.suit.__module__}")
+            logger.debug(
+                "Карты %s нет в руке атакующего",
+                player_input.attack_card,
+                extra={"event": "rules.card_not_in_hand", "game_id": self.game.game_id, "player_id": player_input.player_id},
+            )
             return StateResponse(ActionResult.INVALID_CARD, "У вас нет такой карты.")
 
         result = self.game.game_table.throw_card(player_input.attack_card)
@@ -235,8 +232,7 @@ class PlayRoundWithoutThrowState(GameState):
         if defender:
             # If the defender is taking cards, the attacker can't throw in more cards than the defender has.
             if self.game.round_defender_status == PlayerAction.COLLECT:
-                attack_cards_on_table = self.game.game_table._get_attack_cards()
-                if len(attack_cards_on_table) >= len(defender.get_cards()):
+                if self.game.game_table.attack_count >= len(defender.get_cards()):
                     return StateResponse(ActionResult.TABLE_FULL, "Нельзя подкинуть больше карт, чем есть у защищающегося.")
             # If the defender is still playing, they must have enough cards to beat the new attack.
             else:
@@ -322,18 +318,7 @@ class PlayRoundWithoutThrowState(GameState):
         Returns:
             bool: True, если может отбить ещё, иначе False
         """
-        if len(self.game.game_table.table_cards) == 0:
-            return True
-        elif len(defender_cards) < len(
-            [
-                card["attack_card"]
-                for card in self.game.game_table.table_cards
-                if card["defend_card"] is None
-            ]
-        ):
-            return False
-        else:
-            return True
+        return len(defender_cards) >= self.game.game_table.uncovered_count
 
     def _handle_player_quit_action(self, player_input: PlayerInput) -> StateResponse:
         if pl := self.game.get_player_by_id(player_input.player_id):
@@ -358,20 +343,14 @@ class PlayRoundWithoutThrowState(GameState):
         Returns:
             bool: True, если все карты отбиты, иначе False
         """
-        if not all(
-            card.get("defend_card") for card in self.game.game_table.table_cards
-        ):
+        if not self.game.game_table.is_all_covered:
             return False
         self.game.round_defender_status = PlayerAction.DEFEND
         return True
 
     def _are_all_cards_on_table_defended(self) -> bool:
         """Проверяет, все ли карты на столе отбиты, без побочных эффектов."""
-        if not self.game.game_table.table_cards:
-            return True
-        return all(
-            card.get("defend_card") for card in self.game.game_table.table_cards
-        )
+        return self.game.game_table.is_all_covered
 
     def get_allowed_actions(self) -> Dict[str, List[str]]:
         """
@@ -419,10 +398,14 @@ class PlayRoundWithoutThrowState(GameState):
             "table_cards": self.game.game_table.table_cards,
         }
 
-    class PlayRoundWithThrowState(GameState, ExtraThrowActionMixin):
-        """
-        Состояние игры с использованием дополнительного броска карты
-        """
 
-        def __init__(self, game: FoolGame):
-            super().__init__(game)
+class PlayRoundWithThrowState(GameState, ExtraThrowActionMixin):
+    """
+    Состояние игры с использованием дополнительного броска карты
+
+    Заготовка: enter/exit/handle_input не реализованы, поэтому в графе
+    состояний (backend.app.states.registry) её нет.
+    """
+
+    def __init__(self, game: FoolGame):
+        super().__init__(game)
@@ -0,0 +1,83 @@
+"""
+Граф состояний игры.
+
+Состояние сообщает о переходе именем в StateResponse.next_state; граф
+сопоставляет имя классу и хранит, куда из какого состояния можно перейти.
+Строится один раз при импорте, поиск класса и проверка перехода — словари.
+
+Сброс партии в лобби (FoolGame.reset_to_lobby) идёт мимо графа: он разрешён
+из любого состояния и не является ответом на ввод.
+
+PlayRoundWithThrowState (раунд с подкидыванием) в граф не входит: это
+заготовка без enter/exit/handle_input, создать её нельзя, и ни одно
+состояние в неё не переходит. Пока её нет в графе, next_state с этим именем
+отклоняется как неизвестное состояние, а не падает на создании класса.
+"""
+from enum import Enum
+from typing import Dict, FrozenSet, Iterable, List, Optional, Type
+
+from backend.app.states.deal_state import DealState
+from backend.app.states.game_over import GameOverState
+from backend.app.states.lobby_state import LobbyState
+from backend.app.states.play_round_state import PlayRoundWithoutThrowState
+from backend.app.utils.game_interface import GameState
+
+
+class StateName(str, Enum):
+    """Имена состояний (совпадают с именами классов и значениями next_state)"""
+
+    LOBBY = "LobbyState"
+    DEAL = "DealState"
+    PLAY_ROUND = "PlayRoundWithoutThrowState"
+    GAME_OVER = "GameOverState"
+
+    # Ключ словаря должен совпадать с обычной строкой того же значения
+    __hash__ = str.__hash__
+
+
+class StateGraph:
+    """Реестр состояний: имя -> класс и допустимые следующие состояния"""
+
+    def __init__(self) -> None:
+        self.classes: Dict[str, Type[GameState]] = {}
+        self.transitions: Dict[str, FrozenSet[str]] = {}
+
+    def register(self, name: str, state_cls: Type[GameState], next_states: Iterable[str] = ()) -> None:
+        """Регистрирует состояние и переходы из него."""
+        name = str(getattr(name, "value", name))
+        if name in self.classes:
+            raise ValueError(f"Состояние {name} уже зарегистрировано")
+        self.classes[name] = state_cls
+        self.transitions[name] = frozenset(str(getattr(state, "value", state)) for state in next_states)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.classes
+
+    def get_class(self, name: str) -> Optional[Type[GameState]]:
+        """Класс состояния по имени; None — состояние не зарегистрировано."""
+        return self.classes.get(name)
+
+    def can_transition(self, current: str, target: str) -> bool:
+        """Разрешён ли переход current -> target."""
+        return target in self.transitions.get(current, ())
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Граф переходов {состояние: [следующие состояния]} для инструментов."""
+        return {name: sorted(targets) for name, targets in self.transitions.items()}
+
+    def to_dot(self) -> str:
+        """Граф переходов в формате Graphviz."""
+        lines = ["digraph FoolGame {"]
+        for name, targets in self.to_dict().items():
+            lines.append(f'    "{name}";')
+            lines.extend(f'    "{name}" -> "{target}";' for target in targets)
+        lines.append("}")
+        return "\n".join(lines)
+
+
+STATE_GRAPH = StateGraph()
+STATE_GRAPH.register(StateName.LOBBY, LobbyState, [StateName.PLAY_ROUND])
+STATE_GRAPH.register(StateName.PLAY_ROUND, PlayRoundWithoutThrowState, [StateName.DEAL, StateName.GAME_OVER])
+# После раздачи игра возвращается в раунд, из которого пришла, или заканчивается
+STATE_GRAPH.register(StateName.DEAL, DealState, [StateName.PLAY_ROUND, StateName.GAME_OVER])
+STATE_GRAPH.register(StateName.GAME_OVER, GameOverState)
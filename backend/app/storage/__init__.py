@@ -0,0 +1,12 @@
+from backend.app.storage.game_store import (
+    GameStore,
+    InMemoryGameStore,
+    KeyValueGameStore,
+    open_game_store,
+)
+from backend.app.storage.snapshot_store import (
+    FileSnapshotStore,
+    SnapshotStore,
+    SQLiteSnapshotStore,
+    open_snapshot_store,
+)
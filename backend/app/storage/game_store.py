@@ -0,0 +1,435 @@
+"""
+Хранилище игр GameManager.
+
+InMemoryGameStore держит партии объектами в словарях процесса. KeyValueGameStore
+хранит снимки партий и индекс игроков в Redis (или совместимом сервере, см.
+kv_server), поэтому партии переживают перезапуск и доступны другим узлам API.
+"""
+import logging
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Set, Tuple
+
+from backend.app.models.deck import DeckSource
+from backend.app.models.event_log import GameEventLog
+from backend.app.models.game import FoolGame
+
+logger = logging.getLogger(__name__)
+
+
+class GameStore(ABC):
+    """
+    Партии менеджера: ожидающие игроков (pending), идущие (active) и
+    привязка player_id -> game_id.
+
+    Объект, полученный из хранилища, меняется на месте; после изменения
+    менеджер вызывает save(), чтобы хранилище записало новое состояние.
+    """
+
+    pending: Mapping[str, FoolGame]  # Игры, ожидающие игроков
+    active: Mapping[str, FoolGame]  # Игры, которые идут
+
+    @abstractmethod
+    def get(self, game_id: str) -> Optional[FoolGame]:
+        """Партия по id из любого списка или None."""
+
+    @abstractmethod
+    def add(self, game: FoolGame, pending: bool) -> None:
+        """Добавляет партию в список ожидающих или идущих."""
+
+    @abstractmethod
+    def move(self, game_id: str, pending: bool) -> None:
+        """Переносит партию между ожидающими и идущими."""
+
+    @abstractmethod
+    def save(self, game: FoolGame) -> None:
+        """Записывает изменённое состояние партии."""
+
+    @abstractmethod
+    def remove(self, game_id: str) -> None:
+        """Удаляет партию."""
+
+    @abstractmethod
+    def player_game(self, player_id: str) -> Optional[str]:
+        """Id партии, в которой числится игрок."""
+
+    @abstractmethod
+    def bind_player(self, player_id: str, game_id: str) -> None:
+        """Привязывает игрока к партии."""
+
+    @abstractmethod
+    def unbind_player(self, player_id: str) -> None:
+        """Удаляет привязку игрока, если она есть."""
+
+    def evict(self, game_id: str) -> bool:
+        """
+        Выгружает партию из памяти процесса, если хранилище само поднимет её
+        при следующем get().
+
+        Returns:
+            bool: False — партия живёт только в памяти и выгружать её некуда.
+        """
+        return False
+
+    def flush(self) -> None:
+        """Дожидается отправки отложенных записей, если хранилище их откладывает."""
+
+    def close(self) -> None:
+        """Освобождает ресурсы хранилища."""
+
+
+class InMemoryGameStore(GameStore):
+    """Партии в словарях процесса; save() ничего не делает — объект и есть состояние"""
+
+    def __init__(self) -> None:
+        self.pending: Dict[str, FoolGame] = {}
+        self.active: Dict[str, FoolGame] = {}
+        self.players: Dict[str, str] = {}  # Связь player_id -> game_id
+
+    def get(self, game_id: str) -> Optional[FoolGame]:
+        return self.active.get(game_id) or self.pending.get(game_id)
+
+    def add(self, game: FoolGame, pending: bool) -> None:
+        self.remove(game.game_id)
+        (self.pending if pending else self.active)[game.game_id] = game
+
+    def move(self, game_id: str, pending: bool) -> None:
+        source, target = (self.active, self.pending) if pending else (self.pending, self.active)
+        if game_id in source:
+            target[game_id] = source.pop(game_id)
+
+    def save(self, game: FoolGame) -> None:
+        pass
+
+    def remove(self, game_id: str) -> None:
+        self.pending.pop(game_id, None)
+        self.active.pop(game_id, None)
+
+    def player_game(self, player_id: str) -> Optional[str]:
+        return self.players.get(player_id)
+
+    def bind_player(self, player_id: str, game_id: str) -> None:
+        self.players[player_id] = game_id
+
+    def unbind_player(self, player_id: str) -> None:
+        self.players.pop(player_id, None)
+
+
+class _GamesView(Mapping):
+    """Список партий KeyValueGameStore (локальная копия множества id) как словарь"""
+
+    def __init__(self, store: "KeyValueGameStore", ids: Dict[str, None]) -> None:
+        self._store = store
+        self._ids = ids
+
+    def __getitem__(self, game_id: str) -> FoolGame:
+        game = self._store.get(game_id) if game_id in self._ids else None
+        if game is None:
+            raise KeyError(game_id)
+        return game
+
+    def __contains__(self, game_id: object) -> bool:
+        return game_id in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._ids))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class KeyValueGameStore(GameStore):
+    """
+    Партии в хранилище ключ-значение с протоколом Redis.
+
+    Ключи (prefix по умолчанию "fool:"):
+        game:<id>     — снимок партии (FoolGame.snapshot())
+        log:<id>      — заголовок журнала ходов партии (GameEventLog.head_bytes())
+        events:<id>   — события журнала; save() дописывает к ним только новые (APPEND)
+        version:<id>  — номер записи снимка, растёт при каждом save()
+        pending, active — множества id партий
+        players       — хэш player_id -> game_id
+
+    Клиент синхронный, поэтому на горячем пути запросов к серверу нет:
+
+    - Запись отложенная: add/save/move/remove и привязки игроков сразу
+      меняют локальное состояние, а команды уходят на сервер из отдельного
+      потока по порядку. flush() дожидается их отправки.
+    - Записанные и прочитанные партии остаются в кэше. Номер записи
+      сверяется в потоке записи не чаще раза в revalidate_after секунд на
+      партию; если партию записал другой узел, следующий get() поднимает её
+      снимок заново. Блокирующее чтение остаётся только для партии, которой
+      нет в кэше.
+    - Списки pending/active и привязки игроков читаются с сервера один раз
+      (при создании хранилища и при первом обращении к игроку) и дальше
+      ведутся локально, так что лобби перечисляется без запросов. Изменения,
+      сделанные другими узлами после этого, в списках не видны.
+
+    Блокировок между узлами нет — партию должен менять один узел (например,
+    шард-владелец, см. backend.api.sharding).
+
+    Args:
+        client: Синхронный клиент redis-py (или совместимый).
+        deck_source: Источник колод для поднятых из снимков партий.
+        revalidate_after: Как часто сверять номер записи партии из кэша, секунды.
+        clock: Источник времени (для тестов).
+    """
+
+    def __init__(
+        self,
+        client,
+        prefix: str = "fool:",
+        deck_source: Optional[DeckSource] = None,
+        revalidate_after: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.client = client
+        self.prefix = prefix
+        self.deck_source = deck_source
+        self.revalidate_after = revalidate_after
+        self.clock = clock
+        self._pending_key = f"{prefix}pending"
+        self._active_key = f"{prefix}active"
+        self._players_key = f"{prefix}players"
+        self._cache: Dict[str, Tuple[FoolGame, float]] = {}  # {game_id: (партия, время последней сверки)}
+        self._versions: Dict[str, int] = {}  # {game_id: номер последней записи этого узла}
+        self._stale: Set[str] = set()  # Партии, которые с тех пор записал другой узел
+        self._players: Dict[str, Optional[str]] = {}  # Известные привязки player_id -> game_id
+        # {game_id: (журнал, байт событий и число игроков в нём на момент последней записи)}
+        self._logged: Dict[str, Tuple[GameEventLog, int, int]] = {}
+        self._pending_ids: Dict[str, None] = dict.fromkeys(self._members(self._pending_key))
+        self._active_ids: Dict[str, None] = dict.fromkeys(self._members(self._active_key))
+        self.pending = _GamesView(self, self._pending_ids)
+        self.active = _GamesView(self, self._active_ids)
+        self._writes: "queue.Queue[Optional[Callable[[], None]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="game-store-writer", daemon=True)
+        self._writer.start()
+
+    def _members(self, key: str) -> List[str]:
+        return sorted(member.decode() for member in self.client.smembers(key))
+
+    def _game_key(self, game_id: str) -> str:
+        return f"{self.prefix}game:{game_id}"
+
+    def _log_key(self, game_id: str) -> str:
+        return f"{self.prefix}log:{game_id}"
+
+    def _events_key(self, game_id: str) -> str:
+        return f"{self.prefix}events:{game_id}"
+
+    def _version_key(self, game_id: str) -> str:
+        return f"{self.prefix}version:{game_id}"
+
+    def _write_loop(self) -> None:
+        """Поток записи: выполняет отложенные команды по порядку."""
+        while True:
+            write = self._writes.get()
+            try:
+                if write is None:
+                    return
+                write()
+            except Exception as e:
+                logger.error("Не удалось выполнить запись в хранилище игр: %s", e)
+            finally:
+                self._writes.task_done()
+
+    def _submit(self, write: Callable[[], None]) -> None:
+        self._writes.put(write)
+
+    def flush(self) -> None:
+        self._writes.join()
+
+    def _write_game(self, game: FoolGame, sets: Tuple[Tuple[str, str], ...] = ()) -> None:
+        """Ставит в очередь запись снимка и журнала партии (и перенос между множествами)."""
+        game_id = game.game_id
+        snapshot = game.snapshot()
+        head, events, append = self._log_delta(game_id, game.event_log, game_id in self._stale)
+        self._stale.discard(game_id)
+        self._cache[game_id] = (game, self.clock())
+
+        def write() -> None:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.set(self._game_key(game_id), snapshot)
+            pipe.incr(self._version_key(game_id))
+            if events is None:
+                pipe.delete(self._log_key(game_id), self._events_key(game_id))
+            else:
+                if head is not None:
+                    pipe.set(self._log_key(game_id), head)
+                if not append:
+                    pipe.set(self._events_key(game_id), events)
+                elif events:
+                    pipe.append(self._events_key(game_id), events)
+            for target, other in sets:
+                pipe.sadd(target, game_id)
+                pipe.srem(other, game_id)
+            self._versions[game_id] = pipe.execute()[1]
+
+        self._submit(write)
+
+    def _log_delta(
+        self, game_id: str, event_log: Optional[GameEventLog], rewrite: bool = False
+    ) -> Tuple[Optional[bytes], Optional[bytes], bool]:
+        """
+        Что записать из журнала партии: (заголовок или None, если он не
+        изменился; события или None, если журнала нет; дописать ли события к
+        записанным). Журнал растёт только в конец, поэтому после первой записи
+        уходят лишь новые события, а заголовок — когда в журнале появился новый
+        игрок. rewrite — записать журнал целиком (партию мог менять другой узел).
+        """
+        if event_log is None:
+            self._logged.pop(game_id, None)
+            return None, None, False
+        size, players = event_log.events_size, len(event_log.player_ids)
+        logged = self._logged.get(game_id)
+        self._logged[game_id] = (event_log, size, players)
+        if rewrite or logged is None or logged[0] is not event_log or logged[1] > size:
+            return event_log.head_bytes(), event_log.events_bytes(), False
+        head = event_log.head_bytes() if logged[2] != players else None
+        return head, event_log.events_bytes(logged[1]), True
+
+    def _revalidate(self, game_id: str) -> None:
+        """Ставит в очередь сверку номера записи партии из кэша."""
+
+        def check() -> None:
+            version = self.client.get(self._version_key(game_id))
+            if version is None or int(version) != self._versions.get(game_id):
+                self._stale.add(game_id)
+
+        self._submit(check)
+
+    def get(self, game_id: str) -> Optional[FoolGame]:
+        cached = self._cache.get(game_id)
+        if cached is not None and game_id not in self._stale:
+            game, checked_at = cached
+            now = self.clock()
+            if now - checked_at >= self.revalidate_after:
+                self._cache[game_id] = (game, now)
+                self._revalidate(game_id)
+            return game
+        return self._load(game_id)
+
+    def _load(self, game_id: str) -> Optional[FoolGame]:
+        """Поднимает партию с сервера; отложенные записи сначала отправляются."""
+        self.flush()
+        self._stale.discard(game_id)
+        self._cache.pop(game_id, None)
+        self._logged.pop(game_id, None)
+        version, data, log_head, log_events = self.client.mget(
+            self._version_key(game_id), self._game_key(game_id), self._log_key(game_id), self._events_key(game_id)
+        )
+        if version is None or data is None:
+            return None
+        try:
+            game = FoolGame.restore(data)
+            if log_head is not None and log_events is not None:
+                game.event_log = GameEventLog.from_parts(log_head, log_events)
+            elif log_head is not None:
+                # Журнал, записанный целиком (to_bytes) до разделения на части
+                game.event_log = GameEventLog.from_bytes(log_head)
+        except ValueError as e:
+            logger.error("Снимок игры %s в хранилище повреждён: %s", game_id, e)
+            return None
+        if game.event_log is not None and log_events is not None:
+            event_log = game.event_log
+            self._logged[game_id] = (event_log, event_log.events_size, len(event_log.player_ids))
+        game.deck.source = self.deck_source
+        self._versions[game_id] = int(version)
+        self._cache[game_id] = (game, self.clock())
+        return game
+
+    def _place(self, game_id: str, pending: bool) -> Tuple[str, str]:
+        """Переносит id партии между локальными множествами; возвращает (куда, откуда) на сервере."""
+        if pending:
+            self._active_ids.pop(game_id, None)
+            self._pending_ids[game_id] = None
+            return self._pending_key, self._active_key
+        self._pending_ids.pop(game_id, None)
+        self._active_ids[game_id] = None
+        return self._active_key, self._pending_key
+
+    def add(self, game: FoolGame, pending: bool) -> None:
+        self._write_game(game, (self._place(game.game_id, pending),))
+
+    def move(self, game_id: str, pending: bool) -> None:
+        if game_id not in (self.active if pending else self.pending):
+            return
+        target, other = self._place(game_id, pending)
+
+        def write() -> None:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.srem(other, game_id)
+            pipe.sadd(target, game_id)
+            pipe.execute()
+
+        self._submit(write)
+
+    def save(self, game: FoolGame) -> None:
+        self._write_game(game)
+
+    def remove(self, game_id: str) -> None:
+        self._pending_ids.pop(game_id, None)
+        self._active_ids.pop(game_id, None)
+        self._cache.pop(game_id, None)
+        self._stale.discard(game_id)
+        self._logged.pop(game_id, None)
+
+        def write() -> None:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.delete(
+                self._game_key(game_id), self._log_key(game_id), self._events_key(game_id), self._version_key(game_id)
+            )
+            pipe.srem(self._pending_key, game_id)
+            pipe.srem(self._active_key, game_id)
+            pipe.execute()
+            self._versions.pop(game_id, None)
+
+        self._submit(write)
+
+    def evict(self, game_id: str) -> bool:
+        self._cache.pop(game_id, None)
+        self._logged.pop(game_id, None)
+        return True
+
+    def player_game(self, player_id: str) -> Optional[str]:
+        if player_id not in self._players:
+            game_id = self.client.hget(self._players_key, player_id)
+            self._players[player_id] = game_id.decode() if game_id is not None else None
+        return self._players[player_id]
+
+    def bind_player(self, player_id: str, game_id: str) -> None:
+        self._players[player_id] = game_id
+        self._submit(lambda: self.client.hset(self._players_key, player_id, game_id))
+
+    def unbind_player(self, player_id: str) -> None:
+        self._players[player_id] = None
+        self._submit(lambda: self.client.hdel(self._players_key, player_id))
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._writes.put(None)
+            self._writer.join()
+        self._cache.clear()
+        self.client.close()
+
+
+def open_game_store(url: Optional[str], deck_source: Optional[DeckSource] = None) -> GameStore:
+    """
+    Создаёт хранилище игр по адресу из настроек.
+
+    Args:
+        url: "redis://хост:порт/база" или None — партии в памяти процесса.
+        deck_source: Источник колод для партий, поднятых из хранилища.
+    """
+    if not url:
+        return InMemoryGameStore()
+    scheme, sep, location = url.partition("://")
+    if not sep or not location:
+        raise ValueError(f"Некорректный адрес хранилища игр: {url!r}")
+    if scheme in ("redis", "rediss"):
+        import redis
+
+        return KeyValueGameStore(redis.Redis.from_url(url), deck_source=deck_source)
+    raise ValueError(f"Неизвестный тип хранилища игр: {scheme!r}")
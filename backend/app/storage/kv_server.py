@@ -0,0 +1,327 @@
+"""
+Локальная замена Redis для разработки и тестов.
+
+Небольшой TCP-сервер, понимающий протокол RESP и подмножество команд Redis,
+которое использует KeyValueGameStore: строки, счётчики, хэши и множества.
+Данные живут в памяти процесса. redis-py подключается к нему как к обычному
+Redis, поэтому хранилище проверяется тем же клиентом, что и в проде.
+
+    python -m backend.app.storage.kv_server --port 6380
+"""
+import argparse
+import logging
+import socketserver
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+Value = Union[bytes, Dict[bytes, bytes], Set[bytes]]
+Reply = Union[None, int, bytes, str, list, dict, "KVError"]
+
+
+class KVError(Exception):
+    """Ошибка команды; уходит клиенту как -ERR"""
+
+
+class KVData:
+    """Данные сервера и исполнение команд; один замок на всё хранилище"""
+
+    def __init__(self) -> None:
+        self._data: Dict[bytes, Value] = {}
+        self._lock = threading.Lock()
+        self._commands: Dict[bytes, Callable[..., Reply]] = {
+            name[4:].upper().encode(): getattr(self, name) for name in dir(self) if name.startswith("cmd_")
+        }
+
+    def execute(self, args: List[bytes]) -> Reply:
+        """Выполняет команду [имя, аргументы...] и возвращает ответ."""
+        handler = self._commands.get(args[0].upper())
+        if handler is None:
+            return KVError(f"unknown command '{args[0].decode(errors='replace')}'")
+        with self._lock:
+            try:
+                return handler(*args[1:])
+            except TypeError:
+                return KVError(f"wrong number of arguments for '{args[0].decode(errors='replace').lower()}' command")
+            except KVError as e:
+                return e
+
+    def _typed(self, key: bytes, kind: type, create: bool = False):
+        value = self._data.get(key)
+        if value is None:
+            if not create:
+                return None
+            value = self._data[key] = kind()
+        if not isinstance(value, kind):
+            raise KVError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    # Служебные команды, которые redis-py шлёт при подключении
+
+    def cmd_ping(self, message: Optional[bytes] = None) -> Reply:
+        return message if message is not None else "PONG"
+
+    def cmd_client(self, *args: bytes) -> Reply:
+        return "OK"
+
+    def cmd_select(self, index: bytes) -> Reply:
+        if index != b"0":
+            raise KVError("only database 0 is supported")
+        return "OK"
+
+    def cmd_flushdb(self, *args: bytes) -> Reply:
+        self._data.clear()
+        return "OK"
+
+    def cmd_dbsize(self) -> Reply:
+        return len(self._data)
+
+    # Строки и ключи
+
+    def cmd_get(self, key: bytes) -> Reply:
+        return self._typed(key, bytes)
+
+    def cmd_mget(self, *keys: bytes) -> Reply:
+        if not keys:
+            raise TypeError
+        return [value if isinstance(value, bytes) else None for value in map(self._data.get, keys)]
+
+    def cmd_set(self, key: bytes, value: bytes) -> Reply:
+        self._data[key] = value
+        return "OK"
+
+    def cmd_append(self, key: bytes, value: bytes) -> Reply:
+        data = (self._typed(key, bytes) or b"") + value
+        self._data[key] = data
+        return len(data)
+
+    def cmd_incr(self, key: bytes) -> Reply:
+        return self.cmd_incrby(key, b"1")
+
+    def cmd_incrby(self, key: bytes, increment: bytes) -> Reply:
+        current = self._typed(key, bytes)
+        try:
+            number = int(current or b"0") + int(increment)
+        except ValueError:
+            raise KVError("value is not an integer or out of range")
+        self._data[key] = str(number).encode()
+        return number
+
+    def cmd_del(self, *keys: bytes) -> Reply:
+        if not keys:
+            raise TypeError
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def cmd_exists(self, *keys: bytes) -> Reply:
+        if not keys:
+            raise TypeError
+        return sum(key in self._data for key in keys)
+
+    def cmd_keys(self, pattern: bytes) -> Reply:
+        # Поддерживается только шаблон вида "префикс*"
+        prefix = pattern[:-1] if pattern.endswith(b"*") else pattern
+        return [key for key in self._data if key.startswith(prefix) and (pattern.endswith(b"*") or key == pattern)]
+
+    # Хэши
+
+    def cmd_hset(self, key: bytes, *pairs: bytes) -> Reply:
+        if not pairs or len(pairs) % 2:
+            raise TypeError
+        hash_ = self._typed(key, dict, create=True)
+        added = 0
+        for field, value in zip(pairs[::2], pairs[1::2]):
+            added += field not in hash_
+            hash_[field] = value
+        return added
+
+    def cmd_hget(self, key: bytes, field: bytes) -> Reply:
+        hash_ = self._typed(key, dict)
+        return hash_.get(field) if hash_ else None
+
+    def cmd_hdel(self, key: bytes, *fields: bytes) -> Reply:
+        if not fields:
+            raise TypeError
+        hash_ = self._typed(key, dict)
+        if not hash_:
+            return 0
+        removed = sum(hash_.pop(field, None) is not None for field in fields)
+        if not hash_:
+            del self._data[key]
+        return removed
+
+    def cmd_hgetall(self, key: bytes) -> Reply:
+        hash_ = self._typed(key, dict) or {}
+        return [item for pair in hash_.items() for item in pair]
+
+    def cmd_hlen(self, key: bytes) -> Reply:
+        return len(self._typed(key, dict) or ())
+
+    # Множества
+
+    def cmd_sadd(self, key: bytes, *members: bytes) -> Reply:
+        if not members:
+            raise TypeError
+        set_ = self._typed(key, set, create=True)
+        before = len(set_)
+        set_.update(members)
+        return len(set_) - before
+
+    def cmd_srem(self, key: bytes, *members: bytes) -> Reply:
+        if not members:
+            raise TypeError
+        set_ = self._typed(key, set)
+        if not set_:
+            return 0
+        before = len(set_)
+        set_.difference_update(members)
+        if not set_:
+            del self._data[key]
+        return before - len(set_)
+
+    def cmd_sismember(self, key: bytes, member: bytes) -> Reply:
+        return int(member in (self._typed(key, set) or ()))
+
+    def cmd_smembers(self, key: bytes) -> Reply:
+        return list(self._typed(key, set) or ())
+
+    def cmd_scard(self, key: bytes) -> Reply:
+        return len(self._typed(key, set) or ())
+
+
+def encode_reply(reply: Reply, protocol: int = 2) -> bytes:
+    """Кодирует ответ в RESP2 или RESP3 (в RESP3 отличаются null и map)."""
+    if reply is None:
+        return b"_\r\n" if protocol == 3 else b"$-1\r\n"
+    if isinstance(reply, KVError):
+        message = str(reply)
+        prefix = "" if message.startswith("WRONGTYPE") else "ERR "
+        return f"-{prefix}{message}\r\n".encode()
+    if isinstance(reply, str):
+        return f"+{reply}\r\n".encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    if isinstance(reply, dict):
+        items = [item for pair in reply.items() for item in pair]
+        if protocol != 3:
+            return encode_reply(items)
+        return b"%%%d\r\n" % len(reply) + b"".join(encode_reply(item, protocol) for item in items)
+    return b"*%d\r\n" % len(reply) + b"".join(encode_reply(item, protocol) for item in reply)
+
+
+def read_command(stream) -> Optional[List[bytes]]:
+    """
+    Читает одну команду: массив bulk-строк или inline-строку (как из telnet).
+
+    Returns:
+        Optional[List[bytes]]: Имя и аргументы; None — клиент закрыл соединение.
+    """
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.rstrip(b"\r\n")
+        if not line:
+            continue
+        if not line.startswith(b"*"):
+            return line.split()
+        args = []
+        for _ in range(int(line[1:])):
+            header = stream.readline()
+            if not header.startswith(b"$"):
+                raise KVError("Protocol error: expected '$'")
+            size = int(header[1:])
+            args.append(stream.read(size + 2)[:size])
+        if args:
+            return args
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "KVServer"
+
+    def handle(self) -> None:
+        protocol = 2
+        while True:
+            try:
+                args = read_command(self.rfile)
+            except (KVError, ValueError) as e:
+                self.wfile.write(encode_reply(KVError(str(e))))
+                return
+            except ConnectionError:
+                return
+            if args is None:
+                return
+            if args[0].upper() == b"QUIT":
+                self.wfile.write(encode_reply("OK"))
+                return
+            if args[0].upper() == b"HELLO":
+                # redis-py по умолчанию договаривается о RESP3
+                requested = args[1] if len(args) > 1 else str(protocol).encode()
+                if requested not in (b"2", b"3"):
+                    self.wfile.write(b"-NOPROTO unsupported protocol version\r\n")
+                    continue
+                protocol = int(requested)
+                hello = {"server": "fool-kv", "version": "7.0.0", "proto": protocol, "id": 1, "mode": "standalone"}
+                self.wfile.write(encode_reply(hello, protocol))
+                continue
+            self.wfile.write(encode_reply(self.server.data.execute(args), protocol))
+
+
+class KVServer(socketserver.ThreadingTCPServer):
+    """
+    TCP-сервер хранилища: поток на соединение, данные общие.
+
+    Args:
+        address: (хост, порт); порт 0 — выбрать свободный (см. port).
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int] = ("127.0.0.1", 0)) -> None:
+        super().__init__(address, _Handler)
+        self.data = KVData()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.server_address[0]}:{self.port}/0"
+
+    def start(self) -> "KVServer":
+        """Запускает сервер в фоновом потоке."""
+        self._thread = threading.Thread(target=self.serve_forever, name="kv-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер и закрывает сокет."""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Локальная замена Redis для игрового сервера")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with KVServer((args.host, args.port)) as server:
+        logger.info(f"Хранилище слушает {server.url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
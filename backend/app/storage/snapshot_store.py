@@ -0,0 +1,140 @@
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotStore(ABC):
+    """
+    Хранилище снимков партий (FoolGame.snapshot()).
+
+    Хранит последний снимок каждой партии по game_id. Реализации должны
+    выдерживать запись после каждого хода.
+    """
+
+    @abstractmethod
+    def save(self, game_id: str, data: bytes) -> None:
+        """Сохраняет снимок партии, заменяя предыдущий."""
+
+    @abstractmethod
+    def load(self, game_id: str) -> Optional[bytes]:
+        """Возвращает последний снимок партии или None."""
+
+    @abstractmethod
+    def delete(self, game_id: str) -> None:
+        """Удаляет снимок партии, если он есть."""
+
+    @abstractmethod
+    def game_ids(self) -> Iterator[str]:
+        """Перебирает id партий, для которых есть снимки."""
+
+    def close(self) -> None:
+        """Освобождает ресурсы хранилища."""
+
+
+class FileSnapshotStore(SnapshotStore):
+    """Снимки в файлах <game_id>.snap одной директории; запись атомарная через rename"""
+
+    SUFFIX = ".snap"
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, game_id: str) -> Path:
+        if not game_id or os.sep in game_id or game_id.startswith("."):
+            raise ValueError(f"Недопустимый game_id для файлового хранилища: {game_id!r}")
+        return self.directory / f"{game_id}{self.SUFFIX}"
+
+    def save(self, game_id: str, data: bytes) -> None:
+        path = self._path(game_id)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def load(self, game_id: str) -> Optional[bytes]:
+        try:
+            return self._path(game_id).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, game_id: str) -> None:
+        try:
+            self._path(game_id).unlink()
+        except FileNotFoundError:
+            pass
+
+    def game_ids(self) -> Iterator[str]:
+        for path in self.directory.glob(f"*{self.SUFFIX}"):
+            yield path.stem
+
+
+class SQLiteSnapshotStore(SnapshotStore):
+    """Снимки в таблице SQLite; WAL и synchronous=NORMAL, чтобы запись после хода была дешёвой"""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS game_snapshots ("
+            "game_id TEXT PRIMARY KEY, data BLOB NOT NULL)"
+        )
+
+    def save(self, game_id: str, data: bytes) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO game_snapshots (game_id, data) VALUES (?, ?)",
+                (game_id, data),
+            )
+
+    def load(self, game_id: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM game_snapshots WHERE game_id = ?", (game_id,)
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def delete(self, game_id: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM game_snapshots WHERE game_id = ?", (game_id,))
+
+    def game_ids(self) -> Iterator[str]:
+        with self._lock:
+            rows = self._connection.execute("SELECT game_id FROM game_snapshots").fetchall()
+        for (game_id,) in rows:
+            yield game_id
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def open_snapshot_store(url: Optional[str]) -> Optional[SnapshotStore]:
+    """
+    Создаёт хранилище по адресу из настроек.
+
+    Args:
+        url: "sqlite:///путь/к/файлу.db", "file:///путь/к/директории" или None.
+
+    Returns:
+        Optional[SnapshotStore]: Хранилище или None, если адрес не задан.
+    """
+    if not url:
+        return None
+    scheme, sep, location = url.partition("://")
+    if not sep or not location:
+        raise ValueError(f"Некорректный адрес хранилища снимков: {url!r}")
+    if scheme == "sqlite":
+        return SQLiteSnapshotStore(location)
+    if scheme == "file":
+        return FileSnapshotStore(location)
+    raise ValueError(f"Неизвестный тип хранилища снимков: {scheme!r}")
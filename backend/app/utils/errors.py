@@ -45,6 +45,12 @@ class CardAlreadyOnTableError(GameLogicError):
         message = f"Карта {card} уже на столе"
         super().__init__(message=message, error_code="CARD_ALREADY_ON_TABLE")
 
+class CardAlreadyCoveredError(GameLogicError):
+    """Ошибка: атакующая карта уже покрыта"""
+    def __init__(self, card):
+        message = f"Карта {card} уже покрыта"
+        super().__init__(message=message, error_code="CARD_ALREADY_COVERED")
+
 class NoFreeSlotsError(GameLogicError):
     """Ошибка: нет свободных слотов на столе"""
     def __init__(self):
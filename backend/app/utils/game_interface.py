@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
 from backend.app.contracts.game_contract import PlayerInput, PlayerAction, ActionResult, StateResponse, StateTransition
+from backend.app.utils.profiling import profiled
 
 class Game(ABC):
     @abstractmethod
@@ -21,6 +22,13 @@ class GameState(ABC):
     def __init__(self, game: Game) -> None:
         self.game: Game = game
     """Абстрактный базовый класс для всех состояний игры с улучшенным интерфейсом"""
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        # enter/exit каждого состояния попадают в замеры профилировщика
+        super().__init_subclass__(**kwargs)
+        for method in ("enter", "exit"):
+            if method in cls.__dict__:
+                setattr(cls, method, profiled()(cls.__dict__[method]))
     
     @abstractmethod
     def enter(self) -> Dict[str, Any]:
@@ -66,6 +74,16 @@ class GameState(ABC):
     #     """
 
 
+    def auto_transition(self) -> Optional[str]:
+        """
+        Вызывается сразу после enter(): переходное состояние возвращает имя
+        следующего состояния, и игра переходит в него без ввода игрока
+
+        Returns:
+            Optional[str]: Имя следующего состояния или None, если состояние ждёт ввода
+        """
+        return None
+
     def get_state_info(self) -> Dict[str, Any]:
         """
         Возвращает информацию о текущем состоянии
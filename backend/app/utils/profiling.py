@@ -0,0 +1,170 @@
+"""
+Профилирование по запросу.
+
+@profiled() отмечает функции горячего пути (ход игры, вход и выход из
+состояния, обработчики WebSocket). Пока замеры выключены, обёртка проверяет
+один атрибут PROFILER.enabled и сразу вызывает функцию. Когда включены,
+длительность каждого вызова кладётся в кольцевой буфер ограниченного размера.
+
+run_cprofile() снимает профиль cProfile всего потока цикла событий на
+заданное время — для случаев, когда неясно, какую функцию отмечать.
+"""
+import asyncio
+import cProfile
+import functools
+import io
+import marshal
+import pstats
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional
+
+# Сколько последних вызовов хранит буфер замеров
+TIMINGS_BUFFER_SIZE = 10000
+# Предел длительности одного профиля cProfile, секунды
+MAX_PROFILE_SECONDS = 60.0
+
+
+class CallTiming(NamedTuple):
+    name: str
+    started: float  # time.time() начала вызова
+    duration: float  # Секунды
+
+
+@dataclass
+class TimingSummary:
+    """Сводка замеров одной функции"""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class Profiler:
+    """Переключатель замеров и кольцевой буфер последних вызовов"""
+
+    def __init__(self, size: int = TIMINGS_BUFFER_SIZE) -> None:
+        self.enabled = False
+        self.timings: Deque[CallTiming] = deque(maxlen=size)
+        self._session: Optional[cProfile.Profile] = None
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        self.timings.clear()
+
+    def record(self, name: str, started: float, duration: float) -> None:
+        self.timings.append(CallTiming(name, started, duration))
+
+    def summary(self) -> Dict[str, dict]:
+        """Сводка по функциям из буфера, от самых затратных по суммарному времени."""
+        summaries: Dict[str, TimingSummary] = {}
+        for timing in list(self.timings):
+            summaries.setdefault(timing.name, TimingSummary()).add(timing.duration)
+        ordered = sorted(summaries.items(), key=lambda item: item[1].total, reverse=True)
+        return {name: summary.as_dict() for name, summary in ordered}
+
+    def recent(self, limit: int = 100) -> List[dict]:
+        """Последние limit вызовов, от новых к старым."""
+        timings = list(self.timings)[-limit:] if limit > 0 else []
+        return [
+            {"name": t.name, "started": round(t.started, 6), "duration_ms": round(t.duration * 1000, 3)}
+            for t in reversed(timings)
+        ]
+
+    @property
+    def profiling(self) -> bool:
+        """Идёт ли сейчас снятие профиля cProfile."""
+        return self._session is not None
+
+    async def run_cprofile(self, seconds: float) -> cProfile.Profile:
+        """
+        Профилирует поток цикла событий в течение seconds секунд.
+
+        Raises:
+            RuntimeError: Если профиль уже снимается.
+        """
+        if self._session is not None:
+            raise RuntimeError("Профиль уже снимается")
+        self._session = profile = cProfile.Profile()
+        profile.enable()
+        try:
+            await asyncio.sleep(min(seconds, MAX_PROFILE_SECONDS))
+        finally:
+            profile.disable()
+            self._session = None
+        return profile
+
+
+def profile_to_pstats(profile: cProfile.Profile) -> bytes:
+    """Профиль в формате файла pstats (как Profile.dump_stats)."""
+    profile.create_stats()
+    return marshal.dumps(profile.stats)
+
+
+def profile_to_text(profile: cProfile.Profile, sort: str = "cumulative", limit: int = 50) -> str:
+    """Текстовый отчёт pstats: limit самых затратных функций."""
+    stream = io.StringIO()
+    pstats.Stats(profile, stream=stream).sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+PROFILER = Profiler()
+
+
+def profiled(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Декоратор замера времени вызова (обычной функции или корутины).
+
+    Args:
+        name: Имя в буфере замеров; по умолчанию __qualname__ функции.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not PROFILER.enabled:
+                    return await func(*args, **kwargs)
+                started, counter = time.time(), time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    PROFILER.record(label, started, time.perf_counter() - counter)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            started, counter = time.time(), time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PROFILER.record(label, started, time.perf_counter() - counter)
+
+        return wrapper
+
+    return decorator
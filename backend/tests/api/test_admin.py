@@ -0,0 +1,114 @@
+import marshal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api.main import app
+from backend.api.routers import admin
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+from backend.app.models.game import FoolGame
+from backend.app.utils.profiling import PROFILER, profiled
+
+TOKEN = {"X-Admin-Token": "secret"}
+
+
+@pytest.fixture
+def profiler():
+    PROFILER.clear()
+    yield PROFILER
+    PROFILER.disable()
+    PROFILER.clear()
+
+
+def test_profiled_records_only_when_enabled(profiler):
+    @profiled("double")
+    def double(x):
+        return x * 2
+
+    assert double(2) == 4
+    assert not profiler.timings
+
+    profiler.enable()
+    game = FoolGame("profiled-game", 2, seed=3)
+    for player_id in ("a", "b"):
+        game.handle_input(PlayerInput(player_id, PlayerAction.JOIN))
+    for player_id in ("a", "b"):
+        game.handle_input(PlayerInput(player_id, PlayerAction.READY))
+    assert double(3) == 6
+
+    summary = profiler.summary()
+    assert summary["FoolGame.handle_input"]["count"] == 4
+    assert summary["LobbyState.exit"]["count"] == 1
+    assert summary["PlayRoundWithoutThrowState.enter"]["count"] == 1
+    assert summary["double"]["count"] == 1
+    assert profiler.recent(1)[0]["name"] == "double"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_admin_requires_token(client, monkeypatch):
+    assert client.get("/api/v1/admin/timings").status_code == 403
+    assert client.get("/api/v1/admin/timings", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", None)
+    assert client.get("/api/v1/admin/timings", headers=TOKEN).status_code == 404
+
+
+def test_admin_timings_and_profile(client, profiler):
+    assert client.post("/api/v1/admin/timings/enable", headers=TOKEN).json() == {"enabled": True}
+    FoolGame("admin-game", 2, seed=3).handle_input(PlayerInput("a", PlayerAction.JOIN))
+    client.post("/api/v1/admin/timings/disable", headers=TOKEN)
+    timings = client.get("/api/v1/admin/timings", params={"limit": 5}, headers=TOKEN).json()
+    assert not timings["enabled"]
+    assert timings["summary"]["FoolGame.handle_input"]["count"] == 1
+    assert timings["recent"][0]["name"] == "FoolGame.handle_input"
+
+    text = client.post("/api/v1/admin/profile", params={"seconds": 0.05}, headers=TOKEN)
+    assert text.status_code == 200 and "function calls" in text.text
+    dump = client.post("/api/v1/admin/profile", params={"seconds": 0.05, "format": "pstats"}, headers=TOKEN)
+    assert dump.status_code == 200
+    assert isinstance(marshal.loads(dump.content), dict)
+
+
+def test_admin_game_command_stats(client):
+    from backend.api.dependencies import game_actors
+
+    async def command():
+        return None
+
+    async def run_command():
+        await game_actors.submit("admin-stats-game", command)
+
+    # Команда выполняется в цикле событий приложения
+    client.portal.call(run_command)
+    try:
+        stats = client.get("/api/v1/admin/games/stats", headers=TOKEN).json()
+        assert stats["admin-stats-game"]["count"] == 1 and stats["admin-stats-game"]["depth"] == 0
+        one = client.get("/api/v1/admin/games/admin-stats-game/stats", headers=TOKEN).json()
+        assert one == stats["admin-stats-game"]
+        assert client.get("/api/v1/admin/games/missing/stats", headers=TOKEN).status_code == 404
+
+        text = client.get("/metrics").text
+        assert 'fool_game_command_seconds_count{result="ok"}' in text
+        assert any(line.startswith("fool_game_commands_queued ") for line in text.splitlines())
+        assert any(line.startswith("fool_game_actors ") for line in text.splitlines())
+    finally:
+        game_actors.close("admin-stats-game")
+
+
+def test_admin_room_fanout(client):
+    from backend.api.dependencies import connection_manager
+
+    connection_manager._record_fanout("admin-fanout-room", 0.002)
+    try:
+        rooms = client.get("/api/v1/admin/rooms/fanout", headers=TOKEN).json()
+        assert rooms["admin-fanout-room"]["count"] == 1 and rooms["admin-fanout-room"]["max_ms"] == 2.0
+        room = client.get("/api/v1/admin/rooms/admin-fanout-room/fanout", headers=TOKEN).json()
+        assert room == rooms["admin-fanout-room"]
+        assert client.get("/api/v1/admin/rooms/missing/fanout", headers=TOKEN).status_code == 404
+    finally:
+        connection_manager.forget_room("admin-fanout-room")
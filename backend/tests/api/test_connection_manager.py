@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+from backend.api.managers.connection_managaer import ConnectionManager
+
+
+class FakeWebSocket:
+    """WebSocket с настраиваемой задержкой отправки"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+        self.closed = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000, reason=None):
+        self.closed = (code, reason)
+
+
+async def _connect(manager, **sockets):
+    for player_id, websocket in sockets.items():
+        await manager.connect(player_id, websocket)
+
+
+def test_broadcast_does_not_wait_for_slow_client():
+    async def scenario():
+        manager = ConnectionManager(send_timeout=1.0)
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=0.3)
+        await _connect(manager, fast=fast, slow=slow)
+
+        sent = await manager.broadcast_to_players(["fast", "slow"], {"type": "ping"}, room_id="room")
+        assert sent == 2
+        # Рассылка только ставит сообщения в очереди
+        assert fast.sent == [] and slow.sent == []
+
+        await asyncio.sleep(0.05)
+        assert fast.sent == [{"type": "ping"}]
+        assert slow.sent == []
+
+        await asyncio.sleep(0.4)
+        assert slow.sent == [{"type": "ping"}]
+        stats = manager.get_fanout_stats("room")
+        assert stats.count == 1
+        assert stats.last >= 0.3
+
+    asyncio.run(scenario())
+
+
+def test_send_timeout_disconnects_client():
+    async def scenario():
+        manager = ConnectionManager(send_timeout=0.05)
+        fast, stuck = FakeWebSocket(), FakeWebSocket(delay=10)
+        await _connect(manager, fast=fast, stuck=stuck)
+
+        await manager.broadcast_to_players(["fast", "stuck"], {"type": "ping"}, room_id="room")
+        await asyncio.sleep(0.2)
+
+        assert manager.is_connected("fast")
+        assert not manager.is_connected("stuck")
+        assert stuck.closed == (1013, "Send timeout")
+        # Рассылка завершилась, хотя один из получателей отвалился
+        assert manager.get_fanout_stats("room").count == 1
+
+    asyncio.run(scenario())
+
+
+def test_queue_overflow_disconnects_client():
+    async def scenario():
+        manager = ConnectionManager(queue_size=2, send_timeout=10)
+        slow = FakeWebSocket(delay=10)
+        await _connect(manager, slow=slow)
+
+        results = [await manager.send_message("slow", {"n": n}) for n in range(4)]
+        assert len(manager._drops) == 1  # Задача закрытия удерживается до завершения
+        await asyncio.sleep(0.01)
+        assert not manager._drops
+
+        assert results == [True, True, False, False]
+        assert not manager.is_connected("slow")
+        assert slow.closed == (1013, "Outbound queue overflow")
+
+    asyncio.run(scenario())
+
+
+def test_send_to_players_and_stale_disconnect():
+    async def scenario():
+        manager = ConnectionManager()
+        first, second = FakeWebSocket(), FakeWebSocket()
+        await _connect(manager, a=first, b=second)
+
+        sent = await manager.send_to_players({"a": {"to": "a"}, "b": {"to": "b"}}, room_id="room")
+        await asyncio.sleep(0.01)
+        assert sent == 2
+        assert first.sent == [{"to": "a"}]
+        assert second.sent == [{"to": "b"}]
+
+        # Переподключение: отключение старого сокета не трогает новый
+        reconnected = FakeWebSocket()
+        await manager.connect("a", reconnected)
+        manager.disconnect("a", first)
+        assert manager.get_connection("a") is reconnected
+        assert not await manager.send_message("missing", {"type": "ping"})
+
+    asyncio.run(scenario())
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from backend.api.managers.game_actor import GameActors
+
+
+def test_commands_are_serialized():
+    """Команда с await внутри не перемежается со следующей"""
+
+    async def scenario():
+        actors = GameActors()
+        trace = []
+
+        def command(name):
+            async def run():
+                trace.append(f"{name}:start")
+                await asyncio.sleep(0.01)
+                trace.append(f"{name}:end")
+                return name
+
+            return run
+
+        results = await asyncio.gather(*(actors.submit("g", command(n)) for n in "abc"))
+        assert results == ["a", "b", "c"]
+        assert trace == ["a:start", "a:end", "b:start", "b:end", "c:start", "c:end"]
+
+        stats = actors.get_stats("g")
+        assert stats["count"] == 3 and stats["max_depth"] == 3 and stats["depth"] == 0
+        assert stats["mean_ms"] > 0
+        # Простаивающая очередь не держит задачу
+        assert actors.get("g")._task is None
+
+    asyncio.run(scenario())
+
+
+def test_games_do_not_wait_for_each_other():
+    async def scenario():
+        actors = GameActors()
+        release = asyncio.Event()
+
+        async def blocked():
+            await release.wait()
+
+        async def quick():
+            return "done"
+
+        slow = actors.submit("slow", blocked)
+        assert await asyncio.wait_for(actors.submit("fast", quick), 1) == "done"
+        assert actors.get_stats("slow")["depth"] == 0 and not slow.done()
+        release.set()
+        await slow
+
+    asyncio.run(scenario())
+
+
+def test_failed_command_does_not_stop_queue():
+    async def scenario():
+        actors = GameActors()
+
+        async def fail():
+            raise ValueError("bad move")
+
+        async def ok():
+            return 1
+
+        failed, succeeded = actors.submit("g", fail), actors.submit("g", ok)
+        with pytest.raises(ValueError):
+            await failed
+        assert await succeeded == 1
+        assert actors.get_stats("g")["failed"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_schedule_and_close():
+    async def scenario():
+        actors = GameActors()
+        actor = actors.get("g")
+        calls = []
+
+        async def record():
+            calls.append("reset")
+
+        actor.schedule(0.01, record)
+        actor.schedule(0.01, record).cancel()
+        await asyncio.sleep(0.05)
+        assert calls == ["reset"]
+
+        actor.schedule(0.01, record)
+        actors.close("g")
+        await asyncio.sleep(0.05)
+        assert calls == ["reset"]
+        assert actors.get_stats("g") is None
+        with pytest.raises(RuntimeError):
+            actor.submit(record)
+
+    asyncio.run(scenario())
@@ -0,0 +1,146 @@
+from backend.api.managers.game_manager import GameManager
+from backend.api.managers.game_reaper import GameReaper, ReaperConfig
+from backend.api.managers.state_sync_manager import PlayerSyncState
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+from backend.app.states.registry import StateName
+from backend.app.storage import FileSnapshotStore
+from backend.app.utils.metrics import REGISTRY
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _sample(series: str) -> float:
+    """Значение серии (имя с метками) в выгрузке реестра"""
+    return sum(
+        float(line.rsplit(" ", 1)[1]) for line in REGISTRY.render().splitlines() if line.rsplit(" ", 1)[0] == series
+    )
+
+
+def start_game(manager: GameManager, player_ids):
+    game = manager.create_game(len(player_ids))
+    for player_id in player_ids:
+        game.handle_input(PlayerInput(player_id, PlayerAction.JOIN))
+        manager.add_game_to_player(game.game_id, player_id)
+    for player_id in player_ids:
+        game.handle_input(PlayerInput(player_id, PlayerAction.READY))
+    manager.update_game_slots_by_id(game.game_id)
+    manager.checkpoint(game)
+    return game
+
+
+def test_reaps_games_by_ttl():
+    clock = FakeClock()
+    manager = GameManager(clock=clock)
+    connected = set()
+    removed = []
+    reaper = GameReaper(
+        manager,
+        ReaperConfig(empty_lobby_ttl=60, abandoned_ttl=600, finished_ttl=120),
+        is_connected=connected.__contains__,
+        on_removed=lambda game_id, player_ids: removed.append(game_id),
+    )
+    reclaimed_before = _sample('fool_reaper_reclaimed_total{reason="empty_lobby"}')
+    empty = manager.create_game(2)
+    playing = start_game(manager, ["a", "b"])
+    finished = start_game(manager, ["c", "d"])
+    finished._current_state = finished._get_state(StateName.GAME_OVER)
+
+    clock.now += 59
+    assert reaper.sweep() == 0
+    clock.now += 1
+    assert reaper.sweep() == 1
+    assert removed == [empty.game_id] and manager.get_game_by_id(empty.game_id) is None
+
+    clock.now += 60
+    reaper.sweep()
+    assert manager.get_game_by_id(finished.game_id) is None
+    assert manager.get_game_by_player_id("c") is None
+
+    # Игра с подключённым игроком не считается брошенной
+    connected.add("a")
+    clock.now += 600
+    reaper.sweep()
+    assert manager.get_game_by_player_id("b") is playing
+    connected.clear()
+    reaper.sweep()
+    assert manager.get_game_by_player_id("b") is None
+
+    stats = reaper.stats.to_dict()
+    assert stats["reclaimed"] == {"empty_lobby": 1, "abandoned": 1, "finished": 1}
+    assert stats["bytes_freed"] > 0 and stats["tracked_bytes"] == 0
+    assert _sample('fool_reaper_reclaimed_total{reason="empty_lobby"}') - reclaimed_before == 1
+    assert removed == [empty.game_id, finished.game_id, playing.game_id]
+
+
+def test_activity_postpones_reaping():
+    clock = FakeClock()
+    manager = GameManager(clock=clock)
+    reaper = GameReaper(manager, ReaperConfig(abandoned_ttl=100))
+    game = start_game(manager, ["a", "b"])
+    clock.now += 90
+    manager.checkpoint(game)
+    clock.now += 90
+    assert reaper.sweep() == 0
+    clock.now += 10
+    assert reaper.sweep() == 1
+
+
+def test_evicts_cold_games_over_budget(tmp_path):
+    clock = FakeClock()
+    manager = GameManager(snapshot_store=FileSnapshotStore(tmp_path), clock=clock)
+    games = []
+    for index in range(3):
+        games.append(start_game(manager, [f"p{index}", f"q{index}"]))
+        clock.now += 1
+    size = len(games[0].snapshot())
+    reaper = GameReaper(manager, ReaperConfig(memory_budget=size + size // 2))
+
+    evicted_before = _sample("fool_reaper_evicted_total")
+    freed_before = _sample("fool_reaper_bytes_freed_total")
+    assert reaper.sweep() == 2
+    assert set(manager.active_games) == {games[2].game_id}
+    assert reaper.stats.evicted == 2 and reaper.stats.tracked_bytes <= size + size // 2
+    # Счётчики сборщика видны в /metrics
+    assert _sample("fool_reaper_evicted_total") - evicted_before == 2
+    assert _sample("fool_reaper_bytes_freed_total") - freed_before == 2 * size
+
+    restored = manager.get_game_by_player_id("p0")
+    assert restored is not games[0] and restored.snapshot() == games[0].snapshot()
+    assert games[0].game_id in manager.active_games
+    # Выгруженная и не поднятая игра по-прежнему удаляется по сроку
+    assert manager.remove_game(games[1].game_id)
+    assert manager.get_game_by_player_id("p1") is None
+
+
+def test_connected_and_busy_games_are_not_evicted(tmp_path):
+    clock = FakeClock()
+    manager = GameManager(snapshot_store=FileSnapshotStore(tmp_path), clock=clock)
+    games = [start_game(manager, [f"p{index}", f"q{index}"]) for index in range(3)]
+    connected = {"q0"}
+    busy = {games[1].game_id}
+    reaper = GameReaper(
+        manager, ReaperConfig(memory_budget=1), is_connected=connected.__contains__, in_use=busy.__contains__
+    )
+
+    assert reaper.sweep() == 1
+    assert set(manager.active_games) == {games[0].game_id, games[1].game_id}
+    # Обработчик WebSocket и менеджер по-прежнему видят один и тот же объект партии
+    assert manager.get_game_by_player_id("p0") is games[0]
+
+
+def test_forget_game_drops_room_state():
+    from backend.api import dependencies
+
+    dependencies.connection_manager._record_fanout("reaped-room", 0.001)
+    dependencies.game_actors.get("reaped-room")
+    dependencies.state_sync_manager.players["reaped-player"] = PlayerSyncState()
+    dependencies.forget_game("reaped-room", ("reaped-player",))
+    assert dependencies.connection_manager.get_fanout_stats("reaped-room") is None
+    assert dependencies.game_actors.get_stats("reaped-room") is None
+    assert "reaped-player" not in dependencies.state_sync_manager.players
@@ -0,0 +1,41 @@
+import asyncio
+
+from backend.api.loadtest import LoadBot, LoadConfig, LoadReport, run_load
+from backend.api.loadtest.__main__ import main
+from backend.app.simulation.policies import GreedyPolicy
+
+
+def test_bots_play_full_games_in_process():
+    report = asyncio.run(run_load(LoadConfig(bots=6, room_size=3, policies=("greedy", "random"), timeout=60)))
+    assert report.connected == 6
+    assert report.games == report.finished == 2
+    assert report.moves > 0 and len(report.latencies) >= report.moves - report.games * 3
+    assert 0 < report.p50 <= report.p95 <= report.p99
+    assert report.messages_per_sec > 0
+    assert report.rss_samples and report.peak_rss > 0
+    assert report.check(max_p99_ms=60_000) == []
+    assert report.check(max_p95_ms=0.0)
+
+
+def test_bot_applies_deltas_and_detects_gaps():
+    bot = LoadBot("b", GreedyPolicy(), LoadReport())
+    assert bot.apply({"type": "connection_confirmed", "data": {
+        "seq": 1, "current_state": "PlayRoundWithoutThrowState", "trump_suit": "S", "position": 1,
+        "attacker_position": 1, "defender_position": 2, "allowed_actions": ["QUIT", "ATTACK"],
+        "cards": [{"rank": "6", "suit": "H"}, {"rank": "7", "suit": "S"}],
+        "room_players": [{"player_id": "p2", "position": 2, "cards_count": 6}], "table_cards": [],
+    }})
+    # Стол пуст: ход младшей некозырной картой
+    assert bot.next_move() == {"type": "play_card", "attack_card": {"rank": "6", "suit": "H"}}
+    assert bot.apply({"type": "game_state_delta", "data": {
+        "seq": 2, "cards_removed": [{"rank": "6", "suit": "H"}], "table_size": 1,
+        "table_slots": [[0, {"attack_card": {"rank": "6", "suit": "H"}, "defend_card": None}]],
+    }})
+    assert bot.table == [[0, None]] and bot.next_move() is None  # Ждёт защиты
+    assert not bot.apply({"type": "game_state_delta", "data": {"seq": 4}})
+    assert not bot.synced
+
+
+def test_cli_gate_exit_code(capsys):
+    assert main(["--bots", "2", "--json", "--max-p95-ms", "0"]) == 1
+    assert '"failures"' in capsys.readouterr().out
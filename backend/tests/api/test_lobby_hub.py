@@ -0,0 +1,70 @@
+import asyncio
+
+from backend.api.managers.game_manager import GameManager
+from backend.api.managers.lobby_hub import RESYNC, LobbyHub
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+
+
+def _events(subscription):
+    """Забирает из очереди подписчика все SSE кадры как пары (event, data)"""
+    events = []
+    while not subscription.queue.empty():
+        frame = subscription.queue.get_nowait()
+        lines = dict(line.split(": ", 1) for line in frame.decode().strip().splitlines())
+        events.append((lines["event"], lines["data"]))
+    return events
+
+
+def _join(manager, game, player_id):
+    game.handle_input(PlayerInput(player_id=player_id, action=PlayerAction.JOIN))
+    manager.add_game_to_player(game.game_id, player_id)
+    manager.update_game_slots_by_id(game.game_id)
+
+
+def test_game_manager_publishes_lobby_changes():
+    async def scenario():
+        hub = LobbyHub()
+        manager = GameManager(lobby_hub=hub)
+        first, second = hub.subscribe(), hub.subscribe()
+
+        game = manager.create_game(players_limit=2)
+        _join(manager, game, "p1")
+        # Повторное обновление без изменений ничего не публикует
+        manager.update_game_slots_by_id(game.game_id)
+        _join(manager, game, "p2")
+
+        gid = game.game_id
+        expected = [
+            ("game_added", f'{{"game_id": "{gid}", "players_limit": 2, "players_inside": 0}}'),
+            ("game_updated", f'{{"game_id": "{gid}", "players_limit": 2, "players_inside": 1}}'),
+            ("game_removed", f'{{"game_id": "{gid}"}}'),
+        ]
+        assert _events(first) == expected
+        assert _events(second) == expected
+
+        # Игрок вышел из заполненной игры — она вернулась в лобби
+        manager.handle_player_quit(gid, "p2")
+        assert [event for event, _ in _events(first)] == ["game_added"]
+        assert manager.lobby_games() == [
+            {"game_id": gid, "players_limit": 2, "players_inside": 1}
+        ]
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_gets_resync():
+    async def scenario():
+        hub = LobbyHub()
+        subscription = hub.subscribe()
+        subscription.queue = asyncio.Queue(2)
+
+        for n in range(3):
+            hub.publish("game_updated", {"n": n})
+
+        assert await subscription.get(timeout=0.01) is RESYNC
+        assert await subscription.get(timeout=0.01) is None
+
+        subscription.close()
+        assert hub.publish("game_updated", {}) == 0
+
+    asyncio.run(scenario())
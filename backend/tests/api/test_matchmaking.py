@@ -0,0 +1,115 @@
+import asyncio
+import random
+
+from backend.api.managers.game_actor import GameActors
+from backend.api.managers.game_manager import GameManager
+from backend.api.routers.games import join_game
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+
+
+def _join(manager, game, player_id):
+    game.handle_input(PlayerInput(player_id=player_id, action=PlayerAction.JOIN))
+    manager.add_game_to_player(game.game_id, player_id)
+    manager.update_game_slots_by_id(game.game_id)
+
+
+def _linear_choice(manager, players_limit=None):
+    """Эталон: полный перебор ожидающих игр"""
+    candidates = [
+        (game.players_limit - len(game.players), order, game.game_id)
+        for order, game in enumerate(manager.pending_games.values())
+        if not game.is_full()
+        and (players_limit is None or game.players_limit == players_limit)
+    ]
+    return min(candidates)[2] if candidates else None
+
+
+def test_prefers_game_closest_to_start():
+    manager = GameManager()
+    assert manager.find_available_game() is None
+
+    old_pair = manager.create_game(2)
+    big = manager.create_game(4)
+    new_pair = manager.create_game(2)
+    # Все пустые — самая ранняя из тех, где меньше всего свободных мест
+    assert manager.find_available_game() is old_pair
+
+    for player_id in ("a", "b", "c"):
+        _join(manager, big, player_id)
+    assert manager.find_available_game() is big
+    assert manager.find_available_game(players_limit=2) is old_pair
+    assert manager.find_available_game(players_limit=6) is None
+
+    _join(manager, big, "d")
+    assert big.game_id in manager.active_games
+    assert manager.find_available_game() is old_pair
+
+    _join(manager, new_pair, "e")
+    assert manager.find_available_game() is new_pair
+
+    # Игрок вышел из заполненной игры — она снова доступна и создана раньше
+    manager.handle_player_quit(big.game_id, "d")
+    assert big.game_id in manager.pending_games
+    assert manager.find_available_game() is big
+    manager.handle_player_quit(big.game_id, "c")
+    assert manager.find_available_game() is new_pair
+
+
+def test_index_matches_linear_scan_under_churn():
+    rng = random.Random(7)
+    manager = GameManager()
+    players = {}
+    for step in range(500):
+        limit = rng.choice([None, 2, 3, 4, 5, 6])
+        if rng.random() < 0.7:
+            game = manager.find_available_game(limit)
+            assert (game.game_id if game else None) == _linear_choice(manager, limit)
+            if game is None:
+                game = manager.create_game(limit or 2)
+            player_id = f"p{step}"
+            _join(manager, game, player_id)
+            players[player_id] = game.game_id
+        elif players:
+            player_id = rng.choice(sorted(players))
+            game_id = players.pop(player_id)
+            if game_id in manager.pending_games:
+                manager.handle_player_quit(game_id, player_id)
+
+
+def test_buckets_stay_bounded_under_churn():
+    manager = GameManager()
+    oldest = manager.create_game(3)
+    games = [manager.create_game(3) for _ in range(5)]
+    for step in range(1000):
+        # Самая старая игра всегда на вершине корзины, поэтому устаревшие
+        # записи остальных до вершины не доходят
+        game = games[step % len(games)]
+        _join(manager, game, f"p{step}")
+        manager.handle_player_quit(game.game_id, f"p{step}")
+        assert manager.find_available_game() is oldest
+
+    live = {}
+    for key, _ in manager._game_slots.values():
+        live[key] = live.get(key, 0) + 1
+    for key, heap in manager._slot_buckets.items():
+        assert len(heap) <= 2 * live.get(key, 0) + 1
+
+
+def test_concurrent_quick_joins_do_not_lose_the_race():
+    manager = GameManager()
+    actors = GameActors()
+    almost_full = manager.create_game(2)
+    _join(manager, almost_full, "first")
+
+    async def scenario():
+        return await asyncio.gather(
+            *(join_game(player_id, gm=manager, actors=actors) for player_id in ("a", "b", "c"))
+        )
+
+    joined = asyncio.run(scenario())
+    # Последнее место досталось одному, остальные ушли в новую игру, а не получили 409
+    assert joined[0].game_id == almost_full.game_id
+    assert joined[1].game_id == joined[2].game_id != almost_full.game_id
+    for response in joined:
+        assert manager.get_game_by_player_id(response.player_id).game_id == response.game_id
+    assert manager.find_available_game() is None
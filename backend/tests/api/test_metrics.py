@@ -0,0 +1,59 @@
+from fastapi.testclient import TestClient
+
+from backend.api.main import app
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+from backend.app.models.game import FoolGame
+from backend.app.utils.metrics import MetricsRegistry
+
+
+def test_render_text_format():
+    registry = MetricsRegistry()
+    moves = registry.counter("moves_total", "Ходы", ("state",))
+    latency = registry.histogram("latency_seconds", "Задержка", ("state",), buckets=(0.1, 1.0))
+    registry.gauge("rooms", "Комнаты", lambda: {("a\"b",): 2}, ("name",))
+    moves.labels("PlayRoundState").inc()
+    moves.labels("PlayRoundState").inc(2)
+    for value in (0.05, 0.5, 5):
+        latency.labels("Lobby").observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP moves_total Ходы",
+        "# TYPE moves_total counter",
+        'moves_total{state="PlayRoundState"} 3',
+        "# HELP latency_seconds Задержка",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{state="Lobby",le="0.1"} 1',
+        'latency_seconds_bucket{state="Lobby",le="1"} 2',
+        'latency_seconds_bucket{state="Lobby",le="+Inf"} 3',
+        'latency_seconds_sum{state="Lobby"} 5.55',
+        'latency_seconds_count{state="Lobby"} 3',
+        "# HELP rooms Комнаты",
+        "# TYPE rooms gauge",
+        'rooms{name="a\\"b"} 2',
+    ]
+
+
+def _sample(text: str, prefix: str) -> float:
+    return sum(float(line.rsplit(" ", 1)[1]) for line in text.splitlines() if line.startswith(prefix))
+
+
+def test_metrics_endpoint():
+    with TestClient(app) as client:
+        before = client.get("/metrics").text
+        game = FoolGame("metrics-game", 2, seed=3)
+        game.handle_input(PlayerInput("metrics-a", PlayerAction.JOIN))
+        game.handle_input(PlayerInput("metrics-b", PlayerAction.JOIN))
+        game.handle_input(PlayerInput("metrics-a", PlayerAction.READY))
+        game.handle_input(PlayerInput("metrics-b", PlayerAction.READY))
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    joins = 'fool_handle_input_seconds_count{state="LobbyState",action="JOIN"}'
+    assert _sample(text, joins) - _sample(before, joins) == 2
+    transitions = 'fool_state_transitions_total{from_state="LobbyState",to_state="PlayRoundWithoutThrowState"}'
+    assert _sample(text, transitions) - _sample(before, transitions) >= 1
+    for name in ("fool_games{status=\"active\"}", "fool_games{status=\"pending\"}",
+                 "fool_websocket_connections", "fool_lobby_subscribers", "fool_reaper_tracked_bytes"):
+        assert any(line.startswith(name + " ") for line in text.splitlines())
@@ -0,0 +1,252 @@
+import asyncio
+from collections import Counter
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from backend.api.managers.game_manager import GameManager
+from backend.api.shard_router import LobbyMerge, ShardRouter, create_app, merge_shard_metrics, parse_sse
+from backend.api.sharding import ShardMap, shard_of
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+from backend.app.storage import FileSnapshotStore
+
+
+def test_shard_of_is_stable_and_balanced():
+    game_ids = [f"game-{i}" for i in range(4000)]
+    counts = Counter(shard_of(game_id, 4) for game_id in game_ids)
+    assert set(counts) == {0, 1, 2, 3}
+    assert min(counts.values()) > 800
+    assert [shard_of(game_id, 4) for game_id in game_ids] == [shard_of(game_id, 4) for game_id in game_ids]
+    assert shard_of("any", 1) == 0
+
+
+def test_shard_map():
+    shard = ShardMap(3, 2)
+    assert all(shard.owns(shard.new_game_id()) for _ in range(20))
+    with pytest.raises(ValueError):
+        ShardMap(2, 2)
+
+
+def test_game_manager_restores_only_own_games(tmp_path):
+    store = FileSnapshotStore(tmp_path)
+    shards = [GameManager(snapshot_store=store, shard=ShardMap(2, index)) for index in range(2)]
+    games = []
+    for index, manager in enumerate(shards):
+        game = manager.create_game(2)
+        assert shard_of(game.game_id, 2) == index
+        game.handle_input(PlayerInput(f"p{index}", PlayerAction.JOIN))
+        manager.checkpoint(game)
+        games.append(game)
+
+    restarted = GameManager(snapshot_store=store, shard=ShardMap(2, 1))
+    assert restarted.restore_games() == 1
+    assert restarted.get_game_by_id(games[1].game_id) is not None
+    # Чужой снимок не удалён — его восстановит владелец
+    assert sorted(store.game_ids()) == sorted(game.game_id for game in games)
+
+
+def test_lobby_merge():
+    merge = LobbyMerge()
+    assert merge.apply(0, "message", '[{"game_id": "a", "players_limit": 2, "players_inside": 1}]') == (
+        "message",
+        '[{"game_id": "a", "players_limit": 2, "players_inside": 1}]',
+    )
+    merge.apply(1, "game_added", '{"game_id": "b", "players_limit": 3, "players_inside": 0}')
+    event, data = merge.apply(1, "message", "[]")
+    assert event == "message" and [game["game_id"] for game in merge.all_games()] == ["a"]
+    assert merge.apply(0, "game_removed", '{"game_id": "a"}') == ("game_removed", '{"game_id": "a"}')
+    assert merge.all_games() == []
+    assert merge.apply(0, "ping", "keep-alive") is None
+
+
+def test_merge_shard_metrics():
+    shard_text = (
+        "# HELP latency Задержка\n# TYPE latency histogram\n"
+        'latency_bucket{le="+Inf"} 2\nlatency_sum 0.5\nlatency_count 2\n'
+        "# HELP rooms Комнаты\n# TYPE rooms gauge\nrooms 3\n"
+    )
+    assert merge_shard_metrics([shard_text, shard_text]).splitlines() == [
+        "# HELP latency Задержка",
+        "# TYPE latency histogram",
+        'latency_bucket{shard="0",le="+Inf"} 2',
+        'latency_sum{shard="0"} 0.5',
+        'latency_count{shard="0"} 2',
+        'latency_bucket{shard="1",le="+Inf"} 2',
+        'latency_sum{shard="1"} 0.5',
+        'latency_count{shard="1"} 2',
+        "# HELP rooms Комнаты",
+        "# TYPE rooms gauge",
+        'rooms{shard="0"} 3',
+        'rooms{shard="1"} 3',
+    ]
+
+
+def test_parse_sse():
+    async def lines():
+        for line in ["event: game_added", 'data: {"game_id": "a"}', "", ": comment", "data: [1,", "data: 2]", ""]:
+            yield line
+
+    async def collect():
+        return [item async for item in parse_sse(lines())]
+
+    assert asyncio.run(collect()) == [("game_added", '{"game_id": "a"}'), ("message", "[1,\n2]")]
+
+
+def _fake_shard(index: int, games: dict) -> FastAPI:
+    """Шард с минимальным API: игры в games[game_id] = (лимит, [игроки])"""
+    app = FastAPI()
+
+    @app.get("/api/v1/games")
+    def list_games():
+        return [
+            {"game_id": game_id, "players_limit": limit, "players_inside": len(players)}
+            for game_id, (limit, players) in games.items()
+        ]
+
+    @app.post("/api/v1/join_game")
+    def join_game(player_id: str, game_id: str | None = None):
+        if game_id is None:
+            game_id = ShardMap(2, index).new_game_id()
+            games[game_id] = (2, [])
+        limit, players = games[game_id]
+        if len(players) >= limit:
+            raise HTTPException(409, "full")
+        players.append(player_id)
+        return {"game_id": game_id, "shard": index}
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics():
+        return f"# HELP moves_total Ходы\n# TYPE moves_total counter\nmoves_total{{state=\"x\"}} {index + 1}\n"
+
+    @app.post("/api/v1/admin/profile")
+    @app.get("/api/v1/admin/games/{game_id}/stats")
+    def admin(game_id: str | None = None):
+        return {"shard": index}
+
+    @app.get("/api/v1/wire/compact")
+    def wire_compact():
+        return {"version": 1, "shard": index}
+
+    @app.get("/api/v1/player_game")
+    def player_game(player_id: str):
+        for game_id, (_, players) in games.items():
+            if player_id in players:
+                return {
+                    "game_id": game_id,
+                    "shard": index,
+                    "websocket_connection": f"ws://localhost:8000/api/v1/ws/{game_id}?player_id={player_id}",
+                }
+        raise HTTPException(404, "not found")
+
+    return app
+
+
+def test_router_forwards_to_owning_shard():
+    shard_games = [{}, {}]
+    owned = [ShardMap(2, index).new_game_id() for index in range(2)]
+    shard_games[0][owned[0]] = (4, ["x"])
+    shard_games[1][owned[1]] = (2, ["y"])
+    router = ShardRouter(
+        [
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=_fake_shard(i, games)), base_url="http://shard")
+            for i, games in enumerate(shard_games)
+        ]
+    )
+    with TestClient(create_app(router)) as client:
+        assert len(client.get("/api/v1/games").json()) == 2
+
+        joined = client.post("/api/v1/join_game", params={"player_id": "a", "game_id": owned[0]}).json()
+        assert joined == {"game_id": owned[0], "shard": 0}
+
+        # Быстрый подбор: игра, где осталось меньше всего мест (шард 1)
+        assert client.post("/api/v1/join_game", params={"player_id": "b"}).json()["shard"] == 1
+        # Единственная свободная игра заполнена — новая создаётся на одном из шардов
+        created = client.post("/api/v1/join_game", params={"player_id": "c", "players_limit": 2}).json()
+        assert created["game_id"] not in owned
+
+        assert client.get("/api/v1/player_game", params={"player_id": "b"}).json()["shard"] == 1
+        router.player_shards.clear()
+        assert client.get("/api/v1/player_game", params={"player_id": "a"}).json()["shard"] == 0
+        assert client.get("/api/v1/player_game", params={"player_id": "nobody"}).status_code == 404
+        assert client.get("/api/v1/wire/compact").json()["version"] == 1
+        # Служебные запросы — шарду игры или явно указанному
+        assert client.get(f"/api/v1/admin/games/{owned[1]}/stats").json() == {"shard": 1}
+        assert client.post("/api/v1/admin/profile", params={"game_id": owned[0]}).json() == {"shard": 0}
+        assert client.post("/api/v1/admin/profile", params={"shard": 1}).json() == {"shard": 1}
+        assert client.post("/api/v1/admin/profile").status_code == 400
+        assert client.get("/metrics").text.splitlines() == [
+            "# HELP moves_total Ходы",
+            "# TYPE moves_total counter",
+            'moves_total{shard="0",state="x"} 1',
+            'moves_total{shard="1",state="x"} 2',
+        ]
+
+
+def test_router_redirects_websocket_to_shard():
+    games = [{}, {}]
+    owned = ShardMap(2, 1).new_game_id()
+    games[1][owned] = (2, [])
+
+    router = ShardRouter(
+        [
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=_fake_shard(i, games[i])), base_url="http://shard")
+            for i in range(2)
+        ],
+        public_urls=["ws://shards:9000", "ws://shards:9001"],
+    )
+    with TestClient(create_app(router)) as client:
+        client.post("/api/v1/join_game", params={"player_id": "a", "game_id": owned})
+        game = client.get("/api/v1/player_game", params={"player_id": "a"}).json()
+        # Адрес WebSocket — порт шарда-владельца, путь и параметры от шарда
+        assert game["websocket_connection"] == f"ws://shards:9001/api/v1/ws/{owned}?player_id=a"
+
+        # Игрок вышел из игры по прямому WebSocket — роутер этого не видел
+        games[1][owned][1].clear()
+        assert client.get("/api/v1/player_game", params={"player_id": "a"}).status_code == 404
+        assert "a" not in router.player_shards
+
+    with pytest.raises(ValueError):
+        ShardRouter(router.clients, public_urls=["ws://shards:9000"])
+
+
+def test_router_forgets_player_when_websocket_closes(tmp_path):
+    import threading
+
+    import uvicorn
+    from fastapi import WebSocket, WebSocketDisconnect
+
+    shard_app = FastAPI()
+
+    @shard_app.websocket("/api/v1/ws/{game_id}")
+    async def echo_once(websocket: WebSocket, game_id: str):
+        await websocket.accept()
+        await websocket.send_text(await websocket.receive_text())
+        await websocket.close()
+
+    path = str(tmp_path / "shard-0.sock")
+    server = uvicorn.Server(uvicorn.Config(shard_app, uds=path, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            thread.join(0.01)
+        client = httpx.AsyncClient(base_url="http://shard")
+        router = ShardRouter([client, client], [path, str(tmp_path / "missing.sock")])
+        game_id = ShardMap(2, 0).new_game_id()
+        other_game_id = ShardMap(2, 1).new_game_id()
+        with TestClient(create_app(router)) as test_client:
+            router.player_shards.update({"a": 0, "b": 1})
+            with test_client.websocket_connect(f"/api/v1/ws/{game_id}?player_id=a") as websocket:
+                websocket.send_text("hi")
+                assert websocket.receive_text() == "hi"
+            # Шард недоступен: соединение отклонено, шард игрока тоже забыт
+            with pytest.raises(WebSocketDisconnect):
+                with test_client.websocket_connect(f"/api/v1/ws/{other_game_id}?player_id=b") as websocket:
+                    websocket.receive_text()
+            assert router.player_shards == {}
+    finally:
+        server.should_exit = True
+        thread.join()
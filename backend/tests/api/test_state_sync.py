@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from backend.api.managers.state_sync_manager import StateSyncManager
+from backend.api.models.websocket_models import MessageType, ReconnectionData, ReconnectionResponse
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+from backend.app.models.card_set import iter_indices
+from backend.app.models.card import card_by_index
+from backend.app.models.game import FoolGame
+
+
+@pytest.fixture
+def game():
+    """Партия на 3 игроков сразу после раздачи"""
+    random.seed(7)
+    game = FoolGame("sync", players_limit=3)
+    for pid in ("1", "2", "3"):
+        game.handle_input(PlayerInput(pid, PlayerAction.JOIN))
+    for pid in ("1", "2", "3"):
+        game.handle_input(PlayerInput(pid, PlayerAction.READY))
+    return game
+
+
+def _sync_all(sync: StateSyncManager, game: FoolGame) -> dict:
+    actions = game.get_allowed_actions()
+    shared = sync.build_shared_view(game)
+    return {p.id_: sync.update(game, p, actions.get(p.id_, []), shared) for p in game.players}
+
+
+def _apply(view: dict, delta: dict) -> dict:
+    """Применяет дельту к снимку так же, как клиент"""
+    view = dict(view)
+    view.update(delta.get("set", {}))
+    removed = delta.get("cards_removed", [])
+    view["cards"] = [c for c in view["cards"] if c not in removed] + delta.get("cards_added", [])
+    if "table_size" in delta:
+        table = view["table_cards"][: delta["table_size"]]
+        for index, slot in delta.get("table_slots", []):
+            if index < len(table):
+                table[index] = slot
+            else:
+                table.append(slot)
+        view["table_cards"] = table
+    players = {p["player_id"]: p for p in view["room_players"]}
+    for pid in delta.get("players_removed", []):
+        players.pop(pid)
+    for player in delta.get("players_updated", []):
+        players[player["player_id"]] = {**players.get(player["player_id"], {}), **player}
+    view["room_players"] = list(players.values())
+    view["seq"] = delta["seq"]
+    return view
+
+
+def _attack(game: FoolGame) -> PlayerInput:
+    attacker = game.get_player_by_id(game.current_attacker_id)
+    index = next(iter_indices(attacker.hand_mask))
+    card = card_by_index(index, game.deck.trump_suit)
+    return PlayerInput(attacker.id_, PlayerAction.ATTACK, attack_card=card)
+
+
+def test_snapshot_matches_reconnection_response(game):
+    """Тест: снимок совпадает с тем, что давала pydantic-модель ReconnectionResponse"""
+    sync = StateSyncManager()
+    player = game.players[0]
+    actions = game.get_allowed_actions()[player.id_]
+    message = sync.snapshot(game, player, actions)
+    assert message["type"] == MessageType.CONNECTION_CONFIRMED
+    assert message["data"]["seq"] == 1
+    expected = ReconnectionResponse(data=ReconnectionData(**message["data"])).model_dump()
+    assert expected == message
+
+
+def test_first_update_is_snapshot_then_delta(game):
+    """Тест: первый раз уходит снимок, после хода — только изменения"""
+    sync = StateSyncManager()
+    first = _sync_all(sync, game)
+    assert all(m["type"] == MessageType.CONNECTION_CONFIRMED for m in first.values())
+    assert _sync_all(sync, game) == {"1": None, "2": None, "3": None}
+
+    attack = _attack(game)
+    game.handle_input(attack)
+    messages = _sync_all(sync, game)
+    attacker_delta = messages[attack.player_id]
+    assert attacker_delta["type"] == MessageType.GAME_STATE_DELTA
+    assert attacker_delta["data"]["seq"] == 2
+    assert attacker_delta["data"]["cards_removed"] == [attack.attack_card.to_dict()]
+    assert attacker_delta["data"]["table_size"] == 1
+    assert "cards" not in attacker_delta["data"]
+    for pid, message in messages.items():
+        if pid != attack.player_id:
+            assert "cards_removed" not in message["data"]
+            assert message["data"]["players_updated"][0]["player_id"] == attack.player_id
+
+
+def test_deltas_rebuild_snapshot(game):
+    """Тест: снимок плюс дельты дают то же состояние, что свежий снимок"""
+    sync = StateSyncManager()
+    views = {pid: m["data"] for pid, m in _sync_all(sync, game).items()}
+
+    attack = _attack(game)
+    moves = [attack, PlayerInput(game.current_defender_id, PlayerAction.PASS),
+             PlayerInput(attack.player_id, PlayerAction.PASS)]
+    for move in moves:
+        game.handle_input(move)
+        for pid, message in _sync_all(sync, game).items():
+            if message is not None:
+                views[pid] = _apply(views[pid], message["data"])
+
+    actions = game.get_allowed_actions()
+    for player in game.players:
+        fresh = StateSyncManager().snapshot(game, player, actions.get(player.id_, []))["data"]
+        view = views[player.id_]
+        assert sorted(view["cards"], key=str) == sorted(fresh["cards"], key=str)
+        assert {k: v for k, v in view.items() if k not in ("cards", "seq")} == \
+            {k: v for k, v in fresh.items() if k not in ("cards", "seq")}
+
+
+def test_reset_forces_snapshot(game):
+    """Тест: после сброса (переподключение, пропуск seq) уходит снимок с новым номером"""
+    sync = StateSyncManager()
+    _sync_all(sync, game)
+    sync.reset("2")
+    messages = _sync_all(sync, game)
+    assert messages["2"]["type"] == MessageType.CONNECTION_CONFIRMED
+    assert messages["2"]["data"]["seq"] == 2
+    assert messages["1"] is None
@@ -0,0 +1,206 @@
+import asyncio
+import random
+
+import pytest
+
+from backend.api.dependencies import game_actors, game_manager
+from backend.api.managers.timer_wheel import TimerWheel
+from backend.api.routers import websocket_handlers
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+from backend.app.states.registry import StateName
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_fires_on_time_across_levels():
+    clock = FakeClock()
+    # 4 ячейки на 3 уровнях охватывают 64 шага; дальше — ожидание на верхнем уровне
+    wheel = TimerWheel(tick=1.0, slots=4, levels=3, clock=clock)
+    fired = []
+    for delay in (1, 3, 4, 5, 17, 63, 64, 200):
+        wheel.schedule(delay, lambda d=delay: fired.append((d, clock.now)))
+    assert len(wheel) == 8
+
+    while len(wheel):
+        clock.now += 1
+        wheel.advance()
+    assert fired == [(d, float(d)) for d in (1, 3, 4, 5, 17, 63, 64, 200)]
+
+
+def test_cancel_and_100k_timers():
+    clock = FakeClock()
+    wheel = TimerWheel(tick=0.01, clock=clock)
+    rng = random.Random(1)
+    fired = []
+    handles = [wheel.schedule(rng.uniform(0, 120), fired.append, i) for i in range(100_000)]
+    cancelled = set(range(0, 100_000, 2))
+    for i in cancelled:
+        assert handles[i].cancel()
+    assert not handles[0].cancel()
+    assert len(wheel) == 50_000
+
+    last_tick = -1
+    while len(wheel):
+        clock.now += 0.5
+        wheel.advance()
+        # Таймер срабатывает на первом advance() после своего срока
+        for i in fired[last_tick + 1 :]:
+            assert clock.now - 0.5 < handles[i].expires * wheel.tick <= clock.now + 1e-9
+        last_tick = len(fired) - 1
+    assert sorted(fired) == [i for i in range(100_000) if i not in cancelled]
+    assert not any(handle.pending for handle in handles)
+
+
+def test_driver_task_runs_only_while_timers_pending():
+    async def scenario():
+        wheel = TimerWheel(tick=0.005)
+        fired = []
+        wheel.schedule(0.01, fired.append, "a")
+        wheel.schedule(0.02, fired.append, "b").cancel()
+        assert wheel._task is not None
+        await asyncio.sleep(0.05)
+        assert fired == ["a"]
+        assert wheel._task is None
+
+    asyncio.run(scenario())
+
+
+def test_deadline_replaced_and_guarded():
+    async def scenario():
+        actor = game_actors.get("deadline-game")
+        calls = []
+
+        async def expire(name):
+            calls.append(name)
+
+        actor.set_deadline(0.02, lambda: expire("turn-1"), key="turn-1")
+        actor.set_deadline(0.02, lambda: expire("same"), key="turn-1")  # тот же ход не продлевается
+        assert actor.deadline_key == "turn-1"
+        await asyncio.sleep(0.05)
+        assert calls == ["turn-1"]
+
+        actor.set_deadline(0.02, lambda: expire("turn-2"), key="turn-2")
+        actor.set_deadline(0.02, lambda: expire("turn-3"), key="turn-3")
+        actor.clear_deadline()
+        await asyncio.sleep(0.05)
+        assert calls == ["turn-1"]
+        game_actors.close("deadline-game")
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def fast_timeouts(monkeypatch):
+    monkeypatch.setattr(websocket_handlers, "TURN_TIMEOUT", 0.02)
+    monkeypatch.setattr(websocket_handlers, "LOBBY_READY_TIMEOUT", 0.02)
+
+
+def _wait_for(predicate, timeout=1.0):
+    async def wait():
+        for _ in range(int(timeout / 0.01)):
+            if predicate():
+                return True
+            await asyncio.sleep(0.01)
+        return predicate()
+
+    return wait()
+
+
+def test_turn_timeout_plays_for_afk_players(fast_timeouts):
+    async def scenario():
+        random.seed(1)
+        game = game_manager.create_game(2)
+        for player_id in ("afk-a", "afk-b"):
+            game.handle_input(PlayerInput(player_id, PlayerAction.JOIN))
+            game_manager.add_game_to_player(game.game_id, player_id)
+        for player_id in ("afk-a", "afk-b"):
+            game.handle_input(PlayerInput(player_id, PlayerAction.READY))
+        game_manager.update_game_slots_by_id(game.game_id)
+        attacker = game.get_player_by_id(game.current_attacker_id)
+        defender = game.get_player_by_id(game.current_defender_id)
+        defender_cards = len(defender.get_cards())
+
+        await websocket_handlers._broadcast_game_state(game)
+        # Атакующий не ходит — за него кладётся младшая карта; защищающийся не
+        # отбивается — берёт; атакующий не подкидывает — пас, раунд окончен
+        assert await _wait_for(lambda: len(defender.get_cards()) > defender_cards)
+        assert game.current_state_name == StateName.PLAY_ROUND
+        assert game.current_attacker_id == attacker.id_
+        assert not game.game_table.attack_count
+        game_actors.close(game.game_id)
+        for player_id in ("afk-a", "afk-b"):
+            game_manager.handle_player_quit(game.game_id, player_id)
+
+    asyncio.run(scenario())
+
+
+def test_ready_timeout_frees_seats(fast_timeouts):
+    async def scenario():
+        game = game_manager.create_game(2)
+        for player_id in ("lazy-a", "lazy-b"):
+            game.handle_input(PlayerInput(player_id, PlayerAction.JOIN))
+            game_manager.add_game_to_player(game.game_id, player_id)
+        game.handle_input(PlayerInput("lazy-a", PlayerAction.READY))
+        game_manager.update_game_slots_by_id(game.game_id)
+
+        await websocket_handlers._broadcast_game_state(game)
+        assert await _wait_for(lambda: len(game.players) == 1)
+        assert [p.id_ for p in game.players] == ["lazy-a"]
+        assert game_manager.get_game_by_player_id("lazy-b") is None
+        assert game_actors.get(game.game_id).deadline_key is None
+        game_actors.close(game.game_id)
+        game_manager.handle_player_quit(game.game_id, "lazy-a")
+
+    asyncio.run(scenario())
+
+
+def test_ready_timeout_quit_is_not_repeated_on_socket_close(fast_timeouts, monkeypatch):
+    broadcasts = []
+
+    async def record(player_ids, message):
+        broadcasts.append(message["type"])
+
+    monkeypatch.setattr(websocket_handlers.connection_manager, "broadcast_to_players", record)
+
+    async def scenario():
+        game = game_manager.create_game(2)
+        for player_id in ("slow-a", "slow-b"):
+            game.handle_input(PlayerInput(player_id, PlayerAction.JOIN))
+            game_manager.add_game_to_player(game.game_id, player_id)
+        game.handle_input(PlayerInput("slow-a", PlayerAction.READY))
+        game_manager.update_game_slots_by_id(game.game_id)
+
+        await websocket_handlers._broadcast_game_state(game)
+        assert await _wait_for(lambda: len(game.players) == 1)
+        assert len(broadcasts) == 1
+        # Закрытие соединения после срока готовности — повторный выход ничего не делает
+        await websocket_handlers.handle_player_disconnected(game.game_id, "slow-b", game)
+        assert len(broadcasts) == 1 and [p.id_ for p in game.players] == ["slow-a"]
+        game_actors.close(game.game_id)
+        game_manager.handle_player_quit(game.game_id, "slow-a")
+
+    asyncio.run(scenario())
+
+
+def test_turn_timeout_survives_missing_answer(monkeypatch):
+    async def scenario():
+        game = game_manager.create_game(2)
+        for player_id in ("mute-a", "mute-b"):
+            game.handle_input(PlayerInput(player_id, PlayerAction.JOIN))
+            game_manager.add_game_to_player(game.game_id, player_id)
+        for player_id in ("mute-a", "mute-b"):
+            game.handle_input(PlayerInput(player_id, PlayerAction.READY))
+        attacker_id = game.current_attacker_id
+        monkeypatch.setattr(game, "handle_input", lambda player_input: None)
+        await websocket_handlers.handle_turn_timeout(game.game_id, attacker_id)
+        monkeypatch.undo()
+        for player_id in ("mute-a", "mute-b"):
+            game_manager.handle_player_quit(game.game_id, player_id)
+
+    asyncio.run(scenario())
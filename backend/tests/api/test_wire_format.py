@@ -0,0 +1,120 @@
+import asyncio
+import json
+import random
+
+import msgspec
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api.main import app
+from backend.api.managers.connection_managaer import ConnectionManager
+from backend.api.managers.state_sync_manager import StateSyncManager
+from backend.api.wire_format import COMPACT_WIRE, JSON_WIRE, compact_schema, negotiate
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+from backend.app.models.card import CARDS
+from backend.app.models.game import FoolGame
+
+
+def _full_state(players: int = 6):
+    random.seed(1)
+    game = FoolGame("wire", players)
+    for i in range(players):
+        game.handle_input(PlayerInput(f"p{i}", PlayerAction.JOIN))
+    for i in range(players):
+        game.handle_input(PlayerInput(f"p{i}", PlayerAction.READY))
+    player = game.players[0]
+    message = StateSyncManager().snapshot(game, player, game.get_allowed_actions()[player.id_])
+    return game, player, message
+
+
+def test_compact_full_state():
+    game, player, message = _full_state()
+    frame = COMPACT_WIRE.encode(message)
+    decoded = msgspec.msgpack.decode(frame)
+    schema = compact_schema()
+
+    assert schema["type"][decoded["type"]] == "connection_confirmed"
+    data = decoded["data"]
+    assert sorted(data["cards"]) == sorted(card.index for card in player.get_cards())
+    assert schema["current_state"][data["current_state"]] == game.current_state_name
+    assert schema["trump_suit"][data["trump_suit"]] == game.deck.trump_suit.value
+    assert data["status"] == player.status.value
+    assert all(isinstance(other["status"], int) for other in data["room_players"])
+    # Полный снимок на 6 игроков заметно меньше JSON
+    assert len(frame) < 0.7 * len(JSON_WIRE.encode(message).encode())
+
+
+def test_compact_table_cards_and_incoming():
+    attack, defend = CARDS[3], CARDS[7]
+    message = {
+        "type": "game_state_delta",
+        "data": {"table_slots": [[0, {"attack_card": attack.to_dict(), "defend_card": None}]]},
+    }
+    data = msgspec.msgpack.decode(COMPACT_WIRE.encode(message))["data"]
+    assert data["table_slots"] == [[0, {"attack_card": attack.index, "defend_card": None}]]
+
+    incoming = msgspec.msgpack.encode({"type": "play_card", "data": {"attack_card": attack.index, "defend_card": defend.index}})
+    assert COMPACT_WIRE.decode(incoming) == {
+        "type": "play_card",
+        "data": {"attack_card": attack.to_dict(), "defend_card": defend.to_dict()},
+    }
+    assert COMPACT_WIRE.decode(json.dumps({"type": "resync_state"})) == {"type": "resync_state"}
+
+
+def test_json_matches_send_json():
+    game, player, message = _full_state()
+    message["data"]["room_players"][0]["name"] = "Игрок \"1\""
+    frame = JSON_WIRE.encode(message)
+    assert isinstance(frame, str)
+    assert frame == json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def test_negotiate():
+    assert negotiate(None, []) == (JSON_WIRE, None)
+    assert negotiate(None, ["chat", "fool.compact.v1"]) == (COMPACT_WIRE, "fool.compact.v1")
+    assert negotiate("compact", []) == (COMPACT_WIRE, None)
+    assert negotiate("json", ["fool.compact.v1"]) == (JSON_WIRE, None)
+    with pytest.raises(ValueError):
+        negotiate("xml", [])
+
+
+class _RecordingWebSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def accept(self, subprotocol=None):
+        self.subprotocol = subprotocol
+
+    async def send_text(self, text):
+        self.frames.append(text)
+
+    async def send_bytes(self, data):
+        self.frames.append(data)
+
+
+def test_broadcast_encodes_once_per_format():
+    async def scenario():
+        manager = ConnectionManager()
+        plain, compact = _RecordingWebSocket(), _RecordingWebSocket()
+        await manager.connect("plain", plain)
+        await manager.connect("compact", compact, COMPACT_WIRE, "fool.compact.v1")
+        await manager.broadcast_to_players(["plain", "compact"], {"type": "player_connected"})
+        await asyncio.sleep(0.01)
+        return plain, compact
+
+    plain, compact = asyncio.run(scenario())
+    assert compact.subprotocol == "fool.compact.v1"
+    assert plain.frames == ['{"type":"player_connected"}']
+    assert msgspec.msgpack.decode(compact.frames[0]) == {"type": 0}
+
+
+def test_websocket_compact_subprotocol():
+    with TestClient(app) as client:
+        joined = client.post("/api/v1/join_game", params={"player_id": "wire-a", "players_limit": 2}).json()
+        path = f"/api/v1/ws/{joined['game_id']}?player_id=wire-a"
+        with client.websocket_connect(path, subprotocols=["fool.compact.v1"]) as websocket:
+            assert websocket.accepted_subprotocol == "fool.compact.v1"
+            message = msgspec.msgpack.decode(websocket.receive_bytes())
+            schema = client.get("/api/v1/wire/compact").json()
+            assert schema["type"][message["type"]] == "connection_confirmed"
+        client.post("/api/v1/exit_game", params={"player_id": "wire-a"})
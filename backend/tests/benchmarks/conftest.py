@@ -0,0 +1,142 @@
+"""
+Бенчмарки горячих путей движка правил.
+
+Запуск (обычный прогон тестов их пропускает):
+
+    pytest backend/tests/benchmarks --benchmark-only
+
+Минимальное время раунда каждого бенчмарка сравнивается с сохранённой базой
+baseline.json. Сравнение относительное: вместе с базой записано время
+калибровочной нагрузки (_calibration), и база пересчитывается на скорость
+текущей машины по той же нагрузке, измеренной в начале прогона.
+
+Порог включается явно (BENCHMARK_GATE=1, например на выделенном раннере):
+тогда бенчмарк, ставший медленнее пересчитанной базы больше чем на
+BENCHMARK_MAX_REGRESSION процентов (по умолчанию 30), падает. Без него
+замедления только печатаются в итоге прогона.
+
+Перезаписать базу результатами текущего прогона:
+
+    BENCHMARK_SAVE_BASELINE=1 pytest backend/tests/benchmarks --benchmark-only
+"""
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+MAX_REGRESSION = float(os.environ.get("BENCHMARK_MAX_REGRESSION", "30"))
+SAVE_BASELINE = os.environ.get("BENCHMARK_SAVE_BASELINE") == "1"
+GATE = os.environ.get("BENCHMARK_GATE") == "1"
+# Ключ базы с временем калибровочной нагрузки на машине, где база сохранена
+CALIBRATION_KEY = "_calibration"
+CALIBRATION_ROUNDS = 50
+
+_results: Dict[str, float] = {}
+_slowdowns: List[str] = []
+
+
+def _load_baseline() -> Dict[str, float]:
+    if not BASELINE_PATH.exists():
+        return {}
+    with BASELINE_PATH.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+_baseline = _load_baseline()
+
+
+def _calibration_workload() -> int:
+    """Чистый Python без движка: словари, списки и арифметика, как на горячих путях"""
+    total = 0
+    table: Dict[int, int] = {}
+    for i in range(5000):
+        table[i % 97] = table.get(i % 97, 0) + i
+        total += len([value for value in table.values() if value & 1])
+    return total
+
+
+@pytest.fixture(scope="session")
+def calibration() -> float:
+    """Минимальное время калибровочной нагрузки на этой машине, секунды"""
+    best = float("inf")
+    for _ in range(CALIBRATION_ROUNDS):
+        started = time.perf_counter()
+        _calibration_workload()
+        best = min(best, time.perf_counter() - started)
+    _results[CALIBRATION_KEY] = best
+    return best
+
+
+@pytest.fixture(autouse=True)
+def _benchmark_only(request):
+    """Бенчмарки идут только с --benchmark-only, чтобы не тормозить обычный прогон"""
+    if not request.config.getoption("benchmark_only", False):
+        pytest.skip("бенчмарки запускаются с --benchmark-only")
+    # Логи состояний на каждом ходе искажают замеры
+    app_logger = logging.getLogger("backend.app")
+    previous_level = app_logger.level
+    app_logger.setLevel(logging.WARNING)
+    yield
+    app_logger.setLevel(previous_level)
+
+
+@pytest.fixture
+def hot_path(benchmark, request, calibration):
+    """
+    Обёртка над benchmark, которая сверяет результат с базой.
+
+    Принимает те же аргументы, что benchmark.pedantic; после замера
+    минимальное время раунда сравнивается с baseline.json, пересчитанной
+    на скорость машины по калибровке.
+    """
+
+    def run(target, *, setup=None, rounds=200, iterations=1, warmup_rounds=5, args=()):
+        if setup is None:
+            result = benchmark.pedantic(
+                target, args=args, rounds=rounds, iterations=iterations, warmup_rounds=warmup_rounds
+            )
+        else:
+            result = benchmark.pedantic(target, setup=setup, rounds=rounds, warmup_rounds=warmup_rounds)
+
+        if benchmark.stats is None:
+            return result
+        measured = benchmark.stats.stats.min
+        name = request.node.name
+        _results[name] = measured
+        expected = _baseline.get(name)
+        if expected and not SAVE_BASELINE:
+            expected *= calibration / _baseline.get(CALIBRATION_KEY, calibration)
+            slowdown = (measured / expected - 1) * 100
+            message = (
+                f"{name}: {measured * 1e6:.1f} мкс против базы {expected * 1e6:.1f} мкс "
+                f"(+{slowdown:.0f}% при допуске {MAX_REGRESSION:.0f}%)"
+            )
+            if GATE:
+                assert slowdown <= MAX_REGRESSION, message
+            elif slowdown > MAX_REGRESSION:
+                _slowdowns.append(message)
+        return result
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _slowdowns:
+        terminalreporter.section("замедления относительно базы (порог выключен, см. BENCHMARK_GATE)")
+        for message in _slowdowns:
+            terminalreporter.write_line(message)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if SAVE_BASELINE and _results:
+        baseline = {**_baseline, **_results}
+        with BASELINE_PATH.open("w", encoding="utf-8") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+            f.write("\n")
@@ -0,0 +1,246 @@
+import json
+import logging
+import os
+import random
+from functools import partial
+
+import pytest
+
+from backend.api.managers.state_sync_manager import StateSyncManager
+from backend.api.wire_format import COMPACT_WIRE, JSON_WIRE
+from backend.app.config.logging_config import make_queue_logging
+from backend.app.contracts.game_contract import ActionResult, PlayerAction, PlayerInput
+from backend.app.models.card import CARDS, RANKS_COUNT, SUIT_POSITION, SUITS, Rank, Suit, card_by_index
+from backend.app.models.card_table import CardTable
+from backend.app.models.deck import Deck, RandomDeckSource
+from backend.app.models.deck_pool import DeckPool
+from backend.app.models.game import FoolGame
+from backend.app.models.player import Player
+from backend.app.simulation import SimulationConfig, play_game
+from backend.app.states.play_round_state import PlayRoundWithoutThrowState
+
+SEED = 1
+
+
+def _started_game(players: int = 2) -> FoolGame:
+    """Партия сразу после раздачи"""
+    random.seed(SEED)
+    game = FoolGame("bench", players)
+    for i in range(players):
+        game.handle_input(PlayerInput(f"p{i}", PlayerAction.JOIN))
+    for i in range(players):
+        game.handle_input(PlayerInput(f"p{i}", PlayerAction.READY))
+    return game
+
+
+def _suit_card(suit: Suit, rank_position: int, trump_suit: Suit):
+    return card_by_index(SUIT_POSITION[suit] * RANKS_COUNT + rank_position, trump_suit)
+
+
+def _rigged_round():
+    """
+    Раунд с известными руками: атакующий держит 6–В некозырной масти,
+    защищающийся — Д, К, Т той же масти, поэтому ход и защита всегда допустимы.
+    """
+    game = _started_game()
+    trump = game.deck.trump_suit
+    plain, other = [suit for suit in SUITS if suit != trump][:2]
+    attacker = game.get_player_by_id(game.current_attacker_id)
+    defender = game.get_player_by_id(game.current_defender_id)
+    attacker.clear_hand()
+    defender.clear_hand()
+    for rank_position in range(6):
+        attacker.add_card(_suit_card(plain, rank_position, trump))
+    for rank_position in range(6, 9):
+        defender.add_card(_suit_card(plain, rank_position, trump))
+        defender.add_card(_suit_card(other, rank_position, trump))
+    attack = PlayerInput(attacker.id_, PlayerAction.ATTACK, attack_card=_suit_card(plain, 0, trump))
+    defend = PlayerInput(
+        defender.id_,
+        PlayerAction.DEFEND,
+        attack_card=attack.attack_card,
+        defend_card=_suit_card(plain, 6, trump),
+    )
+    return game, attack, defend
+
+
+def test_generate_deck(hot_path):
+    deck = Deck()
+    hot_path(deck.generate_deck, rounds=500, iterations=10)
+    assert len(deck) == 36
+
+
+def test_create_game(hot_path):
+    source = RandomDeckSource(random.Random(SEED))
+    game = hot_path(partial(FoolGame, "bench", 4, deck_source=source), rounds=500, iterations=10)
+    assert len(game.deck) == 36
+
+
+def test_create_game_pooled(hot_path):
+    # Пул без фонового потока и с запасом на все вызовы: меряется только выдача готовой колоды
+    pool = DeckPool(size=5500, rng=random.Random(SEED), background=False)
+    game = hot_path(partial(FoolGame, "bench", 4, deck_source=pool), rounds=500, iterations=10)
+    assert len(game.deck) == 36
+    assert pool.misses == 0
+
+
+def test_player_add_remove_cards(hot_path):
+    player = Player("p0", "Player")
+    hand = CARDS[:6]
+
+    def add_remove():
+        for card in hand:
+            player.add_card(card)
+        for card in hand:
+            player.remove_card(card)
+
+    hot_path(add_remove, rounds=500, iterations=10)
+    assert not player.get_cards()
+
+
+def test_table_throw_cover(hot_path):
+    table = CardTable(trump_suit=Suit.SPADES)
+    attacks = [card for card in CARDS if card.rank == Rank.SIX]
+    defends = [card for card in CARDS if card.rank == Rank.SEVEN]
+
+    def throw_cover():
+        for attack, defend in zip(attacks, defends):
+            table.throw_card(attack)
+            table.cover_card(attack, defend)
+        table.clear_table()
+
+    hot_path(throw_cover, rounds=500, iterations=10)
+
+
+def test_handle_input_attack(hot_path):
+    def setup():
+        game, attack, _ = _rigged_round()
+        return (game, attack), {}
+
+    response = hot_path(FoolGame.handle_input, setup=setup, rounds=300)
+    assert response.result == ActionResult.SUCCESS
+
+
+def test_handle_input_defend(hot_path):
+    def setup():
+        game, attack, defend = _rigged_round()
+        game.handle_input(attack)
+        return (game, defend), {}
+
+    response = hot_path(FoolGame.handle_input, setup=setup, rounds=300)
+    assert response.result == ActionResult.SUCCESS
+
+
+def test_handle_input_pass(hot_path):
+    def setup():
+        game, attack, defend = _rigged_round()
+        game.handle_input(attack)
+        game.handle_input(defend)
+        return (game, PlayerInput(attack.player_id, PlayerAction.PASS)), {}
+
+    transition = hot_path(FoolGame.handle_input, setup=setup, rounds=300)
+    assert transition.new_state == "PlayRoundWithoutThrowState"
+
+
+def test_set_state(hot_path):
+    def setup():
+        game = _started_game()
+        return (game, PlayRoundWithoutThrowState(game)), {}
+
+    hot_path(FoolGame._set_state, setup=setup, rounds=300)
+
+
+def test_get_allowed_actions(hot_path):
+    game, attack, _ = _rigged_round()
+    game.handle_input(attack)
+    actions = hot_path(game.get_allowed_actions, rounds=500, iterations=10)
+    assert PlayerAction.DEFEND.name in actions[game.current_defender_id]
+
+
+@pytest.mark.parametrize("players", [2, 3, 4, 5, 6])
+def test_full_game(hot_path, players):
+    config = SimulationConfig(players=players)
+    record = hot_path(play_game, args=(SEED, config), rounds=20, warmup_rounds=2)
+    assert record.finished
+
+
+def test_game_snapshot(hot_path):
+    game, attack, _ = _rigged_round()
+    game.handle_input(attack)
+    data = hot_path(game.snapshot, rounds=500, iterations=10)
+    assert len(data) < 200
+
+
+def test_game_restore(hot_path):
+    game, attack, _ = _rigged_round()
+    game.handle_input(attack)
+    data = game.snapshot()
+    restored = hot_path(FoolGame.restore, args=(data,), rounds=300)
+    assert restored.snapshot() == data
+
+
+def _full_state_message() -> dict:
+    """Полный снимок состояния (connection_confirmed) для игрока партии на 6"""
+    game = _started_game(6)
+    player = game.players[0]
+    return StateSyncManager().snapshot(game, player, game.get_allowed_actions()[player.id_])
+
+
+@pytest.mark.parametrize("wire", [JSON_WIRE, COMPACT_WIRE], ids=lambda wire: wire.name)
+def test_encode_full_state(hot_path, wire):
+    # Размер кадра: JSON ~850 байт, компактный ~500
+    message = _full_state_message()
+    frame = hot_path(wire.encode, args=(message,), rounds=500, iterations=10)
+    assert len(frame) < (600 if wire.binary else 1000)
+
+
+
+def _stdlib_json(message: dict) -> str:
+    """Прежнее кодирование JSON-кадра (как WebSocket.send_json) — точка отсчёта"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+@pytest.mark.parametrize("encode", [_stdlib_json, JSON_WIRE.encode, COMPACT_WIRE.encode], ids=["stdlib", "json", "compact"])
+def test_encode_room_snapshots(hot_path, benchmark, encode):
+    # Полные снимки всем 6 игрокам одной рассылкой; в extra_info — сообщений в секунду на ядро
+    game = _started_game(6)
+    sync = StateSyncManager()
+    shared = sync.build_shared_view(game)
+    actions = game.get_allowed_actions()
+    messages = [sync.snapshot(game, p, actions[p.id_], shared) for p in game.players]
+
+    frames = hot_path(lambda: [encode(message) for message in messages], rounds=500, iterations=10)
+    benchmark.extra_info["messages_per_sec"] = round(len(messages) / benchmark.stats.stats.min)
+    assert len(frames) == len(messages)
+
+
+@pytest.fixture
+def app_logging(request):
+    """Логи backend.app на уровне INFO через очередь в JSON (в /dev/null) — как в проде"""
+    if not request.param:
+        yield
+        return
+    app_logger = logging.getLogger("backend.app")
+    saved = app_logger.level, app_logger.propagate, list(app_logger.handlers)
+    with open(os.devnull, "w") as devnull:
+        handler, listener = make_queue_logging(devnull, log_format="json")
+        app_logger.handlers = [handler]
+        app_logger.setLevel(logging.INFO)
+        app_logger.propagate = False
+        listener.start()
+        try:
+            yield
+        finally:
+            listener.stop()
+            app_logger.setLevel(saved[0])
+            app_logger.propagate = saved[1]
+            app_logger.handlers = saved[2]
+
+
+@pytest.mark.parametrize("app_logging", [False, True], ids=["logging_off", "logging_on"], indirect=True)
+def test_moves_with_logging(hot_path, benchmark, app_logging):
+    # Партия на 4 игроков; в extra_info — ходов в секунду на ядро
+    config = SimulationConfig(players=4)
+    record = hot_path(play_game, args=(SEED, config), rounds=20, warmup_rounds=2)
+    benchmark.extra_info["moves_per_sec"] = round(record.moves / benchmark.stats.stats.min)
+    assert record.finished
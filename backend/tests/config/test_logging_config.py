@@ -0,0 +1,79 @@
+import io
+import json
+import logging
+
+from backend.app.config.logging_config import RateLimitFilter, make_queue_logging
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"test.logging.{name}")
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def _record(event=None, level=logging.INFO) -> logging.LogRecord:
+    record = logging.LogRecord("test", level, __file__, 1, "msg", None, None)
+    if event:
+        record.event = event
+    return record
+
+
+def test_json_records_written_by_listener():
+    stream = io.StringIO()
+    handler, listener = make_queue_logging(stream, log_format="json", rate_limit=0)
+    logger = _logger("json", handler)
+    hand = ["6S", "7S"]
+    listener.start()
+    try:
+        logger.info("Ход картой %s, рука %s", "6S", hand, extra={"event": "move", "game_id": "g1", "player_id": "p1"})
+        # Аргументы подставлены в момент вызова, а не при выводе
+        hand.clear()
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Ошибка", extra={"game_id": "g1"})
+    finally:
+        listener.stop()
+
+    first, second = (json.loads(line) for line in stream.getvalue().splitlines())
+    assert first["message"] == "Ход картой 6S, рука ['6S', '7S']"
+    assert (first["level"], first["event"], first["game_id"], first["player_id"]) == ("INFO", "move", "g1", "p1")
+    assert second["level"] == "ERROR" and "ValueError: boom" in second["exc_info"]
+    assert "player_id" not in second
+
+
+def test_rate_limit_per_event():
+    clock = FakeClock()
+    limit = RateLimitFilter(rate=2, rates={"rare": 0}, clock=clock)
+
+    assert [limit.filter(_record("ws")) for _ in range(4)] == [True, True, False, False]
+    # Другие события, записи без события и предупреждения не ограничиваются
+    assert limit.filter(_record("rules"))
+    assert limit.filter(_record())
+    assert limit.filter(_record("ws", logging.WARNING))
+    assert all(limit.filter(_record("rare")) for _ in range(10))
+
+    clock.now += 0.5
+    record = _record("ws")
+    assert limit.filter(record)
+    assert record.suppressed == 2
+    assert not limit.filter(_record("ws"))
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler, listener = make_queue_logging(io.StringIO(), rate_limit=0, queue_size=2)
+    logger = _logger("full", handler)
+    for i in range(5):
+        logger.info("запись %s", i)
+    assert handler.dropped == 3
+    assert handler.queue.qsize() == 2
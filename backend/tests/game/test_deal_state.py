@@ -80,7 +80,7 @@ def test_check_win_condition_all_victory(game_with_players):
 def test_check_win_condition_one_active(game_with_players):
     state = DealState(game_with_players)
     game_with_players.deck = []
-    game_with_players.players[0].cards = [Card(Suit.HEARTS, Rank.SIX)]
+    game_with_players.players[0].cards = [Card(Rank.SIX, Suit.HEARTS)]
 
     assert state._check_win_condition() is True
 
@@ -129,16 +129,10 @@ def test_deal_cards_order(game_with_players):
 def test_fill_hand_partial_deck(game_with_players):
     state = DealState(game_with_players)
     player = Player(id_=4, name="Sex")
-    cards = [
-        Card(Suit.HEARTS, Rank.SIX),
-        Card(Suit.DIAMONDS, Rank.SEVEN),
-        Card(Suit.CLUBS, Rank.EIGHT),
-        Card(Suit.SPADES, Rank.NINE),
-    ]
-    for c in cards:
+    # Карты в руку берём из вытянутых, чтобы они не совпали с оставшимися в колоде
+    drawn = [game_with_players.deck.draw() for _ in range(34)]
+    for c in drawn[:4]:
         player.add_card(c)
-    for _ in range(34):
-        game_with_players.deck.draw()
     state._fill_hand(player)
     assert len(player.get_cards()) == 6  # 4 + 2 = 6
 
@@ -152,3 +146,18 @@ def test_update_player_statuses(game_with_players):
 
     assert game_with_players.players[0].status == PlayerStatus.UNREADY
     assert game_with_players.players[1].status == PlayerStatus.VICTORY
+
+
+def test_auto_transition(game_with_players):
+    """Раздача сама определяет следующее состояние и не вызывает ввод"""
+    state = DealState(game_with_players)
+    game_with_players.state_history = ["PlayRoundWithoutThrowState"]
+    log_size = len(game_with_players.event_log)
+    state.enter()
+    assert state.auto_transition() == "PlayRoundWithoutThrowState"
+    assert len(game_with_players.event_log) == log_size
+
+    game_with_players.deck = []
+    for p in game_with_players.players:
+        p.clear_hand()
+    assert state.auto_transition() == "GameOverState"
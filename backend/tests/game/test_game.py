@@ -4,6 +4,7 @@ from unittest.mock import Mock, patch
 from backend.app.contracts.game_contract import PlayerInput, PlayerAction, ActionResult, StateResponse, StateTransition
 from backend.app.models.player import Player, PlayerStatus
 from backend.app.models.game import FoolGame
+from backend.app.states.registry import STATE_GRAPH
 from backend.app.utils.game_interface import GameState
 
 
@@ -34,6 +35,7 @@ def mock_state():
     state.exit.return_value = {"message": "Exited mock state"}
     state.get_state_info.return_value = {"state_info": "mock_info"}
     state.get_allowed_actions.return_value = {1: [PlayerAction.READY, PlayerAction.QUIT]}
+    state.auto_transition.return_value = None
     return state
 
 
@@ -113,8 +115,9 @@ def test_handle_input_state_transition(game, mock_state):
         def get_state_info(self): 
             return {}
     
-    # Патчим метод __subclasses__ для GameState
-    with patch.object(GameState, '__subclasses__', return_value=[NewState]):
+    # Регистрируем новое состояние и переход в него из мока
+    with patch.dict(STATE_GRAPH.classes, {"NewState": NewState}), \
+            patch.dict(STATE_GRAPH.transitions, {"MockState": frozenset({"NewState"})}):
         mock_state.handle_input.return_value = StateResponse(
             ActionResult.SUCCESS,
             "Transition to new state",
@@ -149,13 +152,37 @@ def test_handle_input_invalid_state(game, mock_state):
         None
     )
     
-    # Патчим метод __subclasses__ для GameState
-    with patch.object(GameState, '__subclasses__', return_value=[]):
-        player_input = PlayerInput(player_id=1, action=PlayerAction.JOIN)
-        response = game.handle_input(player_input)
-        
-        assert response.result == ActionResult.INVALID_ACTION
-        assert "State NonExistentState not found" in response.message
+    player_input = PlayerInput(player_id=1, action=PlayerAction.JOIN)
+    response = game.handle_input(player_input)
+
+    assert response.result == ActionResult.INVALID_ACTION
+    assert "State NonExistentState not found" in response.message
+
+
+def test_handle_input_transition_not_allowed(game, mock_state):
+    """Тест обработки ввода с переходом, которого нет в графе состояний"""
+    game._current_state = mock_state
+    mock_state.handle_input.return_value = StateResponse(
+        ActionResult.SUCCESS,
+        "Transition to game over",
+        "GameOverState",
+        None
+    )
+
+    response = game.handle_input(PlayerInput(player_id=1, action=PlayerAction.JOIN))
+
+    assert response.result == ActionResult.INVALID_ACTION
+    assert "MockState -> GameOverState is not allowed" in response.message
+    assert game._current_state is mock_state
+
+
+def test_states_are_reused(game_with_players):
+    """Объекты состояний создаются один раз на партию"""
+    game = game_with_players
+    lobby = game._current_state
+    game.reset_to_lobby()
+    assert game._current_state is lobby
+    assert game._get_state("DealState") is game._get_state("DealState")
 
 
 def test_get_game_state(game_with_players, mock_state):
@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import MagicMock, Mock, patch
 
 from backend.app.contracts.game_contract import PlayerInput, PlayerAction, ActionResult, StateResponse
-from backend.app.models.card import Card
+from backend.app.models.card import CARDS, Card
 from backend.app.models.game import FoolGame
 from backend.app.models.player import Player, PlayerStatus
 from backend.app.states.lobby_state import LobbyState
@@ -193,8 +193,7 @@ def test_exit_state(lobby_state, game_mock):
     """Тест выхода из состояния лобби"""
     # Создаем мок колоды с уникальными картами
     mock_deck = MagicMock()
-    mock_cards = [MagicMock(spec=Card) for _ in range(36)]
-    mock_deck.draw.side_effect = mock_cards
+    mock_deck.draw.side_effect = list(CARDS)
     
     # Присваиваем мок колоды игровому объекту
     game_mock.deck = mock_deck
@@ -0,0 +1,57 @@
+import pytest
+
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+from backend.app.models.game import FoolGame
+from backend.app.states.deal_state import DealState
+from backend.app.states.play_round_state import PlayRoundWithThrowState
+from backend.app.states.registry import STATE_GRAPH, StateGraph, StateName
+
+
+def test_graph_covers_all_states():
+    graph = STATE_GRAPH.to_dict()
+    assert set(graph) == {name.value for name in StateName}
+    # Все цели переходов зарегистрированы
+    assert all(target in STATE_GRAPH for targets in graph.values() for target in targets)
+    assert STATE_GRAPH.get_class(StateName.DEAL) is DealState
+    assert STATE_GRAPH.can_transition("DealState", StateName.PLAY_ROUND)
+    assert not STATE_GRAPH.can_transition(StateName.LOBBY, "GameOverState")
+    assert '"LobbyState" -> "PlayRoundWithoutThrowState";' in STATE_GRAPH.to_dot()
+    # Раунд с подкидыванием — заготовка, в граф не входит
+    assert PlayRoundWithThrowState.__abstractmethods__
+    assert "PlayRoundWithThrowState" not in STATE_GRAPH
+
+
+def test_register_twice():
+    graph = StateGraph()
+    graph.register(StateName.DEAL, DealState, [StateName.GAME_OVER])
+    with pytest.raises(ValueError):
+        graph.register("DealState", DealState)
+
+
+def test_game_walks_the_graph():
+    """Реальная партия проходит только по рёбрам графа"""
+    game = FoolGame("g", 2, seed=3)
+    for action in (PlayerAction.JOIN, PlayerAction.READY):
+        for seat in range(2):
+            game.handle_input(PlayerInput(f"p{seat}", action))
+    path = game.state_history + [game.current_state_name]
+    assert path == ["LobbyState", "PlayRoundWithoutThrowState"]
+    assert all(STATE_GRAPH.can_transition(a, b) for a, b in zip(path, path[1:]))
+
+
+def test_round_end_returns_transition_chain():
+    """Конец раунда проходит раздачу внутри одного хода и возвращает сводный переход"""
+    game = FoolGame("g", 2, seed=3)
+    for action in (PlayerAction.JOIN, PlayerAction.READY):
+        for seat in range(2):
+            game.handle_input(PlayerInput(f"p{seat}", action))
+    attacker = game.get_player_by_id(game.current_attacker_id)
+    defender_id = game.current_defender_id
+    game.handle_input(PlayerInput(attacker.id_, PlayerAction.ATTACK, attack_card=next(iter(attacker.get_cards()))))
+    game.handle_input(PlayerInput(defender_id, PlayerAction.PASS))  # решает взять карты
+    transition = game.handle_input(PlayerInput(attacker.id_, PlayerAction.PASS))
+
+    assert transition.path == ["PlayRoundWithoutThrowState", "DealState", "PlayRoundWithoutThrowState"]
+    assert [step.new_state for step in transition.steps] == ["DealState", "PlayRoundWithoutThrowState"]
+    assert transition.new_state == game.current_state_name == "PlayRoundWithoutThrowState"
+    assert game.current_attacker_id == attacker.id_  # защищавшийся взял карты и пропускает ход
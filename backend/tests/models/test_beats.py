@@ -0,0 +1,58 @@
+import pytest
+
+from backend.app.models.beats import BEATS, beaters_mask, beats, defense_options
+from backend.app.models.card import CARDS, Card, Rank, Suit
+from backend.app.models.card_set import CardSet
+from backend.app.models.card_table import CardTable
+from backend.app.utils.errors import InvalidDefenseError, WeakDefenseError
+
+
+def _reference_beats(attack: Card, defend: Card, trump_suit: Suit) -> bool:
+    """Правило защиты в лоб: старшая той же масти или козырь против не козыря"""
+    if attack.suit == defend.suit:
+        return defend.rank.value > attack.rank.value
+    return defend.suit == trump_suit
+
+
+def test_matrix_shape():
+    """Тест: по одному срезу 36 строк на каждую козырную масть"""
+    assert len(BEATS) == len(Suit)
+    assert all(len(row) == len(CARDS) for row in BEATS)
+
+
+@pytest.mark.parametrize("trump_suit", list(Suit))
+def test_matrix_matches_rules(trump_suit):
+    """Тест: матрица совпадает с правилом для всех пар карт"""
+    for attack in CARDS:
+        for defend in CARDS:
+            assert beats(attack, defend, trump_suit) == _reference_beats(attack, defend, trump_suit)
+
+
+def test_no_trump_beats_only_same_suit():
+    """Тест: без козыря бьют только старшие карты той же масти"""
+    attack = Card(Rank.TEN, Suit.CLUBS)
+    assert CardSet.from_mask(beaters_mask(attack, None)) == CardSet(
+        [Card(Rank.JACK, Suit.CLUBS), Card(Rank.QUEEN, Suit.CLUBS),
+         Card(Rank.KING, Suit.CLUBS), Card(Rank.ACE, Suit.CLUBS)]
+    )
+
+
+def test_defense_options():
+    """Тест: выбор карт руки, которыми можно отбиться"""
+    hand = CardSet([Card(Rank.SIX, Suit.SPADES), Card(Rank.KING, Suit.HEARTS), Card(Rank.SIX, Suit.HEARTS)])
+    options = CardSet.from_mask(defense_options(hand.mask, Card(Rank.TEN, Suit.HEARTS), Suit.SPADES))
+    assert options == CardSet([Card(Rank.SIX, Suit.SPADES), Card(Rank.KING, Suit.HEARTS)])
+
+
+def test_table_uses_game_trump_suit():
+    """Тест: стол проверяет защиту по козырю партии, а не по типу карты"""
+    table = CardTable(trump_suit=Suit.SPADES)
+    table.throw_card(Card(Rank.ACE, Suit.HEARTS))
+    assert table.cover_card(Card(Rank.ACE, Suit.HEARTS), Card(Rank.SIX, Suit.SPADES)) is True
+
+    table.clear_table()
+    table.throw_card(Card(Rank.SEVEN, Suit.HEARTS))
+    with pytest.raises(InvalidDefenseError):
+        table.validate_defense(Card(Rank.SEVEN, Suit.HEARTS), Card(Rank.ACE, Suit.CLUBS))
+    with pytest.raises(WeakDefenseError):
+        table.validate_defense(Card(Rank.SEVEN, Suit.HEARTS), Card(Rank.SIX, Suit.HEARTS))
@@ -0,0 +1,117 @@
+import pytest
+
+from backend.app.models.card import CARDS, DECK_SIZE, Card, TrumpCard, Rank, Suit, card_by_index
+from backend.app.models.card_set import (
+    FULL_DECK_MASK,
+    SUIT_MASKS,
+    CardSet,
+    beating_mask,
+    cards_of_ranks,
+    iter_indices,
+    ranks_of,
+)
+
+
+def test_card_indices_are_unique_and_dense():
+    """Тест: каждая из 36 карт получает свой индекс 0..35"""
+    indices = {Card(rank, suit).index for suit in Suit for rank in Rank}
+    assert indices == set(range(DECK_SIZE))
+
+
+def test_card_by_index_returns_interned_objects():
+    """Тест: таблица карт отдаёт одни и те же объекты"""
+    card = Card(Rank.QUEEN, Suit.CLUBS)
+    assert card_by_index(card.index) is CARDS[card.index]
+    assert card_by_index(card.index) == card
+    trump = card_by_index(card.index, Suit.CLUBS)
+    assert isinstance(trump, TrumpCard)
+    assert trump is card_by_index(card.index, Suit.CLUBS)
+    assert not isinstance(card_by_index(card.index, Suit.HEARTS), TrumpCard)
+
+
+def test_from_dict_accepts_all_formats():
+    """Тест: from_dict понимает числа, строки и имена"""
+    expected = Card(Rank.ACE, Suit.SPADES)
+    assert Card.from_dict({"rank": "14", "suit": "S"}) is CARDS[expected.index]
+    assert Card.from_dict({"rank": 14, "suit": "SPADES"}) == expected
+    assert Card.from_dict({"rank": "ACE", "suit": Suit.SPADES}) == expected
+    assert isinstance(Card.from_dict({"rank": "14", "suit": "S"}, Suit.SPADES), TrumpCard)
+    with pytest.raises(ValueError):
+        Card.from_dict({"rank": "15", "suit": "S"})
+    with pytest.raises(ValueError):
+        Card.from_dict({"rank": "14", "suit": "X"})
+
+
+def test_card_set_membership_and_len():
+    """Тест: добавление, проверка принадлежности и удаление"""
+    hand = CardSet()
+    six = Card(Rank.SIX, Suit.HEARTS)
+    ace = TrumpCard(Rank.ACE, Suit.DIAMONDS)
+    hand.add(six)
+    hand.add(ace)
+    assert len(hand) == 2
+    assert six in hand
+    assert Card(Rank.ACE, Suit.DIAMONDS) in hand
+    assert Card(Rank.SEVEN, Suit.HEARTS) not in hand
+    assert "not a card" not in hand
+    hand.remove(six)
+    assert six not in hand
+    with pytest.raises(KeyError):
+        hand.remove(six)
+    hand.clear()
+    assert not hand
+
+
+def test_card_set_iteration_keeps_trump_cards():
+    """Тест: перебор возвращает карты в порядке индексов и сохраняет козыри"""
+    trump = TrumpCard(Rank.TEN, Suit.CLUBS)
+    plain = Card(Rank.SIX, Suit.HEARTS)
+    hand = CardSet([trump, plain])
+    cards = list(hand)
+    assert cards == [plain, trump]
+    assert isinstance(cards[1], TrumpCard)
+    assert not isinstance(cards[0], TrumpCard)
+
+
+def test_card_set_from_mask():
+    """Тест: множество по маске и маска по множеству совпадают"""
+    hand = CardSet.from_mask(SUIT_MASKS[0], Suit.HEARTS)
+    assert len(hand) == 9
+    assert all(card.suit == Suit.HEARTS for card in hand)
+    assert all(isinstance(card, TrumpCard) for card in hand)
+    assert CardSet(hand).mask == SUIT_MASKS[0]
+    assert CardSet.from_mask(FULL_DECK_MASK) == CardSet(CARDS)
+
+
+def test_ranks_of_and_cards_of_ranks():
+    """Тест: свёртка маски карт в ранги и обратно"""
+    mask = (1 << Card(Rank.SIX, Suit.HEARTS).index) | (1 << Card(Rank.KING, Suit.SPADES).index)
+    ranks = ranks_of(mask)
+    assert [i for i in iter_indices(ranks)] == [0, 7]
+    sixes = cards_of_ranks(1)
+    assert {card.suit for card in CardSet.from_mask(sixes)} == set(Suit)
+    assert {card.rank for card in CardSet.from_mask(sixes)} == {Rank.SIX}
+
+
+def test_beating_mask():
+    """Тест: маска карт, которыми можно побить данную"""
+    seven_hearts = Card(Rank.SEVEN, Suit.HEARTS)
+    beaters = CardSet.from_mask(beating_mask(seven_hearts.index, Suit.SPADES))
+    assert Card(Rank.EIGHT, Suit.HEARTS) in beaters
+    assert Card(Rank.SIX, Suit.HEARTS) not in beaters
+    assert Card(Rank.SIX, Suit.SPADES) in beaters
+    assert Card(Rank.ACE, Suit.CLUBS) not in beaters
+
+    seven_spades = Card(Rank.SEVEN, Suit.SPADES)
+    trump_beaters = CardSet.from_mask(beating_mask(seven_spades.index, Suit.SPADES))
+    assert trump_beaters == CardSet(
+        Card(rank, Suit.SPADES) for rank in Rank if rank.value > Rank.SEVEN.value
+    )
+
+
+def test_can_beat():
+    """Тест: проверка наличия карты, которой можно отбиться"""
+    hand = CardSet([Card(Rank.SIX, Suit.CLUBS), Card(Rank.NINE, Suit.HEARTS)])
+    assert hand.can_beat(Card(Rank.EIGHT, Suit.HEARTS), Suit.SPADES)
+    assert not hand.can_beat(Card(Rank.TEN, Suit.HEARTS), Suit.SPADES)
+    assert hand.can_beat(Card(Rank.TEN, Suit.HEARTS), Suit.CLUBS)
@@ -4,6 +4,7 @@ from typing import List, Dict
 
 from backend.app.models.card import Card, TrumpCard, Rank, Suit
 from backend.app.models.card_table import CardTable
+from backend.app.utils.errors import CardAlreadyCoveredError
 
 @pytest.fixture
 def card_setup():
@@ -63,7 +64,7 @@ def test_throw_first_card(table: CardTable, card_setup: Dict[str, Card]):
         assert result["status"] is "sucsess"
 
     assert len(table.table_cards) == 1
-    assert table.table_cards[0]['attack_card'] == card_setup["six_hearts"]
+    assert table.table_cards[0].attack_card == card_setup["six_hearts"]
 
 def test_throw_matching_rank_card(table: CardTable, card_setup: Dict[str, Card]):
     """Тест добавления карты с совпадающим рангом"""
@@ -72,7 +73,7 @@ def test_throw_matching_rank_card(table: CardTable, card_setup: Dict[str, Card])
     if not isinstance(result, Exception) and result.get("status"):
         assert result["status"] is "sucsess"
     assert len(table.table_cards) == 2
-    assert table.table_cards[1]['attack_card'] == card_setup["six_diamonds"]
+    assert table.table_cards[1].attack_card == card_setup["six_diamonds"]
 
 def test_throw_non_matching_rank_card(table: CardTable, card_setup: Dict[str, Card]):
     """Тест добавления карты с несовпадающим рангом"""
@@ -96,14 +97,14 @@ def test_cover_card_success(table: CardTable, card_setup: Dict[str, Card]):
     table.throw_card(card_setup["six_hearts"])
     result = table.cover_card(card_setup["six_hearts"], card_setup["seven_hearts"])
     assert result is True
-    assert table.table_cards[0]['defend_card'] == card_setup["seven_hearts"]
+    assert table.table_cards[0].defend_card == card_setup["seven_hearts"]
 
 def test_cover_card_failure_lower_rank(table: CardTable, card_setup: Dict[str, Card]): 
     """Тест неудачного покрытия карты из-за более низкого ранга"""
     table.throw_card(card_setup["seven_hearts"])
     result = table.cover_card(card_setup["seven_hearts"], card_setup["six_hearts"])
     assert result is False
-    assert table.table_cards[0].get('defend_card') is None
+    assert table.table_cards[0].defend_card is None
 
 def test_cover_card_not_on_table(table: CardTable, card_setup: Dict[str, Card]):
     """Тест покрытия карты, которой нет на столе"""
@@ -154,28 +155,28 @@ def test_throw_trump_card(table: CardTable, card_setup: Dict[str, Card]):
     result = table.throw_card(card_setup["trump_ace_diamonds"])
     assert result["status"] == "sucsess"
     assert len(table.table_cards) == 1
-    assert table.table_cards[0]['attack_card'] == card_setup["trump_ace_diamonds"]
+    assert table.table_cards[0].attack_card == card_setup["trump_ace_diamonds"]
 
 def test_cover_card_with_trump(table: CardTable, card_setup: Dict[str, Card]):
     """Тест покрытия обычной карты козырной картой"""
     table.throw_card(card_setup["ace_diamonds"])
     result = table.cover_card(card_setup["ace_diamonds"], card_setup["trump_six_hearts"])
     assert result is True
-    assert table.table_cards[0]['defend_card'] == card_setup["trump_six_hearts"]
+    assert table.table_cards[0].defend_card == card_setup["trump_six_hearts"]
 
 def test_cover_trump_with_higher_trump(table: CardTable, card_setup: Dict[str, Card]):
     """Тест покрытия козырной карты другой козырной картой более высокого ранга"""
     table.throw_card(card_setup["trump_six_hearts"])
     result = table.cover_card(card_setup["trump_six_hearts"], card_setup["trump_king_diamonds"])
     assert result is True
-    assert table.table_cards[0]['defend_card'] == card_setup["trump_king_diamonds"]
+    assert table.table_cards[0].defend_card == card_setup["trump_king_diamonds"]
 
 def test_cover_trump_with_regular_card_failure(table: CardTable, card_setup: Dict[str, Card]):
     """Тест неудачного покрытия козырной карты обычной картой"""
     table.throw_card(card_setup["trump_six_hearts"])
     result = table.cover_card(card_setup["trump_six_hearts"], card_setup["ace_diamonds"])
     assert result is False
-    assert table.table_cards[0].get('defend_card') is None
+    assert table.table_cards[0].defend_card is None
 
 def test_trump_card_index(table: CardTable, card_setup: Dict[str, Card]):
     """Тест получения индекса козырной карты"""
@@ -228,3 +229,37 @@ def test_clear_table_with_trump_cards(table: CardTable, card_setup: Dict[str, Ca
     assert len(table.table_cards) == 0
     assert len(table._get_attack_cards()) == 0
     assert len(table._get_defend_cards()) == 0
+
+def test_incremental_index(table: CardTable, card_setup: Dict[str, Card]):
+    """Тест: индексы стола обновляются при каждом ходе"""
+    assert table.is_all_covered
+    table.throw_card(card_setup["six_hearts"])
+    table.throw_card(card_setup["six_diamonds"])
+    assert table.attack_count == 2
+    assert table.uncovered_count == 2
+    assert table.rank_count(Rank.SIX) == 2
+
+    table.cover_card(card_setup["six_hearts"], card_setup["seven_hearts"])
+    assert table.uncovered_count == 1
+    assert not table.is_all_covered
+    assert table._get_table_ranks() == {Rank.SIX, Rank.SEVEN}
+    assert table._get_card_index(card_setup["seven_hearts"]) == 0
+
+    table.cover_card(card_setup["six_diamonds"], card_setup["seven_diamonds"])
+    assert table.is_all_covered
+    assert table.rank_count(Rank.SEVEN) == 2
+
+    table.clear_table()
+    assert table.attack_count == 0
+    assert table.ranks_mask == 0
+    assert table.cards_mask == 0
+    assert table._get_card_index(card_setup["six_hearts"]) is None
+
+def test_cover_already_covered_card(table: CardTable, card_setup: Dict[str, Card]):
+    """Тест: повторно покрыть уже покрытую карту нельзя"""
+    table.throw_card(card_setup["six_hearts"])
+    table.cover_card(card_setup["six_hearts"], card_setup["seven_hearts"])
+    with pytest.raises(CardAlreadyCoveredError):
+        table.cover_card(card_setup["six_hearts"], card_setup["eight_hearts"])
+    assert table.table_cards[0].defend_card == card_setup["seven_hearts"]
+    assert table.uncovered_count == 0
@@ -1,7 +1,11 @@
+import random
+import time
+
 import pytest
 
-from backend.app.models.card import Card, TrumpCard, Suit, Rank
-from backend.app.models.deck import Deck
+from backend.app.models.card import Card, TrumpCard, Suit, Rank, card_by_index
+from backend.app.models.deck import Deck, ScriptedDeckSource, shuffled_deck
+from backend.app.models.deck_pool import DeckPool
 
 
 @pytest.fixture
@@ -23,17 +27,6 @@ def test_initialization(deck):
     # Проверяем, что козырная карта последняя в колоде
     assert deck._cards[0] == deck.trump_card
 
-def test_shuffle(deck):
-    """Тест перемешивания колоды"""
-    # Сохраняем копию карт до перемешивания
-    cards_before = deck._cards.copy()
-    # Перемешиваем колоду
-    deck.shuffle()
-    # Проверяем, что количество карт не изменилось
-    assert len(deck) == len(cards_before)
-    # Проверяем, что все карты сохранились (хотя порядок мог измениться)
-    assert {(card.rank, card.suit) for card in deck._cards} == {(card.rank, card.suit) for card in cards_before}
-
 def test_draw(deck):
     """Тест взятия карты из колоды"""
     initial_size = len(deck)
@@ -84,3 +77,57 @@ def test_cards_uniqueness_and_completeness(deck):
                 assert isinstance(matching_cards[0], TrumpCard), f"Карта {matching_cards[0]} должна быть TrumpCard"
             else:
                 assert not isinstance(matching_cards[0], TrumpCard), f"Карта {matching_cards[0]} не должна быть TrumpCard"
+
+
+def test_seeded_decks_repeat():
+    """Колода и все следующие колоды определяются seed"""
+    first, second = Deck(seed=7), Deck(seed=7)
+    assert first._cards == second._cards
+    first.generate_deck()
+    second.generate_deck()
+    assert first.seed == second.seed
+    assert first._cards == second._cards
+    assert first._cards == list(shuffled_deck(first.seed))
+
+
+def test_injected_rng():
+    """Seed колод берутся из переданного генератора, карты интернированы"""
+    deck = Deck(rng=random.Random(3))
+    assert deck.seed == random.Random(3).getrandbits(64)
+    assert all(card is card_by_index(card.index, deck.trump_suit) for card in deck._cards)
+
+    fair = Deck(rng=random.SystemRandom())
+    assert len(fair) == 36 and fair.trump_card is fair._cards[0]
+
+
+def test_scripted_source():
+    deck = Deck(seed=1, source=ScriptedDeckSource([5]))
+    assert deck.seed == 1
+    deck.generate_deck()
+    assert deck.seed == 5
+    with pytest.raises(ValueError):
+        deck.generate_deck()
+
+
+def test_deck_pool():
+    """Пул выдаёт готовые колоды, а опустев — считает их на месте"""
+    pool = DeckPool(size=4, rng=random.Random(1), background=False)
+    assert len(pool) == 4
+    seeds = [Deck(source=pool).seed for _ in range(6)]
+    assert len(set(seeds)) == 6
+    assert pool.stats() == {"size": 0, "hits": 4, "misses": 2}
+    assert pool.fill() == 4
+
+
+def test_deck_pool_refills_in_background():
+    pool = DeckPool(size=8, low_watermark=4)
+    try:
+        for _ in range(6):
+            seed, order = pool.next_deck()
+            assert list(order) == list(shuffled_deck(seed))
+        deadline = time.monotonic() + 5
+        while len(pool) < 8 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(pool) == 8
+    finally:
+        pool.close()
@@ -0,0 +1,103 @@
+import random
+import uuid
+
+import pytest
+
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+from backend.app.models.game import FoolGame
+from backend.app.models.game_snapshot import SnapshotError
+from backend.app.simulation.engine import PLAY_STATE, _next_input
+from backend.app.simulation.policies import make_policy
+
+
+def _started_game(players: int, seed: int = 3) -> FoolGame:
+    random.seed(seed)
+    game = FoolGame(str(uuid.uuid4()), players)
+    for _ in range(players):
+        game.handle_input(PlayerInput(str(uuid.uuid4()), PlayerAction.JOIN))
+    for player in list(game.players):
+        game.handle_input(PlayerInput(player.id_, PlayerAction.READY))
+    return game
+
+
+def test_lobby_round_trip():
+    game = FoolGame("lobby", 3)
+    game.handle_input(PlayerInput("p1", PlayerAction.JOIN))
+    restored = FoolGame.restore(game.snapshot())
+
+    assert restored.game_id == "lobby"
+    assert restored.players_limit == 3
+    assert restored.current_state_name == "LobbyState"
+    assert [p.id_ for p in restored.players] == ["p1"]
+    assert restored.players[0].name == "Player p1"
+    assert restored.deck.trump_card == game.deck.trump_card
+    assert restored.snapshot() == game.snapshot()
+
+
+@pytest.mark.parametrize("players, seed, policy_seed", [(2, 3, 2), (6, 3, 6), (2, 13, 13)])
+def test_restored_game_plays_identically(players, seed, policy_seed):
+    """Каждый ход применяется и к партии, и к её восстановленной копии"""
+    game = _started_game(players, seed)
+    rng = random.Random(policy_seed)
+    max_attacks = 0
+    policies = {p.id_: make_policy("random", random.Random(rng.random())) for p in game.players}
+
+    moves = 0
+    while game.current_state_name == PLAY_STATE and moves < 500:
+        data = game.snapshot()
+        assert len(data) < 200
+        copy = FoolGame.restore(data)
+        assert copy.snapshot() == data
+        assert copy.state_history == game.state_history
+        assert copy.round_defender_status == game.round_defender_status
+        assert copy.game_table.slots == game.game_table.slots
+        max_attacks = max(max_attacks, game.game_table.attack_count)
+
+        player_input = _next_input(game, policies)
+        game.handle_input(player_input)
+        copy.handle_input(player_input)
+        assert copy.snapshot() == game.snapshot()
+        moves += 1
+
+    assert game.current_state_name == "GameOverState"
+    if seed == 13:
+        # В этой партии на стол ложится 6 атак — столько мест только после первого отбоя
+        assert max_attacks == 6
+    restored = FoolGame.restore(game.snapshot())
+    assert restored._current_state.winner_id == game._current_state.winner_id
+    assert restored._current_state.loser_ids == game._current_state.loser_ids
+
+
+def test_custom_names_and_plain_ids():
+    game = FoolGame(None, 2)
+    game.handle_input(PlayerInput("player-1", PlayerAction.JOIN))
+    game.players[0].name = "Вася"
+    restored = FoolGame.restore(game.snapshot())
+    assert restored.game_id is None
+    assert restored.players[0].id_ == "player-1"
+    assert restored.players[0].name == "Вася"
+
+
+def test_corrupted_snapshot():
+    data = _started_game(2).snapshot()
+    with pytest.raises(SnapshotError):
+        FoolGame.restore(b"XX" + data[2:])
+    with pytest.raises(SnapshotError):
+        FoolGame.restore(data[:2] + bytes([99]) + data[3:])
+    with pytest.raises(SnapshotError):
+        FoolGame.restore(data[:-3])
+    with pytest.raises(SnapshotError):
+        FoolGame.restore(data + b"\x00")
+
+
+def test_truncated_players_and_bad_positions():
+    game = FoolGame("g", 2)
+    game.handle_input(PlayerInput("p1", PlayerAction.JOIN))
+    data = game.snapshot()
+    # Обрыв сразу после id игрока, перед тегом имени
+    cut = data.index(b"p1") + 2
+    with pytest.raises(SnapshotError):
+        FoolGame.restore(data[:cut])
+    # Позиция атакующего за пределами списка игроков
+    with pytest.raises(SnapshotError):
+        FoolGame.restore(data[:5] + bytes([7]) + data[6:])
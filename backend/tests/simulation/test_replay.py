@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+from backend.app.models.deck_pool import DeckPool
+from backend.app.models.event_log import GameEventLog
+from backend.app.models.game import FoolGame
+from backend.app.simulation.engine import PLAY_STATE, _next_input
+from backend.app.simulation.policies import make_policy
+from backend.app.simulation.replay import replay, replay_logs
+
+
+def _recorded_game(players: int, seed: int):
+    """Партия ботов; возвращает её и снимки после каждого события журнала"""
+    game = FoolGame(f"game-{seed}", players, seed=seed)
+    snapshots = [game.snapshot()]
+    for seat in range(players):
+        game.handle_input(PlayerInput(f"p{seat}", PlayerAction.JOIN))
+        snapshots.append(game.snapshot())
+    for seat in range(players):
+        game.handle_input(PlayerInput(f"p{seat}", PlayerAction.READY))
+        snapshots.append(game.snapshot())
+
+    rng = random.Random(seed)
+    policies = {p.id_: make_policy("random", random.Random(rng.random())) for p in game.players}
+    while game.current_state_name == PLAY_STATE and len(snapshots) < 400:
+        game.handle_input(_next_input(game, policies))
+        snapshots.append(game.snapshot())
+    return game, snapshots
+
+
+def test_seeded_deck_is_deterministic():
+    assert FoolGame("a", 2, seed=42).deck._cards == FoolGame("b", 2, seed=42).deck._cards
+    game = FoolGame("a", 2, seed=42)
+    assert game.event_log.seed == game.deck.seed == 42
+
+
+@pytest.mark.parametrize("players", [2, 4])
+def test_replay_to_any_move(players):
+    game, snapshots = _recorded_game(players, seed=players)
+    log = GameEventLog.from_bytes(game.event_log.to_bytes())
+
+    assert len(log) == len(snapshots) - 1
+    for upto, expected in enumerate(snapshots):
+        assert replay(log, upto).snapshot() == expected
+    assert replay(log).current_state_name == "GameOverState"
+
+
+def test_replay_after_reset_to_lobby():
+    game, _ = _recorded_game(2, seed=5)
+    game.reset_to_lobby()
+    for seat in range(2):
+        game.handle_input(PlayerInput(f"p{seat}", PlayerAction.READY))
+    # Seed колоды после рестарта записан в журнал
+    assert game.event_log.reset_seeds() == [game.deck.seed]
+    assert replay(game.event_log).snapshot() == game.snapshot()
+
+
+def test_replay_with_system_random_decks():
+    """Колоды из пула с системным генератором воспроизводятся по записанным seed"""
+    pool = DeckPool(size=2, background=False)
+    game = FoolGame("g", 2, deck_source=pool)
+    for action in (PlayerAction.JOIN, PlayerAction.READY):
+        for seat in range(2):
+            game.handle_input(PlayerInput(f"p{seat}", action))
+    for _ in range(2):
+        game.reset_to_lobby()
+    log = GameEventLog.from_bytes(game.event_log.to_bytes())
+    assert len(log.reset_seeds()) == 2
+    assert replay(log).snapshot() == game.snapshot()
+
+
+def test_rejected_input_is_not_logged():
+    game = FoolGame("g", 2, seed=1)
+    game.handle_input(PlayerInput("p0", PlayerAction.JOIN))
+    game.handle_input(PlayerInput("p0", PlayerAction.JOIN))  # отклонён
+    game.handle_input(PlayerInput("p1", PlayerAction.ATTACK))  # не в этом состоянии
+    assert len(game.event_log) == 1
+    assert replay(game.event_log).snapshot() == game.snapshot()
+
+
+def test_replay_logs_matches_across_workers():
+    games = [_recorded_game(2 + seed % 3, seed)[0] for seed in range(6)]
+    logs = [game.event_log.to_bytes() for game in games]
+
+    single = replay_logs(logs)
+    assert single.snapshots == [game.snapshot() for game in games]
+    assert single.games == 6
+    assert single.events == sum(len(game.event_log) for game in games)
+    assert replay_logs(logs, workers=2, chunk_size=2).snapshots == single.snapshots
+
+
+def test_corrupted_log():
+    data = FoolGame("g", 2, seed=1).event_log.to_bytes()
+    with pytest.raises(ValueError):
+        GameEventLog.from_bytes(b"XX" + data[2:])
+    with pytest.raises(ValueError):
+        GameEventLog.from_bytes(data + b"\x00")
@@ -0,0 +1,59 @@
+import pytest
+
+from backend.app.models.card import Card, Rank, Suit
+from backend.app.models.card_set import CardSet
+from backend.app.simulation import (
+    GreedyPolicy,
+    RandomPolicy,
+    SimulationConfig,
+    make_policy,
+    play_game,
+    run_simulation,
+)
+
+
+@pytest.mark.parametrize("players", [2, 3, 4])
+@pytest.mark.parametrize("policy", ["greedy", "random"])
+def test_bots_finish_game(players, policy):
+    """Тест: боты доигрывают партию до конца без недопустимых ходов"""
+    record = play_game(seed=11, config=SimulationConfig(players=players, policies=(policy,)))
+    assert record.finished
+    assert record.moves > 0
+    assert record.transitions["LobbyState->PlayRoundWithoutThrowState"] == 1
+    assert record.transitions["DealState->GameOverState"] == 1
+
+
+def test_game_is_reproducible_by_seed():
+    """Тест: одно и то же зерно даёт одну и ту же партию"""
+    config = SimulationConfig(policies=("random", "greedy"), record_moves=True)
+    first = play_game(seed=5, config=config)
+    second = play_game(seed=5, config=config)
+    assert first.log == second.log
+    assert len(first.log) == first.moves
+
+
+def test_run_simulation_report():
+    """Тест: сводка по серии партий"""
+    report = run_simulation(20, SimulationConfig(), seed=3, chunk_size=7)
+    assert report.games == 20
+    assert report.finished + report.aborted == 20
+    assert report.mean_game_length == report.moves / 20
+    assert sum(report.wins.values()) <= report.finished
+    assert report.to_dict()["transitions"]["DealState->GameOverState"] == report.finished
+
+
+def test_greedy_policy_saves_trumps():
+    """Тест: жадная стратегия не тратит козыри, пока есть обычные карты"""
+    policy = GreedyPolicy()
+    hand = CardSet([Card(Rank.SIX, Suit.SPADES), Card(Rank.TEN, Suit.HEARTS), Card(Rank.NINE, Suit.CLUBS)])
+    assert policy.choose_attack(hand.mask, Suit.SPADES, must_attack=True) == Card(Rank.NINE, Suit.CLUBS).index
+    assert policy.choose_defense(CardSet([Card(Rank.SIX, Suit.SPADES)]).mask,
+                                 Card(Rank.ACE, Suit.HEARTS), Suit.SPADES) == Card(Rank.SIX, Suit.SPADES).index
+    assert policy.choose_attack(CardSet([Card(Rank.SIX, Suit.SPADES)]).mask, Suit.SPADES, must_attack=False) is None
+
+
+def test_make_policy():
+    """Тест: стратегии создаются по имени"""
+    assert isinstance(make_policy("random"), RandomPolicy)
+    with pytest.raises(ValueError):
+        make_policy("unknown")
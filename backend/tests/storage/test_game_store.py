@@ -0,0 +1,191 @@
+import pytest
+import redis
+
+from backend.api.managers.game_manager import GameManager
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+from backend.app.models.game import FoolGame
+from backend.app.storage import InMemoryGameStore, KeyValueGameStore, open_game_store
+from backend.app.storage.kv_server import KVServer
+
+
+@pytest.fixture
+def kv_server():
+    server = KVServer().start()
+    yield server
+    server.stop()
+
+
+def kv_store(server: KVServer) -> KeyValueGameStore:
+    return KeyValueGameStore(redis.Redis(port=server.port))
+
+
+@pytest.fixture(params=["memory", "kv"])
+def store(request):
+    if request.param == "memory":
+        yield InMemoryGameStore()
+        return
+    server = request.getfixturevalue("kv_server")
+    store = kv_store(server)
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize("protocol", [2, 3])
+def test_kv_server_speaks_redis(kv_server, protocol):
+    client = redis.Redis(port=kv_server.port, protocol=protocol)
+    assert client.ping()
+    assert client.get("missing") is None
+    assert client.set("a", b"\x00\r\n") and client.get("a") == b"\x00\r\n"
+    assert client.incr("n") == 1 and client.incr("n") == 2
+    assert client.hset("h", "f", "v") == 1 and client.hget("h", "f") == b"v"
+    assert client.sadd("s", "x", "y") == 2 and client.smembers("s") == {b"x", b"y"}
+    pipe = client.pipeline(transaction=False)
+    pipe.srem("s", "x").scard("s").delete("a", "missing")
+    assert pipe.execute() == [1, 1, 1]
+    with pytest.raises(redis.ResponseError, match="WRONGTYPE"):
+        client.hget("s", "f")
+    client.close()
+
+
+def test_store_contract(store):
+    game = FoolGame("g1", 2)
+    store.add(game, pending=True)
+    assert "g1" in store.pending and "g1" not in store.active
+    assert store.get("g1") is game
+
+    store.move("g1", pending=False)
+    assert list(store.active) == ["g1"] and len(store.pending) == 0
+
+    store.bind_player("p1", "g1")
+    assert store.player_game("p1") == "g1"
+    store.unbind_player("p1")
+    store.unbind_player("missing")
+    assert store.player_game("p1") is None
+
+    store.remove("g1")
+    assert store.get("g1") is None and "g1" not in store.active
+
+
+def test_kv_store_caches_until_another_node_writes(kv_server):
+    now = [0.0]
+    node_a = KeyValueGameStore(redis.Redis(port=kv_server.port), clock=lambda: now[0])
+    node_b = kv_store(kv_server)
+    game = FoolGame("g1", 2)
+    node_a.add(game, pending=True)
+    node_a.flush()
+
+    from_b = node_b.get("g1")
+    assert from_b is not game and from_b.snapshot() == game.snapshot()
+    # Партия в кэше — снимок повторно не разбирается
+    assert node_b.get("g1") is from_b
+    assert node_a.get("g1") is game
+
+    from_b.handle_input(PlayerInput("p1", PlayerAction.JOIN))
+    node_b.save(from_b)
+    node_b.flush()
+    # До срока сверки узел отдаёт партию из кэша без запросов к серверу
+    assert node_a.get("g1") is game
+    now[0] += node_a.revalidate_after
+    assert node_a.get("g1") is game  # Сверка ушла в поток записи
+    node_a.flush()
+    fresh = node_a.get("g1")
+    assert fresh is not game and [p.id_ for p in fresh.players] == ["p1"]
+    assert fresh.event_log.to_bytes() == from_b.event_log.to_bytes()
+    node_a.close()
+    node_b.close()
+
+
+def test_kv_store_appends_only_new_events(kv_server, monkeypatch):
+    store = kv_store(kv_server)
+    sent = []
+    pipeline = store.client.pipeline
+
+    def recording_pipeline(**kwargs):
+        pipe = pipeline(**kwargs)
+        execute = pipe.execute
+
+        def record():
+            sent.extend(args for args, _ in pipe.command_stack)
+            return execute()
+
+        pipe.execute = record
+        return pipe
+
+    monkeypatch.setattr(store.client, "pipeline", recording_pipeline)
+    game = FoolGame("g1", 3)
+    store.add(game, pending=True)
+    game.handle_input(PlayerInput("p1", PlayerAction.JOIN))
+    game.handle_input(PlayerInput("p2", PlayerAction.JOIN))
+    store.save(game)
+    store.flush()
+
+    sent.clear()
+    written = game.event_log.events_size
+    game.handle_input(PlayerInput("p1", PlayerAction.JOIN))  # отклонён — в журнал не попадает
+    game.handle_input(PlayerInput("p1", PlayerAction.READY))
+    store.save(game)
+    store.flush()
+    # Игроки в журнале те же — заголовок не переписывается, события дописываются
+    log_writes = [args for args in sent if args[1].startswith(("fool:log:", "fool:events:"))]
+    assert log_writes == [("APPEND", "fool:events:g1", game.event_log.events_bytes(written))]
+
+    game.handle_input(PlayerInput("p3", PlayerAction.JOIN))
+    store.save(game)
+    store.flush()
+    store.evict("g1")
+    loaded = store.get("g1")
+    assert loaded is not game
+    assert loaded.event_log.to_bytes() == game.event_log.to_bytes()
+    store.close()
+
+
+def test_kv_store_serves_lists_and_players_locally(kv_server):
+    store = kv_store(kv_server)
+    game = FoolGame("g1", 2)
+    store.add(game, pending=True)
+    store.bind_player("p1", "g1")
+    store.move("g1", pending=False)
+    # Команды ещё в очереди записи, а локальное состояние уже изменено
+    assert list(store.active) == ["g1"] and "g1" not in store.pending
+    assert store.player_game("p1") == "g1"
+    store.flush()
+
+    client = redis.Redis(port=kv_server.port)
+    assert client.smembers("fool:active") == {b"g1"} and client.scard("fool:pending") == 0
+    assert client.hget("fool:players", "p1") == b"g1"
+    client.delete("fool:active")
+    assert list(store.active) == ["g1"]  # Список не перечитывается с сервера
+    client.close()
+    store.close()
+
+
+def test_game_manager_survives_restart_on_kv_store(kv_server):
+    manager = GameManager(store=kv_store(kv_server))
+    started = manager.create_game(2)
+    waiting = manager.create_game(3)
+    for game, player_ids in ((started, ["a", "b"]), (waiting, ["c"])):
+        for player_id in player_ids:
+            game.handle_input(PlayerInput(player_id, PlayerAction.JOIN))
+            manager.add_game_to_player(game.game_id, player_id)
+            manager.update_game_slots_by_id(game.game_id)
+            manager.checkpoint(game)
+    manager.store.flush()
+
+    restarted = GameManager(store=kv_store(kv_server))
+    assert restarted.restore_games() == 2
+    assert set(restarted.active_games) == {started.game_id}
+    assert set(restarted.pending_games) == {waiting.game_id}
+    assert restarted.get_game_by_player_id("a").snapshot() == started.snapshot()
+    assert restarted.find_available_game().game_id == waiting.game_id
+    assert restarted.lobby_games() == [
+        {"game_id": waiting.game_id, "players_limit": 3, "players_inside": 1}
+    ]
+
+
+def test_open_game_store(kv_server):
+    assert isinstance(open_game_store(None), InMemoryGameStore)
+    store = open_game_store(kv_server.url)
+    assert isinstance(store, KeyValueGameStore)
+    store.close()
+    with pytest.raises(ValueError):
+        open_game_store("memcached://localhost")
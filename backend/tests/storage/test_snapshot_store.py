@@ -0,0 +1,69 @@
+import pytest
+
+from backend.api.managers.game_manager import GameManager
+from backend.app.contracts.game_contract import PlayerAction, PlayerInput
+from backend.app.storage import (
+    FileSnapshotStore,
+    SQLiteSnapshotStore,
+    open_snapshot_store,
+)
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        store = FileSnapshotStore(tmp_path / "snapshots")
+    else:
+        store = SQLiteSnapshotStore(tmp_path / "snapshots.db")
+    yield store
+    store.close()
+
+
+def test_save_load_delete(store):
+    assert store.load("g1") is None
+    store.save("g1", b"first")
+    store.save("g1", b"second")
+    store.save("g2", b"\x00\xff")
+
+    assert store.load("g1") == b"second"
+    assert sorted(store.game_ids()) == ["g1", "g2"]
+
+    store.delete("g1")
+    store.delete("missing")
+    assert store.load("g1") is None
+    assert list(store.game_ids()) == ["g2"]
+
+
+def test_game_manager_restores_games(store):
+    manager = GameManager(snapshot_store=store)
+    started = manager.create_game(2)
+    waiting = manager.create_game(3)
+    for game, player_ids in ((started, ["a", "b"]), (waiting, ["c"])):
+        for player_id in player_ids:
+            game.handle_input(PlayerInput(player_id, PlayerAction.JOIN))
+            manager.add_game_to_player(game.game_id, player_id)
+            manager.update_game_slots_by_id(game.game_id)
+    for player_id in ("a", "b"):
+        started.handle_input(PlayerInput(player_id, PlayerAction.READY))
+    manager.checkpoint(started)
+    manager.checkpoint(waiting)
+    # Пустая комната не восстанавливается
+    manager.checkpoint(manager.create_game(2))
+
+    restarted = GameManager(snapshot_store=store)
+    assert restarted.restore_games() == 2
+    assert set(restarted.active_games) == {started.game_id}
+    assert set(restarted.pending_games) == {waiting.game_id}
+    assert restarted.get_game_by_player_id("a").snapshot() == started.snapshot()
+    assert restarted.find_available_game().game_id == waiting.game_id
+    assert len(list(store.game_ids())) == 2
+
+
+def test_open_snapshot_store(tmp_path):
+    assert open_snapshot_store(None) is None
+    assert isinstance(open_snapshot_store(f"file://{tmp_path}"), FileSnapshotStore)
+    sqlite_store = open_snapshot_store(f"sqlite://{tmp_path / 'games.db'}")
+    assert isinstance(sqlite_store, SQLiteSnapshotStore)
+    sqlite_store.close()
+    with pytest.raises(ValueError):
+        open_snapshot_store("redis://localhost")
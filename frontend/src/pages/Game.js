@@ -9,6 +9,7 @@ import backImage from 'assets/images/imperial_back.png';
 import DiscardDeck from 'components/GameTable/DiscardDeck';
 import Card from '../components/GameTable/Card';
 import { getCardSvgPath } from 'utils/cardSvgLinker';
+import { applyStateDelta } from 'utils/gameStateDelta';
 import 'assets/styles/game/Game.css';
 import { ToastContainer, toast } from 'react-toastify';
 import 'react-toastify/dist/ReactToastify.css';
@@ -21,6 +22,8 @@ function Game() {
   const location = useLocation();
   const websocketUrl = location.state?.websocket;
   const ws = useRef(null);
+  // Номер последнего применённого сообщения состояния (seq)
+  const lastSeq = useRef(0);
 
   const [connectionStatus, setConnectionStatus] = useState('Connecting');
   const [isUsingMocks, setIsUsingMocks] = useState(!websocketUrl);
@@ -100,6 +103,7 @@ function Game() {
           break;
 
         case "connection_confirmed":
+          lastSeq.current = message.data.seq || 0;
           const isCurrentPlayerAttacker = message.data.position === message.data.attacker_position;
           const isCurrentPlayerDefender = message.data.position === message.data.defender_position;
           
@@ -159,6 +163,16 @@ function Game() {
           });
           break;
 
+        case 'game_state_delta':
+          if (message.data.seq !== lastSeq.current + 1) {
+            // Пропущено сообщение — дельту не применяем, просим полный снимок
+            ws.current?.send(JSON.stringify({ type: 'resync_state' }));
+            break;
+          }
+          lastSeq.current = message.data.seq;
+          setGameState(prev => applyStateDelta(prev, message.data, currentPlayerId));
+          break;
+
         case 'player_joined':
           setGameState(prev => {
             const existingPlayerIndex = prev.players.findIndex(p => p.id === message.data.player_id);
@@ -8,6 +8,17 @@ import { ROUTES } from 'constants/routes';
 import { API_BASE_URL } from 'constants/api';
 import api from 'utils/apiMiddleware';
 
+// Игра из ленты лобби -> элемент списка
+const parseGame = (game) => ({
+  id: game.game_id,
+  name: `Игра ${game.game_id}`,
+  players: {
+    current: game.players_inside,
+    max: game.players_limit
+  },
+  isPublic: !game.password,
+});
+
 function GamesList() {
   const [games, setGames] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -83,16 +94,7 @@ function GamesList() {
           if (!isMounted) return;
 
           const gamesList = JSON.parse(event.data);
-          const parsedGames = gamesList.map((game) => ({
-            id: game.game_id,
-            name: `Игра ${game.game_id}`,
-            players: {
-              current: game.players_inside,
-              max: game.players_limit
-            },
-            isPublic: !game.password,
-          }));
-          setGames(parsedGames);
+          setGames(gamesList.map(parseGame));
           setLoading(false);
         };
 
@@ -117,21 +119,26 @@ function GamesList() {
           if (!isMounted) return;
         });
 
-        // Добавляем обработчик для games_update событий
-        eventSource.addEventListener('games_update', (event) => {
+        // Инкрементальные изменения лобби: добавление или обновление игры
+        const upsertGame = (event) => {
           if (!isMounted) return;
-          const gamesList = JSON.parse(event.data);
-          const parsedGames = gamesList.map((game) => ({
-            id: game.game_id,
-            name: `Игра ${game.game_id}`,
-            players: {
-              current: game.players_inside,
-              max: game.players_limit
-            },
-            isPublic: !game.password,
-          }));
-          setGames(parsedGames);
-          setLoading(false);
+          const game = parseGame(JSON.parse(event.data));
+          setGames((prev) => {
+            const index = prev.findIndex((g) => g.id === game.id);
+            if (index < 0) return [...prev, game];
+            const next = [...prev];
+            next[index] = game;
+            return next;
+          });
+        };
+        eventSource.addEventListener('game_added', upsertGame);
+        eventSource.addEventListener('game_updated', upsertGame);
+
+        // Игра заполнилась или удалена — убираем из списка
+        eventSource.addEventListener('game_removed', (event) => {
+          if (!isMounted) return;
+          const { game_id: gameId } = JSON.parse(event.data);
+          setGames((prev) => prev.filter((g) => g.id !== gameId));
         });
 
         // Добавляем обработчик для закрытия соединения
@@ -0,0 +1,83 @@
+/**
+ * Применение дельт состояния игры (сообщение game_state_delta) к gameState.
+ *
+ * Сервер присылает только изменившиеся поля и номер seq. Если номер пришёл
+ * не по порядку, дельту применять нельзя — нужно запросить полный снимок
+ * сообщением resync_state.
+ */
+
+// Поля дельты (set) -> поля gameState
+const SCALAR_FIELDS = {
+  current_state: 'gamePhase',
+  status: 'playerStatus',
+  position: 'player_position',
+  allowed_actions: 'yourAllowedActions',
+  deck_size: 'deckSize',
+  trump_suit: 'trumpSuit',
+  trump_rank: 'trumpRank',
+  attacker_position: 'attackerPosition',
+  defender_position: 'defenderPosition',
+};
+
+const cardKey = (card) => `${card.rank}${card.suit}`;
+
+/**
+ * Возвращает новое состояние игры с применённой дельтой
+ * @param {Object} prev - текущее состояние игры
+ * @param {Object} delta - data сообщения game_state_delta
+ * @param {string} currentPlayerId - id текущего игрока
+ * @returns {Object} новое состояние
+ */
+export function applyStateDelta(prev, delta, currentPlayerId) {
+  const next = { ...prev };
+
+  Object.entries(delta.set || {}).forEach(([field, value]) => {
+    if (SCALAR_FIELDS[field]) {
+      next[SCALAR_FIELDS[field]] = value;
+    }
+  });
+
+  if (delta.cards_added || delta.cards_removed) {
+    const removed = new Set((delta.cards_removed || []).map(cardKey));
+    next.yourCards = [
+      ...prev.yourCards.filter((card) => !removed.has(cardKey(card))),
+      ...(delta.cards_added || []),
+    ];
+  }
+
+  if (delta.table_size !== undefined) {
+    const tableCards = prev.tableCards.slice(0, delta.table_size);
+    (delta.table_slots || []).forEach(([index, pair]) => {
+      tableCards[index] = { base: pair.attack_card, cover: pair.defend_card || null };
+    });
+    next.tableCards = tableCards;
+  }
+
+  const removedPlayers = new Set(delta.players_removed || []);
+  const players = prev.players.filter((p) => !removedPlayers.has(p.id));
+  // Для уже известных игроков приходят только изменившиеся поля
+  (delta.players_updated || []).forEach((update) => {
+    const entry = { id: update.player_id };
+    if (update.name !== undefined) entry.name = update.name;
+    if (update.cards_count !== undefined) entry.cards = update.cards_count;
+    if (update.position !== undefined) entry.position = update.position;
+    if (update.status !== undefined) entry.status = update.status;
+    const index = players.findIndex((p) => p.id === update.player_id);
+    if (index >= 0) {
+      players[index] = { ...players[index], ...entry };
+    } else {
+      players.push(entry);
+    }
+  });
+  next.players = players
+    .map((p) => (p.id === currentPlayerId
+      ? { ...p, cards: next.yourCards.length, position: next.player_position, status: next.playerStatus }
+      : p))
+    .sort((a, b) => a.position - b.position);
+
+  next.isAttacker = next.player_position === next.attackerPosition;
+  next.isDefender = next.player_position === next.defenderPosition;
+  next.current_attacker_id = next.players.find((p) => p.position === next.attackerPosition)?.id;
+  next.current_defender_id = next.players.find((p) => p.position === next.defenderPosition)?.id;
+  return next;
+}